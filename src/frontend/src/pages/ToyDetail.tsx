@@ -3,7 +3,7 @@ import { useParams, useNavigate } from 'react-router-dom';
 import { toyApiClient } from '../services/toyApiClient';
 import { tripApiClient } from '../services/tripApiClient';
 import type { Toy } from '../types/toy';
-import type { Trip } from '../types/trip';
+import type { TripSummary } from '../types/trip';
 
 function ToyDetail() {
   const { id } = useParams<{ id: string }>();
@@ -20,14 +20,13 @@ function ToyDetail() {
   const [uploadingAvatar, setUploadingAvatar] = useState(false);
   const [avatarUrl, setAvatarUrl] = useState<string | null>(null);
   const [loadingAvatar, setLoadingAvatar] = useState(false);
-  const [trips, setTrips] = useState<Trip[]>([]);
+  const [trips, setTrips] = useState<TripSummary[]>([]);
   const [loadingTrips, setLoadingTrips] = useState(false);
   const fileInputRef = useRef<HTMLInputElement>(null);
 
   useEffect(() => {
     if (id) {
-      loadToy();
-      loadTrips();
+      loadTimeline();
     }
   }, [id]);
 
@@ -76,16 +75,23 @@ function ToyDetail() {
     }
   };
 
-  const loadTrips = async () => {
+  const loadTimeline = async () => {
     if (!id) return;
     
     try {
+      setLoading(true);
       setLoadingTrips(true);
-      const tripsData = await tripApiClient.listTrips({ toy_id: id, limit: 5 });
-      setTrips(tripsData.items);
+      setError(null);
+      // One request for the toy and its recent trips
+      const timeline = await tripApiClient.getToyTimeline(id, 5);
+      setToy(timeline.toy);
+      setEditName(timeline.toy.name);
+      setEditDescription(timeline.toy.description || '');
+      setTrips(timeline.trips);
     } catch (err) {
-      console.error('Failed to load trips:', err);
+      setError(err instanceof Error ? err.message : 'Failed to load toy');
     } finally {
+      setLoading(false);
       setLoadingTrips(false);
     }
   };
@@ -396,7 +402,7 @@ function ToyDetail() {
                     <div className="flex-1 min-w-0">
                       <h3 className="font-medium text-gray-900 mb-1">{trip.title}</h3>
                       <div className="text-sm text-gray-600">
-                        {trip.location_name} • {trip.gallery.length} photo{trip.gallery.length !== 1 ? 's' : ''}
+                        {trip.location_name} • {trip.gallery_count} photo{trip.gallery_count !== 1 ? 's' : ''}
                       </div>
                     </div>
                     <svg className="w-5 h-5 text-gray-400 flex-shrink-0 ml-2" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -17,7 +17,8 @@ function TripDetail() {
   const [editDescription, setEditDescription] = useState('');
   const [isSaving, setIsSaving] = useState(false);
   const [isDeleting, setIsDeleting] = useState(false);
-  const [galleryBlobUrls, setGalleryBlobUrls] = useState<Map<string, string>>(new Map());
+  const [contactSheetUrl, setContactSheetUrl] = useState<string | null>(null);
+  const [contactSheetFailed, setContactSheetFailed] = useState(false);
 
   useEffect(() => {
     if (tripId) {
@@ -26,16 +27,27 @@ function TripDetail() {
   }, [tripId]);
 
   useEffect(() => {
-    // Load gallery image blobs when trip changes
-    if (trip && tripId) {
-      loadGalleryImages();
+    // Load the gallery contact sheet when trip changes
+    let sheetUrl: string | null = null;
+    if (trip && tripId && trip.gallery_count > 0) {
+      setContactSheetFailed(false);
+      tripApiClient.getContactSheetBlob(tripId, 6)
+        .then(url => {
+          sheetUrl = url;
+          setContactSheetUrl(url);
+        })
+        .catch(err => {
+          console.error('Failed to load gallery contact sheet:', err);
+          setContactSheetFailed(true);
+        });
     }
     
-    // Cleanup blob URLs on unmount or when trip changes
+    // Cleanup blob URL on unmount or when trip changes
     return () => {
-      galleryBlobUrls.forEach(url => URL.revokeObjectURL(url));
+      if (sheetUrl) URL.revokeObjectURL(sheetUrl);
+      setContactSheetUrl(null);
     };
-  }, [trip?.id]);
+  }, [trip?.id, trip?.gallery_count]);
 
   const loadTrip = async () => {
     if (!tripId) return;
@@ -54,25 +66,6 @@ function TripDetail() {
     }
   };
 
-  const loadGalleryImages = async () => {
-    if (!trip || !tripId) return;
-    
-    // Load blob URLs for gallery images (limited to preview, first 6)
-    const imagesToLoad = trip.gallery.slice(0, 6);
-    const newUrls = new Map<string, string>();
-    
-    for (const image of imagesToLoad) {
-      try {
-        const blobUrl = await tripApiClient.getGalleryImageBlob(tripId, image.image_id);
-        newUrls.set(image.image_id, blobUrl);
-      } catch (err) {
-        console.error(`Failed to load gallery image ${image.image_id}:`, err);
-      }
-    }
-    
-    setGalleryBlobUrls(newUrls);
-  };
-
   const handleSave = async () => {
     if (!tripId || !trip) return;
     
@@ -284,7 +277,7 @@ function TripDetail() {
           <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-6">
             <div className="flex items-center justify-between mb-4">
               <h2 className="text-xl font-semibold text-gray-900">
-                Gallery ({trip.gallery.length})
+                Gallery ({trip.gallery_count})
               </h2>
               <button
                 onClick={() => navigate(`/trip/${tripId}/gallery`)}
@@ -297,7 +290,7 @@ function TripDetail() {
               </button>
             </div>
 
-            {trip.gallery.length === 0 ? (
+            {trip.gallery_count === 0 ? (
               <div className="text-center py-8 text-gray-500">
                 <svg className="w-12 h-12 mx-auto mb-2 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                   <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z" />
@@ -311,31 +304,25 @@ function TripDetail() {
                 </button>
               </div>
             ) : (
-              <div className="grid grid-cols-2 sm:grid-cols-3 gap-2">
-                {trip.gallery.slice(0, 6).map((image) => {
-                  const blobUrl = galleryBlobUrls.get(image.image_id);
-                  return (
-                    <div
-                      key={image.image_id}
-                      onClick={() => navigate(`/trip/${tripId}/gallery`)}
-                      className="aspect-square bg-gray-100 rounded-lg overflow-hidden cursor-pointer hover:opacity-90 transition-opacity"
-                    >
-                      {blobUrl ? (
-                        <img
-                          src={blobUrl}
-                          alt={image.caption || 'Gallery image'}
-                          className="w-full h-full object-cover"
-                        />
-                      ) : (
-                        <div className="w-full h-full flex items-center justify-center">
-                          <svg className="w-8 h-8 text-gray-400 animate-spin" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15" />
-                          </svg>
-                        </div>
-                      )}
-                    </div>
-                  );
-                })}
+              <div
+                onClick={() => navigate(`/trip/${tripId}/gallery`)}
+                className="bg-gray-100 rounded-lg overflow-hidden cursor-pointer hover:opacity-90 transition-opacity"
+              >
+                {contactSheetUrl ? (
+                  <img
+                    src={contactSheetUrl}
+                    alt="Gallery preview"
+                    className="w-full h-auto"
+                  />
+                ) : contactSheetFailed ? (
+                  <div className="py-8 text-center text-sm text-gray-500">Preview unavailable</div>
+                ) : (
+                  <div className="w-full aspect-video flex items-center justify-center">
+                    <svg className="w-8 h-8 text-gray-400 animate-spin" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                      <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15" />
+                    </svg>
+                  </div>
+                )}
               </div>
             )}
           </div>
@@ -365,7 +352,7 @@ function TripDetail() {
 
               <div>
                 <span className="text-gray-500">Photos:</span>
-                <span className="ml-2 font-medium">{trip.gallery.length}</span>
+                <span className="ml-2 font-medium">{trip.gallery_count}</span>
               </div>
               <div>
                 <span className="text-gray-500">Public Tracking:</span>
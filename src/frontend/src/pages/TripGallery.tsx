@@ -13,6 +13,7 @@ function TripGallery() {
   const [error, setError] = useState<string | null>(null);
   const [uploading, setUploading] = useState(false);
   const [selectedImage, setSelectedImage] = useState<GalleryImage | null>(null);
+  const [images, setImages] = useState<GalleryImage[]>([]);
   const [galleryBlobUrls, setGalleryBlobUrls] = useState<Map<string, string>>(new Map());
   const [loadingImages, setLoadingImages] = useState<Set<string>>(new Set());
   
@@ -36,7 +37,7 @@ function TripGallery() {
     return () => {
       galleryBlobUrls.forEach(url => URL.revokeObjectURL(url));
     };
-  }, [trip?.id]);
+  }, [trip?.id, trip?.gallery_count]);
 
   const loadTrip = async () => {
     if (!tripId) return;
@@ -56,16 +57,30 @@ function TripGallery() {
   const loadGalleryImages = async () => {
     if (!trip || !tripId) return;
     
+    // Gallery metadata is paged separately from the trip
+    const gallery: GalleryImage[] = [];
+    let continuationToken: string | undefined;
+    try {
+      do {
+        const page = await tripApiClient.listGallery(tripId, { limit: 100, continuation_token: continuationToken });
+        gallery.push(...page.items);
+        continuationToken = page.continuation_token ?? undefined;
+      } while (continuationToken);
+    } catch (err) {
+      console.error('Failed to list gallery images:', err);
+    }
+    setImages(gallery);
+
     // Load blob URLs for all gallery images
     const newUrls = new Map<string, string>();
     const loading = new Set<string>();
     
-    for (const image of trip.gallery) {
+    for (const image of gallery) {
       loading.add(image.image_id);
     }
     setLoadingImages(loading);
     
-    for (const image of trip.gallery) {
+    for (const image of gallery) {
       try {
         const blobUrl = await tripApiClient.getGalleryImageBlob(tripId, image.image_id);
         newUrls.set(image.image_id, blobUrl);
@@ -86,16 +101,16 @@ function TripGallery() {
   const handleFileSelect = async (e: React.ChangeEvent<HTMLInputElement>) => {
     if (!tripId || !e.target.files || e.target.files.length === 0) return;
     
-    const file = e.target.files[0];
+    const files = Array.from(e.target.files);
     
     // Validate file size (max 10MB)
-    if (file.size > 10 * 1024 * 1024) {
+    if (files.some((file) => file.size > 10 * 1024 * 1024)) {
       alert('File size must be less than 10MB');
       return;
     }
     
     // Validate file type
-    if (!file.type.startsWith('image/')) {
+    if (files.some((file) => !file.type.startsWith('image/'))) {
       alert('File must be an image');
       return;
     }
@@ -107,7 +122,28 @@ function TripGallery() {
       if (uploadLandmark.trim()) metadata.landmark = uploadLandmark.trim();
       if (uploadCaption.trim()) metadata.caption = uploadCaption.trim();
       
-      await tripApiClient.uploadGalleryImage(tripId, file, metadata);
+      // Directly to storage when the service supports it, otherwise one request for all selected files
+      let failed: string[];
+      const firstTicket = await tripApiClient.createGalleryUpload(tripId, files[0].type);
+      if (firstTicket) {
+        const outcomes = await Promise.allSettled(
+          files.map(async (file, index) => {
+            const ticket = index === 0 ? firstTicket : await tripApiClient.createGalleryUpload(tripId, file.type);
+            return tripApiClient.uploadGalleryImageDirect(tripId, ticket!, file, metadata);
+          })
+        );
+        failed = outcomes.flatMap((outcome, index) =>
+          outcome.status === 'rejected'
+            ? [`${files[index].name}: ${outcome.reason instanceof Error ? outcome.reason.message : outcome.reason}`]
+            : []
+        );
+      } else {
+        const { results } = await tripApiClient.uploadGalleryImages(tripId, files, metadata);
+        failed = results.filter((result) => result.error).map((result) => `${result.filename}: ${result.error}`);
+      }
+      if (failed.length > 0) {
+        alert(failed.join('\n'));
+      }
       
       // Reset form
       setUploadLandmark('');
@@ -118,7 +154,7 @@ function TripGallery() {
       
       await loadTrip();
     } catch (err) {
-      alert(err instanceof Error ? err.message : 'Failed to upload image');
+      alert(err instanceof Error ? err.message : 'Failed to upload images');
     } finally {
       setUploading(false);
     }
@@ -177,17 +213,18 @@ function TripGallery() {
 
       {/* Upload Form */}
       <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-6 mb-6">
-        <h2 className="text-lg font-semibold text-gray-900 mb-4">Upload Photo</h2>
+        <h2 className="text-lg font-semibold text-gray-900 mb-4">Upload Photos</h2>
         
         <div className="grid grid-cols-1 md:grid-cols-4 gap-4">
           <div className="md:col-span-2">
             <label className="block text-sm font-medium text-gray-700 mb-1">
-              Select Image
+              Select Images
             </label>
             <input
               ref={fileInputRef}
               type="file"
               accept="image/*"
+              multiple
               onChange={handleFileSelect}
               disabled={uploading}
               className="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-gray-900 disabled:opacity-50"
@@ -233,7 +270,7 @@ function TripGallery() {
       </div>
 
       {/* Gallery Grid */}
-      {trip.gallery.length === 0 ? (
+      {trip.gallery_count === 0 ? (
         <div className="bg-white rounded-lg shadow-sm border border-gray-200 p-12 text-center">
           <svg className="w-16 h-16 text-gray-400 mx-auto mb-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
             <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z" />
@@ -245,7 +282,7 @@ function TripGallery() {
         </div>
       ) : (
         <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-4 gap-4">
-          {trip.gallery.map((image) => {
+          {images.map((image) => {
             const blobUrl = galleryBlobUrls.get(image.image_id);
             const isLoading = loadingImages.has(image.image_id);
             
@@ -174,12 +174,12 @@ function TripList() {
 
                   <div className="flex items-center gap-4 text-sm text-gray-500">
                     
-                    {trip.gallery.length > 0 && (
+                    {trip.gallery_count > 0 && (
                       <div className="flex items-center gap-1">
                         <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                           <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z" />
                         </svg>
-                        <span>{trip.gallery.length} photo{trip.gallery.length !== 1 ? 's' : ''}</span>
+                        <span>{trip.gallery_count} photo{trip.gallery_count !== 1 ? 's' : ''}</span>
                       </div>
                     )}
                     
@@ -1,5 +1,14 @@
 import { API_CONFIG } from '../config/apiConfig';
-import type { Trip, TripCreate, TripUpdate, TripListResponse } from '../types/trip';
+import type {
+  Trip,
+  TripCreate,
+  TripUpdate,
+  TripListResponse,
+  GalleryListResponse,
+  GalleryBatchUploadResponse,
+  GalleryUploadTicket,
+  ToyTimeline,
+} from '../types/trip';
 
 class TripApiClient {
   private baseUrl: string;
@@ -44,14 +53,16 @@ class TripApiClient {
     toy_id?: string;
     owner_oid?: string;
     limit?: number;
-    offset?: number;
+    continuation_token?: string;
+    include_total?: boolean;
   }): Promise<TripListResponse> {
     const queryParams = new URLSearchParams();
     
     if (params.toy_id) queryParams.append('toy_id', params.toy_id);
     if (params.owner_oid) queryParams.append('owner_oid', params.owner_oid);
     if (params.limit) queryParams.append('limit', params.limit.toString());
-    if (params.offset) queryParams.append('offset', params.offset.toString());
+    if (params.continuation_token) queryParams.append('continuation_token', params.continuation_token);
+    if (params.include_total) queryParams.append('include_total', 'true');
 
     const response = await this.fetch(`${this.baseUrl}/trip?${queryParams}`);
     
@@ -88,6 +99,17 @@ class TripApiClient {
     }
   }
 
+  async getToyTimeline(toyId: string, limit = 5): Promise<ToyTimeline> {
+    // Toy and recent trips in one request, assembled by the trip service
+    const response = await this.fetch(`${this.baseUrl}/toy/${toyId}/timeline?limit=${limit}`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to load toy timeline: ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
   async uploadGalleryImage(
     tripId: string,
     file: File,
@@ -120,6 +142,112 @@ class TripApiClient {
     return response.json();
   }
 
+  async uploadGalleryImages(
+    tripId: string,
+    files: File[],
+    metadata?: {
+      landmark?: string;
+      caption?: string;
+    }
+  ): Promise<GalleryBatchUploadResponse> {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+
+    const queryParams = new URLSearchParams();
+
+    if (metadata?.landmark) queryParams.append('landmark', metadata.landmark);
+    if (metadata?.caption) queryParams.append('caption', metadata.caption);
+
+    const url = `${this.baseUrl}/trip/${tripId}/gallery/batch${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
+
+    const response = await this.fetch(url, {
+      method: 'POST',
+      body: formData,
+    });
+
+    if (!response.ok) {
+      const error = await response.text();
+      throw new Error(`Failed to upload gallery images: ${response.statusText} - ${error}`);
+    }
+
+    return response.json();
+  }
+
+  // Returns null when the service cannot issue direct upload URLs (filesystem blob backend)
+  async createGalleryUpload(tripId: string, contentType: string): Promise<GalleryUploadTicket | null> {
+    const response = await this.fetch(`${this.baseUrl}/trip/${tripId}/gallery/uploads`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ content_type: contentType }),
+    });
+
+    if (response.status === 501) {
+      return null;
+    }
+    if (!response.ok) {
+      const error = await response.text();
+      throw new Error(`Failed to start gallery upload: ${response.statusText} - ${error}`);
+    }
+
+    return response.json();
+  }
+
+  async uploadGalleryImageDirect(
+    tripId: string,
+    ticket: GalleryUploadTicket,
+    file: File,
+    metadata?: {
+      landmark?: string;
+      caption?: string;
+    }
+  ): Promise<Trip> {
+    // Straight to Blob Storage with the pre-signed URL (plain fetch: no API credentials go to storage)
+    const upload = await fetch(ticket.upload_url, {
+      method: 'PUT',
+      headers: ticket.upload_headers,
+      body: file,
+    });
+
+    if (!upload.ok) {
+      throw new Error(`Failed to upload gallery image to storage: ${upload.statusText}`);
+    }
+
+    const response = await this.fetch(`${this.baseUrl}/trip/${tripId}/gallery/uploads/${ticket.image_id}/commit`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify(metadata ?? {}),
+    });
+
+    if (!response.ok) {
+      const error = await response.text();
+      throw new Error(`Failed to commit gallery image: ${response.statusText} - ${error}`);
+    }
+
+    return response.json();
+  }
+
+  async listGallery(
+    tripId: string,
+    params: { limit?: number; continuation_token?: string } = {}
+  ): Promise<GalleryListResponse> {
+    const queryParams = new URLSearchParams();
+
+    if (params.limit) queryParams.append('limit', params.limit.toString());
+    if (params.continuation_token) queryParams.append('continuation_token', params.continuation_token);
+
+    const response = await this.fetch(`${this.baseUrl}/trip/${tripId}/gallery?${queryParams}`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to list gallery: ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
   getGalleryImageUrl(tripId: string, imageId: string): string {
     return `${this.baseUrl}/trip/${tripId}/gallery/${imageId}`;
   }
@@ -135,6 +263,17 @@ class TripApiClient {
     return URL.createObjectURL(blob);
   }
 
+  async getContactSheetBlob(tripId: string, limit = 6): Promise<string> {
+    const response = await this.fetch(`${this.baseUrl}/trip/${tripId}/gallery/contact-sheet?limit=${limit}`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to fetch contact sheet: ${response.statusText}`);
+    }
+
+    const blob = await response.blob();
+    return URL.createObjectURL(blob);
+  }
+
   async deleteGalleryImage(tripId: string, imageId: string): Promise<void> {
     const response = await this.fetch(`${this.baseUrl}/trip/${tripId}/gallery/${imageId}`, {
       method: 'DELETE',
@@ -149,7 +288,8 @@ class TripApiClient {
 
   async getTripCountByToyId(toyId: string): Promise<number> {
     try {
-      const response = await this.fetch(`${this.baseUrl}/trip?toy_id=${toyId}&limit=1000`);
+      // Server-side count; only a one-item page is read
+      const response = await this.fetch(`${this.baseUrl}/trip?toy_id=${toyId}&limit=1&include_total=true`);
       
       if (!response.ok) {
         console.error(`Failed to fetch trip count for toy ${toyId}`);
@@ -157,7 +297,7 @@ class TripApiClient {
       }
 
       const data: TripListResponse = await response.json();
-      return data.total;
+      return data.total ?? 0;
     } catch (error) {
       console.error(`Error fetching trip count for toy ${toyId}:`, error);
       return 0;
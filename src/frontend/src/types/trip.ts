@@ -1,3 +1,5 @@
+import type { Toy } from './toy';
+
 export enum TripStatus {
   PLANNED = 'planned',
   IN_PROGRESS = 'in_progress',
@@ -14,11 +16,17 @@ export interface GalleryImage {
   source: string;
 }
 
+export interface GeoPoint {
+  type: 'Point';
+  coordinates: [number, number];
+}
+
 export interface TripBase {
   title: string;
   description?: string;
   location_name: string;
   country_code: string;
+  location?: GeoPoint | null;
   public_tracking_enabled: boolean;
 }
 
@@ -30,6 +38,7 @@ export interface TripUpdate {
   title?: string;
   description?: string;
   location_name?: string;
+  location?: GeoPoint | null;
   country_code?: string;
   public_tracking_enabled?: boolean;
   status?: TripStatus;
@@ -40,14 +49,57 @@ export interface Trip extends TripBase {
   toy_id: string;
   owner_oid: string;
   status: TripStatus;
-  gallery: GalleryImage[];
+  gallery_count: number;
+  cover_image: GalleryImage | null; // Oldest image; the full gallery is listed via /trip/{id}/gallery
   created_at: string;
   updated_at: string;
 }
 
+export interface TripSummary {
+  id: string;
+  title: string;
+  location_name: string;
+  country_code: string;
+  status: TripStatus;
+  gallery_count: number;
+  cover_image: GalleryImage | null;
+  created_at: string;
+}
+
+export interface ToyTimeline {
+  toy: Toy;
+  trips: TripSummary[]; // Newest first
+  trip_count: number;
+  continuation_token: string | null; // Continue with listTrips({ toy_id, continuation_token })
+}
+
+export interface GalleryListResponse {
+  items: GalleryImage[];
+  limit: number;
+  continuation_token: string | null;
+}
+
+export interface GalleryUploadResult {
+  filename: string | null;
+  image: GalleryImage | null;
+  error: string | null;
+}
+
+export interface GalleryBatchUploadResponse {
+  trip: Trip;
+  results: GalleryUploadResult[]; // In request order; failed files carry an error
+}
+
+export interface GalleryUploadTicket {
+  image_id: string;
+  upload_url: string; // Pre-signed, write-only Blob Storage URL
+  upload_headers: Record<string, string>; // Must be sent with the PUT
+  expires_at: string;
+}
+
 export interface TripListResponse {
   items: Trip[];
-  total: number;
   limit: number;
-  offset: number;
+  continuation_token: string | null;
+  total?: number; // Only when requested with include_total
 }
@@ -182,15 +182,29 @@ class TestTripServiceAuthentication:
         cleanup_trips.extend(trip_ids)
 
         # List trips by toy
-        response = httpx.get(f"{base_url}/trip?toy_id={test_toy_id}", headers=auth_headers, timeout=10.0)
+        response = httpx.get(
+            f"{base_url}/trip?toy_id={test_toy_id}&include_total=true", headers=auth_headers, timeout=10.0
+        )
 
         assert response.status_code == 200
         data = response.json()
         assert "items" in data
-        assert "total" in data
+        assert data["total"] >= 2
+        assert "continuation_token" in data
         assert len(data["items"]) >= 2
         assert all(trip["toy_id"] == test_toy_id for trip in data["items"])
 
+        # Keyset pagination: the second page starts after the first one
+        first = httpx.get(f"{base_url}/trip?toy_id={test_toy_id}&limit=1", headers=auth_headers, timeout=10.0).json()
+        assert first["continuation_token"]
+        second = httpx.get(
+            f"{base_url}/trip",
+            params={"toy_id": test_toy_id, "limit": 1, "continuation_token": first["continuation_token"]},
+            headers=auth_headers,
+            timeout=10.0,
+        ).json()
+        assert second["items"][0]["id"] != first["items"][0]["id"]
+
     @pytest.mark.usefixtures("check_services_available")
     def test_list_trips_by_owner(
         self, service_config: dict, auth_headers: dict, test_toy_id: str, cleanup_trips: list, user_oid: str
@@ -318,11 +332,18 @@ class TestTripGallery:
 
         assert response.status_code == 200, f"Failed to upload image: {response.text}"
         trip = response.json()
-        assert len(trip["gallery"]) == 1
-        assert trip["gallery"][0]["landmark"] == "Test Landmark"
-        assert trip["gallery"][0]["caption"] == "Test gallery image"
+        assert trip["gallery_count"] == 1
+        assert trip["cover_image"]["landmark"] == "Test Landmark"
+
+        # Gallery metadata is listed separately from the trip
+        response = httpx.get(f"{base_url}/trip/{test_trip_id}/gallery", headers=auth_headers, timeout=10.0)
+        assert response.status_code == 200
+        gallery = response.json()
+        assert len(gallery["items"]) == 1
+        assert gallery["items"][0]["caption"] == "Test gallery image"
+        assert gallery["continuation_token"] is None
 
-        image_id = trip["gallery"][0]["image_id"]
+        image_id = gallery["items"][0]["image_id"]
 
         # Download image
         response = httpx.get(
@@ -355,7 +376,7 @@ class TestTripGallery:
             headers=upload_headers,
             timeout=10.0,
         )
-        image_id = response.json()["gallery"][0]["image_id"]
+        image_id = response.json()["cover_image"]["image_id"]
 
         # Delete image
         response = httpx.delete(
@@ -367,7 +388,8 @@ class TestTripGallery:
         # Verify image removed from trip
         response = httpx.get(f"{base_url}/trip/{test_trip_id}", headers=auth_headers, timeout=10.0)
         trip = response.json()
-        assert len(trip["gallery"]) == 0
+        assert trip["gallery_count"] == 0
+        assert trip["cover_image"] is None
 
 
 
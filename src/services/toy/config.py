@@ -1,4 +1,8 @@
 """Application configuration."""
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,26 +22,64 @@ class Settings(BaseSettings):
     # Managed Identity Client ID (optional - for explicit identity selection)
     azure_client_id: str | None = None
 
+    # Repository backend: "cosmos" (default), "sqlite" (single node) or "memory" (process-local, for benchmarks and tests)
+    repository_backend: Literal["cosmos", "sqlite", "memory"] = "cosmos"
+
+    # SQLite (repository_backend = "sqlite")
+    sqlite_path: str = "data/toys.db"
+    sqlite_read_connections: int = 4
+
     # Cosmos DB
-    cosmos_endpoint: str
+    cosmos_endpoint: str | None = None  # Required when repository_backend is "cosmos"
     cosmos_database_name: str = "toytripdb"
     cosmos_container_name: str = "toys"
     cosmos_key: str | None = None
     cosmos_disable_ssl_verify: bool = False
 
+    # Blob backend: "azure" (Blob Storage / Azurite, default) or "filesystem" (local directory)
+    blob_backend: Literal["azure", "filesystem"] = "azure"
+    blob_filesystem_root: str = "data/blobs"  # Containers become sub-directories
+
     # Blob Storage
-    storage_account_url: str
+    storage_account_url: str | None = None  # Required when blob_backend is "azure"
     storage_account_key: str | None = None
     blob_container_avatars: str = "avatars"
+    # Store avatars under their SHA-256 (sha256/{hash}): identical uploads share one reference-counted blob
+    blob_content_addressing: bool = False
+
+    # HTTP connection pool for the Cosmos and Blob SDK clients
+    http_pool_size: int = 100  # Max connections per pool (0 = unlimited)
+    http_pool_per_host: int = 0  # Max connections per host (0 = unlimited)
+    http_keepalive_seconds: float = 15.0
+    http_dns_cache_seconds: int = 10  # 0 disables DNS caching
+    http_shared_session: bool = True  # One aiohttp session for both SDK clients
+
+    # Response compression (JSON/text only; image routes are never compressed)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # Bytes; smaller bodies are sent as-is
+    compression_cache_entries: int = 256  # Compressed bodies cached by ETag (0 disables)
 
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8001
     log_level: str = "INFO"
+    # Open DB/storage connections during startup instead of on the first request
+    startup_warm_up: bool = True
 
     # Testing (optional)
     test_client_secret: str | None = None
 
+    @model_validator(mode="after")
+    def validate_backends(self) -> "Settings":
+        """Require Cosmos/Storage settings only when those backends are selected."""
+        if self.repository_backend == "cosmos" and not self.cosmos_endpoint:
+            raise ValueError("COSMOS_ENDPOINT is required when REPOSITORY_BACKEND is 'cosmos'")
+        if self.blob_backend == "azure" and not self.storage_account_url:
+            raise ValueError("STORAGE_ACCOUNT_URL is required when BLOB_BACKEND is 'azure'")
+        return self
+
 
-# Global settings instance
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Load settings from the environment on first use, so importing the app needs no configuration."""
+    return Settings()
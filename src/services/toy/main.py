@@ -1,21 +1,32 @@
 """Main FastAPI application for Toy Service."""
+from startup import StartupProfile
+
+# Created before the heavy imports below so their cost shows up in the profile
+startup_profile = StartupProfile("toy")
+
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
 
-from config import settings
-from repositories import ToyRepository
+from config import Settings, get_settings
+from middleware import CompressionMiddleware
+from models import Toy, ToyDocument
+from repositories import InMemoryToyRepository, SqliteToyRepository, ToyRepository
 from routes import toy_routes
-from services import BlobService
-
-# Configure logging
-logging.basicConfig(
-    level=settings.log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+from services import (
+    BlobService,
+    FilesystemBlobService,
+    HttpConnectionPool,
+    close_shared_credential,
+    shared_credential_metrics,
 )
 
+startup_profile.mark("imports")
+
 # Suppress verbose Azure SDK logging (cosmos, storage, core.pipeline)
 logging.getLogger("azure.cosmos").setLevel(logging.WARNING)
 logging.getLogger("azure.core.pipeline").setLevel(logging.WARNING)
@@ -25,39 +36,119 @@ logging.getLogger("azure.identity").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # Global instances
-toy_repo: ToyRepository | None = None
-blob_svc: BlobService | None = None
+settings: Settings | None = None
+toy_repo: ToyRepository | SqliteToyRepository | InMemoryToyRepository | None = None
+blob_svc: BlobService | FilesystemBlobService | None = None
+http_pool: HttpConnectionPool | None = None
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def _load_settings() -> Settings:
     """
-    Application lifespan context manager.
+    Load settings and configure logging, once.
 
-    Initializes and cleans up resources (DB, Blob clients).
+    First called when Starlette builds the middleware stack on the first ASGI
+    event (the lifespan startup), so importing this module reads no
+    environment and the settings phase is profiled as part of startup.
     """
-    global toy_repo, blob_svc
-
-    logger.info("Starting Toy Service...")
-
-    # Initialize repositories and services
-    toy_repo = ToyRepository(
+    global settings
+    if settings is None:
+        with startup_profile.phase("settings"):
+            settings = get_settings()
+        logging.basicConfig(
+            level=settings.log_level,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+    return settings
+
+
+def _create_repository() -> ToyRepository | SqliteToyRepository | InMemoryToyRepository:
+    """Create the repository for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryToyRepository()
+    if settings.repository_backend == "sqlite":
+        return SqliteToyRepository(settings.sqlite_path, settings.sqlite_read_connections)
+    return ToyRepository(
         cosmos_endpoint=settings.cosmos_endpoint,
         database_name=settings.cosmos_database_name,
         container_name=settings.cosmos_container_name,
         credential=settings.cosmos_key,
         disable_ssl_verify=settings.cosmos_disable_ssl_verify,
+        http_pool=http_pool,
     )
 
-    blob_svc = BlobService(
+
+def _create_blob_service() -> BlobService | FilesystemBlobService:
+    """Create the image storage service for the configured backend."""
+    if settings.blob_backend == "filesystem":
+        return FilesystemBlobService(
+            settings.blob_filesystem_root,
+            settings.blob_container_avatars,
+            content_addressed=settings.blob_content_addressing,
+        )
+    return BlobService(
         storage_account_url=settings.storage_account_url,
         container_name=settings.blob_container_avatars,
         credential=settings.storage_account_key,
+        http_pool=http_pool,
+        content_addressed=settings.blob_content_addressing,
     )
 
-    # Inject into routes module
-    toy_routes.toy_repository = toy_repo
-    toy_routes.blob_service = blob_svc
+
+def _warm_up_models():
+    """Run one document round trip so first-request validation/serialization paths are hot."""
+    doc = ToyDocument.from_toy(Toy(name="warm-up"))
+    item = doc.model_dump(by_alias=False, mode="json")
+    ToyDocument(**item).to_toy().model_dump(mode="json")
+
+
+async def _warm_up_connections():
+    """Open Cosmos and Blob connections (and acquire tokens) before traffic arrives."""
+    results = await asyncio.gather(toy_repo.warm_up(), blob_svc.warm_up(), return_exceptions=True)
+    for name, result in zip((settings.repository_backend, settings.blob_backend), results):
+        if isinstance(result, Exception):
+            # Not fatal: clients still initialize lazily on the first request
+            logger.warning(f"Warm-up of {name} connection failed: {result}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan context manager.
+
+    Initializes and cleans up resources (DB, Blob clients).
+    """
+    global toy_repo, blob_svc, http_pool
+
+    _load_settings()
+    logger.info("Starting Toy Service...")
+
+    # Initialize repositories and services
+    with startup_profile.phase("clients"):
+        http_pool = HttpConnectionPool(
+            pool_size=settings.http_pool_size,
+            per_host_limit=settings.http_pool_per_host,
+            keepalive_seconds=settings.http_keepalive_seconds,
+            dns_cache_seconds=settings.http_dns_cache_seconds,
+            shared_session=settings.http_shared_session,
+        )
+
+        toy_repo = _create_repository()
+
+        blob_svc = _create_blob_service()
+
+        # Inject into routes module
+        toy_routes.toy_repository = toy_repo
+        toy_routes.blob_service = blob_svc
+
+    with startup_profile.phase("warm_models"):
+        _warm_up_models()
+
+    if settings.startup_warm_up:
+        with startup_profile.phase("warm_connections"):
+            await _warm_up_connections()
+
+    startup_profile.complete()
+    app.state.startup_profile = startup_profile.snapshot()
 
     logger.info("Toy Service initialized successfully")
 
@@ -69,6 +160,9 @@ async def lifespan(app: FastAPI):
         await toy_repo.close()
     if blob_svc:
         await blob_svc.close()
+    if http_pool:
+        await http_pool.close()
+    await close_shared_credential()
     logger.info("Toy Service shut down complete")
 
 
@@ -89,10 +183,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _compression(app: ASGIApp) -> ASGIApp:
+    """Wrap the app in compression middleware when enabled in settings."""
+    settings = _load_settings()
+    if not settings.compression_enabled:
+        return app
+    # Compress JSON responses; image routes stream binary content and are excluded
+    return CompressionMiddleware(
+        app,
+        minimum_size=settings.compression_min_size,
+        cache_entries=settings.compression_cache_entries,
+        excluded_paths=["^/toy/[^/]+/avatar"],
+    )
+
+
+# Built with the middleware stack on startup, when settings are loaded
+app.add_middleware(_compression)
+
 # Include routers
 app.include_router(toy_routes.router)
 
 
+@app.get("/metrics")
+async def runtime_metrics():
+    """Runtime metrics: startup phase timings, credential token cache and HTTP pool saturation."""
+    return {
+        "startup": getattr(app.state, "startup_profile", None),
+        "credential": shared_credential_metrics(),
+        "http_pool": http_pool.metrics() if http_pool else None,
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -102,6 +224,7 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
+    settings = _load_settings()
     uvicorn.run(
         "main:app",
         host=settings.api_host,
@@ -0,0 +1,4 @@
+"""Middleware package."""
+from .compression import CompressionMiddleware
+
+__all__ = ["CompressionMiddleware"]
@@ -0,0 +1,208 @@
+"""Response compression middleware.
+
+Compresses JSON/text responses with brotli or gzip (negotiated through
+Accept-Encoding) once they exceed a minimum size. Image and other binary
+responses are never touched. Successful GET responses get a weak ETag, honour
+If-None-Match, and their compressed bytes are cached per (ETag, encoding) so
+hot list responses are compressed once rather than on every request.
+"""
+import asyncio
+import gzip
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip still works
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Bodies above this size are compressed in a worker thread to keep the event loop free
+THREAD_OFFLOAD_BYTES = 256 * 1024
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses, ETags and caches JSON/text responses."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_entries: int = 256,
+        excluded_paths: Iterable[str] = (),
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Bodies smaller than this (bytes) are sent uncompressed
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: brotli quality (0-11); low values favour latency
+            cache_entries: Max compressed bodies kept in the ETag-keyed LRU cache (0 disables)
+            excluded_paths: Regex patterns of paths never touched (e.g. image routes)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache_entries = cache_entries
+        self.excluded_paths = [re.compile(pattern) for pattern in excluded_paths]
+        self._cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or any(p.search(scope["path"]) for p in self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        responder = _CompressionResponder(
+            self,
+            send,
+            method=scope["method"],
+            encoding=self._negotiate(request_headers.get("accept-encoding", "")),
+            if_none_match=request_headers.get("if-none-match"),
+        )
+        await self.app(scope, receive, responder.send)
+
+    def _negotiate(self, accept_encoding: str) -> str | None:
+        """Pick the best supported encoding the client accepts."""
+        accepted = {}
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.lower()] = quality
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    def _compress_sync(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    async def compress(self, body: bytes, encoding: str, etag: str | None) -> bytes:
+        """Compress a body, reusing cached bytes for a known ETag."""
+        key = (etag, encoding) if etag and self.cache_entries else None
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        if len(body) > THREAD_OFFLOAD_BYTES:
+            compressed = await asyncio.to_thread(self._compress_sync, body, encoding)
+        else:
+            compressed = self._compress_sync(body, encoding)
+
+        if key is not None:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+        return compressed
+
+
+class _CompressionResponder:
+    """Per-request send wrapper that buffers a single-chunk body and rewrites it."""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        send: Send,
+        method: str,
+        encoding: str | None,
+        if_none_match: str | None,
+    ):
+        self.middleware = middleware
+        self._send = send
+        self.method = method
+        self.encoding = encoding
+        self.if_none_match = if_none_match
+        self.start_message: Message | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            if "content-encoding" in headers or not content_type.startswith(COMPRESSIBLE_TYPES):
+                self.passthrough = True
+                await self._send(message)
+            else:
+                # Defer the start message until the body is known
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if message.get("more_body", False):
+            # Streaming body: don't buffer, send as-is
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        await self._send_buffered(message.get("body", b""))
+
+    async def _send_buffered(self, body: bytes):
+        start = self.start_message
+        headers = MutableHeaders(raw=start["headers"])
+        status = start["status"]
+        cacheable = (
+            self.method == "GET"
+            and status == 200
+            and not any(d in headers.get("cache-control", "") for d in ("no-store", "private"))
+        )
+
+        etag = headers.get("etag")
+        if etag is None and cacheable:
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers["ETag"] = etag
+
+        if etag and cacheable and self.if_none_match and _etag_matches(self.if_none_match, etag):
+            del headers["content-length"]
+            if "content-type" in headers:
+                del headers["content-type"]
+            await self._send({**start, "status": 304, "headers": headers.raw})
+            await self._send({"type": "http.response.body", "body": b""})
+            return
+
+        compress = self.encoding is not None and len(body) >= self.middleware.minimum_size
+        if len(body) >= self.middleware.minimum_size:
+            headers.add_vary_header("Accept-Encoding")
+        if compress:
+            body = await self.middleware.compress(body, self.encoding, etag if cacheable else None)
+            headers["Content-Encoding"] = self.encoding
+            headers["Content-Length"] = str(len(body))
+
+        await self._send({**start, "headers": headers.raw})
+        await self._send({"type": "http.response.body", "body": body})
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
@@ -1,4 +1,4 @@
 """Models package."""
-from .toy import Toy, ToyCreate, ToyDocument, ToyUpdate
+from .toy import Toy, ToyCreate, ToyDocument, ToyLookup, ToyLookupResult, ToyUpdate
 
-__all__ = ["Toy", "ToyCreate", "ToyUpdate", "ToyDocument"]
+__all__ = ["Toy", "ToyCreate", "ToyUpdate", "ToyDocument", "ToyLookup", "ToyLookupResult"]
@@ -53,6 +53,19 @@ class Toy(ToyBase):
         return value.isoformat() if value else None
 
 
+class ToyLookup(BaseModel):
+    """Batched toy existence check (used by other services)."""
+
+    ids: list[UUID] = Field(..., min_length=1, max_length=100, description="Toy IDs to check")
+
+
+class ToyLookupResult(BaseModel):
+    """Which of the requested toy IDs exist."""
+
+    found: list[UUID] = Field(..., description="Requested IDs that exist")
+    missing: list[UUID] = Field(..., description="Requested IDs that do not exist")
+
+
 class ToyDocument(Toy):
     """Toy model for Cosmos DB storage (includes partition key field)."""
 
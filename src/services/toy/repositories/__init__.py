@@ -1,4 +1,6 @@
 """Repositories package."""
+from .memory_repository import InMemoryToyRepository
+from .sqlite_repository import SqliteToyRepository
 from .toy_repository import ToyRepository
 
-__all__ = ["ToyRepository"]
+__all__ = ["InMemoryToyRepository", "SqliteToyRepository", "ToyRepository"]
@@ -0,0 +1,166 @@
+"""In-memory toy repository.
+
+Drop-in replacement for ToyRepository used for local benchmarking, load tests
+on a laptop and tests. Documents are stored as the same JSON-mode dicts that
+would be written to Cosmos DB, so the Pydantic serialization/validation path
+is identical and only the network round trip is removed. Data lives only as
+long as the process.
+"""
+import bisect
+import logging
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from models import Toy, ToyDocument
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryToyRepository:
+    """Toy repository backed by a dict keyed by id and a created_at-sorted index."""
+
+    def __init__(self):
+        """Initialize an empty repository."""
+        self._items: dict[str, dict[str, Any]] = {}
+        # (created_at, id) in ascending order; listed in reverse for newest first
+        self._by_created: list[tuple[datetime, str]] = []
+        self._index_keys: dict[str, tuple[datetime, str]] = {}
+
+    async def warm_up(self):
+        """Nothing to connect to; present for API parity with ToyRepository."""
+        logger.info("Using in-memory toy repository")
+
+    async def create(self, toy: Toy) -> Toy:
+        """
+        Create a new toy.
+
+        Args:
+            toy: Toy instance to create
+
+        Returns:
+            Created Toy
+
+        Raises:
+            ValueError: If a toy with the same ID already exists
+        """
+        toy_id_str = str(toy.id)
+        if toy_id_str in self._items:
+            raise ValueError(f"Toy already exists: {toy_id_str}")
+
+        item = ToyDocument.from_toy(toy).model_dump(by_alias=False, mode="json")
+        item["id"] = toy_id_str
+        item["toy_id"] = toy_id_str
+
+        self._items[toy_id_str] = item
+        key = (toy.created_at, toy_id_str)
+        bisect.insort(self._by_created, key)
+        self._index_keys[toy_id_str] = key
+        logger.info(f"Created toy: {toy_id_str}")
+
+        return ToyDocument(**item).to_toy()
+
+    async def get_by_id(self, toy_id: UUID) -> Toy | None:
+        """
+        Retrieve a toy by ID.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Toy if found, None otherwise
+        """
+        item = self._items.get(str(toy_id))
+        if item is None:
+            logger.debug(f"Toy not found: {toy_id}")
+            return None
+        return ToyDocument(**item).to_toy()
+
+    async def existing_ids(self, toy_ids: list[UUID]) -> set[str]:
+        """
+        Return which of the given toys exist.
+
+        Args:
+            toy_ids: UUIDs to check
+
+        Returns:
+            Set of the IDs (as strings) that exist
+        """
+        return {str(toy_id) for toy_id in toy_ids if str(toy_id) in self._items}
+
+    async def list_all(self, limit: int = 20, offset: int = 0) -> tuple[list[Toy], int]:
+        """
+        List toys newest first with pagination.
+
+        Args:
+            limit: Maximum number of items to return
+            offset: Number of items to skip
+
+        Returns:
+            Tuple of (list of toys, total count)
+        """
+        total = len(self._by_created)
+        # Slice the sorted index directly; only the requested page is materialized
+        end = max(total - offset, 0)
+        start = max(end - limit, 0)
+        page = reversed(self._by_created[start:end])
+
+        toys = [ToyDocument(**self._items[toy_id]).to_toy() for _, toy_id in page]
+        logger.debug(f"Listed {len(toys)} toys (total: {total})")
+
+        return toys, total
+
+    async def update(self, toy_id: UUID, updates: dict[str, Any]) -> Toy | None:
+        """
+        Update a toy with partial data.
+
+        Args:
+            toy_id: UUID of the toy to update
+            updates: Dictionary of fields to update
+
+        Returns:
+            Updated Toy if found, None otherwise
+        """
+        toy_id_str = str(toy_id)
+        current = self._items.get(toy_id_str)
+        if current is None:
+            logger.debug(f"Toy not found for update: {toy_id_str}")
+            return None
+
+        # Copy so a failed validation below leaves the stored document untouched
+        item = dict(current)
+        for key, value in updates.items():
+            if key not in {"id", "toy_id", "created_at"}:  # Immutable fields
+                item[key] = value
+        item["updated_at"] = datetime.now(UTC).isoformat()
+
+        toy = ToyDocument(**item).to_toy()
+        self._items[toy_id_str] = item
+        logger.info(f"Updated toy: {toy_id_str}")
+        return toy
+
+    async def delete(self, toy_id: UUID) -> bool:
+        """
+        Delete a toy.
+
+        Args:
+            toy_id: UUID of the toy to delete
+
+        Returns:
+            True if deleted, False if not found
+        """
+        toy_id_str = str(toy_id)
+        if self._items.pop(toy_id_str, None) is None:
+            logger.debug(f"Toy not found for deletion: {toy_id_str}")
+            return False
+
+        key = self._index_keys.pop(toy_id_str)
+        index = bisect.bisect_left(self._by_created, key)
+        if index < len(self._by_created) and self._by_created[index] == key:
+            del self._by_created[index]
+        logger.info(f"Deleted toy: {toy_id_str}")
+        return True
+
+    async def close(self):
+        """Nothing to release; present for API parity with ToyRepository."""
+        return None
@@ -0,0 +1,302 @@
+"""SQLite toy repository for single-node deployments.
+
+Documents are stored as JSON text (validated with JSON1) next to plain columns
+for the fields that are filtered or sorted on, so those get real B-tree
+indexes. The database runs in WAL mode: one writer connection serializes all
+writes while a small pool of read connections serves reads concurrently. All
+SQLite calls run in worker threads so the event loop never blocks on disk I/O.
+"""
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+from uuid import UUID
+
+from models import Toy, ToyDocument
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS toys (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    doc TEXT NOT NULL CHECK (json_valid(doc))
+);
+CREATE INDEX IF NOT EXISTS idx_toys_created_at ON toys (created_at DESC, id DESC);
+"""
+
+
+def sort_key(value: datetime) -> str:
+    """Fixed-width UTC timestamp that sorts lexicographically in time order."""
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class SqliteConnectionPool:
+    """One writer connection plus a pool of read connections, each used from worker threads."""
+
+    def __init__(self, path: str, read_connections: int = 4):
+        """
+        Initialize the pool (connections are opened lazily by open()).
+
+        Args:
+            path: Database file path (parent directories are created)
+            read_connections: Number of concurrent read connections
+        """
+        self.path = path
+        self.read_connections = max(read_connections, 1)
+        # A single worker thread owns the writer, so writes are serialized without locks
+        self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._reader_executor = ThreadPoolExecutor(max_workers=self.read_connections, thread_name_prefix="sqlite-reader")
+        self._writer: sqlite3.Connection | None = None
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA busy_timeout = 5000")
+        connection.execute("PRAGMA synchronous = NORMAL")  # Durable with WAL apart from the last commits on power loss
+        return connection
+
+    def _open_sync(self, schema: str):
+        if self._writer is not None:
+            return  # Opened by a concurrent caller queued on the writer thread first
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._writer.executescript(schema)
+        for _ in range(self.read_connections):
+            reader = self._connect()
+            reader.execute("PRAGMA query_only = ON")
+            self._readers.put(reader)
+
+    async def open(self, schema: str):
+        """Open all connections and apply the schema."""
+        if self._writer is None:
+            await asyncio.get_running_loop().run_in_executor(self._writer_executor, self._open_sync, schema)
+            logger.info(f"Opened SQLite database '{self.path}' (WAL, {self.read_connections} readers)")
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn with a read connection in a reader thread."""
+
+        def run() -> T:
+            connection = self._readers.get()
+            try:
+                return fn(connection)
+            finally:
+                self._readers.put(connection)
+
+        return await asyncio.get_running_loop().run_in_executor(self._reader_executor, run)
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn inside a write transaction on the writer thread."""
+
+        def run() -> T:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._writer)
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+            return result
+
+        return await asyncio.get_running_loop().run_in_executor(self._writer_executor, run)
+
+    def _close_sync(self):
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def close(self):
+        """Close all connections and stop the worker threads."""
+        if self._writer is not None:
+            await asyncio.get_running_loop().run_in_executor(self._writer_executor, self._close_sync)
+        self._writer_executor.shutdown(wait=False)
+        self._reader_executor.shutdown(wait=False)
+
+
+class SqliteToyRepository:
+    """Toy repository persisted in a local SQLite database."""
+
+    def __init__(self, path: str, read_connections: int = 4):
+        """
+        Initialize the SQLite toy repository.
+
+        Args:
+            path: Database file path
+            read_connections: Number of concurrent read connections
+        """
+        self.pool = SqliteConnectionPool(path, read_connections)
+
+    async def _ensure_initialized(self) -> SqliteConnectionPool:
+        await self.pool.open(SCHEMA)
+        return self.pool
+
+    async def warm_up(self):
+        """Open the database and apply the schema ahead of the first request."""
+        await self._ensure_initialized()
+
+    async def create(self, toy: Toy) -> Toy:
+        """
+        Create a new toy.
+
+        Args:
+            toy: Toy instance to create
+
+        Returns:
+            Created Toy
+
+        Raises:
+            ValueError: If a toy with the same ID already exists
+        """
+        pool = await self._ensure_initialized()
+        item = ToyDocument.from_toy(toy).model_dump(by_alias=False, mode="json")
+        item["id"] = str(toy.id)
+        item["toy_id"] = str(toy.id)
+
+        def insert(connection: sqlite3.Connection):
+            connection.execute(
+                "INSERT INTO toys (id, created_at, doc) VALUES (?, ?, ?)",
+                (item["id"], sort_key(toy.created_at), json.dumps(item)),
+            )
+
+        try:
+            await pool.write(insert)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Toy already exists: {item['id']}")
+        logger.info(f"Created toy: {item['id']}")
+
+        return ToyDocument(**item).to_toy()
+
+    async def get_by_id(self, toy_id: UUID) -> Toy | None:
+        """
+        Retrieve a toy by ID.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Toy if found, None otherwise
+        """
+        pool = await self._ensure_initialized()
+        row = await pool.read(
+            lambda connection: connection.execute("SELECT doc FROM toys WHERE id = ?", (str(toy_id),)).fetchone()
+        )
+        if row is None:
+            logger.debug(f"Toy not found: {toy_id}")
+            return None
+        return ToyDocument(**json.loads(row[0])).to_toy()
+
+    async def existing_ids(self, toy_ids: list[UUID]) -> set[str]:
+        """
+        Return which of the given toys exist.
+
+        Args:
+            toy_ids: UUIDs to check
+
+        Returns:
+            Set of the IDs (as strings) that exist
+        """
+        pool = await self._ensure_initialized()
+        ids = [str(toy_id) for toy_id in toy_ids]
+        placeholders = ", ".join("?" * len(ids))
+        rows = await pool.read(
+            lambda connection: connection.execute(f"SELECT id FROM toys WHERE id IN ({placeholders})", ids).fetchall()
+        )
+        return {row[0] for row in rows}
+
+    async def list_all(self, limit: int = 20, offset: int = 0) -> tuple[list[Toy], int]:
+        """
+        List toys newest first with pagination.
+
+        Args:
+            limit: Maximum number of items to return
+            offset: Number of items to skip
+
+        Returns:
+            Tuple of (list of toys, total count)
+        """
+        pool = await self._ensure_initialized()
+
+        def query(connection: sqlite3.Connection) -> tuple[list[tuple[str]], int]:
+            rows = connection.execute(
+                "SELECT doc FROM toys ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+            total = connection.execute("SELECT COUNT(*) FROM toys").fetchone()[0]
+            return rows, total
+
+        rows, total = await pool.read(query)
+        toys = [ToyDocument(**json.loads(doc)).to_toy() for (doc,) in rows]
+        logger.debug(f"Listed {len(toys)} toys (total: {total})")
+
+        return toys, total
+
+    async def update(self, toy_id: UUID, updates: dict[str, Any]) -> Toy | None:
+        """
+        Update a toy with partial data.
+
+        Args:
+            toy_id: UUID of the toy to update
+            updates: Dictionary of fields to update
+
+        Returns:
+            Updated Toy if found, None otherwise
+        """
+        pool = await self._ensure_initialized()
+        toy_id_str = str(toy_id)
+        # Values must be JSON-serializable (enums/UUIDs are converted like in a Cosmos replace)
+        changes = json.loads(json.dumps(updates, default=str))
+
+        def read_modify_write(connection: sqlite3.Connection) -> dict[str, Any] | None:
+            row = connection.execute("SELECT doc FROM toys WHERE id = ?", (toy_id_str,)).fetchone()
+            if row is None:
+                return None
+            item = json.loads(row[0])
+            for key, value in changes.items():
+                if key not in {"id", "toy_id", "created_at"}:  # Immutable fields
+                    item[key] = value
+            item["updated_at"] = datetime.now(UTC).isoformat()
+            connection.execute("UPDATE toys SET doc = ? WHERE id = ?", (json.dumps(item), toy_id_str))
+            return item
+
+        item = await pool.write(read_modify_write)
+        if item is None:
+            logger.debug(f"Toy not found for update: {toy_id_str}")
+            return None
+        logger.info(f"Updated toy: {toy_id_str}")
+        return ToyDocument(**item).to_toy()
+
+    async def delete(self, toy_id: UUID) -> bool:
+        """
+        Delete a toy.
+
+        Args:
+            toy_id: UUID of the toy to delete
+
+        Returns:
+            True if deleted, False if not found
+        """
+        pool = await self._ensure_initialized()
+        toy_id_str = str(toy_id)
+        deleted = await pool.write(
+            lambda connection: connection.execute("DELETE FROM toys WHERE id = ?", (toy_id_str,)).rowcount
+        )
+        if not deleted:
+            logger.debug(f"Toy not found for deletion: {toy_id_str}")
+            return False
+        logger.info(f"Deleted toy: {toy_id_str}")
+        return True
+
+    async def close(self):
+        """Close the database connections."""
+        await self.pool.close()
+        logger.info("SQLite database closed")
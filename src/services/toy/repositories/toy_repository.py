@@ -10,9 +10,10 @@ from uuid import UUID
 
 from azure.cosmos.aio import ContainerProxy, CosmosClient, DatabaseProxy
 from azure.cosmos import PartitionKey, exceptions
-from azure.identity.aio import DefaultAzureCredential
 
 from models import Toy, ToyDocument
+from services.credentials import get_shared_credential
+from services.http_pool import HttpConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ logger = logging.getLogger(__name__)
 class ToyRepository:
     """Repository for toy CRUD operations in Cosmos DB."""
 
-    def __init__(self, cosmos_endpoint: str, database_name: str, container_name: str, credential: Any = None, disable_ssl_verify: bool = False):
+    def __init__(self, cosmos_endpoint: str, database_name: str, container_name: str, credential: Any = None, disable_ssl_verify: bool = False, http_pool: HttpConnectionPool | None = None):
         """
         Initialize the toy repository.
 
@@ -30,12 +31,14 @@ class ToyRepository:
             container_name: Name of the container (collection)
             credential: Optional credential (key or TokenCredential)
             disable_ssl_verify: Whether to disable SSL certificate verification
+            http_pool: Optional connection pool providing the HTTP transport
         """
         self.cosmos_endpoint = cosmos_endpoint
         self.database_name = database_name
         self.container_name = container_name
         self.credential = credential
         self.disable_ssl_verify = disable_ssl_verify
+        self.http_pool = http_pool
         self._client: CosmosClient | None = None
         self._database: DatabaseProxy | None = None
         self._container: ContainerProxy | None = None
@@ -50,6 +53,9 @@ class ToyRepository:
         if self._container is not None:
             return self._container
 
+        # Pooled transport when configured, SDK default otherwise
+        transport_kwargs = {"transport": self.http_pool.create_transport("cosmos")} if self.http_pool else {}
+
         # Initialize async client
         if self.credential:
             # Use provided credential (e.g. key for emulator)
@@ -58,19 +64,20 @@ class ToyRepository:
                 self.cosmos_endpoint, 
                 credential=self.credential,
                 connection_verify=not self.disable_ssl_verify,
-                enable_endpoint_discovery=not self.disable_ssl_verify
+                enable_endpoint_discovery=not self.disable_ssl_verify,
+                **transport_kwargs,
             )
         else:
             # Initialize async client with managed identity
-            # Exclude shared token cache to prevent home tenant confusion in multi-tenant scenarios
-            # Local: Uses Azure CLI (logged in with correct tenant)
-            # AKS: Uses Workload Identity / Managed Identity (federated identity)
-            credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
+            # One credential per process: discovery and token acquisition happen once and
+            # tokens are refreshed in the background (see services/credentials.py)
+            credential = get_shared_credential()
             self._client = CosmosClient(
                 self.cosmos_endpoint, 
                 credential=credential,
                 connection_verify=not self.disable_ssl_verify,
-                enable_endpoint_discovery=not self.disable_ssl_verify
+                enable_endpoint_discovery=not self.disable_ssl_verify,
+                **transport_kwargs,
             )
 
         # Get existing database (created via Bicep)
@@ -95,6 +102,17 @@ class ToyRepository:
 
         return self._container
 
+    async def warm_up(self):
+        """
+        Open the Cosmos connection ahead of the first request.
+
+        Initializes the client and reads container properties, which also
+        acquires the first access token when using managed identity.
+        """
+        container = await self._ensure_initialized()
+        await container.read()
+        logger.info(f"Warmed up connection to container '{self.container_name}'")
+
     async def create(self, toy: Toy) -> Toy:
         """
         Create a new toy in the database.
@@ -142,6 +160,22 @@ class ToyRepository:
             logger.debug(f"Toy not found: {toy_id_str}")
             return None
 
+    async def existing_ids(self, toy_ids: list[UUID]) -> set[str]:
+        """
+        Return which of the given toys exist.
+
+        Args:
+            toy_ids: UUIDs to check
+
+        Returns:
+            Set of the IDs (as strings) that exist
+        """
+        container = await self._ensure_initialized()
+        # Projects only the id; served from the id index without reading toy documents
+        query = "SELECT VALUE c.id FROM c WHERE ARRAY_CONTAINS(@ids, c.id)"
+        parameters = [{"name": "@ids", "value": [str(toy_id) for toy_id in toy_ids]}]
+        return {toy_id async for toy_id in container.query_items(query=query, parameters=parameters)}
+
     async def list_all(self, limit: int = 20, offset: int = 0) -> tuple[list[Toy], int]:
         """
         List toys with pagination.
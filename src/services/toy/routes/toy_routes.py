@@ -3,12 +3,13 @@ import logging
 from typing import Annotated, Callable
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 
-from models import Toy, ToyCreate, ToyUpdate
+from models import Toy, ToyCreate, ToyLookup, ToyLookupResult, ToyUpdate
 from repositories import ToyRepository
 from services import BlobService
+from services.byte_range import RangeNotSatisfiableError
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +77,24 @@ async def list_toys(
     return {"items": [toy.model_dump(mode="json") for toy in toys], "total": total, "limit": limit, "offset": offset}
 
 
+@router.post("/lookup", response_model=ToyLookupResult)
+async def lookup_toys(
+    lookup: ToyLookup,
+    repo: Annotated[ToyRepository, Depends(get_toy_repo)],
+) -> ToyLookupResult:
+    """
+    Check which toys exist, for up to 100 IDs in one call.
+
+    Lets other services validate toy references in batches instead of one
+    GET per toy.
+    """
+    existing = await repo.existing_ids(lookup.ids)
+    return ToyLookupResult(
+        found=[toy_id for toy_id in lookup.ids if str(toy_id) in existing],
+        missing=[toy_id for toy_id in lookup.ids if str(toy_id) not in existing],
+    )
+
+
 @router.get("/{toy_id}", response_model=Toy)
 async def get_toy(
     toy_id: UUID,
@@ -130,15 +149,15 @@ async def delete_toy(
     if not toy:
         raise HTTPException(status_code=404, detail="Toy not found")
 
-    # Delete avatar if exists
-    if toy.avatar_blob_name:
-        await blob_svc.delete_avatar(toy.avatar_blob_name)
-
     # Delete toy from database
     deleted = await repo.delete(toy_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Toy not found")
 
+    # Delete avatar once nothing references it (a shared blob must not be released twice on retry)
+    if toy.avatar_blob_name:
+        await blob_svc.delete_avatar(toy.avatar_blob_name)
+
     logger.info(f"Deleted toy {toy_id}")
 
 
@@ -161,10 +180,6 @@ async def upload_avatar(
         raise HTTPException(status_code=404, detail="Toy not found")
 
     try:
-        # Delete old avatar if exists
-        if toy.avatar_blob_name:
-            await blob_svc.delete_avatar(toy.avatar_blob_name)
-
         # Upload new avatar
         blob_name = await blob_svc.upload_avatar(file, str(toy_id))
 
@@ -172,8 +187,13 @@ async def upload_avatar(
         updated_toy = await repo.update(toy_id, {"avatar_blob_name": blob_name, "has_avatar": True})
 
         if not updated_toy:
+            await blob_svc.delete_avatar(blob_name)
             raise HTTPException(status_code=404, detail="Toy not found")
 
+        # Delete old avatar once the toy points at the new one (it may be the same shared blob)
+        if toy.avatar_blob_name:
+            await blob_svc.delete_avatar(toy.avatar_blob_name)
+
         logger.info(f"Uploaded avatar for toy {toy_id}")
         return updated_toy
 
@@ -189,11 +209,14 @@ async def get_avatar(
     toy_id: UUID,
     repo: Annotated[ToyRepository, Depends(get_toy_repo)],
     blob_svc: Annotated[BlobService, Depends(get_blob_svc)],
-) -> StreamingResponse:
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
+    if_range: Annotated[str | None, Header()] = None,
+) -> Response:
     """
     Get avatar image for a toy.
 
-    Streams the image from blob storage.
+    Streams the image from blob storage. A single `Range` (with optional
+    `If-Range`) is answered with 206 and only those bytes are read.
     """
     # Get toy
     toy = await repo.get_by_id(toy_id)
@@ -201,17 +224,29 @@ async def get_avatar(
         raise HTTPException(status_code=404, detail="Toy has no avatar image")
 
     try:
-        # Stream avatar from blob storage
-        stream, content_type = await blob_svc.stream_avatar(toy.avatar_blob_name)
+        # Filesystem backend: let the server send the file directly (sendfile, no copy through Python);
+        # FileResponse answers Range and If-Range itself
+        path = blob_svc.local_path(toy.avatar_blob_name)
+        if path is not None:
+            if not path.is_file():
+                raise FileNotFoundError(toy.avatar_blob_name)
+            return FileResponse(path, headers={"Cache-Control": "public, max-age=3600"})
+
+        # Stream avatar (or the requested range of it) from blob storage
+        blob = await blob_svc.open_avatar(toy.avatar_blob_name, range_header, if_range)
 
         return StreamingResponse(
-            stream,
-            media_type=content_type,
+            blob.chunks,
+            status_code=blob.status_code,
+            media_type=blob.content_type,
             headers={
+                **blob.headers(),
                 "Cache-Control": "public, max-age=3600",  # 1 hour cache
             },
         )
 
+    except RangeNotSatisfiableError as e:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": e.content_range})
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Avatar image not found")
     except Exception as e:
@@ -236,10 +271,10 @@ async def delete_avatar(
     if not toy.avatar_blob_name:
         raise HTTPException(status_code=404, detail="Toy has no avatar")
 
-    # Delete avatar from blob storage
-    await blob_svc.delete_avatar(toy.avatar_blob_name)
-
     # Update toy to remove avatar reference
     await repo.update(toy_id, {"avatar_blob_name": None, "has_avatar": False})
 
+    # Delete avatar from blob storage
+    await blob_svc.delete_avatar(toy.avatar_blob_name)
+
     logger.info(f"Deleted avatar for toy {toy_id}")
@@ -1,4 +1,20 @@
 """Services package."""
 from .blob_service import BlobService
+from .credentials import (
+    SharedTokenCredential,
+    close_shared_credential,
+    get_shared_credential,
+    shared_credential_metrics,
+)
+from .filesystem_blob_service import FilesystemBlobService
+from .http_pool import HttpConnectionPool
 
-__all__ = ["BlobService"]
+__all__ = [
+    "BlobService",
+    "FilesystemBlobService",
+    "HttpConnectionPool",
+    "SharedTokenCredential",
+    "close_shared_credential",
+    "get_shared_credential",
+    "shared_credential_metrics",
+]
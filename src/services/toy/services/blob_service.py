@@ -7,14 +7,20 @@ native async/await support without blocking the event loop.
 import logging
 import mimetypes
 from io import BytesIO
+from pathlib import Path
 from uuid import uuid4
 
-from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient
 from azure.storage.blob import ContentSettings
-from azure.core.exceptions import ServiceRequestError, ClientAuthenticationError  # type: ignore
+from azure.core import MatchConditions
+from azure.core.exceptions import ServiceRequestError, ClientAuthenticationError, ResourceModifiedError  # type: ignore
 from fastapi import UploadFile
 
+from services.byte_range import BlobRange, RangeNotSatisfiableError, if_range_matches, parse_range, resolve_range
+from services.content_store import acquire_blob, content_blob_name, is_content_addressed, read_hashed, release_blob
+from services.credentials import get_shared_credential
+from services.http_pool import HttpConnectionPool
+
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -27,7 +33,14 @@ class BlobService:
     ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
     MAX_FILE_SIZE_BYTES = 5 * 1024 * 1024  # 5MB
 
-    def __init__(self, storage_account_url: str, container_name: str, credential: Any = None):
+    def __init__(
+        self,
+        storage_account_url: str,
+        container_name: str,
+        credential: Any = None,
+        http_pool: HttpConnectionPool | None = None,
+        content_addressed: bool = False,
+    ):
         """
         Initialize blob service.
 
@@ -35,10 +48,14 @@ class BlobService:
             storage_account_url: Storage account URL
             container_name: Container name for avatars
             credential: Optional credential (key or TokenCredential)
+            http_pool: Optional connection pool providing the HTTP transport
+            content_addressed: Store avatars under their content hash, shared and reference counted
         """
         self.storage_account_url = storage_account_url
         self.container_name = container_name
         self.credential = credential
+        self.http_pool = http_pool
+        self.content_addressed = content_addressed
         self._client: BlobServiceClient | None = None
         self._container_client = None
 
@@ -47,16 +64,22 @@ class BlobService:
         if self._container_client is not None:
             return
 
+        # Pooled transport when configured, SDK default otherwise
+        transport_kwargs = {"transport": self.http_pool.create_transport("blob")} if self.http_pool else {}
+
         # Initialize async client
         if self.credential:
-            self._client = BlobServiceClient(account_url=self.storage_account_url, credential=self.credential)
+            self._client = BlobServiceClient(
+                account_url=self.storage_account_url, credential=self.credential, **transport_kwargs
+            )
         else:
             # Initialize async client with managed identity
-            # Exclude shared token cache to prevent home tenant confusion in multi-tenant scenarios
-            # Local: Uses Azure CLI (logged in with correct tenant)
-            # AKS: Uses Workload Identity / Managed Identity (federated identity)
-            credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
-            self._client = BlobServiceClient(account_url=self.storage_account_url, credential=credential)
+            # One credential per process: discovery and token acquisition happen once and
+            # tokens are refreshed in the background (see services/credentials.py)
+            credential = get_shared_credential()
+            self._client = BlobServiceClient(
+                account_url=self.storage_account_url, credential=credential, **transport_kwargs
+            )
 
         # Get container and create if it doesn't exist (for local development with emulator)
         self._container_client = self._client.get_container_client(self.container_name)
@@ -68,6 +91,19 @@ class BlobService:
             pass
         logger.info(f"Connected to container '{self.container_name}'")
 
+    def local_path(self, blob_name: str) -> Path | None:
+        """Blobs have no local file; routes fall back to streaming (see FilesystemBlobService)."""
+        return None
+
+    async def warm_up(self):
+        """
+        Open the storage connection ahead of the first request.
+
+        Initialization already performs a round trip to the container, which
+        also acquires the first access token when using managed identity.
+        """
+        await self._ensure_initialized()
+
     async def upload_avatar(self, file: UploadFile, toy_id: str) -> str:
         """
         Upload avatar image to blob storage.
@@ -91,6 +127,9 @@ class BlobService:
                 f"Unsupported file type: {content_type}. Allowed: {', '.join(self.ALLOWED_CONTENT_TYPES)}"
             )
 
+        if self.content_addressed:
+            return await self._upload_shared(file, content_type)
+
         # Read file content and validate size
         content = await file.read()
         if len(content) > self.MAX_FILE_SIZE_BYTES:
@@ -120,6 +159,18 @@ class BlobService:
         logger.info(f"Uploaded avatar: {blob_name} ({len(content)} bytes)")
         return blob_name
 
+    async def _upload_shared(self, file: UploadFile, content_type: str) -> str:
+        """Store an upload under its content hash; identical bytes reuse the existing blob."""
+        content, digest = await read_hashed(file, self.MAX_FILE_SIZE_BYTES)
+        blob_name = content_blob_name(digest, content_type)
+        try:
+            written = await acquire_blob(self._container_client, blob_name, content, content_type)
+        except (ServiceRequestError, ClientAuthenticationError, TimeoutError) as e:  # network / auth layer
+            logger.error(f"Failed to upload avatar (network/auth): {e}")
+            raise ValueError("Avatar upload failed due to storage connectivity or authentication issue") from e
+        logger.info(f"{'Uploaded' if written else 'Reused'} avatar: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
     async def download_avatar(self, blob_name: str) -> tuple[bytes, str]:
         """
         Download avatar image from blob storage.
@@ -161,6 +212,12 @@ class BlobService:
         """
         await self._ensure_initialized()
 
+        if is_content_addressed(blob_name):
+            released = await release_blob(self._container_client, blob_name)
+            if released:
+                logger.info(f"Released avatar: {blob_name}")
+            return released
+
         blob_client = self._container_client.get_blob_client(blob_name)
 
         try:
@@ -187,6 +244,75 @@ class BlobService:
         content, content_type = await self.download_avatar(blob_name)
         return BytesIO(content), content_type
 
+    async def open_avatar(
+        self, blob_name: str, range_header: str | None = None, if_range: str | None = None
+    ) -> BlobRange:
+        """
+        Open an avatar image for streaming, optionally only a byte range of it.
+
+        Without a range this is a single download request whose response also
+        carries the blob properties. With a range, the properties are read
+        first to resolve the range (and If-Range), then only the requested
+        bytes are downloaded, on condition that the blob still has the ETag
+        they were resolved against. If it was replaced in between, the whole
+        new blob is sent instead (200), never a range mixing two versions.
+
+        Args:
+            blob_name: Blob reference from database
+            range_header: Optional `Range` request header
+            if_range: Optional `If-Range` request header
+
+        Returns:
+            Range of the blob to send, with its chunk iterator
+
+        Raises:
+            FileNotFoundError: If blob doesn't exist
+            RangeNotSatisfiableError: If the range lies outside the blob
+        """
+        await self._ensure_initialized()
+
+        blob_client = self._container_client.get_blob_client(blob_name)
+        requested = parse_range(range_header)
+
+        try:
+            if requested is None:
+                downloader = await blob_client.download_blob()
+                properties = downloader.properties
+                start, end = 0, properties.size - 1
+            else:
+                properties = await blob_client.get_blob_properties()
+                start, end = 0, properties.size - 1
+                if not if_range or if_range_matches(if_range, properties.etag, properties.last_modified):
+                    start, end = resolve_range(requested, properties.size)
+                offset, length = (None, None) if (start, end) == (0, properties.size - 1) else (start, end - start + 1)
+                try:
+                    downloader = await blob_client.download_blob(
+                        offset=offset,
+                        length=length,
+                        etag=properties.etag,
+                        match_condition=MatchConditions.IfNotModified,
+                    )
+                except ResourceModifiedError:
+                    logger.info(f"Blob {blob_name} changed while opening a range; sending it whole")
+                    downloader = await blob_client.download_blob()
+                    properties = downloader.properties
+                    start, end = 0, properties.size - 1
+        except RangeNotSatisfiableError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Failed to open blob {blob_name}: {e}")
+            raise FileNotFoundError(f"Avatar not found: {blob_name}") from e
+
+        return BlobRange(
+            chunks=downloader.chunks(),
+            content_type=properties.content_settings.content_type or "application/octet-stream",
+            size=properties.size,
+            start=start,
+            end=end,
+            etag=properties.etag,
+            last_modified=properties.last_modified,
+        )
+
     async def close(self):
         """Close blob service client connection."""
         if self._client:
@@ -0,0 +1,141 @@
+"""Single-range HTTP Range requests for blob downloads.
+
+Large images are downloaded through the API rather than straight from storage,
+so resuming an interrupted download, or reading only the header of an image,
+must be possible without sending the whole blob again. Only one range per
+request is supported. A multi-range or malformed `Range` header is ignored and
+the full blob is sent, which RFC 9110 permits. The requested bytes are
+read from storage with a ranged blob download, not cut out of a full download.
+"""
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+
+class RangeNotSatisfiableError(ValueError):
+    """The requested range lies outside the blob (answered with 416)."""
+
+    def __init__(self, size: int):
+        super().__init__(f"Range not satisfiable for {size} bytes")
+        self.size = size
+
+    @property
+    def content_range(self) -> str:
+        """Content-Range value of the 416 response."""
+        return f"bytes */{self.size}"
+
+
+def parse_range(header: str | None) -> tuple[int | None, int | None] | None:
+    """
+    Parse a single-range `Range` header.
+
+    Args:
+        header: Header value, e.g. "bytes=0-499", "bytes=500-" or "bytes=-500"
+
+    Returns:
+        (first, last) with last None for open ranges and first None for suffix
+        ranges (last is then the suffix length); None when the header is
+        absent, malformed, multi-range or not in bytes
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = (part.strip() for part in spec.partition("-"))
+    if not dash or not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if not first:
+        return None, int(last)
+    if not last:
+        return int(first), None
+    if int(last) < int(first):
+        return None
+    return int(first), int(last)
+
+
+def resolve_range(requested: tuple[int | None, int | None], size: int) -> tuple[int, int]:
+    """
+    Resolve a parsed range against the blob size.
+
+    Args:
+        requested: Result of parse_range
+        size: Blob size in bytes
+
+    Returns:
+        (start, end) byte offsets, end inclusive
+
+    Raises:
+        RangeNotSatisfiableError: If no byte of the range exists
+    """
+    first, last = requested
+    if first is None:
+        if last == 0 or size == 0:
+            raise RangeNotSatisfiableError(size)
+        return max(0, size - last), size - 1
+    if first >= size:
+        raise RangeNotSatisfiableError(size)
+    return first, size - 1 if last is None else min(last, size - 1)
+
+
+def if_range_matches(if_range: str, etag: str | None, last_modified: datetime | None) -> bool:
+    """
+    Check an `If-Range` precondition: the range applies only if the blob is unchanged.
+
+    Args:
+        if_range: Header value, a strong entity tag or an HTTP date
+        etag: Current ETag of the blob
+        last_modified: Current modification time of the blob
+
+    Returns:
+        True if the range should be served, False if the full blob should be sent
+    """
+    if_range = if_range.strip()
+    if if_range.startswith('"'):
+        return etag is not None and if_range == _quoted(etag)
+    if if_range.startswith("W/") or last_modified is None:
+        return False
+    try:
+        return parsedate_to_datetime(if_range) == last_modified.replace(microsecond=0)
+    except (TypeError, ValueError):
+        return False
+
+
+def _quoted(etag: str) -> str:
+    """ETag in header form; Blob Storage returns ETags with or without quotes."""
+    return etag if etag.startswith('"') else f'"{etag}"'
+
+
+@dataclass
+class BlobRange:
+    """A byte range of a blob, ready to be streamed."""
+
+    chunks: AsyncIterator[bytes]
+    content_type: str
+    size: int  # Size of the whole blob
+    start: int
+    end: int  # Inclusive
+    etag: str | None = None
+    last_modified: datetime | None = None
+
+    @property
+    def partial(self) -> bool:
+        """True if only part of the blob is sent (206)."""
+        return self.size > 0 and (self.start, self.end) != (0, self.size - 1)
+
+    @property
+    def status_code(self) -> int:
+        """HTTP status of the response."""
+        return 206 if self.partial else 200
+
+    def headers(self) -> dict[str, str]:
+        """Length, range and validator headers of the response."""
+        headers = {"Accept-Ranges": "bytes", "Content-Length": str(self.end - self.start + 1 if self.size else 0)}
+        if self.partial:
+            headers["Content-Range"] = f"bytes {self.start}-{self.end}/{self.size}"
+        if self.etag:
+            headers["ETag"] = _quoted(self.etag)
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
@@ -0,0 +1,185 @@
+"""Content-addressed image blobs with reference counting.
+
+With content addressing enabled, uploaded images are stored under
+`sha256/{hash}{ext}` instead of a fresh per-upload name. Identical bytes share
+one blob, and uploading them again skips the storage write. Each shared blob
+carries a reference count: in blob metadata for Blob Storage, updated with
+ETag-conditional writes so concurrent uploads and deletes never lose a count,
+and in a locked `.{name}.refs` file for the filesystem backend. The blob is
+deleted when its last reference is released.
+
+Releasing a reference is not idempotent, so callers drop the database
+reference first and release afterwards. A failed release then leaks a blob
+instead of deleting one that is still referenced.
+"""
+import hashlib
+import mimetypes
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from azure.storage.blob import ContentSettings
+from fastapi import UploadFile
+
+try:
+    import fcntl
+except ImportError:  # Windows: the process-wide lock below still serializes threads
+    fcntl = None
+
+CONTENT_PREFIX = "sha256/"
+REFCOUNT_KEY = "refcount"
+# Uploads are hashed while they are read, in chunks of this size
+READ_CHUNK_BYTES = 1024 * 1024
+# Optimistic concurrency retries of one reference count update
+MAX_ATTEMPTS = 8
+
+_refs_lock = threading.Lock()
+
+
+def is_content_addressed(blob_name: str) -> bool:
+    """True for shared, reference-counted blobs."""
+    return blob_name.startswith(CONTENT_PREFIX)
+
+
+def content_blob_name(digest: str, content_type: str) -> str:
+    """Blob name of content with the given SHA-256 hex digest."""
+    return f"{CONTENT_PREFIX}{digest}{mimetypes.guess_extension(content_type) or '.jpg'}"
+
+
+async def read_hashed(file: UploadFile, max_bytes: int) -> tuple[bytes, str]:
+    """
+    Read an upload in chunks, hashing it as it streams.
+
+    Args:
+        file: Uploaded file from FastAPI
+        max_bytes: Size limit; reading stops as soon as it is exceeded
+
+    Returns:
+        Tuple of (content, SHA-256 hex digest)
+
+    Raises:
+        ValueError: If the file is larger than max_bytes
+    """
+    digest = hashlib.sha256()
+    content = bytearray()
+    while chunk := await file.read(READ_CHUNK_BYTES):
+        content += chunk
+        if len(content) > max_bytes:
+            raise ValueError(f"File size exceeds maximum of {max_bytes / 1024 / 1024}MB")
+        digest.update(chunk)
+    return bytes(content), digest.hexdigest()
+
+
+async def acquire_blob(container_client: Any, blob_name: str, content: bytes, content_type: str) -> bool:
+    """
+    Add a reference to a shared blob, storing the content if it does not exist yet.
+
+    Args:
+        container_client: Async container client
+        blob_name: Content-addressed blob name
+        content: Content to store when the blob is new
+        content_type: Content type to serve the blob with
+
+    Returns:
+        True if the content was written, False if an existing blob was reused
+
+    Raises:
+        ValueError: If the count could not be updated within MAX_ATTEMPTS
+    """
+    blob_client = container_client.get_blob_client(blob_name)
+    for _ in range(MAX_ATTEMPTS):
+        try:
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            try:
+                await blob_client.upload_blob(
+                    data=content,
+                    content_settings=ContentSettings(content_type=content_type),
+                    metadata={REFCOUNT_KEY: "1"},
+                    overwrite=False,
+                )
+                return True
+            except ResourceExistsError:
+                continue  # A concurrent upload of the same content won; count on its blob
+        count = int(properties.metadata.get(REFCOUNT_KEY, "0"))
+        try:
+            await blob_client.set_blob_metadata(
+                {REFCOUNT_KEY: str(count + 1)}, etag=properties.etag, match_condition=MatchConditions.IfNotModified
+            )
+            return False
+        except (ResourceModifiedError, ResourceNotFoundError):
+            continue
+    raise ValueError(f"Could not reference {blob_name}: too many concurrent updates")
+
+
+async def release_blob(container_client: Any, blob_name: str) -> bool:
+    """
+    Drop a reference to a shared blob, deleting it with the last reference.
+
+    Args:
+        container_client: Async container client
+        blob_name: Content-addressed blob name
+
+    Returns:
+        True if the reference was released (or the blob is already gone)
+    """
+    blob_client = container_client.get_blob_client(blob_name)
+    for _ in range(MAX_ATTEMPTS):
+        try:
+            properties = await blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            return True
+        count = int(properties.metadata.get(REFCOUNT_KEY, "0"))
+        condition = {"etag": properties.etag, "match_condition": MatchConditions.IfNotModified}
+        try:
+            if count <= 1:
+                await blob_client.delete_blob(**condition)
+            else:
+                await blob_client.set_blob_metadata({REFCOUNT_KEY: str(count - 1)}, **condition)
+            return True
+        except (ResourceModifiedError, ResourceNotFoundError):
+            continue
+    return False
+
+
+class FileRefCount:
+    """Reference count of a shared file, read and written under a lock (see file_refcount)."""
+
+    def __init__(self, handle):
+        self._handle = handle
+        handle.seek(0)
+        self.value = int(handle.read().strip() or 0)
+
+    def save(self):
+        """Write the count back."""
+        self._handle.seek(0)
+        self._handle.truncate()
+        self._handle.write(str(self.value))
+        self._handle.flush()
+
+
+@contextmanager
+def file_refcount(path: Path) -> Iterator[FileRefCount]:
+    """
+    Lock and read the reference count of a shared file.
+
+    The count lives in `.{name}.refs` next to the file. The file lock also
+    covers other worker processes; the count file is never deleted, so every
+    process locks the same inode.
+
+    Args:
+        path: Path of the shared file
+
+    Yields:
+        Count to read and update (call save() to persist)
+    """
+    refs = path.with_name(f".{path.name}.refs")
+    refs.parent.mkdir(parents=True, exist_ok=True)
+    with _refs_lock, open(refs, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        yield FileRefCount(handle)
@@ -0,0 +1,213 @@
+"""Process-wide Azure credential with proactive token refresh.
+
+Cosmos and Blob clients share one credential per process, so credential
+discovery and token acquisition happen once per scope instead of once per SDK
+client. Tokens are refreshed by a background task before they expire; the SDK
+pipelines only ever read from the cache, so requests never wait on Entra ID.
+"""
+import asyncio
+import logging
+import time
+from typing import Any
+
+from azure.core.credentials import AccessToken
+
+logger = logging.getLogger(__name__)
+
+
+class SharedTokenCredential:
+    """Async token credential that caches tokens per scope and refreshes them in the background."""
+
+    # azure-core pipelines refresh their own copy when < 300s (+ jitter) remain,
+    # so the shared cache must renew well before that point
+    DEFAULT_REFRESH_MARGIN_SECONDS = 600
+    DEFAULT_CHECK_INTERVAL_SECONDS = 30
+    # Tokens closer than this to expiry are never handed out
+    MIN_VALIDITY_SECONDS = 60
+
+    def __init__(
+        self,
+        credential: Any = None,
+        refresh_margin_seconds: int = DEFAULT_REFRESH_MARGIN_SECONDS,
+        check_interval_seconds: int = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ):
+        """
+        Initialize the shared credential.
+
+        Args:
+            credential: Optional underlying async TokenCredential (defaults to DefaultAzureCredential)
+            refresh_margin_seconds: Refresh tokens this many seconds before expiry
+            check_interval_seconds: How often the background task checks for expiring tokens
+        """
+        self._credential = credential
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._tokens: dict[tuple, AccessToken] = {}
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._refresh_task: asyncio.Task | None = None
+        self._metrics = {
+            "cache_hits": 0,
+            "fetches": 0,
+            "fetch_failures": 0,
+            "background_refreshes": 0,
+            "fetch_latency_ms_total": 0.0,
+            "fetch_latency_ms_max": 0.0,
+            "fetch_latency_ms_last": 0.0,
+        }
+
+    def _ensure_credential(self) -> Any:
+        """Create the underlying credential on first use."""
+        if self._credential is None:
+            # Imported lazily: azure.identity is slow to import and unused with key auth
+            from azure.identity.aio import DefaultAzureCredential
+
+            # Exclude shared token cache to prevent home tenant confusion in multi-tenant scenarios
+            # Local: Uses Azure CLI (logged in with correct tenant)
+            # AKS: Uses Workload Identity / Managed Identity (federated identity)
+            self._credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
+        return self._credential
+
+    def _ensure_refresh_task(self):
+        """Start the background refresh task once an event loop is running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def get_token(
+        self,
+        *scopes: str,
+        claims: str | None = None,
+        tenant_id: str | None = None,
+        enable_cae: bool = False,
+        **kwargs: Any,
+    ) -> AccessToken:
+        """
+        Return a cached token for the scopes, fetching one only on a cache miss.
+
+        Args:
+            scopes: Requested token scopes
+            claims: Additional claims (e.g. from a CAE challenge); bypasses the cache
+            tenant_id: Optional tenant override
+            enable_cae: Whether to request a CAE-enabled token
+
+        Returns:
+            AccessToken valid for at least MIN_VALIDITY_SECONDS
+        """
+        self._ensure_refresh_task()
+        key = (scopes, tenant_id, enable_cae)
+
+        if claims:
+            # Claims challenges must always reach Entra ID
+            return await self._fetch(key, claims=claims, **kwargs)
+
+        token = self._tokens.get(key)
+        if token and token.expires_on - time.time() > self.MIN_VALIDITY_SECONDS:
+            self._metrics["cache_hits"] += 1
+            return token
+
+        # Single flight: concurrent misses for the same scope wait for one fetch
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            token = self._tokens.get(key)
+            if token and token.expires_on - time.time() > self.MIN_VALIDITY_SECONDS:
+                self._metrics["cache_hits"] += 1
+                return token
+            return await self._fetch(key, **kwargs)
+
+    async def _fetch(self, key: tuple, **kwargs: Any) -> AccessToken:
+        """Acquire a token from the underlying credential and record latency."""
+        scopes, tenant_id, enable_cae = key
+        credential = self._ensure_credential()
+        if tenant_id:
+            kwargs["tenant_id"] = tenant_id
+        if enable_cae:
+            kwargs["enable_cae"] = enable_cae
+
+        started = time.perf_counter()
+        try:
+            token = await credential.get_token(*scopes, **kwargs)
+        except Exception:
+            self._metrics["fetch_failures"] += 1
+            raise
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        self._metrics["fetches"] += 1
+        self._metrics["fetch_latency_ms_total"] += latency_ms
+        self._metrics["fetch_latency_ms_last"] = latency_ms
+        self._metrics["fetch_latency_ms_max"] = max(self._metrics["fetch_latency_ms_max"], latency_ms)
+
+        if "claims" not in kwargs:
+            self._tokens[key] = token
+        logger.info(f"Acquired token for {', '.join(scopes)} in {latency_ms:.0f} ms")
+        return token
+
+    async def _refresh_loop(self):
+        """Refresh cached tokens that are about to expire."""
+        while True:
+            await asyncio.sleep(self.check_interval_seconds)
+            for key, token in list(self._tokens.items()):
+                if token.expires_on - time.time() > self.refresh_margin_seconds:
+                    continue
+                try:
+                    async with self._locks.setdefault(key, asyncio.Lock()):
+                        await self._fetch(key)
+                    self._metrics["background_refreshes"] += 1
+                except Exception as e:  # noqa: BLE001
+                    # Keep serving the old token; the next cycle retries
+                    logger.warning(f"Background token refresh failed for {', '.join(key[0])}: {e}")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return token cache and fetch latency metrics."""
+        fetches = self._metrics["fetches"]
+        now = time.time()
+        return {
+            **{k: round(v, 2) if isinstance(v, float) else v for k, v in self._metrics.items()},
+            "fetch_latency_ms_avg": round(self._metrics["fetch_latency_ms_total"] / fetches, 2) if fetches else 0.0,
+            "cached_scopes": {
+                " ".join(key[0]): int(token.expires_on - now) for key, token in self._tokens.items()
+            },
+        }
+
+    async def close(self):
+        """Stop background refresh and close the underlying credential."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._credential is not None and hasattr(self._credential, "close"):
+            await self._credential.close()
+            logger.info("Shared credential closed")
+
+    async def __aenter__(self) -> "SharedTokenCredential":
+        return self
+
+    async def __aexit__(self, *args: Any):
+        # SDK clients may use the credential as a context manager; lifetime is owned by the process
+        return None
+
+
+# Process-wide instance shared by all SDK clients
+_shared_credential: SharedTokenCredential | None = None
+
+
+def get_shared_credential() -> SharedTokenCredential:
+    """Return the process-wide credential, creating it on first use."""
+    global _shared_credential
+    if _shared_credential is None:
+        _shared_credential = SharedTokenCredential()
+    return _shared_credential
+
+
+def shared_credential_metrics() -> dict[str, Any] | None:
+    """Return metrics of the shared credential, or None if it was never used."""
+    return _shared_credential.metrics() if _shared_credential else None
+
+
+async def close_shared_credential():
+    """Close the process-wide credential if it was created."""
+    global _shared_credential
+    if _shared_credential is not None:
+        await _shared_credential.close()
+        _shared_credential = None
@@ -0,0 +1,229 @@
+"""Local filesystem storage for avatar images.
+
+Drop-in replacement for BlobService on local and single-node deployments.
+Files use the same `{toy_id}/{uuid}.{ext}` layout as the blob container, are
+written atomically (temp file + rename), and expose their local path so routes
+can answer with `FileResponse`, letting the server use `sendfile` instead of
+copying image bytes through Python.
+"""
+import asyncio
+import logging
+import mimetypes
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+from fastapi import UploadFile
+
+from services.blob_service import BlobService
+from services.content_store import content_blob_name, file_refcount, is_content_addressed, read_hashed
+
+logger = logging.getLogger(__name__)
+
+
+class FilesystemBlobService:
+    """Avatar storage in a directory tree instead of a blob container."""
+
+    ALLOWED_CONTENT_TYPES = BlobService.ALLOWED_CONTENT_TYPES
+    MAX_FILE_SIZE_BYTES = BlobService.MAX_FILE_SIZE_BYTES
+
+    def __init__(self, root: str, container_name: str, content_addressed: bool = False):
+        """
+        Initialize filesystem blob service.
+
+        Args:
+            root: Base directory for all containers
+            container_name: Sub-directory playing the role of the blob container
+            content_addressed: Store avatars under their content hash, shared and reference counted
+        """
+        self.container_name = container_name
+        self.content_addressed = content_addressed
+        self.directory = (Path(root) / container_name).resolve()
+
+    async def warm_up(self):
+        """Create the container directory ahead of the first request."""
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+        logger.info(f"Using filesystem storage at '{self.directory}'")
+
+    def local_path(self, blob_name: str) -> Path:
+        """
+        Resolve a blob name to its file path.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Absolute path inside the container directory
+
+        Raises:
+            FileNotFoundError: If the name escapes the container directory
+        """
+        path = (self.directory / blob_name).resolve()
+        if not path.is_relative_to(self.directory):
+            raise FileNotFoundError(f"Invalid blob name: {blob_name}")
+        return path
+
+    async def upload_avatar(self, file: UploadFile, toy_id: str) -> str:
+        """
+        Store an avatar image.
+
+        Args:
+            file: Uploaded file from FastAPI
+            toy_id: Toy ID for naming the file
+
+        Returns:
+            Blob name (reference for database)
+
+        Raises:
+            ValueError: If file type or size is invalid
+        """
+        content_type = file.content_type
+        if content_type not in self.ALLOWED_CONTENT_TYPES:
+            raise ValueError(
+                f"Unsupported file type: {content_type}. Allowed: {', '.join(self.ALLOWED_CONTENT_TYPES)}"
+            )
+
+        if self.content_addressed:
+            return await self._upload_shared(file, content_type)
+
+        content = await file.read()
+        if len(content) > self.MAX_FILE_SIZE_BYTES:
+            raise ValueError(f"File size exceeds maximum of {self.MAX_FILE_SIZE_BYTES / 1024 / 1024}MB")
+
+        # Same naming as the blob container: {toy_id}/{uuid}.{extension}
+        extension = mimetypes.guess_extension(content_type) or ".jpg"
+        blob_name = f"{toy_id}/{uuid4()}{extension}"
+
+        await asyncio.to_thread(_write_atomic, self.local_path(blob_name), content)
+        logger.info(f"Stored avatar: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
+    async def _upload_shared(self, file: UploadFile, content_type: str) -> str:
+        """Store an upload under its content hash; identical bytes reuse the existing file."""
+        content, digest = await read_hashed(file, self.MAX_FILE_SIZE_BYTES)
+        blob_name = content_blob_name(digest, content_type)
+        path = self.local_path(blob_name)
+
+        def acquire() -> bool:
+            with file_refcount(path) as refs:
+                written = refs.value == 0 or not path.is_file()
+                if written:
+                    _write_atomic(path, content)
+                refs.value += 1
+                refs.save()
+            return written
+
+        written = await asyncio.to_thread(acquire)
+        logger.info(f"{'Stored' if written else 'Reused'} avatar: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
+    def _release(self, blob_name: str):
+        """Drop a reference to a shared file, deleting it with the last one (runs in a worker thread)."""
+        path = self.local_path(blob_name)
+        with file_refcount(path) as refs:
+            refs.value = max(0, refs.value - 1)
+            if refs.value == 0:
+                path.unlink(missing_ok=True)
+            refs.save()
+
+    async def download_avatar(self, blob_name: str) -> tuple[bytes, str]:
+        """
+        Read an avatar image.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Tuple of (image bytes, content type)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        path = self.local_path(blob_name)
+        try:
+            content = await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            raise FileNotFoundError(f"Avatar not found: {blob_name}") from e
+        return content, self.content_type(blob_name)
+
+    async def delete_avatar(self, blob_name: str) -> bool:
+        """
+        Delete an avatar image.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            True if deleted, False if not found
+        """
+        try:
+            if is_content_addressed(blob_name):
+                await asyncio.to_thread(self._release, blob_name)
+            else:
+                await asyncio.to_thread(self.local_path(blob_name).unlink)
+        except (FileNotFoundError, OSError) as e:
+            logger.warning(f"Failed to delete file {blob_name}: {e}")
+            return False
+        logger.info(f"Deleted avatar: {blob_name}")
+        return True
+
+    async def stream_avatar(self, blob_name: str) -> tuple[BytesIO, str]:
+        """
+        Read an avatar image into a stream (for callers that cannot use local_path).
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Tuple of (BytesIO stream, content type)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        content, content_type = await self.download_avatar(blob_name)
+        return BytesIO(content), content_type
+
+    @contextmanager
+    def mmap_avatar(self, blob_name: str) -> Iterator[mmap.mmap]:
+        """
+        Memory-map an avatar read-only, e.g. for image processing without a copy.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Yields:
+            Read-only memory map of the file
+        """
+        with open(self.local_path(blob_name), "rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            yield mapped
+
+    @staticmethod
+    def content_type(blob_name: str) -> str:
+        """Content type derived from the file extension."""
+        return mimetypes.guess_type(blob_name)[0] or "application/octet-stream"
+
+    async def close(self):
+        """Nothing to release; present for API parity with BlobService."""
+        return None
+
+
+def _write_atomic(path: Path, content: bytes):
+    """Write to a temp file in the target directory, fsync, then rename over the target."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
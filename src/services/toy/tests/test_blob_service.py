@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from azure.core.exceptions import ResourceModifiedError
+
+from services import BlobService
+
+
+class FakeBlobClient:
+    """Serves one blob; records the ranges requested from storage."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.downloads: list[tuple] = []
+        self.properties = SimpleNamespace(
+            size=len(content),
+            etag='"0x8D1"',
+            last_modified=None,
+            content_settings=SimpleNamespace(content_type="image/png"),
+        )
+
+    async def get_blob_properties(self):
+        return self.properties
+
+    def replace(self, content: bytes):
+        self.content = content
+        self.properties = SimpleNamespace(**{**vars(self.properties), "size": len(content), "etag": '"0x8D9"'})
+
+    async def download_blob(self, offset=None, length=None, etag=None, match_condition=None):
+        if etag is not None and etag != self.properties.etag:
+            raise ResourceModifiedError("blob changed")
+        self.downloads.append((offset, length))
+        start = offset or 0
+        data = self.content[start : start + length if length is not None else None]
+
+        async def chunks():
+            yield data
+
+        return SimpleNamespace(properties=self.properties, chunks=chunks)
+
+
+def make_service(blob_client) -> BlobService:
+    service = BlobService("https://example.blob.core.windows.net", "avatars")
+    service._container_client = SimpleNamespace(get_blob_client=lambda blob_name: blob_client)
+    return service
+
+
+async def read_range(service, range_header=None):
+    blob = await service.open_avatar("toy-1/a.png", range_header)
+    return blob, b"".join([chunk async for chunk in blob.chunks])
+
+
+async def test_open_avatar_downloads_only_the_requested_range():
+    blob_client = FakeBlobClient(bytes(range(100)))
+
+    blob, body = await read_range(make_service(blob_client), "bytes=10-19")
+
+    assert (blob.status_code, blob.start, blob.end, body) == (206, 10, 19, bytes(range(10, 20)))
+    assert blob_client.downloads == [(10, 10)]
+
+
+async def test_open_avatar_sends_whole_blob_replaced_while_opening_a_range():
+    blob_client = FakeBlobClient(bytes(range(100)))
+    read_properties = blob_client.get_blob_properties
+
+    async def properties_then_replace():
+        properties = await read_properties()
+        blob_client.replace(b"new" * 10)
+        return properties
+
+    blob_client.get_blob_properties = properties_then_replace
+    blob, body = await read_range(make_service(blob_client), "bytes=0-9")
+
+    assert (blob.status_code, blob.size, blob.etag, body) == (200, 30, '"0x8D9"', b"new" * 10)
+    assert blob_client.downloads == [(None, None)]
@@ -0,0 +1,98 @@
+import gzip
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from middleware import CompressionMiddleware
+
+
+def _build_client(**kwargs) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/toy")
+    async def list_toys():
+        return {"items": [{"name": f"Toy {i}", "description": "A very well travelled bear"} for i in range(200)]}
+
+    @app.get("/toy/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/toy/{toy_id}/avatar")
+    async def avatar(toy_id: str):
+        return Response(content=b"\xff\xd8" + b"x" * 5000, media_type="image/jpeg")
+
+    @app.get("/text-avatar/{toy_id}")
+    async def excluded(toy_id: str):
+        return {"items": ["x" * 5000]}
+
+    app.add_middleware(CompressionMiddleware, excluded_paths=[r"^/text-avatar/"], **kwargs)
+    return TestClient(app)
+
+
+def test_large_json_is_gzipped():
+    client = _build_client()
+
+    response = client.get("/toy", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["items"][0]["name"] == "Toy 0"
+
+
+def test_brotli_preferred_when_accepted():
+    client = _build_client()
+
+    response = client.get("/toy", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+
+
+def test_small_responses_are_not_compressed():
+    client = _build_client()
+
+    response = client.get("/toy/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_images_and_excluded_paths_are_untouched():
+    client = _build_client()
+
+    image = client.get("/toy/123/avatar", headers={"Accept-Encoding": "gzip"})
+    excluded = client.get("/text-avatar/123", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in image.headers
+    assert "etag" not in image.headers
+    assert "content-encoding" not in excluded.headers
+
+
+def test_etag_enables_not_modified():
+    client = _build_client()
+
+    first = client.get("/toy", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/toy", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+
+    assert first.headers["etag"].startswith('W/"')
+    assert second.status_code == 304
+    assert second.content == b""
+
+
+def test_compressed_body_is_cached_by_etag():
+    app = FastAPI()
+    payload = {"items": ["bear"] * 1000}
+
+    @app.get("/toy")
+    async def list_toys():
+        return payload
+
+    middleware = CompressionMiddleware(app)
+    client = TestClient(middleware)
+
+    first = client.get("/toy", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/toy", headers={"Accept-Encoding": "gzip"})
+
+    assert first.content == second.content
+    assert middleware.cache_misses == 1
+    assert middleware.cache_hits == 1
+    cached = next(iter(middleware._cache.values()))
+    assert gzip.decompress(cached).startswith(b'{"items"')
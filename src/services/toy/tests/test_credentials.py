@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from azure.core.credentials import AccessToken
+
+from services.credentials import SharedTokenCredential
+
+
+class _StubCredential:
+    def __init__(self, lifetime: int = 3600, delay: float = 0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls: list[tuple[str, ...]] = []
+
+    async def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        self.calls.append(scopes)
+        await asyncio.sleep(self.delay)
+        return AccessToken(f"token-{len(self.calls)}", int(time.time()) + self.lifetime)
+
+    async def close(self):
+        pass
+
+
+async def test_concurrent_misses_fetch_once():
+    stub = _StubCredential(delay=0.01)
+    credential = SharedTokenCredential(credential=stub)
+
+    tokens = await asyncio.gather(*(credential.get_token("https://storage.azure.com/.default") for _ in range(10)))
+
+    assert {t.token for t in tokens} == {"token-1"}
+    assert len(stub.calls) == 1
+    metrics = credential.metrics()
+    assert metrics["fetches"] == 1
+    assert metrics["cache_hits"] == 9
+    await credential.close()
+
+
+async def test_scopes_are_cached_separately():
+    stub = _StubCredential()
+    credential = SharedTokenCredential(credential=stub)
+
+    await credential.get_token("https://storage.azure.com/.default")
+    await credential.get_token("https://cosmos.azure.com/.default")
+    await credential.get_token("https://storage.azure.com/.default")
+
+    assert len(stub.calls) == 2
+    await credential.close()
+
+
+async def test_background_refresh_renews_expiring_token():
+    stub = _StubCredential(lifetime=300)
+    credential = SharedTokenCredential(credential=stub, refresh_margin_seconds=600, check_interval_seconds=0)
+
+    first = await credential.get_token("https://storage.azure.com/.default")
+    await asyncio.sleep(0.05)
+    second = await credential.get_token("https://storage.azure.com/.default")
+
+    assert second.token != first.token
+    assert credential.metrics()["background_refreshes"] >= 1
+    await credential.close()
+
+
+async def test_claims_bypass_cache():
+    stub = _StubCredential()
+    credential = SharedTokenCredential(credential=stub)
+
+    await credential.get_token("scope")
+    await credential.get_token("scope", claims='{"access_token":{}}')
+
+    assert len(stub.calls) == 2
+    await credential.close()
@@ -0,0 +1,52 @@
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from services.filesystem_blob_service import FilesystemBlobService
+
+
+def upload(content: bytes, content_type: str = "image/png") -> UploadFile:
+    return UploadFile(BytesIO(content), filename="a", headers=Headers({"content-type": content_type}))
+
+
+async def test_upload_uses_blob_layout_and_reads_back(tmp_path):
+    svc = FilesystemBlobService(str(tmp_path), "avatars")
+
+    blob_name = await svc.upload_avatar(upload(b"png-bytes"), "toy-1")
+
+    assert blob_name.startswith("toy-1/") and blob_name.endswith(".png")
+    path = svc.local_path(blob_name)
+    assert path.parent == tmp_path / "avatars" / "toy-1"
+    assert [p.name for p in path.parent.iterdir()] == [path.name]  # no leftover temp files
+    assert await svc.download_avatar(blob_name) == (b"png-bytes", "image/png")
+    with svc.mmap_avatar(blob_name) as mapped:
+        assert mapped[:3] == b"png"
+
+    assert await svc.delete_avatar(blob_name) is True
+    assert await svc.delete_avatar(blob_name) is False
+    with pytest.raises(FileNotFoundError):
+        await svc.download_avatar(blob_name)
+
+
+async def test_rejects_invalid_uploads_and_path_traversal(tmp_path):
+    svc = FilesystemBlobService(str(tmp_path), "avatars")
+
+    with pytest.raises(ValueError):
+        await svc.upload_avatar(upload(b"x", "text/plain"), "toy-1")
+    with pytest.raises(FileNotFoundError):
+        svc.local_path("../secrets.txt")
+
+
+async def test_content_addressed_avatars_are_shared_until_last_release(tmp_path):
+    svc = FilesystemBlobService(str(tmp_path), "avatars", content_addressed=True)
+
+    first = await svc.upload_avatar(upload(b"same"), "toy-1")
+    second = await svc.upload_avatar(upload(b"same"), "toy-2")
+
+    assert first == second and first.startswith("sha256/") and first.endswith(".png")
+    assert await svc.delete_avatar(first) is True
+    assert await svc.download_avatar(second) == (b"same", "image/png")
+    assert await svc.delete_avatar(second) is True
+    assert not svc.local_path(first).exists()
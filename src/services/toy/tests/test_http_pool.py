@@ -0,0 +1,39 @@
+from services.http_pool import HttpConnectionPool
+
+
+async def test_shared_session_is_reused_across_clients():
+    pool = HttpConnectionPool(pool_size=10, per_host_limit=5)
+
+    cosmos = pool.create_transport("cosmos")
+    blob = pool.create_transport("blob")
+
+    assert cosmos.session is blob.session
+    assert list(pool.metrics()) == ["shared"]
+    metrics = pool.metrics()["shared"]
+    assert metrics["limit"] == 10
+    assert metrics["limit_per_host"] == 5
+    assert metrics["in_use"] == 0
+    assert metrics["waiters"] == 0
+    await pool.close()
+
+
+async def test_separate_sessions_when_not_shared():
+    pool = HttpConnectionPool(shared_session=False, dns_cache_seconds=0)
+
+    cosmos = pool.create_transport("cosmos")
+    blob = pool.create_transport("blob")
+
+    assert cosmos.session is not blob.session
+    assert set(pool.metrics()) == {"cosmos", "blob"}
+    await pool.close()
+    assert pool.metrics() == {}
+
+
+async def test_closing_transport_keeps_pooled_session_open():
+    pool = HttpConnectionPool()
+    transport = pool.create_transport("blob")
+
+    await transport.close()
+
+    assert not transport.session.closed
+    await pool.close()
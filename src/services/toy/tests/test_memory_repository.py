@@ -0,0 +1,41 @@
+from datetime import UTC, datetime, timedelta
+
+from models import Toy
+from repositories.memory_repository import InMemoryToyRepository
+
+
+async def test_crud_round_trip():
+    repo = InMemoryToyRepository()
+    toy = await repo.create(Toy(name="Bear"))
+
+    assert (await repo.get_by_id(toy.id)).name == "Bear"
+    updated = await repo.update(toy.id, {"description": "Brown", "created_at": "ignored"})
+    assert updated.description == "Brown"
+    assert updated.created_at == toy.created_at
+
+    assert await repo.delete(toy.id) is True
+    assert await repo.get_by_id(toy.id) is None
+    assert await repo.delete(toy.id) is False
+    assert await repo.update(toy.id, {"name": "x"}) is None
+
+
+async def test_list_is_newest_first_with_offset():
+    repo = InMemoryToyRepository()
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    toys = [await repo.create(Toy(name=f"t{i}", created_at=base + timedelta(minutes=i))) for i in range(5)]
+    await repo.delete(toys[2].id)
+
+    page, total = await repo.list_all(limit=2, offset=1)
+
+    assert total == 4
+    assert [t.name for t in page] == ["t3", "t1"]
+    assert (await repo.list_all(limit=10, offset=10)) == ([], 4)
+
+
+async def test_existing_ids_reports_only_stored_toys():
+    repo = InMemoryToyRepository()
+    toy = await repo.create(Toy(name="Bear"))
+    other = await repo.create(Toy(name="Fox"))
+    await repo.delete(other.id)
+
+    assert await repo.existing_ids([toy.id, other.id]) == {str(toy.id)}
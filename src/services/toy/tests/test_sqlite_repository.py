@@ -0,0 +1,43 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from models import Toy
+from repositories.sqlite_repository import SqliteToyRepository
+
+
+async def test_crud_and_persistence_across_restarts(tmp_path):
+    path = str(tmp_path / "toys.db")
+    repo = SqliteToyRepository(path, read_connections=2)
+    toy = await repo.create(Toy(name="Bear"))
+    updated = await repo.update(toy.id, {"description": "Brown"})
+    assert updated.description == "Brown"
+    await repo.close()
+
+    reopened = SqliteToyRepository(path)
+    assert (await reopened.get_by_id(toy.id)).description == "Brown"
+    missing = Toy(name="Ghost").id
+    assert await reopened.existing_ids([toy.id, missing]) == {str(toy.id)}
+    assert await reopened.delete(toy.id) is True
+    assert await reopened.get_by_id(toy.id) is None
+    assert await reopened.update(toy.id, {"name": "x"}) is None
+    await reopened.close()
+
+
+async def test_list_uses_created_at_index_newest_first(tmp_path):
+    repo = SqliteToyRepository(str(tmp_path / "toys.db"))
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    # Microsecond-free and microsecond timestamps must still sort in time order
+    await asyncio.gather(
+        *(repo.create(Toy(name=f"t{i}", created_at=base + timedelta(seconds=i, microseconds=(i % 2) * 500)))
+          for i in range(5))
+    )
+
+    page, total = await repo.list_all(limit=2, offset=1)
+
+    assert total == 5
+    assert [t.name for t in page] == ["t3", "t2"]
+    plan = await repo.pool.read(
+        lambda c: c.execute("EXPLAIN QUERY PLAN SELECT doc FROM toys ORDER BY created_at DESC, id DESC LIMIT 2").fetchall()
+    )
+    assert "idx_toys_created_at" in str(plan)
+    await repo.close()
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models import Toy
+from repositories.memory_repository import InMemoryToyRepository
+from routes import toy_routes
+from services import BlobService
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(toy_routes, "toy_repository", InMemoryToyRepository())
+    app = FastAPI()
+    app.include_router(toy_routes.router)
+    return TestClient(app)
+
+
+def create_toy(**fields) -> Toy:
+    return asyncio.run(toy_routes.toy_repository.create(Toy(name="Bear", **fields)))
+
+
+def test_lookup_splits_found_and_missing_in_request_order(client):
+    toys = [create_toy() for _ in range(2)]
+    missing = uuid4()
+    ids = [str(toys[1].id), str(missing), str(toys[0].id)]
+
+    response = client.post("/toy/lookup", json={"ids": ids})
+
+    assert response.status_code == 200
+    assert response.json() == {"found": [ids[0], ids[2]], "missing": [ids[1]]}
+
+
+def test_lookup_bounds_batch_size(client):
+    assert client.post("/toy/lookup", json={"ids": []}).status_code == 422
+    assert client.post("/toy/lookup", json={"ids": [str(uuid4()) for _ in range(101)]}).status_code == 422
+    assert client.post("/toy/lookup", json={"ids": ["not-a-uuid"]}).status_code == 422
+
+
+class FakeBlobClient:
+    """Serves one avatar blob with its properties."""
+
+    content = bytes(range(100))
+    properties = SimpleNamespace(
+        size=100, etag='"0x8D1"', last_modified=None, content_settings=SimpleNamespace(content_type="image/png")
+    )
+
+    async def get_blob_properties(self):
+        return self.properties
+
+    async def download_blob(self, offset=None, length=None, etag=None, match_condition=None):
+        start = offset or 0
+        data = self.content[start : start + length if length is not None else None]
+
+        async def chunks():
+            yield data
+
+        return SimpleNamespace(properties=self.properties, chunks=chunks)
+
+
+def test_avatar_answers_ranges_and_if_range(client, monkeypatch):
+    blob_service = BlobService("https://example.blob.core.windows.net", "avatars")
+    blob_service._container_client = SimpleNamespace(get_blob_client=lambda blob_name: FakeBlobClient())
+    monkeypatch.setattr(toy_routes, "blob_service", blob_service)
+    toy = create_toy(avatar_blob_name="toy/a.png", has_avatar=True)
+    url = f"/toy/{toy.id}/avatar"
+
+    partial = client.get(url, headers={"Range": "bytes=10-19"})
+    assert partial.status_code == 206
+    assert partial.content == bytes(range(10, 20))
+    assert partial.headers["content-range"] == "bytes 10-19/100"
+    assert partial.headers["etag"] == '"0x8D1"'
+
+    matching = client.get(url, headers={"Range": "bytes=-5", "If-Range": '"0x8D1"'})
+    assert (matching.status_code, matching.content) == (206, bytes(range(95, 100)))
+
+    # The client's copy is stale: the whole avatar is sent
+    stale = client.get(url, headers={"Range": "bytes=10-19", "If-Range": '"0x8D0"'})
+    assert (stale.status_code, len(stale.content)) == (200, 100)
+    assert "content-range" not in stale.headers
+
+    unsatisfiable = client.get(url, headers={"Range": "bytes=100-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == "bytes */100"
@@ -1,4 +1,8 @@
 """Application configuration."""
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -18,29 +22,110 @@ class Settings(BaseSettings):
     # Managed Identity Client ID (optional - for explicit identity selection)
     azure_client_id: str | None = None
 
+    # Repository backend: "cosmos" (default), "sqlite" (single node) or "memory" (process-local, for benchmarks and tests)
+    repository_backend: Literal["cosmos", "sqlite", "memory"] = "cosmos"
+
+    # SQLite (repository_backend = "sqlite")
+    sqlite_path: str = "data/trips.db"
+    sqlite_read_connections: int = 4
+
     # Cosmos DB
-    cosmos_endpoint: str
+    cosmos_endpoint: str | None = None  # Required when repository_backend is "cosmos"
     cosmos_database_name: str = "toytripdb"
     cosmos_container_name: str = "trips"
     cosmos_key: str | None = None
     cosmos_disable_ssl_verify: bool = False
+    # Composite and spatial indexes for trip listings (repositories/indexing_policy.py):
+    # "verify" logs missing indexes at startup, "apply" adds them, "off" skips the check
+    cosmos_indexing_policy_mode: Literal["off", "verify", "apply"] = "verify"
+
+    # Move galleries embedded in trip documents by older versions into image items (background, at startup)
+    gallery_migration_enabled: bool = True
+
+    # Fill in trip coordinates from the bundled offline gazetteer when a trip is written without them
+    geocoding_enabled: bool = True
+    gazetteer_path: str | None = None  # Custom gazetteer CSV (default: services/data/gazetteer.csv)
+
+    # Blob backend: "azure" (Blob Storage / Azurite, default) or "filesystem" (local directory)
+    blob_backend: Literal["azure", "filesystem"] = "azure"
+    blob_filesystem_root: str = "data/blobs"  # Containers become sub-directories
 
     # Blob Storage
-    storage_account_url: str
+    storage_account_url: str | None = None  # Required when blob_backend is "azure"
     storage_account_key: str | None = None
     blob_container_gallery: str = "gallery"
+    # Store images under their SHA-256 (sha256/{hash}): identical uploads share one reference-counted blob
+    blob_content_addressing: bool = False
+
+    # Multi-file gallery uploads: files stored at the same time per request
+    gallery_upload_concurrency: int = 8
+    # Direct-to-storage uploads (POST /trip/{id}/gallery/uploads): lifetime of the pre-signed URL
+    gallery_upload_url_ttl_seconds: int = 900
+    # Resumable uploads (POST /trip/{id}/gallery/sessions): chunk size and session lifetime
+    gallery_upload_chunk_bytes: int = 1024 * 1024
+    gallery_upload_session_ttl_seconds: int = 86_400  # At most 7 days: Blob Storage drops uncommitted blocks then
+
+    # Gallery contact sheets (one mosaic image per trip, rendered in worker processes)
+    contact_sheet_workers: int = 2
+    contact_sheet_max_images: int = 36  # Upper bound of the "limit" query parameter
+    contact_sheet_tile_px: int = 240
 
     # Inter-service Communication
     toy_service_url: str = "http://localhost:8001"
+    # Reject trips for toys that do not exist (checked through a TTL cache, see services/toy_client.py)
+    toy_validation_enabled: bool = True
+    toy_cache_ttl_seconds: float = 300.0
+    toy_cache_negative_ttl_seconds: float = 30.0  # Short, so a just-created toy is accepted soon
+    toy_service_timeout_seconds: float = 5.0
+    # GET /toy/{id}/timeline: assembled responses are reused for this long
+    timeline_cache_ttl_seconds: float = 10.0
+
+    # Per-toy trip statistics (GET /toy/{id}/stats), maintained from the trip change feed
+    trip_stats_processor_enabled: bool = True  # Run the feed processor in this instance
+    trip_stats_poll_seconds: float = 5.0
+    trip_stats_batch_size: int = 100
+    trip_stats_rebuild: bool = False  # Drop the statistics and replay the whole feed at startup
+
+    # Trips by country and location (GET /trip/stats/destinations), maintained from the same feed
+    # (polled with the trip_stats_* interval and batch size)
+    destination_stats_processor_enabled: bool = True
+    destination_stats_reconcile_seconds: float = 3600.0  # Re-check the aggregate against the feed (0 = never)
+    destination_stats_cache_ttl_seconds: float = 60.0  # Response cache and Cache-Control max-age
+    destination_stats_rebuild: bool = False
+
+    # HTTP connection pool for the Cosmos and Blob SDK clients
+    http_pool_size: int = 100  # Max connections per pool (0 = unlimited)
+    http_pool_per_host: int = 0  # Max connections per host (0 = unlimited)
+    http_keepalive_seconds: float = 15.0
+    http_dns_cache_seconds: int = 10  # 0 disables DNS caching
+    http_shared_session: bool = True  # One aiohttp session for both SDK clients
+
+    # Response compression (JSON/text only; image routes are never compressed)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # Bytes; smaller bodies are sent as-is
+    compression_cache_entries: int = 256  # Compressed bodies cached by ETag (0 disables)
 
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8002
     log_level: str = "INFO"
+    # Open DB/storage connections during startup instead of on the first request
+    startup_warm_up: bool = True
 
     # Testing (optional)
     test_client_secret: str | None = None
 
+    @model_validator(mode="after")
+    def validate_backends(self) -> "Settings":
+        """Require Cosmos/Storage settings only when those backends are selected."""
+        if self.repository_backend == "cosmos" and not self.cosmos_endpoint:
+            raise ValueError("COSMOS_ENDPOINT is required when REPOSITORY_BACKEND is 'cosmos'")
+        if self.blob_backend == "azure" and not self.storage_account_url:
+            raise ValueError("STORAGE_ACCOUNT_URL is required when BLOB_BACKEND is 'azure'")
+        return self
+
 
-# Global settings instance
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Load settings from the environment on first use, so importing the app needs no configuration."""
+    return Settings()
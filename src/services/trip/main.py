@@ -1,21 +1,39 @@
 """Main FastAPI application for Trip Service."""
+from startup import StartupProfile
+
+# Created before the heavy imports below so their cost shows up in the profile
+startup_profile = StartupProfile("trip")
+
+import asyncio
 import logging
 from contextlib import asynccontextmanager
+from uuid import uuid4
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
 
-from config import settings
-from repositories import TripRepository
-from routes import trip_routes
-from services import GalleryService
-
-# Configure logging
-logging.basicConfig(
-    level=settings.log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+from config import Settings, get_settings
+from middleware import CompressionMiddleware
+from models import GalleryImage, Trip, TripDocument
+from repositories import InMemoryTripRepository, SqliteTripRepository, TripRepository
+from routes import stats_routes, timeline_routes, trip_routes
+from services import (
+    ContactSheetService,
+    DestinationStatsService,
+    FilesystemGalleryService,
+    GalleryService,
+    Gazetteer,
+    HttpConnectionPool,
+    ToyClient,
+    TripStatsService,
+    UploadSessionService,
+    close_shared_credential,
+    shared_credential_metrics,
 )
 
+startup_profile.mark("imports")
+
 # Suppress verbose Azure SDK logging
 logging.getLogger("azure.cosmos").setLevel(logging.WARNING)
 logging.getLogger("azure.core.pipeline").setLevel(logging.WARNING)
@@ -26,40 +44,211 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 # Global instances
-trip_repo: TripRepository | None = None
-gallery_svc: GalleryService | None = None
+settings: Settings | None = None
+trip_repo: TripRepository | SqliteTripRepository | InMemoryTripRepository | None = None
+gallery_svc: GalleryService | FilesystemGalleryService | None = None
+http_pool: HttpConnectionPool | None = None
+toy_client: ToyClient | None = None
+contact_sheet_svc: ContactSheetService | None = None
+trip_stats_svc: TripStatsService | None = None
+destination_stats_svc: DestinationStatsService | None = None
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+def _load_settings() -> Settings:
     """
-    Application lifespan context manager.
+    Load settings and configure logging, once.
 
-    Initializes and cleans up resources (DB, Blob clients).
+    First called when Starlette builds the middleware stack on the first ASGI
+    event (the lifespan startup), so importing this module reads no
+    environment and the settings phase is profiled as part of startup.
     """
-    global trip_repo, gallery_svc
+    global settings
+    if settings is None:
+        with startup_profile.phase("settings"):
+            settings = get_settings()
+        logging.basicConfig(
+            level=settings.log_level,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        )
+    return settings
 
-    logger.info("Starting Trip Service...")
 
-    # Initialize repositories and services
-    trip_repo = TripRepository(
+def _create_repository() -> TripRepository | SqliteTripRepository | InMemoryTripRepository:
+    """Create the repository for the configured backend."""
+    if settings.repository_backend == "memory":
+        return InMemoryTripRepository()
+    if settings.repository_backend == "sqlite":
+        return SqliteTripRepository(settings.sqlite_path, settings.sqlite_read_connections)
+    return TripRepository(
         cosmos_endpoint=settings.cosmos_endpoint,
         database_name=settings.cosmos_database_name,
         container_name=settings.cosmos_container_name,
         credential=settings.cosmos_key,
         disable_ssl_verify=settings.cosmos_disable_ssl_verify,
+        http_pool=http_pool,
     )
 
-    gallery_svc = GalleryService(
+
+def _create_blob_service() -> GalleryService | FilesystemGalleryService:
+    """Create the image storage service for the configured backend."""
+    if settings.blob_backend == "filesystem":
+        return FilesystemGalleryService(
+            settings.blob_filesystem_root,
+            settings.blob_container_gallery,
+            upload_concurrency=settings.gallery_upload_concurrency,
+            content_addressed=settings.blob_content_addressing,
+        )
+    return GalleryService(
         storage_account_url=settings.storage_account_url,
         container_name=settings.blob_container_gallery,
         credential=settings.storage_account_key,
+        http_pool=http_pool,
+        upload_concurrency=settings.gallery_upload_concurrency,
+        upload_url_ttl_seconds=settings.gallery_upload_url_ttl_seconds,
+        content_addressed=settings.blob_content_addressing,
+    )
+
+
+def _warm_up_models():
+    """Run one document round trip so first-request validation/serialization paths are hot."""
+    trip = Trip(
+        title="warm-up",
+        location_name="warm-up",
+        country_code="CZ",
+        toy_id=uuid4(),
+        gallery_count=1,
+        cover_image=GalleryImage(blob_name="warm-up.jpg"),
     )
+    item = TripDocument.from_trip(trip).model_dump(by_alias=False, mode="json")
+    TripDocument(**item).to_trip().model_dump(mode="json")
+
+
+async def _warm_up_connections():
+    """Open Cosmos and Blob connections (and acquire tokens) before traffic arrives."""
+    results = await asyncio.gather(trip_repo.warm_up(), gallery_svc.warm_up(), return_exceptions=True)
+    for name, result in zip((settings.repository_backend, settings.blob_backend), results):
+        if isinstance(result, Exception):
+            # Not fatal: clients still initialize lazily on the first request
+            logger.warning(f"Warm-up of {name} connection failed: {result}")
+
+
+async def _ensure_indexing_policy():
+    """Verify (or apply) the composite and spatial indexes used by trip listings."""
+    try:
+        await trip_repo.ensure_indexing_policy(apply=settings.cosmos_indexing_policy_mode == "apply")
+    except Exception as e:
+        # Not fatal: listings still work, only at a higher RU cost
+        logger.warning(f"Indexing policy check failed: {e}")
+
+
+async def _migrate_embedded_galleries():
+    """Background sweep moving galleries embedded by older versions into image items."""
+    try:
+        await trip_repo.migrate_embedded_galleries()
+    except Exception as e:
+        # Not fatal: trips are migrated on their next gallery access and on the next start
+        logger.warning(f"Gallery migration failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan context manager.
+
+    Initializes and cleans up resources (DB, Blob clients).
+    """
+    global trip_repo, gallery_svc, http_pool, toy_client, contact_sheet_svc, trip_stats_svc
+    global destination_stats_svc
+
+    _load_settings()
+    logger.info("Starting Trip Service...")
+
+    # Initialize repositories and services
+    with startup_profile.phase("clients"):
+        http_pool = HttpConnectionPool(
+            pool_size=settings.http_pool_size,
+            per_host_limit=settings.http_pool_per_host,
+            keepalive_seconds=settings.http_keepalive_seconds,
+            dns_cache_seconds=settings.http_dns_cache_seconds,
+            shared_session=settings.http_shared_session,
+        )
+
+        trip_repo = _create_repository()
+
+        gallery_svc = _create_blob_service()
+        upload_session_svc = UploadSessionService(
+            gallery_svc,
+            chunk_size=settings.gallery_upload_chunk_bytes,
+            ttl_seconds=settings.gallery_upload_session_ttl_seconds,
+        )
+        contact_sheet_svc = ContactSheetService(
+            gallery_svc,
+            workers=settings.contact_sheet_workers,
+            tile_px=settings.contact_sheet_tile_px,
+        )
+        trip_stats_svc = TripStatsService(
+            trip_repo,
+            batch_size=settings.trip_stats_batch_size,
+            poll_seconds=settings.trip_stats_poll_seconds,
+        )
+        destination_stats_svc = DestinationStatsService(
+            trip_repo,
+            batch_size=settings.trip_stats_batch_size,
+            poll_seconds=settings.trip_stats_poll_seconds,
+            reconcile_seconds=settings.destination_stats_reconcile_seconds,
+        )
+
+        # Inject into routes module
+        trip_routes.trip_repository = trip_repo
+        trip_routes.gallery_service = gallery_svc
+        trip_routes.contact_sheet_service = contact_sheet_svc
+        trip_routes.upload_session_service = upload_session_svc
+        trip_routes.contact_sheet_max_images = settings.contact_sheet_max_images
+        if settings.geocoding_enabled:
+            trip_routes.gazetteer = Gazetteer(settings.gazetteer_path) if settings.gazetteer_path else Gazetteer()
+        trip_routes.set_toy_service_url(settings.toy_service_url)
+        toy_client = ToyClient(
+            settings.toy_service_url,
+            ttl_seconds=settings.toy_cache_ttl_seconds,
+            negative_ttl_seconds=settings.toy_cache_negative_ttl_seconds,
+            timeout_seconds=settings.toy_service_timeout_seconds,
+            keepalive_seconds=settings.http_keepalive_seconds,
+        )
+        trip_routes.toy_client = toy_client if settings.toy_validation_enabled else None
+        timeline_routes.toy_client = toy_client
+        timeline_routes.cache_ttl_seconds = settings.timeline_cache_ttl_seconds
+        # The timeline reads the statistics only where this instance maintains them
+        timeline_routes.trip_stats_service = trip_stats_svc if settings.trip_stats_processor_enabled else None
+        stats_routes.trip_stats_service = trip_stats_svc
+        stats_routes.destination_stats_service = destination_stats_svc
+        stats_routes.destinations_cache_ttl_seconds = settings.destination_stats_cache_ttl_seconds
 
-    # Inject into routes module
-    trip_routes.trip_repository = trip_repo
-    trip_routes.gallery_service = gallery_svc
-    trip_routes.set_toy_service_url(settings.toy_service_url)
+    with startup_profile.phase("warm_models"):
+        _warm_up_models()
+
+    if settings.startup_warm_up:
+        with startup_profile.phase("warm_connections"):
+            await _warm_up_connections()
+
+    if settings.repository_backend == "cosmos" and settings.cosmos_indexing_policy_mode != "off":
+        with startup_profile.phase("indexing_policy"):
+            await _ensure_indexing_policy()
+
+    # Runs while serving traffic; does not delay startup
+    migration_task = None
+    if settings.gallery_migration_enabled:
+        migration_task = asyncio.create_task(_migrate_embedded_galleries())
+    stats_task = None
+    if settings.trip_stats_processor_enabled:
+        stats_task = asyncio.create_task(trip_stats_svc.run(rebuild=settings.trip_stats_rebuild))
+    destinations_task = None
+    if settings.destination_stats_processor_enabled:
+        destinations_task = asyncio.create_task(
+            destination_stats_svc.run(rebuild=settings.destination_stats_rebuild)
+        )
+
+    startup_profile.complete()
+    app.state.startup_profile = startup_profile.snapshot()
 
     logger.info("Trip Service initialized successfully")
 
@@ -67,10 +256,23 @@ async def lifespan(app: FastAPI):
 
     # Cleanup
     logger.info("Shutting down Trip Service...")
+    if migration_task:
+        migration_task.cancel()
+    if stats_task:
+        stats_task.cancel()
+    if destinations_task:
+        destinations_task.cancel()
     if trip_repo:
         await trip_repo.close()
+    if contact_sheet_svc:
+        await contact_sheet_svc.close()
     if gallery_svc:
         await gallery_svc.close()
+    if http_pool:
+        await http_pool.close()
+    if toy_client:
+        await toy_client.close()
+    await close_shared_credential()
     logger.info("Trip Service shut down complete")
 
 
@@ -91,8 +293,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+def _compression(app: ASGIApp) -> ASGIApp:
+    """Wrap the app in compression middleware when enabled in settings."""
+    settings = _load_settings()
+    if not settings.compression_enabled:
+        return app
+    # Compress JSON responses; the image routes (contact sheet and image download) stream binary
+    # content and are excluded, the JSON gallery routes (batch, uploads, sessions) are not
+    return CompressionMiddleware(
+        app,
+        minimum_size=settings.compression_min_size,
+        cache_entries=settings.compression_cache_entries,
+        excluded_paths=["^/trip/[^/]+/gallery/(contact-sheet|[0-9a-fA-F-]{36})$"],
+    )
+
+
+# Built with the middleware stack on startup, when settings are loaded
+app.add_middleware(_compression)
+
 # Include routers
+app.include_router(stats_routes.router)
 app.include_router(trip_routes.router)
+app.include_router(timeline_routes.router)
+
+
+@app.get("/metrics")
+async def runtime_metrics():
+    """Runtime metrics: startup phase timings, credential token cache, HTTP pool saturation and toy cache."""
+    return {
+        "startup": getattr(app.state, "startup_profile", None),
+        "credential": shared_credential_metrics(),
+        "http_pool": http_pool.metrics() if http_pool else None,
+        "toy_client": toy_client.metrics() if toy_client else None,
+    }
 
 
 @app.get("/health")
@@ -104,6 +338,7 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
+    settings = _load_settings()
     uvicorn.run(
         app,
         host=settings.api_host,
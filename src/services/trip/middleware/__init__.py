@@ -0,0 +1,5 @@
+"""Middleware package."""
+from middleware.compression import CompressionMiddleware
+from middleware.http_cache import JsonResponseCache, etag_matches, weak_etag
+
+__all__ = ["CompressionMiddleware", "JsonResponseCache", "etag_matches", "weak_etag"]
@@ -0,0 +1,86 @@
+"""ETags and short-lived in-memory caching of JSON responses.
+
+The compression middleware ETags every successful GET response. Routes whose
+payloads are expensive to assemble additionally keep the serialized body for
+a few seconds with JsonResponseCache, so repeated requests skip the work and
+unchanged responses revalidate with 304.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+def weak_etag(body: bytes) -> str:
+    """Weak ETag of a response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+
+class JsonResponseCache:
+    """TTL cache of serialized JSON responses with their ETags (LRU beyond a size)."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Responses kept; the least recently used are evicted beyond it
+        """
+        self.max_entries = max_entries
+        # key -> (expires_at on the monotonic clock, JSON body, ETag)
+        self._entries: OrderedDict[Hashable, tuple[float, bytes, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    async def respond(
+        self,
+        key: Hashable,
+        build: Callable[[], Awaitable[BaseModel]],
+        ttl_seconds: float,
+        if_none_match: str | None = None,
+    ) -> Response:
+        """
+        Serve a cached response, building and caching it when missing or expired.
+
+        Args:
+            key: Cache key of the response
+            build: Produces the payload on a cache miss
+            ttl_seconds: How long the response is cached (also its Cache-Control max-age)
+            if_none_match: If-None-Match request header
+
+        Returns:
+            The JSON response, or 304 when the ETag matches If-None-Match
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            _, body, etag = entry
+        else:
+            body = (await build()).model_dump_json().encode()
+            etag = weak_etag(body)
+            self._entries[key] = (now + ttl_seconds, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={int(ttl_seconds)}"}
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
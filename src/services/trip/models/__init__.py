@@ -1,6 +1,17 @@
 """Trip service models."""
+from models.stats import CountryDestinations, DestinationStats, LocationCount, ToyTripStats
+from models.timeline import ToyTimeline, TripSummary
 from models.trip import (
+    GalleryBatchUploadResponse,
     GalleryImage,
+    GalleryImageDocument,
+    GalleryUploadCommit,
+    GalleryUploadRequest,
+    GalleryUploadResult,
+    GalleryUploadSession,
+    GalleryUploadSessionCreate,
+    GalleryUploadTicket,
+    GeoPoint,
     Trip,
     TripCreate,
     TripDocument,
@@ -9,10 +20,25 @@ from models.trip import (
 )
 
 __all__ = [
+    "CountryDestinations",
+    "DestinationStats",
+    "GalleryBatchUploadResponse",
     "GalleryImage",
+    "GalleryImageDocument",
+    "GalleryUploadCommit",
+    "GalleryUploadRequest",
+    "GalleryUploadResult",
+    "GalleryUploadSession",
+    "GalleryUploadSessionCreate",
+    "GalleryUploadTicket",
+    "GeoPoint",
+    "LocationCount",
     "Trip",
     "TripCreate",
     "TripUpdate",
     "TripDocument",
     "TripStatus",
+    "TripSummary",
+    "ToyTimeline",
+    "ToyTripStats",
 ]
@@ -0,0 +1,55 @@
+"""Models of precomputed trip statistics."""
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_serializer
+
+
+class ToyTripStats(BaseModel):
+    """Trip statistics of one toy, maintained from the trip change feed."""
+
+    toy_id: UUID = Field(..., description="Toy identifier")
+    trip_count: int = Field(default=0, ge=0, description="Number of trips")
+    image_count: int = Field(default=0, ge=0, description="Number of gallery images across all trips")
+    countries: list[str] = Field(default_factory=list, description="Visited countries (ISO 3166-1 alpha-2), sorted")
+    last_trip_at: datetime | None = Field(None, description="Creation time of the newest trip")
+    updated_at: datetime | None = Field(None, description="When the statistics last changed")
+
+    @field_serializer('toy_id')
+    def serialize_toy_id(self, value: UUID) -> str:
+        """Serialize UUID to string."""
+        return str(value)
+
+    @field_serializer('last_trip_at', 'updated_at')
+    def serialize_datetime(self, value: datetime | None) -> str | None:
+        """Serialize datetime to ISO format."""
+        return value.isoformat() if value else None
+
+
+class LocationCount(BaseModel):
+    """Number of trips to one location."""
+
+    location_name: str = Field(..., description="Location name as entered on the trips")
+    trip_count: int = Field(..., ge=0, description="Number of trips")
+
+
+class CountryDestinations(BaseModel):
+    """Trips to one country and its most visited locations."""
+
+    country_code: str = Field(..., description="ISO 3166-1 alpha-2 country code")
+    trip_count: int = Field(..., ge=0, description="Number of trips")
+    location_count: int = Field(..., ge=0, description="Number of distinct locations")
+    locations: list[LocationCount] = Field(default_factory=list, description="Most visited locations first")
+
+
+class DestinationStats(BaseModel):
+    """Trips by country and location, maintained from the trip change feed."""
+
+    trip_count: int = Field(default=0, ge=0, description="Number of trips")
+    countries: list[CountryDestinations] = Field(default_factory=list, description="Most visited countries first")
+    updated_at: datetime | None = Field(None, description="When any country last changed")
+
+    @field_serializer('updated_at')
+    def serialize_datetime(self, value: datetime | None) -> str | None:
+        """Serialize datetime to ISO format."""
+        return value.isoformat() if value else None
@@ -0,0 +1,51 @@
+"""Models of the aggregated toy timeline."""
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_serializer
+
+from models.stats import ToyTripStats
+from models.trip import GalleryImage, Trip, TripStatus
+
+
+class TripSummary(BaseModel):
+    """Trip fields shown on a toy page."""
+
+    id: UUID = Field(..., description="Trip identifier")
+    title: str = Field(..., description="Trip title")
+    location_name: str = Field(..., description="Destination city or location")
+    country_code: str = Field(..., description="ISO 3166-1 alpha-2 country code")
+    status: TripStatus = Field(..., description="Overall trip status")
+    gallery_count: int = Field(..., description="Number of gallery images")
+    cover_image: GalleryImage | None = Field(None, description="Trip cover image metadata")
+    created_at: datetime = Field(..., description="Creation timestamp")
+
+    @field_serializer('id')
+    def serialize_id(self, value: UUID) -> str:
+        """Serialize UUID to string."""
+        return str(value)
+
+    @field_serializer('created_at')
+    def serialize_datetime(self, value: datetime) -> str:
+        """Serialize datetime to ISO format."""
+        return value.isoformat() if value else None
+
+    @classmethod
+    def from_trip(cls, trip: Trip) -> "TripSummary":
+        """Summarize a trip."""
+        return cls(**trip.model_dump(include=set(cls.model_fields)))
+
+
+class ToyTimeline(BaseModel):
+    """A toy and its most recent trips, assembled in one response."""
+
+    toy: dict[str, Any] = Field(..., description="Toy as returned by the toy service")
+    trips: list[TripSummary] = Field(..., description="Most recent trips, newest first")
+    trip_count: int = Field(
+        ..., description="Total number of trips of the toy (stats.trip_count when statistics are enabled)"
+    )
+    stats: ToyTripStats | None = Field(None, description="Precomputed trip statistics of the toy")
+    continuation_token: str | None = Field(
+        None, description="Token for GET /trip?toy_id= to continue after the returned trips"
+    )
@@ -1,9 +1,10 @@
 """Data models for the trip service."""
 from datetime import datetime, UTC
 from enum import Enum
+from typing import Literal
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_validator, field_serializer, model_validator
 
 
 class TripStatus(str, Enum):
@@ -36,6 +37,32 @@ class GalleryImage(BaseModel):
         return value.isoformat() if value else None
 
 
+class GeoPoint(BaseModel):
+    """GeoJSON point (WGS 84), as indexed by Cosmos DB spatial indexes."""
+
+    type: Literal["Point"] = Field(default="Point", description="GeoJSON geometry type")
+    coordinates: list[float] = Field(..., min_length=2, max_length=2, description="[longitude, latitude] in degrees")
+
+    @field_validator("coordinates")
+    @classmethod
+    def validate_coordinates(cls, v: list[float]) -> list[float]:
+        """Ensure longitude and latitude are in range."""
+        longitude, latitude = v
+        if not -180 <= longitude <= 180 or not -90 <= latitude <= 90:
+            raise ValueError("Coordinates must be [longitude (-180..180), latitude (-90..90)]")
+        return v
+
+    @property
+    def longitude(self) -> float:
+        """Longitude in degrees."""
+        return self.coordinates[0]
+
+    @property
+    def latitude(self) -> float:
+        """Latitude in degrees."""
+        return self.coordinates[1]
+
+
 class TripBase(BaseModel):
     """Base trip model with common fields."""
 
@@ -44,6 +71,9 @@ class TripBase(BaseModel):
     location_name: str = Field(..., min_length=1, max_length=200, description="Destination city or location")
     country_code: str = Field(..., min_length=2, max_length=2, description="ISO 3166-1 alpha-2 country code")
     public_tracking_enabled: bool = Field(default=False, description="Enable public location sharing")
+    location: GeoPoint | None = Field(
+        None, description="Coordinates of the destination; looked up from location_name when omitted"
+    )
 
     @field_validator("country_code")
     @classmethod
@@ -68,6 +98,7 @@ class TripUpdate(BaseModel):
     country_code: str | None = Field(None, min_length=2, max_length=2)
     public_tracking_enabled: bool | None = None
     status: TripStatus | None = None
+    location: GeoPoint | None = None
 
     @field_validator("title", "location_name")
     @classmethod
@@ -90,7 +121,8 @@ class Trip(TripBase):
     id: UUID = Field(default_factory=uuid4, description="Unique trip identifier")
     toy_id: UUID = Field(..., description="ID of the toy taking this trip")
     status: TripStatus = Field(default=TripStatus.PLANNED, description="Overall trip status")
-    gallery: list[GalleryImage] = Field(default_factory=list, description="Gallery images")
+    gallery_count: int = Field(default=0, ge=0, description="Number of gallery images")
+    cover_image: GalleryImage | None = Field(None, description="First gallery image, shown as the trip cover")
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Creation timestamp")
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC), description="Last modification timestamp")
 
@@ -105,6 +137,83 @@ class Trip(TripBase):
         return value.isoformat() if value else None
 
 
+class GalleryUploadResult(BaseModel):
+    """Outcome of one file of a multi-file gallery upload."""
+
+    filename: str | None = Field(None, description="Client file name")
+    image: GalleryImage | None = Field(None, description="Stored image metadata (on success)")
+    error: str | None = Field(None, description="Validation or storage error (on failure)")
+
+
+class GalleryBatchUploadResponse(BaseModel):
+    """Response of a multi-file gallery upload."""
+
+    trip: Trip = Field(..., description="Trip after all successful images were added")
+    results: list[GalleryUploadResult] = Field(..., description="Per-file results, in request order")
+
+
+class GalleryUploadRequest(BaseModel):
+    """Request for a direct-to-storage gallery upload."""
+
+    content_type: str = Field(..., description="Content type of the image (JPEG, PNG, or WebP)")
+
+
+class GalleryUploadTicket(BaseModel):
+    """Pre-signed upload target of a pending gallery image."""
+
+    image_id: UUID = Field(..., description="ID the image gets once committed")
+    upload_url: str = Field(..., description="Write-only URL to PUT the image bytes to")
+    upload_headers: dict[str, str] = Field(..., description="Headers the PUT request must send")
+    expires_at: datetime = Field(..., description="Time after which the URL no longer accepts the upload")
+
+    @field_serializer('image_id')
+    def serialize_image_id(self, value: UUID) -> str:
+        """Serialize UUID to string."""
+        return str(value)
+
+    @field_serializer('expires_at')
+    def serialize_datetime(self, value: datetime) -> str:
+        """Serialize datetime to ISO format."""
+        return value.isoformat()
+
+
+class GalleryUploadCommit(BaseModel):
+    """Metadata of a directly uploaded gallery image."""
+
+    landmark: str | None = Field(None, max_length=200, description="Landmark name featured in the image")
+    caption: str | None = Field(None, max_length=500, description="Optional image caption")
+
+
+class GalleryUploadSessionCreate(BaseModel):
+    """Request for a resumable (chunked) gallery upload."""
+
+    content_type: str = Field(..., description="Content type of the image (JPEG, PNG, or WebP)")
+    size: int = Field(..., gt=0, description="Total image size in bytes")
+
+
+class GalleryUploadSession(BaseModel):
+    """Resumable gallery upload: the image is sent in fixed-size chunks, in any order."""
+
+    session_id: UUID = Field(..., description="Session ID; also the ID the image gets once committed")
+    trip_id: UUID = Field(..., description="Trip the image is uploaded to")
+    content_type: str = Field(..., description="Content type of the image")
+    size: int = Field(..., description="Total image size in bytes")
+    chunk_size: int = Field(..., description="Size of every chunk except the last")
+    chunk_count: int = Field(..., description="Number of chunks")
+    expires_at: datetime = Field(..., description="Time after which the session and its chunks are discarded")
+    received_chunks: list[int] = Field(default_factory=list, description="Indexes of the chunks stored so far")
+
+    @field_serializer('session_id', 'trip_id')
+    def serialize_uuid(self, value: UUID) -> str:
+        """Serialize UUID to string."""
+        return str(value)
+
+    @field_serializer('expires_at')
+    def serialize_datetime(self, value: datetime) -> str:
+        """Serialize datetime to ISO format."""
+        return value.isoformat()
+
+
 class TripDocument(Trip):
     """Trip model for Cosmos DB storage (includes partition key field)."""
 
@@ -136,6 +245,15 @@ class TripDocument(Trip):
             return datetime.fromisoformat(value)
         return value
 
+    @model_validator(mode="before")
+    @classmethod
+    def summarize_embedded_gallery(cls, data):
+        """Derive gallery_count/cover_image for documents that still embed their gallery (pre-migration)."""
+        if isinstance(data, dict) and "gallery" in data and "gallery_count" not in data:
+            gallery = data.get("gallery") or []
+            data = {**data, "gallery_count": len(gallery), "cover_image": gallery[0] if gallery else None}
+        return data
+
     @classmethod
     def from_trip(cls, trip: Trip) -> "TripDocument":
         """Create a Cosmos DB document from a Trip model."""
@@ -146,11 +264,13 @@ class TripDocument(Trip):
             "location_name": trip.location_name,
             "country_code": trip.country_code,
             "public_tracking_enabled": trip.public_tracking_enabled,
+            "location": trip.location.model_dump() if trip.location else None,
             "id": str(trip.id),
             "trip_id": str(trip.id),
             "toy_id": str(trip.toy_id),
             "status": trip.status,
-            "gallery": [img.model_dump() for img in trip.gallery],
+            "gallery_count": trip.gallery_count,
+            "cover_image": trip.cover_image.model_dump() if trip.cover_image else None,
             "created_at": trip.created_at,
             "updated_at": trip.updated_at,
         }
@@ -160,3 +280,25 @@ class TripDocument(Trip):
         """Convert Cosmos DB document to Trip model."""
         data = self.model_dump(exclude={"trip_id"})
         return Trip(**data)
+
+
+class GalleryImageDocument(GalleryImage):
+    """Gallery image stored as its own item in the trip's partition."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+    )
+
+    # Cosmos DB fields: id is the image ID, trip_id the partition key shared with the trip document
+    id: str = Field(..., description="Document ID (same as image_id)")
+    trip_id: str = Field(..., description="Partition key (ID of the owning trip)")
+    doc_type: str = Field(default="gallery_image", description="Discriminator from trip documents")
+
+    @classmethod
+    def from_image(cls, trip_id: UUID | str, image: GalleryImage) -> "GalleryImageDocument":
+        """Create a gallery image document for a trip."""
+        return cls(**image.model_dump(), id=str(image.image_id), trip_id=str(trip_id))
+
+    def to_image(self) -> GalleryImage:
+        """Convert the document to the GalleryImage API model."""
+        return GalleryImage(**self.model_dump(exclude={"id", "trip_id", "doc_type"}))
@@ -1,4 +1,7 @@
 """Repository modules."""
+from repositories.errors import TripExistsError
+from repositories.memory_repository import InMemoryTripRepository
+from repositories.sqlite_repository import SqliteTripRepository
 from repositories.trip_repository import TripRepository
 
-__all__ = ["TripRepository"]
+__all__ = ["InMemoryTripRepository", "SqliteTripRepository", "TripExistsError", "TripRepository"]
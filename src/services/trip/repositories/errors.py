@@ -0,0 +1,5 @@
+"""Errors shared by all repository backends."""
+
+
+class TripExistsError(ValueError):
+    """A trip with the same ID already exists."""
@@ -0,0 +1,52 @@
+"""Great-circle distance and search boxes for the nearby query of the local backends.
+
+Cosmos DB answers `ST_DISTANCE` from its spatial index. The in-memory and
+SQLite backends instead look up candidates in an R-tree by the latitude and
+longitude box around the search circle, then keep those within the radius.
+"""
+import math
+
+# Mean Earth radius (IUGG); Cosmos DB measures on the WGS 84 ellipsoid, which differs by under 0.5%
+EARTH_RADIUS_KM = 6371.0088
+
+# (min_longitude, min_latitude, max_longitude, max_latitude) in degrees
+Box = tuple[float, float, float, float]
+
+
+def distance_km(latitude: float, longitude: float, other_latitude: float, other_longitude: float) -> float:
+    """Great-circle (haversine) distance between two points in kilometres."""
+    phi1, phi2 = math.radians(latitude), math.radians(other_latitude)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(other_longitude - longitude)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def search_boxes(latitude: float, longitude: float, radius_km: float) -> list[Box]:
+    """
+    Latitude/longitude boxes covering a search circle.
+
+    The box is split in two where it crosses the antimeridian, and spans all
+    longitudes when the circle reaches a pole.
+
+    Args:
+        latitude: Centre latitude in degrees
+        longitude: Centre longitude in degrees
+        radius_km: Radius in kilometres
+
+    Returns:
+        One or two boxes whose union contains every point within the radius
+    """
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return [(-180.0, max(min_lat, -90.0), 180.0, min(max_lat, 90.0))]
+
+    # Widest longitude span of the circle (at its tangent latitude)
+    d_lon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude)))))
+    min_lon, max_lon = longitude - d_lon, longitude + d_lon
+    if min_lon < -180:
+        return [(-180.0, min_lat, max_lon, max_lat), (min_lon + 360, min_lat, 180.0, max_lat)]
+    if max_lon > 180:
+        return [(min_lon, min_lat, 180.0, max_lat), (-180.0, min_lat, max_lon - 360, max_lat)]
+    return [(min_lon, min_lat, max_lon, max_lat)]
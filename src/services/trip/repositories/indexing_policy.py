@@ -0,0 +1,116 @@
+"""Cosmos DB indexing policy for the trips container.
+
+Listing queries sort by (created_at DESC, id DESC) and optionally filter by
+equality on toy_id, country_code, status and public_tracking_enabled; gallery
+image items are listed per trip by (uploaded_at, id). Cosmos DB can only serve
+such ORDER BY queries from a composite index whose leading paths are the
+filtered properties, so one composite index is declared per supported filter
+combination. Nearby queries filter on the distance to trip coordinates, which
+needs a spatial index on /location. The policy is declared here (instead of
+only in infrastructure templates) so the service can verify or apply it at
+startup.
+"""
+from itertools import combinations
+from typing import Any
+
+# Equality filters of the global listing, in the order they appear in composite indexes and ORDER BY
+LIST_FILTER_FIELDS = ("country_code", "status", "public_tracking_enabled")
+
+# Keyset sort order shared by all listings
+SORT_PATHS = [
+    {"path": "/created_at", "order": "descending"},
+    {"path": "/id", "order": "descending"},
+]
+
+
+def _filter_prefixes() -> list[tuple[str, ...]]:
+    """All filter combinations that need their own composite index (including no filter)."""
+    prefixes: list[tuple[str, ...]] = [(), ("toy_id",)]
+    for size in range(1, len(LIST_FILTER_FIELDS) + 1):
+        prefixes.extend(combinations(LIST_FILTER_FIELDS, size))
+    return prefixes
+
+
+# Gallery image items of one trip, in upload order (doc_type leads because the query filters on it)
+GALLERY_INDEX = [
+    {"path": "/doc_type", "order": "ascending"},
+    {"path": "/uploaded_at", "order": "ascending"},
+    {"path": "/id", "order": "ascending"},
+]
+
+
+# Trip coordinates (GeoJSON points) for the ST_DISTANCE predicate of nearby queries
+SPATIAL_INDEXES = [{"path": "/location/*", "types": ["Point"]}]
+
+
+def composite_indexes() -> list[list[dict[str, str]]]:
+    """Composite indexes for every listing query shape."""
+    trip_indexes = [
+        [{"path": f"/{field}", "order": "ascending"} for field in prefix] + SORT_PATHS
+        for prefix in _filter_prefixes()
+    ]
+    return [*trip_indexes, GALLERY_INDEX]
+
+
+TRIP_INDEXING_POLICY: dict[str, Any] = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [{"path": "/*"}],
+    # Galleries embedded by older versions are never queried (the migration sweep finds their trips by
+    # the missing gallery_count); excluding them keeps their write RU down
+    "excludedPaths": [{"path": "/gallery/*"}, {"path": '/"_etag"/?'}],
+    "compositeIndexes": composite_indexes(),
+    "spatialIndexes": SPATIAL_INDEXES,
+}
+
+
+def _normalize(index: list[dict[str, str]]) -> tuple[tuple[str, str], ...]:
+    # Cosmos omits "order" when it is the default (ascending)
+    return tuple((entry["path"], entry.get("order", "ascending").lower()) for entry in index)
+
+
+def missing_composite_indexes(current_policy: dict[str, Any]) -> list[list[dict[str, str]]]:
+    """
+    Compare a container's indexing policy with TRIP_INDEXING_POLICY.
+
+    Args:
+        current_policy: indexingPolicy as returned by the container properties
+
+    Returns:
+        Required composite indexes that are not present (empty when up to date)
+    """
+    present = {_normalize(index) for index in current_policy.get("compositeIndexes", [])}
+    return [index for index in TRIP_INDEXING_POLICY["compositeIndexes"] if _normalize(index) not in present]
+
+
+def missing_spatial_indexes(current_policy: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Required spatial indexes whose path has no spatial index in a container's policy.
+
+    Args:
+        current_policy: indexingPolicy as returned by the container properties
+
+    Returns:
+        Missing spatial indexes (empty when up to date)
+    """
+    present = {index["path"] for index in current_policy.get("spatialIndexes", [])}
+    return [index for index in SPATIAL_INDEXES if index["path"] not in present]
+
+
+def merged_policy(current_policy: dict[str, Any]) -> dict[str, Any]:
+    """
+    Add missing composite and spatial indexes to an existing policy.
+
+    Other settings (included/excluded paths, existing spatial indexes) are
+    kept as they are, so indexes added by operators are not dropped.
+
+    Args:
+        current_policy: indexingPolicy as returned by the container properties
+
+    Returns:
+        Updated indexing policy
+    """
+    policy = dict(current_policy)
+    policy["compositeIndexes"] = [*current_policy.get("compositeIndexes", []), *missing_composite_indexes(current_policy)]
+    policy["spatialIndexes"] = [*current_policy.get("spatialIndexes", []), *missing_spatial_indexes(current_policy)]
+    return policy
@@ -0,0 +1,595 @@
+"""In-memory trip repository.
+
+Drop-in replacement for TripRepository used for local benchmarking, load tests
+on a laptop and tests. Documents are stored as the same JSON-mode dicts that
+would be written to Cosmos DB, so the Pydantic serialization/validation path
+is identical and only the network round trip is removed. Data lives only as
+long as the process.
+"""
+import bisect
+import json
+import logging
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from models import GalleryImage, GalleryImageDocument, Trip, TripDocument
+from repositories.errors import TripExistsError
+from repositories.geo import distance_km, search_boxes
+from repositories.pagination import decode_continuation, encode_continuation
+from repositories.rtree import RTree
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError, parse_sequence
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryTripRepository:
+    """Trip repository backed by dicts keyed by id and sorted indexes (trips by created_at, images by uploaded_at)."""
+
+    def __init__(self):
+        """Initialize an empty repository."""
+        self._items: dict[str, dict[str, Any]] = {}
+        # toy_id -> [(created_at, trip_id)] in ascending order; listed in reverse for newest first
+        self._by_toy: dict[str, list[tuple[datetime, str]]] = {}
+        self._by_created: list[tuple[datetime, str]] = []
+        self._index_keys: dict[str, tuple[datetime, str]] = {}
+        # Trips with coordinates, by point
+        self._locations = RTree()
+        # trip_id -> image_id -> image document, and trip_id -> [(uploaded_at, image_id)] ascending
+        self._images: dict[str, dict[str, dict[str, Any]]] = {}
+        self._image_index: dict[str, list[tuple[datetime, str]]] = {}
+        # Change feed: trip_id -> (sequence, toy_id, deleted) of its latest change, and (sequence, trip_id)
+        # of all changes in order; superseded log entries are skipped on read and dropped now and then
+        self._changes: dict[str, tuple[int, str, bool]] = {}
+        self._change_log: list[tuple[int, str]] = []
+        self._change_sequence = 0
+        # View documents: partition -> id -> JSON body with its version, and partition -> sorted ids
+        self._views: dict[str, dict[str, str]] = {}
+        self._view_ids: dict[str, list[str]] = {}
+        self._view_version = 0
+
+    async def warm_up(self):
+        """Nothing to connect to; present for API parity with TripRepository."""
+        logger.info("Using in-memory trip repository")
+
+    async def create(self, trip: Trip) -> Trip:
+        """
+        Create a new trip.
+
+        Args:
+            trip: Trip instance to create
+
+        Returns:
+            Created Trip
+
+        Raises:
+            TripExistsError: If a trip with the same ID already exists
+        """
+        trip_id_str = str(trip.id)
+        if trip_id_str in self._items:
+            raise TripExistsError(f"Trip already exists: {trip_id_str}")
+
+        item = TripDocument.from_trip(trip).model_dump(by_alias=False, mode="json")
+        item["id"] = trip_id_str
+        item["trip_id"] = trip_id_str
+
+        self._items[trip_id_str] = item
+        key = (trip.created_at, trip_id_str)
+        bisect.insort(self._by_toy.setdefault(item["toy_id"], []), key)
+        bisect.insort(self._by_created, key)
+        self._index_keys[trip_id_str] = key
+        self._index_location(trip_id_str, item)
+        self._record_change(trip_id_str, item["toy_id"])
+        logger.info(f"Created trip: {trip_id_str} for toy {trip.toy_id}")
+
+        return TripDocument(**item).to_trip()
+
+    async def get_by_id(self, trip_id: UUID) -> Trip | None:
+        """
+        Retrieve a trip by ID.
+
+        Args:
+            trip_id: UUID of the trip
+
+        Returns:
+            Trip if found, None otherwise
+        """
+        item = self._items.get(str(trip_id))
+        if item is None:
+            logger.debug(f"Trip not found: {trip_id}")
+            return None
+        return TripDocument(**item).to_trip()
+
+    async def list_by_toy(
+        self, toy_id: UUID, limit: int = 20, continuation_token: str | None = None
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips for a specific toy, newest first, with keyset pagination.
+
+        Args:
+            toy_id: UUID of the toy
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        toy_id_str = str(toy_id)
+        index = self._by_toy.get(toy_id_str, [])
+        end = len(index)
+        if continuation_token:
+            after_created_at, after_id = decode_continuation(continuation_token)
+            end = bisect.bisect_left(index, (datetime.fromisoformat(after_created_at), after_id))
+
+        # Slice the sorted index directly; only the requested page is materialized
+        page = [self._items[trip_id] for _, trip_id in reversed(index[max(end - limit, 0):end])]
+        next_token = encode_continuation(page[-1]["created_at"], page[-1]["id"]) if end > limit else None
+
+        trips = [TripDocument(**item).to_trip() for item in page]
+        logger.debug(f"Listed {len(trips)} trips for toy {toy_id_str} (more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def count_by_toy(self, toy_id: UUID) -> int:
+        """
+        Count trips of a toy.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Number of trips
+        """
+        return len(self._by_toy.get(str(toy_id), []))
+
+    async def list_trips(
+        self,
+        limit: int = 20,
+        continuation_token: str | None = None,
+        country_code: str | None = None,
+        status: str | None = None,
+        public_tracking_enabled: bool | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips across all toys, newest first, with keyset pagination.
+
+        Args:
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+            country_code: Only trips in this country
+            status: Only trips with this status
+            public_tracking_enabled: Only trips with this tracking setting
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        filters = {"country_code": country_code, "status": status, "public_tracking_enabled": public_tracking_enabled}
+        filters = {field: value for field, value in filters.items() if value is not None}
+
+        end = len(self._by_created)
+        if continuation_token:
+            after_created_at, after_id = decode_continuation(continuation_token)
+            end = bisect.bisect_left(self._by_created, (datetime.fromisoformat(after_created_at), after_id))
+
+        # Walk the index backwards from the cursor until a page (plus one to detect more) matched
+        matches: list[dict[str, Any]] = []
+        for position in range(end - 1, -1, -1):
+            item = self._items[self._by_created[position][1]]
+            if all(item.get(field) == value for field, value in filters.items()):
+                matches.append(item)
+                if len(matches) > limit:
+                    break
+
+        next_token = None
+        if len(matches) > limit:
+            matches = matches[:limit]
+            next_token = encode_continuation(matches[-1]["created_at"], matches[-1]["id"])
+
+        trips = [TripDocument(**item).to_trip() for item in matches]
+        logger.debug(f"Listed {len(trips)} trips (filters: {filters}, more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def list_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20,
+        continuation_token: str | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips within a radius of a point, newest first, with keyset pagination.
+
+        Candidates come from the R-tree by the box around the circle and are
+        filtered by great-circle distance.
+
+        Args:
+            latitude: Latitude of the centre in degrees
+            longitude: Longitude of the centre in degrees
+            radius_km: Search radius in kilometres
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        after = None
+        if continuation_token:
+            after_created_at, after_id = decode_continuation(continuation_token)
+            after = (datetime.fromisoformat(after_created_at), after_id)
+
+        boxes = search_boxes(latitude, longitude, radius_km)
+        candidates = {trip_id_str for box in boxes for trip_id_str in self._locations.search(box)}
+        keys = []
+        for trip_id_str in candidates:
+            key = self._index_keys[trip_id_str]
+            if after is not None and key >= after:
+                continue
+            point_longitude, point_latitude = self._items[trip_id_str]["location"]["coordinates"]
+            if distance_km(latitude, longitude, point_latitude, point_longitude) <= radius_km:
+                keys.append(key)
+        keys.sort(reverse=True)
+
+        next_token = None
+        if len(keys) > limit:
+            keys = keys[:limit]
+            next_token = encode_continuation(self._items[keys[-1][1]]["created_at"], keys[-1][1])
+
+        trips = [TripDocument(**self._items[trip_id_str]).to_trip() for _, trip_id_str in keys]
+        logger.debug(f"Listed {len(trips)} trips within {radius_km} km (more: {next_token is not None})")
+        return trips, next_token
+
+    async def update(self, trip_id: UUID, updates: dict[str, Any]) -> Trip | None:
+        """
+        Update a trip with partial data.
+
+        Args:
+            trip_id: UUID of the trip to update
+            updates: Dictionary of fields to update
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        trip_id_str = str(trip_id)
+        current = self._items.get(trip_id_str)
+        if current is None:
+            logger.debug(f"Trip not found for update: {trip_id_str}")
+            return None
+
+        item = dict(current)
+        for key, value in updates.items():
+            # Immutable and gallery-maintained fields
+            if key not in {"id", "trip_id", "toy_id", "created_at", "gallery_count", "cover_image"}:
+                item[key] = value
+
+        trip = self._replace(trip_id_str, item)
+        logger.info(f"Updated trip: {trip_id_str}")
+        return trip
+
+    async def delete(self, trip_id: UUID) -> bool:
+        """
+        Delete a trip.
+
+        Args:
+            trip_id: UUID of the trip to delete
+
+        Returns:
+            True if deleted, False if not found
+        """
+        trip_id_str = str(trip_id)
+        item = self._items.pop(trip_id_str, None)
+        if item is None:
+            logger.debug(f"Trip not found for deletion: {trip_id_str}")
+            return False
+
+        key = self._index_keys.pop(trip_id_str)
+        index = self._by_toy.get(item["toy_id"], [])
+        _remove_key(index, key)
+        if not index:
+            self._by_toy.pop(item["toy_id"], None)
+        _remove_key(self._by_created, key)
+        self._locations.delete(trip_id_str)
+        self._images.pop(trip_id_str, None)
+        self._image_index.pop(trip_id_str, None)
+        self._record_change(trip_id_str, item["toy_id"], deleted=True)
+        logger.info(f"Deleted trip: {trip_id_str}")
+        return True
+
+    async def list_gallery(
+        self, trip_id: UUID, limit: int = 50, continuation_token: str | None = None
+    ) -> tuple[list[GalleryImage], str | None] | None:
+        """
+        List gallery images of a trip in upload order with keyset pagination.
+
+        Args:
+            trip_id: UUID of the trip
+            limit: Maximum number of images to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of images, continuation token for the next page or None),
+            or None if the trip doesn't exist
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        trip_id_str = str(trip_id)
+        if trip_id_str not in self._items:
+            return None
+
+        index = self._image_index.get(trip_id_str, [])
+        start = 0
+        if continuation_token:
+            after_uploaded_at, after_id = decode_continuation(continuation_token)
+            start = bisect.bisect_right(index, (datetime.fromisoformat(after_uploaded_at), after_id))
+
+        images = self._images.get(trip_id_str, {})
+        page = [images[image_id] for _, image_id in index[start : start + limit]]
+        next_token = (
+            encode_continuation(page[-1]["uploaded_at"], page[-1]["id"]) if start + limit < len(index) else None
+        )
+        return [GalleryImageDocument(**item).to_image() for item in page], next_token
+
+    async def get_gallery_image(self, trip_id: UUID, image_id: UUID) -> GalleryImage | None:
+        """
+        Retrieve one gallery image.
+
+        Args:
+            trip_id: UUID of the trip
+            image_id: UUID of the image
+
+        Returns:
+            GalleryImage if found, None otherwise
+        """
+        item = self._images.get(str(trip_id), {}).get(str(image_id))
+        return GalleryImageDocument(**item).to_image() if item is not None else None
+
+    async def add_gallery_image(self, trip_id: UUID, image: GalleryImage) -> Trip | None:
+        """
+        Add an image to the trip gallery.
+
+        Args:
+            trip_id: UUID of the trip
+            image: GalleryImage to add
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        return await self.add_gallery_images(trip_id, [image])
+
+    async def add_gallery_images(self, trip_id: UUID, images: list[GalleryImage]) -> Trip | None:
+        """
+        Add several images to the trip gallery in one update.
+
+        Args:
+            trip_id: UUID of the trip
+            images: GalleryImages to add, oldest first
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        trip_id_str = str(trip_id)
+        current = self._items.get(trip_id_str)
+        if current is None:
+            logger.debug(f"Trip not found for adding gallery images: {trip_id_str}")
+            return None
+        stored = self._images.setdefault(trip_id_str, {})
+        # Images already in the gallery (a repeated commit) are skipped
+        images = [image for image in images if str(image.image_id) not in stored]
+        if not images:
+            return TripDocument(**current).to_trip()
+
+        item = {**current, "gallery_count": current.get("gallery_count", 0) + len(images)}
+        if not item.get("cover_image"):
+            item["cover_image"] = images[0].model_dump(mode="json")
+        trip = self._replace(trip_id_str, item)
+
+        index = self._image_index.setdefault(trip_id_str, [])
+        for image in images:
+            image_item = GalleryImageDocument.from_image(trip_id_str, image).model_dump(mode="json")
+            stored[image_item["id"]] = image_item
+            bisect.insort(index, (image.uploaded_at, image_item["id"]))
+        logger.info(f"Added {len(images)} gallery images to trip: {trip_id_str}")
+        return trip
+
+    async def remove_gallery_image(self, trip_id: UUID, image_id: UUID) -> Trip | None:
+        """
+        Remove an image from the trip gallery.
+
+        Args:
+            trip_id: UUID of the trip
+            image_id: UUID of the image to remove
+
+        Returns:
+            Updated Trip if this call removed the image, None if the trip or image was not found
+        """
+        trip_id_str = str(trip_id)
+        image_id_str = str(image_id)
+        current = self._items.get(trip_id_str)
+        if current is None:
+            logger.debug(f"Trip not found for removing gallery image: {trip_id_str}")
+            return None
+
+        image_item = self._images.get(trip_id_str, {}).pop(image_id_str, None)
+        if image_item is None:
+            logger.debug(f"Gallery image {image_id_str} not found in trip: {trip_id_str}")
+            return None
+        index = self._image_index[trip_id_str]
+        _remove_key(index, (datetime.fromisoformat(image_item["uploaded_at"]), image_id_str))
+
+        item = {**current, "gallery_count": max(current.get("gallery_count", 0) - 1, 0)}
+        if (item.get("cover_image") or {}).get("image_id") == image_id_str:
+            # Next oldest image becomes the cover
+            item["cover_image"] = (
+                GalleryImageDocument(**self._images[trip_id_str][index[0][1]]).to_image().model_dump(mode="json")
+                if index
+                else None
+            )
+        trip = self._replace(trip_id_str, item)
+        logger.info(f"Removed gallery image {image_id_str} from trip: {trip_id_str}")
+        return trip
+
+    async def migrate_embedded_galleries(self) -> int:
+        """Nothing to migrate: in-memory data never has embedded galleries."""
+        return 0
+
+    async def read_changes(
+        self, continuation: str | None = None, max_items: int = 100
+    ) -> tuple[list[TripChange], str | None]:
+        """
+        Read the trip change feed: the latest version of each trip changed since the continuation.
+
+        Args:
+            continuation: Continuation returned by the previous call, or None to start from the beginning
+            max_items: Maximum number of changes to return
+
+        Returns:
+            Tuple of (changes in commit order, continuation to read on from)
+
+        Raises:
+            ValueError: If the continuation is invalid
+        """
+        after = parse_sequence(continuation)
+        start = bisect.bisect_right(self._change_log, after, key=lambda entry: entry[0])
+        changes: list[TripChange] = []
+        sequence = after
+        for sequence, trip_id_str in self._change_log[start:]:
+            latest, toy_id, deleted = self._changes[trip_id_str]
+            if latest != sequence:
+                continue  # Superseded; the trip appears again further on
+            trip = None if deleted else TripDocument(**self._items[trip_id_str]).to_trip()
+            changes.append(TripChange(trip_id_str, toy_id, trip))
+            if len(changes) == max_items:
+                break
+        return changes, str(sequence) if sequence > after else continuation
+
+    async def read_views(self, partition: str, view_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Read view documents by ID.
+
+        Args:
+            partition: View partition
+            view_ids: Document IDs
+
+        Returns:
+            Documents found, by ID, each with its version under VERSION_KEY
+        """
+        stored = self._views.get(partition, {})
+        return {view_id: json.loads(stored[view_id]) for view_id in view_ids if view_id in stored}
+
+    async def list_views(self, partition: str, prefix: str = "") -> list[dict[str, Any]]:
+        """
+        Read the view documents of a partition, ordered by ID.
+
+        Args:
+            partition: View partition
+            prefix: Only documents whose ID starts with this
+
+        Returns:
+            Documents, each with its version under VERSION_KEY
+        """
+        stored = self._views.get(partition, {})
+        ids = self._view_ids.get(partition, [])
+        docs = []
+        for view_id in ids[bisect.bisect_left(ids, prefix) :]:
+            if not view_id.startswith(prefix):
+                break
+            docs.append(json.loads(stored[view_id]))
+        return docs
+
+    async def write_views(
+        self, partition: str, writes: list[dict[str, Any]], deletes: list[dict[str, Any]] | None = None
+    ):
+        """
+        Create, replace and delete view documents of one partition atomically.
+
+        Args:
+            partition: View partition
+            writes: Documents to store; a VERSION_KEY of None creates the document
+            deletes: Documents to delete, as read
+
+        Raises:
+            ViewConflictError: If any document changed since it was read
+        """
+        deletes = deletes or []
+        stored = self._views.get(partition, {})
+        for doc in [*writes, *deletes]:
+            current = json.loads(stored[doc["id"]])[VERSION_KEY] if doc["id"] in stored else None
+            if current != doc.get(VERSION_KEY):
+                raise ViewConflictError(f"View document changed: {partition}/{doc['id']}")
+
+        stored = self._views.setdefault(partition, {})
+        ids = self._view_ids.setdefault(partition, [])
+        for doc in deletes:
+            del stored[doc["id"]]
+            ids.pop(bisect.bisect_left(ids, doc["id"]))
+        for doc in writes:
+            if doc["id"] not in stored:
+                bisect.insort(ids, doc["id"])
+            self._view_version += 1
+            stored[doc["id"]] = json.dumps({**doc, VERSION_KEY: self._view_version})
+        if not stored:
+            del self._views[partition], self._view_ids[partition]
+
+    async def clear_views(self, prefix: str) -> int:
+        """
+        Delete all view documents of the partitions starting with a prefix.
+
+        Args:
+            prefix: Partition prefix
+
+        Returns:
+            Number of deleted documents
+        """
+        partitions = [partition for partition in self._views if partition.startswith(prefix)]
+        for partition in partitions:
+            del self._view_ids[partition]
+        return sum(len(self._views.pop(partition)) for partition in partitions)
+
+    def _replace(self, trip_id_str: str, item: dict[str, Any]) -> Trip:
+        """Validate and store a modified copy of a trip document."""
+        item["updated_at"] = datetime.now(UTC).isoformat()
+        # Validate before storing so a bad update leaves the stored document untouched
+        trip = TripDocument(**item).to_trip()
+        if item.get("location") != self._items[trip_id_str].get("location"):
+            self._index_location(trip_id_str, item)
+        self._items[trip_id_str] = item
+        self._record_change(trip_id_str, item["toy_id"])
+        return trip
+
+    def _index_location(self, trip_id_str: str, item: dict[str, Any]):
+        """Point the spatial index at a trip's current coordinates."""
+        if item.get("location"):
+            longitude, latitude = item["location"]["coordinates"]
+            self._locations.insert(trip_id_str, (longitude, latitude, longitude, latitude))
+        else:
+            self._locations.delete(trip_id_str)
+
+    def _record_change(self, trip_id_str: str, toy_id: str, deleted: bool = False):
+        """Move a trip to the end of the change feed."""
+        self._change_sequence += 1
+        self._changes[trip_id_str] = (self._change_sequence, toy_id, deleted)
+        self._change_log.append((self._change_sequence, trip_id_str))
+        if len(self._change_log) > 2 * len(self._changes) + 1024:
+            self._change_log = [entry for entry in self._change_log if self._changes[entry[1]][0] == entry[0]]
+
+    async def close(self):
+        """Nothing to release; present for API parity with TripRepository."""
+        return None
+
+
+def _remove_key(index: list[tuple[datetime, str]], key: tuple[datetime, str]):
+    """Remove one key from a sorted index."""
+    position = bisect.bisect_left(index, key)
+    if position < len(index) and index[position] == key:
+        del index[position]
@@ -0,0 +1,49 @@
+"""Opaque continuation tokens for keyset pagination.
+
+Listings are ordered by (created_at DESC, id DESC). A token stores the sort
+key of the last item returned, so the next page starts right after it with an
+indexed range predicate instead of skipping rows (OFFSET) or re-reading
+earlier pages. The sort key format is backend specific; callers only pass the
+token back unchanged.
+"""
+import base64
+import binascii
+import json
+
+
+def encode_continuation(sort_key: str, item_id: str) -> str:
+    """
+    Build a continuation token from the last item of a page.
+
+    Args:
+        sort_key: created_at of the last item, in the backend's sortable format
+        item_id: id of the last item (tie breaker for equal timestamps)
+
+    Returns:
+        URL-safe opaque token
+    """
+    raw = json.dumps([sort_key, item_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_continuation(token: str) -> tuple[str, str]:
+    """
+    Decode a continuation token.
+
+    Args:
+        token: Token returned with a previous page
+
+    Returns:
+        Tuple of (sort_key, item_id)
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        sort_key, item_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise ValueError("Invalid continuation token") from e
+    if not isinstance(sort_key, str) or not isinstance(item_id, str):
+        raise ValueError("Invalid continuation token")
+    return sort_key, item_id
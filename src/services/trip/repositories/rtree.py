@@ -0,0 +1,185 @@
+"""In-memory R-tree for the spatial index of InMemoryTripRepository.
+
+A Guttman R-tree with quadratic splits over 2D boxes (points are boxes of zero
+size). Searching a box visits only the nodes whose bounds intersect it, so a
+nearby query reads the trips around the search circle instead of all trips.
+Deleting keeps nodes at least half full by dissolving underfull nodes and
+reinserting their points.
+"""
+from collections.abc import Hashable, Iterator
+
+from repositories.geo import Box
+
+
+def _area(box: Box) -> float:
+    return (box[2] - box[0]) * (box[3] - box[1])
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+
+class _Node:
+    """Tree node; entries are (box, key) in leaves and (box, child node) otherwise."""
+
+    __slots__ = ("leaf", "entries")
+
+    def __init__(self, leaf: bool, entries: list | None = None):
+        self.leaf = leaf
+        self.entries: list[tuple[Box, object]] = entries or []
+
+    def bounds(self) -> Box:
+        box = self.entries[0][0]
+        for entry_box, _ in self.entries[1:]:
+            box = _union(box, entry_box)
+        return box
+
+
+class RTree:
+    """Spatial index of keys by box."""
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Initialize an empty tree.
+
+        Args:
+            max_entries: Node capacity; nodes split beyond it and are dissolved below half of it
+        """
+        self.max_entries = max(max_entries, 4)
+        self.min_entries = self.max_entries // 2
+        self._root = _Node(leaf=True)
+        # key -> box, to find a key's leaf on delete
+        self._boxes: dict[Hashable, Box] = {}
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def insert(self, key: Hashable, box: Box):
+        """Index a key under a box, replacing its previous box."""
+        if key in self._boxes:
+            self.delete(key)
+        self._boxes[key] = box
+        self._insert(box, key)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; True if it was indexed."""
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return False
+        orphans: list[tuple[Box, Hashable]] = []
+        self._delete(self._root, box, key, orphans)
+        while not self._root.leaf and len(self._root.entries) == 1:
+            self._root = self._root.entries[0][1]
+        if not self._root.leaf and not self._root.entries:
+            self._root = _Node(leaf=True)
+        for orphan_box, orphan_key in orphans:
+            self._insert(orphan_box, orphan_key)
+        return True
+
+    def search(self, box: Box) -> Iterator[Hashable]:
+        """Keys whose boxes intersect a box."""
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for entry_box, item in node.entries:
+                if _intersects(entry_box, box):
+                    if node.leaf:
+                        yield item
+                    else:
+                        stack.append(item)
+
+    def _insert(self, box: Box, key: Hashable):
+        sibling = self._insert_into(self._root, box, key)
+        if sibling is not None:
+            old_root = self._root
+            self._root = _Node(leaf=False, entries=[(old_root.bounds(), old_root), (sibling.bounds(), sibling)])
+
+    def _insert_into(self, node: _Node, box: Box, key: Hashable) -> _Node | None:
+        """Insert below a node; returns the new sibling if the node split."""
+        if node.leaf:
+            node.entries.append((box, key))
+        else:
+            # Child whose bounds grow least (then the smallest child)
+            index = min(
+                range(len(node.entries)),
+                key=lambda i: (
+                    _area(_union(node.entries[i][0], box)) - _area(node.entries[i][0]),
+                    _area(node.entries[i][0]),
+                ),
+            )
+            child_box, child = node.entries[index]
+            sibling = self._insert_into(child, box, key)
+            node.entries[index] = (_union(child_box, box) if sibling is None else child.bounds(), child)
+            if sibling is not None:
+                node.entries.append((sibling.bounds(), sibling))
+        if len(node.entries) > self.max_entries:
+            return self._split(node)
+        return None
+
+    def _split(self, node: _Node) -> _Node:
+        """Quadratic split: keep one group in the node and return the other as a new sibling."""
+        entries = node.entries
+        # Seeds: the pair that would waste the most area together
+        _, first, second = max(
+            (_area(_union(entries[i][0], entries[j][0])) - _area(entries[i][0]) - _area(entries[j][0]), i, j)
+            for i in range(len(entries))
+            for j in range(i + 1, len(entries))
+        )
+        groups = [[entries[first]], [entries[second]]]
+        bounds = [entries[first][0], entries[second][0]]
+        remaining = [entry for i, entry in enumerate(entries) if i not in (first, second)]
+        while remaining:
+            # A group that needs all remaining entries to reach the minimum takes them
+            for g in (0, 1):
+                if len(groups[g]) + len(remaining) <= self.min_entries:
+                    groups[g].extend(remaining)
+                    remaining = []
+            if not remaining:
+                break
+            # Next: the entry with the strongest preference for one group
+            growth = [[_area(_union(bound, entry[0])) - _area(bound) for bound in bounds] for entry in remaining]
+            index = max(range(len(remaining)), key=lambda i: abs(growth[i][0] - growth[i][1]))
+            entry = remaining.pop(index)
+            # Join the group that grows least (then the smaller, then the one with fewer entries)
+            g = min((0, 1), key=lambda g: (growth[index][g], _area(bounds[g]), len(groups[g])))
+            groups[g].append(entry)
+            bounds[g] = _union(bounds[g], entry[0])
+        node.entries = groups[0]
+        return _Node(leaf=node.leaf, entries=groups[1])
+
+    def _delete(self, node: _Node, box: Box, key: Hashable, orphans: list) -> bool:
+        """Remove a key below a node, collecting the points of dissolved nodes; True if found."""
+        if node.leaf:
+            for index, (_, item) in enumerate(node.entries):
+                if item == key:
+                    del node.entries[index]
+                    return True
+            return False
+        for index, (child_box, child) in enumerate(node.entries):
+            if _contains(child_box, box) and self._delete(child, box, key, orphans):
+                if len(child.entries) < self.min_entries:
+                    del node.entries[index]
+                    orphans.extend(self._points(child))
+                else:
+                    node.entries[index] = (child.bounds(), child)
+                return True
+        return False
+
+    @staticmethod
+    def _points(node: _Node) -> Iterator[tuple[Box, Hashable]]:
+        """All leaf entries below a node."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.leaf:
+                yield from current.entries
+            else:
+                stack.extend(child for _, child in current.entries)
@@ -0,0 +1,856 @@
+"""SQLite trip repository for single-node deployments.
+
+Documents are stored as JSON text (validated with JSON1) next to plain columns
+for the fields that are filtered or sorted on, so those get real B-tree
+indexes. Gallery images are rows of their own (as they are items of their own
+in Cosmos DB); the trip document keeps only gallery_count and cover_image.
+The database runs in WAL mode: one writer connection serializes all
+writes while a small pool of read connections serves reads concurrently. All
+SQLite calls run in worker threads so the event loop never blocks on disk I/O.
+"""
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+from uuid import UUID, uuid4
+
+from models import GalleryImage, GalleryImageDocument, Trip, TripDocument
+from repositories.errors import TripExistsError
+from repositories.geo import distance_km, search_boxes
+from repositories.pagination import decode_continuation, encode_continuation
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError, parse_sequence
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trips (
+    id TEXT PRIMARY KEY,
+    toy_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    doc TEXT NOT NULL CHECK (json_valid(doc))
+);
+CREATE INDEX IF NOT EXISTS idx_trips_created_at ON trips (created_at DESC, id DESC);
+-- Serves list_by_toy: equality on toy_id, then keyset order (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_trips_toy_created_at ON trips (toy_id, created_at DESC, id DESC);
+-- Serve list_trips filters; queries must use the exact same json_extract expressions
+CREATE INDEX IF NOT EXISTS idx_trips_country_created_at
+    ON trips (json_extract(doc, '$.country_code'), created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trips_status_created_at
+    ON trips (json_extract(doc, '$.status'), created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_trips_tracking_created_at
+    ON trips (json_extract(doc, '$.public_tracking_enabled'), created_at DESC, id DESC);
+CREATE TABLE IF NOT EXISTS gallery_images (
+    image_id TEXT PRIMARY KEY,
+    trip_id TEXT NOT NULL REFERENCES trips (id) ON DELETE CASCADE,
+    uploaded_at TEXT NOT NULL,
+    doc TEXT NOT NULL CHECK (json_valid(doc))
+);
+-- Serves list_gallery: equality on trip_id, then keyset order (uploaded_at, image_id)
+CREATE INDEX IF NOT EXISTS idx_gallery_images_trip_uploaded_at ON gallery_images (trip_id, uploaded_at, image_id);
+-- Image ID index of earlier versions, superseded by gallery_images
+DROP TABLE IF EXISTS trip_gallery;
+-- Change feed (read_changes): one row per trip, re-inserted with a new seq on every change; a deleted
+-- trip keeps its row without a trips row
+CREATE TABLE IF NOT EXISTS trip_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    trip_id TEXT NOT NULL UNIQUE,
+    toy_id TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trip_changes_insert AFTER INSERT ON trips BEGIN
+    INSERT OR REPLACE INTO trip_changes (trip_id, toy_id) VALUES (new.id, new.toy_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trip_changes_update AFTER UPDATE ON trips BEGIN
+    INSERT OR REPLACE INTO trip_changes (trip_id, toy_id) VALUES (new.id, new.toy_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trip_changes_delete AFTER DELETE ON trips BEGIN
+    INSERT OR REPLACE INTO trip_changes (trip_id, toy_id) VALUES (old.id, old.toy_id);
+END;
+-- Trips written before the change feed existed
+INSERT OR IGNORE INTO trip_changes (trip_id, toy_id) SELECT id, toy_id FROM trips;
+-- Spatial index of trip coordinates (list_nearby). R-tree IDs must be integers, and the rowid of trips
+-- may change on VACUUM, so each located trip gets a stable integer key
+CREATE TABLE IF NOT EXISTS trip_location_keys (
+    key INTEGER PRIMARY KEY,
+    trip_id TEXT NOT NULL UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS trip_locations USING rtree (key, min_lon, max_lon, min_lat, max_lat);
+CREATE TRIGGER IF NOT EXISTS trip_locations_insert AFTER INSERT ON trips
+WHEN json_extract(new.doc, '$.location') IS NOT NULL BEGIN
+    INSERT OR IGNORE INTO trip_location_keys (trip_id) VALUES (new.id);
+    INSERT INTO trip_locations
+    SELECT key, json_extract(new.doc, '$.location.coordinates[0]'), json_extract(new.doc, '$.location.coordinates[0]'),
+        json_extract(new.doc, '$.location.coordinates[1]'), json_extract(new.doc, '$.location.coordinates[1]')
+    FROM trip_location_keys WHERE trip_id = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trip_locations_update AFTER UPDATE ON trips
+WHEN json_extract(old.doc, '$.location') IS NOT json_extract(new.doc, '$.location') BEGIN
+    DELETE FROM trip_locations WHERE key = (SELECT key FROM trip_location_keys WHERE trip_id = new.id);
+    INSERT OR IGNORE INTO trip_location_keys (trip_id) VALUES (new.id);
+    INSERT INTO trip_locations
+    SELECT key, json_extract(new.doc, '$.location.coordinates[0]'), json_extract(new.doc, '$.location.coordinates[0]'),
+        json_extract(new.doc, '$.location.coordinates[1]'), json_extract(new.doc, '$.location.coordinates[1]')
+    FROM trip_location_keys WHERE trip_id = new.id AND json_extract(new.doc, '$.location') IS NOT NULL;
+END;
+CREATE TRIGGER IF NOT EXISTS trip_locations_delete AFTER DELETE ON trips BEGIN
+    DELETE FROM trip_locations WHERE key = (SELECT key FROM trip_location_keys WHERE trip_id = old.id);
+    DELETE FROM trip_location_keys WHERE trip_id = old.id;
+END;
+-- Materialized view documents (read models maintained from the change feed)
+CREATE TABLE IF NOT EXISTS views (
+    partition TEXT NOT NULL,
+    id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    doc TEXT NOT NULL CHECK (json_valid(doc)),
+    PRIMARY KEY (partition, id)
+);
+"""
+
+
+def sort_key(value: datetime) -> str:
+    """Fixed-width UTC timestamp that sorts lexicographically in time order."""
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class SqliteConnectionPool:
+    """One writer connection plus a pool of read connections, each used from worker threads."""
+
+    def __init__(self, path: str, read_connections: int = 4):
+        """
+        Initialize the pool (connections are opened lazily by open()).
+
+        Args:
+            path: Database file path (parent directories are created)
+            read_connections: Number of concurrent read connections
+        """
+        self.path = path
+        self.read_connections = max(read_connections, 1)
+        # A single worker thread owns the writer, so writes are serialized without locks
+        self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._reader_executor = ThreadPoolExecutor(max_workers=self.read_connections, thread_name_prefix="sqlite-reader")
+        self._writer: sqlite3.Connection | None = None
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA busy_timeout = 5000")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA synchronous = NORMAL")  # Durable with WAL apart from the last commits on power loss
+        return connection
+
+    def _open_sync(self, schema: str):
+        if self._writer is not None:
+            return  # Opened by a concurrent caller queued on the writer thread first
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._writer.executescript(schema)
+        for _ in range(self.read_connections):
+            reader = self._connect()
+            reader.execute("PRAGMA query_only = ON")
+            self._readers.put(reader)
+
+    async def open(self, schema: str):
+        """Open all connections and apply the schema."""
+        if self._writer is None:
+            await asyncio.get_running_loop().run_in_executor(self._writer_executor, self._open_sync, schema)
+            logger.info(f"Opened SQLite database '{self.path}' (WAL, {self.read_connections} readers)")
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn with a read connection in a reader thread."""
+
+        def run() -> T:
+            connection = self._readers.get()
+            try:
+                return fn(connection)
+            finally:
+                self._readers.put(connection)
+
+        return await asyncio.get_running_loop().run_in_executor(self._reader_executor, run)
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn inside a write transaction on the writer thread."""
+
+        def run() -> T:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._writer)
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+            return result
+
+        return await asyncio.get_running_loop().run_in_executor(self._writer_executor, run)
+
+    def _close_sync(self):
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def close(self):
+        """Close all connections and stop the worker threads."""
+        if self._writer is not None:
+            await asyncio.get_running_loop().run_in_executor(self._writer_executor, self._close_sync)
+        self._writer_executor.shutdown(wait=False)
+        self._reader_executor.shutdown(wait=False)
+
+
+class SqliteTripRepository:
+    """Trip repository persisted in a local SQLite database."""
+
+    def __init__(self, path: str, read_connections: int = 4):
+        """
+        Initialize the SQLite trip repository.
+
+        Args:
+            path: Database file path
+            read_connections: Number of concurrent read connections
+        """
+        self.pool = SqliteConnectionPool(path, read_connections)
+        self._migrated = False
+
+    async def _ensure_initialized(self) -> SqliteConnectionPool:
+        await self.pool.open(SCHEMA)
+        if not self._migrated:
+            self._migrated = True
+            await self.migrate_embedded_galleries()
+        return self.pool
+
+    async def warm_up(self):
+        """Open the database and apply the schema ahead of the first request."""
+        await self._ensure_initialized()
+
+    async def create(self, trip: Trip) -> Trip:
+        """
+        Create a new trip.
+
+        Args:
+            trip: Trip instance to create
+
+        Returns:
+            Created Trip
+
+        Raises:
+            TripExistsError: If a trip with the same ID already exists
+        """
+        pool = await self._ensure_initialized()
+        item = TripDocument.from_trip(trip).model_dump(by_alias=False, mode="json")
+        item["id"] = str(trip.id)
+        item["trip_id"] = str(trip.id)
+
+        def insert(connection: sqlite3.Connection):
+            connection.execute(
+                "INSERT INTO trips (id, toy_id, created_at, doc) VALUES (?, ?, ?, ?)",
+                (item["id"], item["toy_id"], sort_key(trip.created_at), json.dumps(item)),
+            )
+
+        try:
+            await pool.write(insert)
+        except sqlite3.IntegrityError:
+            raise TripExistsError(f"Trip already exists: {item['id']}")
+        logger.info(f"Created trip: {item['id']} for toy {trip.toy_id}")
+
+        return TripDocument(**item).to_trip()
+
+    async def get_by_id(self, trip_id: UUID) -> Trip | None:
+        """
+        Retrieve a trip by ID.
+
+        Args:
+            trip_id: UUID of the trip
+
+        Returns:
+            Trip if found, None otherwise
+        """
+        pool = await self._ensure_initialized()
+        row = await pool.read(
+            lambda connection: connection.execute("SELECT doc FROM trips WHERE id = ?", (str(trip_id),)).fetchone()
+        )
+        if row is None:
+            logger.debug(f"Trip not found: {trip_id}")
+            return None
+        return TripDocument(**json.loads(row[0])).to_trip()
+
+    async def list_by_toy(
+        self, toy_id: UUID, limit: int = 20, continuation_token: str | None = None
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips for a specific toy, newest first, with keyset pagination.
+
+        Args:
+            toy_id: UUID of the toy
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        toy_id_str = str(toy_id)
+        trips, next_token = await self._query_page("toy_id = ?", [toy_id_str], limit, continuation_token)
+        logger.debug(f"Listed {len(trips)} trips for toy {toy_id_str} (more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def count_by_toy(self, toy_id: UUID) -> int:
+        """
+        Count trips of a toy.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Number of trips
+        """
+        pool = await self._ensure_initialized()
+        return await pool.read(
+            lambda connection: connection.execute(
+                "SELECT COUNT(*) FROM trips WHERE toy_id = ?", (str(toy_id),)
+            ).fetchone()[0]
+        )
+
+    async def list_trips(
+        self,
+        limit: int = 20,
+        continuation_token: str | None = None,
+        country_code: str | None = None,
+        status: str | None = None,
+        public_tracking_enabled: bool | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips across all toys, newest first, with keyset pagination.
+
+        Args:
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+            country_code: Only trips in this country
+            status: Only trips with this status
+            public_tracking_enabled: Only trips with this tracking setting
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        conditions = []
+        parameters: list[Any] = []
+        if country_code is not None:
+            conditions.append("json_extract(doc, '$.country_code') = ?")
+            parameters.append(country_code)
+        if status is not None:
+            conditions.append("json_extract(doc, '$.status') = ?")
+            parameters.append(status)
+        if public_tracking_enabled is not None:
+            conditions.append("json_extract(doc, '$.public_tracking_enabled') = ?")
+            parameters.append(int(public_tracking_enabled))  # JSON booleans extract as 0/1
+
+        trips, next_token = await self._query_page(" AND ".join(conditions), parameters, limit, continuation_token)
+        logger.debug(f"Listed {len(trips)} trips (more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def list_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20,
+        continuation_token: str | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips within a radius of a point, newest first, with keyset pagination.
+
+        Candidates come from the trip_locations R-tree by the box around the
+        circle and are filtered by great-circle distance; only the returned
+        page of documents is loaded.
+
+        Args:
+            latitude: Latitude of the centre in degrees
+            longitude: Longitude of the centre in degrees
+            radius_km: Search radius in kilometres
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        pool = await self._ensure_initialized()
+        after: tuple[str, str] | None = decode_continuation(continuation_token) if continuation_token else None
+
+        def read_page(connection: sqlite3.Connection) -> list[tuple[str, str, str]]:
+            keys = set()
+            for min_lon, min_lat, max_lon, max_lat in search_boxes(latitude, longitude, radius_km):
+                sql = (
+                    "SELECT t.created_at, t.id, json_extract(t.doc, '$.location.coordinates[1]'), "
+                    "json_extract(t.doc, '$.location.coordinates[0]') FROM trip_locations r "
+                    "JOIN trip_location_keys k ON k.key = r.key JOIN trips t ON t.id = k.trip_id "
+                    "WHERE r.max_lon >= ? AND r.min_lon <= ? AND r.max_lat >= ? AND r.min_lat <= ?"
+                )
+                parameters: tuple = (min_lon, max_lon, min_lat, max_lat)
+                if after is not None:
+                    sql += " AND (t.created_at, t.id) < (?, ?)"
+                    parameters += after
+                for created_at, trip_id_str, point_latitude, point_longitude in connection.execute(sql, parameters):
+                    if distance_km(latitude, longitude, point_latitude, point_longitude) <= radius_km:
+                        keys.add((created_at, trip_id_str))
+            page = sorted(keys, reverse=True)[: limit + 1]
+            docs = dict(
+                connection.execute(
+                    f"SELECT id, doc FROM trips WHERE id IN ({', '.join('?' * len(page))})", [key[1] for key in page]
+                ).fetchall()
+            )
+            return [(created_at, trip_id_str, docs[trip_id_str]) for created_at, trip_id_str in page]
+
+        rows = await pool.read(read_page)
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_continuation(rows[-1][0], rows[-1][1])
+
+        trips = [TripDocument(**json.loads(doc)).to_trip() for _, _, doc in rows]
+        logger.debug(f"Listed {len(trips)} trips within {radius_km} km (more: {next_token is not None})")
+        return trips, next_token
+
+    async def _query_page(
+        self, condition: str, parameters: list[Any], limit: int, continuation_token: str | None
+    ) -> tuple[list[Trip], str | None]:
+        """Run one keyset page query ordered by (created_at DESC, id DESC), reading at most limit + 1 rows."""
+        pool = await self._ensure_initialized()
+        conditions = [condition] if condition else []
+        parameters = list(parameters)
+        if continuation_token:
+            after_created_at, after_id = decode_continuation(continuation_token)
+            conditions.append("(created_at, id) < (?, ?)")
+            parameters += [after_created_at, after_id]
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        sql = f"SELECT created_at, id, doc FROM trips {where}ORDER BY created_at DESC, id DESC LIMIT ?"
+        rows = await pool.read(lambda connection: connection.execute(sql, (*parameters, limit + 1)).fetchall())
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_continuation(rows[-1][0], rows[-1][1])
+
+        return [TripDocument(**json.loads(doc)).to_trip() for _, _, doc in rows], next_token
+
+    async def update(self, trip_id: UUID, updates: dict[str, Any]) -> Trip | None:
+        """
+        Update a trip with partial data.
+
+        Args:
+            trip_id: UUID of the trip to update
+            updates: Dictionary of fields to update
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        # Values must be JSON-serializable (enums/UUIDs are converted like in a Cosmos replace)
+        changes = json.loads(json.dumps(updates, default=str))
+
+        def apply(item: dict[str, Any], connection: sqlite3.Connection):
+            for key, value in changes.items():
+                # Immutable fields; gallery fields are maintained by the gallery methods
+                if key not in {"id", "trip_id", "toy_id", "created_at", "gallery_count", "cover_image"}:
+                    item[key] = value
+
+        trip = await self._modify(trip_id, apply)
+        if trip is None:
+            logger.debug(f"Trip not found for update: {trip_id}")
+            return None
+        logger.info(f"Updated trip: {trip_id}")
+        return trip
+
+    async def delete(self, trip_id: UUID) -> bool:
+        """
+        Delete a trip (gallery image rows are removed by cascade).
+
+        Args:
+            trip_id: UUID of the trip to delete
+
+        Returns:
+            True if deleted, False if not found
+        """
+        pool = await self._ensure_initialized()
+        trip_id_str = str(trip_id)
+        deleted = await pool.write(
+            lambda connection: connection.execute("DELETE FROM trips WHERE id = ?", (trip_id_str,)).rowcount
+        )
+        if not deleted:
+            logger.debug(f"Trip not found for deletion: {trip_id_str}")
+            return False
+        logger.info(f"Deleted trip: {trip_id_str}")
+        return True
+
+    async def list_gallery(
+        self, trip_id: UUID, limit: int = 50, continuation_token: str | None = None
+    ) -> tuple[list[GalleryImage], str | None] | None:
+        """
+        List gallery images of a trip in upload order with keyset pagination.
+
+        Args:
+            trip_id: UUID of the trip
+            limit: Maximum number of images to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of images, continuation token for the next page or None),
+            or None if the trip doesn't exist
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        pool = await self._ensure_initialized()
+        trip_id_str = str(trip_id)
+        after = decode_continuation(continuation_token) if continuation_token else ("", "")
+
+        def query(connection: sqlite3.Connection) -> list[tuple[str, str, str]] | None:
+            if connection.execute("SELECT 1 FROM trips WHERE id = ?", (trip_id_str,)).fetchone() is None:
+                return None
+            return connection.execute(
+                "SELECT uploaded_at, image_id, doc FROM gallery_images "
+                "WHERE trip_id = ? AND (uploaded_at, image_id) > (?, ?) ORDER BY uploaded_at, image_id LIMIT ?",
+                (trip_id_str, *after, limit + 1),
+            ).fetchall()
+
+        rows = await pool.read(query)
+        if rows is None:
+            return None
+
+        next_token = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_token = encode_continuation(rows[-1][0], rows[-1][1])
+        return [GalleryImageDocument(**json.loads(doc)).to_image() for _, _, doc in rows], next_token
+
+    async def get_gallery_image(self, trip_id: UUID, image_id: UUID) -> GalleryImage | None:
+        """
+        Retrieve one gallery image by primary key.
+
+        Args:
+            trip_id: UUID of the trip
+            image_id: UUID of the image
+
+        Returns:
+            GalleryImage if found, None otherwise
+        """
+        pool = await self._ensure_initialized()
+        row = await pool.read(
+            lambda connection: connection.execute(
+                "SELECT doc FROM gallery_images WHERE image_id = ? AND trip_id = ?", (str(image_id), str(trip_id))
+            ).fetchone()
+        )
+        return GalleryImageDocument(**json.loads(row[0])).to_image() if row is not None else None
+
+    async def add_gallery_image(self, trip_id: UUID, image: GalleryImage) -> Trip | None:
+        """
+        Add an image to the trip gallery.
+
+        Args:
+            trip_id: UUID of the trip
+            image: GalleryImage to add
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        return await self.add_gallery_images(trip_id, [image])
+
+    async def add_gallery_images(self, trip_id: UUID, images: list[GalleryImage]) -> Trip | None:
+        """
+        Add several images to the trip gallery in one write transaction.
+
+        Args:
+            trip_id: UUID of the trip
+            images: GalleryImages to add, oldest first
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+
+        added: list[GalleryImage] = []
+
+        def apply(item: dict[str, Any], connection: sqlite3.Connection) -> bool:
+            added.clear()
+            for image in images:
+                # Images already in the gallery (a repeated commit) are skipped
+                inserted = connection.execute(
+                    "INSERT OR IGNORE INTO gallery_images (image_id, trip_id, uploaded_at, doc) VALUES (?, ?, ?, ?)",
+                    (
+                        str(image.image_id),
+                        item["id"],
+                        sort_key(image.uploaded_at),
+                        json.dumps(GalleryImageDocument.from_image(item["id"], image).model_dump(mode="json")),
+                    ),
+                ).rowcount
+                if inserted:
+                    added.append(image)
+            if not added:
+                return False
+            item["gallery_count"] = item.get("gallery_count", 0) + len(added)
+            if not item.get("cover_image"):
+                item["cover_image"] = added[0].model_dump(mode="json")
+            return True
+
+        trip = await self._modify(trip_id, apply)
+        if trip is None:
+            logger.debug(f"Trip not found for adding gallery images: {trip_id}")
+            return None
+        logger.info(f"Added {len(added)} gallery images to trip: {trip_id}")
+        return trip
+
+    async def remove_gallery_image(self, trip_id: UUID, image_id: UUID) -> Trip | None:
+        """
+        Remove an image from the trip gallery.
+
+        Args:
+            trip_id: UUID of the trip
+            image_id: UUID of the image to remove
+
+        Returns:
+            Updated Trip if this call removed the image, None if the trip or image was not found
+        """
+        image_id_str = str(image_id)
+        removed = False
+
+        def apply(item: dict[str, Any], connection: sqlite3.Connection) -> bool:
+            nonlocal removed
+            removed = bool(
+                connection.execute(
+                    "DELETE FROM gallery_images WHERE image_id = ? AND trip_id = ?", (image_id_str, item["id"])
+                ).rowcount
+            )
+            if not removed:
+                return False
+            item["gallery_count"] = max(item.get("gallery_count", 0) - 1, 0)
+            if (item.get("cover_image") or {}).get("image_id") == image_id_str:
+                # Next oldest image becomes the cover
+                row = connection.execute(
+                    "SELECT doc FROM gallery_images WHERE trip_id = ? ORDER BY uploaded_at, image_id LIMIT 1",
+                    (item["id"],),
+                ).fetchone()
+                item["cover_image"] = (
+                    GalleryImageDocument(**json.loads(row[0])).to_image().model_dump(mode="json") if row else None
+                )
+            return True
+
+        trip = await self._modify(trip_id, apply)
+        if trip is None:
+            logger.debug(f"Trip not found for removing gallery image: {trip_id}")
+            return None
+        if not removed:
+            logger.debug(f"Gallery image {image_id_str} not found in trip: {trip_id}")
+            return None
+        logger.info(f"Removed gallery image {image_id_str} from trip: {trip_id}")
+        return trip
+
+    async def migrate_embedded_galleries(self) -> int:
+        """
+        Move galleries embedded in trip documents (earlier schema) into gallery_images rows.
+
+        Runs once when the database is opened.
+
+        Returns:
+            Number of migrated trips
+        """
+
+        def migrate(connection: sqlite3.Connection) -> int:
+            rows = connection.execute(
+                "SELECT id, doc FROM trips WHERE json_type(doc, '$.gallery') IS NOT NULL"
+            ).fetchall()
+            for trip_id_str, doc in rows:
+                item = json.loads(doc)
+                gallery = item.pop("gallery") or []
+                for image in gallery:
+                    image_model = GalleryImage(**image)
+                    image_item = GalleryImageDocument.from_image(trip_id_str, image_model).model_dump(mode="json")
+                    connection.execute(
+                        "INSERT OR REPLACE INTO gallery_images (image_id, trip_id, uploaded_at, doc) VALUES (?, ?, ?, ?)",
+                        (image_item["id"], trip_id_str, sort_key(image_model.uploaded_at), json.dumps(image_item)),
+                    )
+                item["gallery_count"] = len(gallery)
+                item["cover_image"] = gallery[0] if gallery else None
+                connection.execute("UPDATE trips SET doc = ? WHERE id = ?", (json.dumps(item), trip_id_str))
+            return len(rows)
+
+        await self.pool.open(SCHEMA)
+        migrated = await self.pool.write(migrate)
+        if migrated:
+            logger.info(f"Migrated embedded galleries of {migrated} trips")
+        return migrated
+
+    async def read_changes(
+        self, continuation: str | None = None, max_items: int = 100
+    ) -> tuple[list[TripChange], str | None]:
+        """
+        Read the trip change feed: the latest version of each trip changed since the continuation.
+
+        Args:
+            continuation: Continuation returned by the previous call, or None to start from the beginning
+            max_items: Maximum number of changes to return
+
+        Returns:
+            Tuple of (changes in commit order, continuation to read on from)
+
+        Raises:
+            ValueError: If the continuation is invalid
+        """
+        after = parse_sequence(continuation)
+        pool = await self._ensure_initialized()
+        rows = await pool.read(
+            lambda connection: connection.execute(
+                "SELECT c.seq, c.trip_id, c.toy_id, t.doc FROM trip_changes c LEFT JOIN trips t ON t.id = c.trip_id "
+                "WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+                (after, max_items),
+            ).fetchall()
+        )
+        changes = [
+            TripChange(trip_id_str, toy_id, TripDocument(**json.loads(doc)).to_trip() if doc is not None else None)
+            for _, trip_id_str, toy_id, doc in rows
+        ]
+        return changes, str(rows[-1][0]) if rows else continuation
+
+    async def read_views(self, partition: str, view_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Read view documents by ID.
+
+        Args:
+            partition: View partition
+            view_ids: Document IDs
+
+        Returns:
+            Documents found, by ID, each with its version under VERSION_KEY
+        """
+        pool = await self._ensure_initialized()
+        placeholders = ", ".join("?" * len(view_ids))
+        rows = await pool.read(
+            lambda connection: connection.execute(
+                f"SELECT version, doc FROM views WHERE partition = ? AND id IN ({placeholders})",
+                (partition, *view_ids),
+            ).fetchall()
+        )
+        docs = [{**json.loads(doc), VERSION_KEY: version} for version, doc in rows]
+        return {doc["id"]: doc for doc in docs}
+
+    async def list_views(self, partition: str, prefix: str = "") -> list[dict[str, Any]]:
+        """
+        Read the view documents of a partition, ordered by ID.
+
+        The prefix is a primary key range, so the read is proportional to the
+        documents returned rather than to the partition.
+
+        Args:
+            partition: View partition
+            prefix: Only documents whose ID starts with this
+
+        Returns:
+            Documents, each with its version under VERSION_KEY
+        """
+        pool = await self._ensure_initialized()
+        query = "SELECT version, doc FROM views WHERE partition = ?"
+        parameters: tuple = (partition,)
+        if prefix:
+            # Smallest string greater than every string starting with the prefix
+            query += " AND id >= ? AND id < ?"
+            parameters += (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+        rows = await pool.read(lambda connection: connection.execute(f"{query} ORDER BY id", parameters).fetchall())
+        return [{**json.loads(doc), VERSION_KEY: version} for version, doc in rows]
+
+    async def write_views(
+        self, partition: str, writes: list[dict[str, Any]], deletes: list[dict[str, Any]] | None = None
+    ):
+        """
+        Create, replace and delete view documents of one partition in one transaction.
+
+        Args:
+            partition: View partition
+            writes: Documents to store; a VERSION_KEY of None creates the document
+            deletes: Documents to delete, as read
+
+        Raises:
+            ViewConflictError: If any document changed since it was read
+        """
+        pool = await self._ensure_initialized()
+        deletes = deletes or []
+
+        def apply(connection: sqlite3.Connection):
+            for doc in [*writes, *deletes]:
+                row = connection.execute(
+                    "SELECT version FROM views WHERE partition = ? AND id = ?", (partition, doc["id"])
+                ).fetchone()
+                if (row[0] if row else None) != doc.get(VERSION_KEY):
+                    raise ViewConflictError(f"View document changed: {partition}/{doc['id']}")
+            connection.executemany(
+                "DELETE FROM views WHERE partition = ? AND id = ?", [(partition, doc["id"]) for doc in deletes]
+            )
+            # Random versions: a document deleted and created again never matches an old version
+            connection.executemany(
+                "INSERT OR REPLACE INTO views (partition, id, version, doc) VALUES (?, ?, ?, ?)",
+                [
+                    (partition, doc["id"], uuid4().hex, json.dumps({k: v for k, v in doc.items() if k != VERSION_KEY}))
+                    for doc in writes
+                ],
+            )
+
+        await pool.write(apply)
+
+    async def clear_views(self, prefix: str) -> int:
+        """
+        Delete all view documents of the partitions starting with a prefix.
+
+        Args:
+            prefix: Partition prefix
+
+        Returns:
+            Number of deleted documents
+        """
+        pool = await self._ensure_initialized()
+        return await pool.write(
+            lambda connection: connection.execute(
+                "DELETE FROM views WHERE substr(partition, 1, ?) = ?", (len(prefix), prefix)
+            ).rowcount
+        )
+
+    async def _modify(
+        self, trip_id: UUID, apply: Callable[[dict[str, Any], sqlite3.Connection], bool | None]
+    ) -> Trip | None:
+        """
+        Read, modify and write back a trip document in one write transaction.
+
+        apply() may return False to leave the trip unchanged (it is still returned).
+        """
+        pool = await self._ensure_initialized()
+        trip_id_str = str(trip_id)
+
+        def read_modify_write(connection: sqlite3.Connection) -> dict[str, Any] | None:
+            row = connection.execute("SELECT doc FROM trips WHERE id = ?", (trip_id_str,)).fetchone()
+            if row is None:
+                return None
+            item = json.loads(row[0])
+            if apply(item, connection) is False:
+                return item
+            item["updated_at"] = datetime.now(UTC).isoformat()
+            connection.execute("UPDATE trips SET doc = ? WHERE id = ?", (json.dumps(item), trip_id_str))
+            return item
+
+        item = await pool.write(read_modify_write)
+        return TripDocument(**item).to_trip() if item is not None else None
+
+    async def close(self):
+        """Close the database connections."""
+        await self.pool.close()
+        logger.info("SQLite database closed")
@@ -4,23 +4,54 @@ This module uses the async Azure Cosmos SDK (azure.cosmos.aio) which is designed
 for use with async frameworks like FastAPI. The async SDK provides native async/await
 support without blocking the event loop.
 """
+import asyncio
 import logging
+from datetime import UTC, datetime
+from enum import Enum
 from typing import Any
 from uuid import UUID
 
+from azure.core import MatchConditions
 from azure.cosmos.aio import ContainerProxy, CosmosClient, DatabaseProxy
 from azure.cosmos import PartitionKey, exceptions
-from azure.identity.aio import DefaultAzureCredential
 
-from models import Trip, TripDocument, GalleryImage
+from models import GalleryImage, GalleryImageDocument, Trip, TripDocument
+from repositories.errors import TripExistsError
+from repositories.indexing_policy import (
+    LIST_FILTER_FIELDS,
+    TRIP_INDEXING_POLICY,
+    merged_policy,
+    missing_composite_indexes,
+    missing_spatial_indexes,
+)
+from repositories.pagination import decode_continuation, encode_continuation
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError
+from services.credentials import get_shared_credential
+from services.http_pool import HttpConnectionPool
 
 logger = logging.getLogger(__name__)
 
+GALLERY_DOC_TYPE = "gallery_image"
+# Written in the trip's partition when it is deleted, so the change feed (which has no deletes) reports it
+TOMBSTONE_DOC_TYPE = "tombstone"
+TOMBSTONE_ID = "tombstone"
+# Tombstones expire when the container has TTL enabled; feed consumers must not lag behind longer
+TOMBSTONE_TTL_SECONDS = 7 * 24 * 3600
+VIEW_DOC_TYPE = "view"
+# Cosmos DB transactional batches hold at most 100 operations
+MAX_BATCH_OPERATIONS = 100
+
+
+def _list_filters(country_code: str | None, status: str | None, public_tracking_enabled: bool | None) -> dict[str, Any]:
+    """Equality filters of a trip listing that were actually given."""
+    values = {"country_code": country_code, "status": status, "public_tracking_enabled": public_tracking_enabled}
+    return {field: value for field, value in values.items() if value is not None}
+
 
 class TripRepository:
     """Repository for trip CRUD operations in Cosmos DB."""
 
-    def __init__(self, cosmos_endpoint: str, database_name: str, container_name: str, credential: Any = None, disable_ssl_verify: bool = False):
+    def __init__(self, cosmos_endpoint: str, database_name: str, container_name: str, credential: Any = None, disable_ssl_verify: bool = False, http_pool: HttpConnectionPool | None = None):
         """
         Initialize the trip repository.
 
@@ -30,15 +61,19 @@ class TripRepository:
             container_name: Name of the container (collection)
             credential: Optional credential (key or TokenCredential)
             disable_ssl_verify: Whether to disable SSL certificate verification
+            http_pool: Optional connection pool providing the HTTP transport
         """
         self.cosmos_endpoint = cosmos_endpoint
         self.database_name = database_name
         self.container_name = container_name
         self.credential = credential
         self.disable_ssl_verify = disable_ssl_verify
+        self.http_pool = http_pool
         self._client: CosmosClient | None = None
         self._database: DatabaseProxy | None = None
         self._container: ContainerProxy | None = None
+        # Set once a migration sweep found no embedded galleries left; image misses then skip the trip read
+        self._embedded_galleries_migrated = False
 
     async def _ensure_initialized(self) -> ContainerProxy:
         """
@@ -50,25 +85,29 @@ class TripRepository:
         if self._container is not None:
             return self._container
 
+        # Pooled transport when configured, SDK default otherwise
+        transport_kwargs = {"transport": self.http_pool.create_transport("cosmos")} if self.http_pool else {}
+
         # Initialize async client
         if self.credential:
             self._client = CosmosClient(
                 self.cosmos_endpoint, 
                 credential=self.credential,
                 connection_verify=not self.disable_ssl_verify,
-                enable_endpoint_discovery=not self.disable_ssl_verify
+                enable_endpoint_discovery=not self.disable_ssl_verify,
+                **transport_kwargs,
             )
         else:
             # Initialize async client with managed identity
-            # Exclude shared token cache to prevent home tenant confusion in multi-tenant scenarios
-            # Local: Uses Azure CLI (logged in with correct tenant)
-            # AKS: Uses Workload Identity / Managed Identity (federated identity)
-            credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
+            # One credential per process: discovery and token acquisition happen once and
+            # tokens are refreshed in the background (see services/credentials.py)
+            credential = get_shared_credential()
             self._client = CosmosClient(
                 self.cosmos_endpoint, 
                 credential=credential,
                 connection_verify=not self.disable_ssl_verify,
-                enable_endpoint_discovery=not self.disable_ssl_verify
+                enable_endpoint_discovery=not self.disable_ssl_verify,
+                **transport_kwargs,
             )
 
         # Get existing database (created via Bicep)
@@ -78,7 +117,9 @@ class TripRepository:
                 self._database = await self._client.create_database_if_not_exists(id=self.database_name)
                 self._container = await self._database.create_container_if_not_exists(
                     id=self.container_name, 
-                    partition_key=PartitionKey(path="/trip_id")
+                    partition_key=PartitionKey(path="/trip_id"),
+                    indexing_policy=TRIP_INDEXING_POLICY,
+                    default_ttl=-1,  # Items expire only when they set a ttl (tombstones)
                 )
             except Exception as e:
                 # If creation fails, try to get existing
@@ -93,6 +134,50 @@ class TripRepository:
 
         return self._container
 
+    async def warm_up(self):
+        """
+        Open the Cosmos connection ahead of the first request.
+
+        Initializes the client and reads container properties, which also
+        acquires the first access token when using managed identity.
+        """
+        container = await self._ensure_initialized()
+        await container.read()
+        logger.info(f"Warmed up connection to container '{self.container_name}'")
+
+    async def ensure_indexing_policy(self, apply: bool = False) -> list[Any]:
+        """
+        Check the container for the composite and spatial indexes the listing queries need.
+
+        Args:
+            apply: Add missing indexes by replacing the container's
+                indexing policy (the index is rebuilt online by Cosmos DB)
+
+        Returns:
+            Composite and spatial indexes that were missing
+        """
+        container = await self._ensure_initialized()
+        properties = await container.read()
+        current_policy = properties.get("indexingPolicy", {})
+        missing = [*missing_composite_indexes(current_policy), *missing_spatial_indexes(current_policy)]
+        if not missing:
+            logger.info(f"Indexing policy of container '{self.container_name}' is up to date")
+            return missing
+
+        if apply:
+            await self._database.replace_container(
+                container,
+                partition_key=PartitionKey(path="/trip_id"),
+                indexing_policy=merged_policy(current_policy),
+            )
+            logger.info(f"Added {len(missing)} indexes to container '{self.container_name}'")
+        else:
+            logger.warning(
+                f"Container '{self.container_name}' is missing {len(missing)} indexes; "
+                f"trip listings will cost more RU until they are added: {missing}"
+            )
+        return missing
+
     async def create(self, trip: Trip) -> Trip:
         """
         Create a new trip in the database.
@@ -104,7 +189,7 @@ class TripRepository:
             Created Trip with server-assigned timestamps
 
         Raises:
-            exceptions.CosmosResourceExistsError: If trip with same ID already exists
+            TripExistsError: If trip with same ID already exists
         """
         container = await self._ensure_initialized()
         doc = TripDocument.from_trip(trip)
@@ -115,7 +200,10 @@ class TripRepository:
         item["id"] = str(trip.id)
         item["trip_id"] = str(trip.id)
 
-        created_item = await container.create_item(body=item)
+        try:
+            created_item = await container.create_item(body=item)
+        except exceptions.CosmosResourceExistsError:
+            raise TripExistsError(f"Trip already exists: {item['id']}") from None
         logger.info(f"Created trip: {created_item['id']} for toy {trip.toy_id}")
 
         return TripDocument(**created_item).to_trip()
@@ -140,41 +228,192 @@ class TripRepository:
             logger.debug(f"Trip not found: {trip_id_str}")
             return None
 
-    async def list_by_toy(self, toy_id: UUID, limit: int = 20, offset: int = 0) -> tuple[list[Trip], int]:
+    async def list_by_toy(
+        self, toy_id: UUID, limit: int = 20, continuation_token: str | None = None
+    ) -> tuple[list[Trip], str | None]:
         """
-        List trips for a specific toy with pagination.
+        List trips for a specific toy, newest first, with keyset pagination.
+
+        Only the requested page is read and parsed. The container is
+        partitioned by /trip_id, so the query still fans out across
+        partitions, but each partition answers from the
+        (toy_id, created_at, id) composite index with at most limit + 1 items.
 
         Args:
             toy_id: UUID of the toy
             limit: Maximum number of items to return
-            offset: Number of items to skip
+            continuation_token: Token returned with the previous page
 
         Returns:
-            Tuple of (list of trips, total count)
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
         """
-        container = await self._ensure_initialized()
         toy_id_str = str(toy_id)
+        trips, next_token = await self._query_page([("toy_id", toy_id_str)], limit, continuation_token)
+        logger.debug(f"Listed {len(trips)} trips for toy {toy_id_str} (more: {next_token is not None})")
+
+        return trips, next_token
 
-        query = "SELECT * FROM c WHERE c.toy_id = @toy_id ORDER BY c.created_at DESC"
-        parameters = [{"name": "@toy_id", "value": toy_id_str}]
+    async def count_by_toy(self, toy_id: UUID) -> int:
+        """
+        Count trips of a toy.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Number of trips
+        """
+        container = await self._ensure_initialized()
+        query = "SELECT VALUE COUNT(1) FROM c WHERE c.toy_id = @toy_id"
+        parameters = [{"name": "@toy_id", "value": str(toy_id)}]
+        counts = [count async for count in container.query_items(query=query, parameters=parameters)]
+        # Cross-partition aggregates may return one partial count per partition range
+        return sum(counts)
+
+    async def list_trips(
+        self,
+        limit: int = 20,
+        continuation_token: str | None = None,
+        country_code: str | None = None,
+        status: str | None = None,
+        public_tracking_enabled: bool | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips across all toys, newest first, with keyset pagination.
+
+        The query reads at most limit + 1 documents: filters are equality
+        predicates and the page starts after the (created_at, id) of the
+        previous page, so each page is served from a composite index (see
+        indexing_policy.py) regardless of how deep the client has paged.
+
+        Args:
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+            country_code: Only trips in this country
+            status: Only trips with this status
+            public_tracking_enabled: Only trips with this tracking setting
 
-        items = [item async for item in container.query_items(
-            query=query,
-            parameters=parameters,
-        )]
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
 
-        total = len(items)
-        paginated_items = items[offset : offset + limit]
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        filters = _list_filters(country_code, status, public_tracking_enabled)
+        trips, next_token = await self._query_page(
+            [(field, filters[field]) for field in LIST_FILTER_FIELDS if field in filters], limit, continuation_token
+        )
+        logger.debug(f"Listed {len(trips)} trips (filters: {filters}, more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def list_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20,
+        continuation_token: str | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        List trips within a radius of a point, newest first, with keyset pagination.
 
-        trips = [TripDocument(**item).to_trip() for item in paginated_items]
-        logger.debug(f"Listed {len(trips)} trips for toy {toy_id_str} (total: {total})")
+        The distance predicate (ST_DISTANCE, in metres on the WGS 84
+        ellipsoid) is served by the spatial index on /location (see
+        indexing_policy.py). Cosmos DB cannot ORDER BY a distance, so pages
+        follow the same (created_at, id) order as the other listings.
+
+        Args:
+            latitude: Latitude of the centre in degrees
+            longitude: Longitude of the centre in degrees
+            radius_km: Search radius in kilometres
+            limit: Maximum number of items to return
+            continuation_token: Token returned with the previous page
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        near = ({"type": "Point", "coordinates": [longitude, latitude]}, radius_km * 1000)
+        trips, next_token = await self._query_page([], limit, continuation_token, near=near)
+        logger.debug(f"Listed {len(trips)} trips within {radius_km} km (more: {next_token is not None})")
+
+        return trips, next_token
+
+    async def _query_page(
+        self,
+        equality: list[tuple[str, Any]],
+        limit: int,
+        continuation_token: str | None,
+        near: tuple[dict[str, Any], float] | None = None,
+    ) -> tuple[list[Trip], str | None]:
+        """
+        Run one keyset page query ordered by (created_at DESC, id DESC).
 
-        return trips, total
+        Reads at most limit + 1 documents: the extra one only tells whether
+        another page exists. Equality-filtered paths lead the ORDER BY so the
+        query is served by the matching composite index.
+
+        Args:
+            equality: (field, value) equality filters, in composite index order
+            limit: Page size
+            continuation_token: Token returned with the previous page
+            near: Only trips within (GeoJSON point, distance in metres)
+
+        Returns:
+            Tuple of (list of trips, continuation token for the next page or None)
+
+        Raises:
+            ValueError: If the continuation token is invalid
+        """
+        container = await self._ensure_initialized()
+
+        # Gallery, tombstone and view items share the container; they have no toy_id or other filtered fields
+        conditions = [] if equality else ["IS_DEFINED(c.toy_id)"]
+        order_by = []
+        parameters: list[dict[str, Any]] = [{"name": "@limit", "value": limit + 1}]
+        for field, value in equality:
+            conditions.append(f"c.{field} = @{field}")
+            order_by.append(f"c.{field} ASC")
+            parameters.append({"name": f"@{field}", "value": value})
+        if near is not None:
+            conditions.append("ST_DISTANCE(c.location, @point) <= @distance")
+            parameters += [{"name": "@point", "value": near[0]}, {"name": "@distance", "value": near[1]}]
+        if continuation_token:
+            after_created_at, after_id = decode_continuation(continuation_token)
+            conditions.append(
+                "(c.created_at < @after_created_at OR (c.created_at = @after_created_at AND c.id < @after_id))"
+            )
+            parameters += [
+                {"name": "@after_created_at", "value": after_created_at},
+                {"name": "@after_id", "value": after_id},
+            ]
+        order_by += ["c.created_at DESC", "c.id DESC"]
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"SELECT TOP @limit * FROM c{where} ORDER BY {', '.join(order_by)}"
+
+        items = [item async for item in container.query_items(query=query, parameters=parameters)]
+        next_token = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_token = encode_continuation(items[-1]["created_at"], items[-1]["id"])
+
+        return [TripDocument(**item).to_trip() for item in items], next_token
 
     async def update(self, trip_id: UUID, updates: dict[str, Any]) -> Trip | None:
         """
         Update a trip with partial data.
 
+        Uses a partial document update (patch) so fields maintained by the
+        gallery operations (gallery_count, cover_image) are never overwritten
+        with a stale copy.
+
         Args:
             trip_id: UUID of the trip to update
             updates: Dictionary of fields to update
@@ -185,21 +424,18 @@ class TripRepository:
         container = await self._ensure_initialized()
         trip_id_str = str(trip_id)
 
-        try:
-            # Read current item
-            item = await container.read_item(item=trip_id_str, partition_key=trip_id_str)
-
-            # Apply updates
-            for key, value in updates.items():
-                if key not in {"id", "trip_id", "toy_id", "created_at"}:  # Immutable fields
-                    item[key] = value
+        # Immutable and gallery-maintained fields are not patched
+        patch = [
+            {"op": "set", "path": f"/{key}", "value": value.value if isinstance(value, Enum) else value}
+            for key, value in updates.items()
+            if key not in {"id", "trip_id", "toy_id", "created_at", "gallery_count", "cover_image"}
+        ]
+        patch.append({"op": "set", "path": "/updated_at", "value": datetime.now(UTC).isoformat()})
 
-            # Update timestamp
-            from datetime import datetime, UTC
-            item["updated_at"] = datetime.now(UTC).isoformat()
-
-            # Replace item
-            updated_item = await container.replace_item(item=item, body=item)
+        try:
+            updated_item = await container.patch_item(
+                item=trip_id_str, partition_key=trip_id_str, patch_operations=patch
+            )
             logger.info(f"Updated trip: {trip_id_str}")
             return TripDocument(**updated_item).to_trip()
 
@@ -209,7 +445,10 @@ class TripRepository:
 
     async def delete(self, trip_id: UUID) -> bool:
         """
-        Delete a trip.
+        Delete a trip together with its gallery image items.
+
+        The trip is replaced by a tombstone item in the same transactional
+        batch, so change feed consumers see the deletion.
 
         Args:
             trip_id: UUID of the trip to delete
@@ -221,87 +460,477 @@ class TripRepository:
         trip_id_str = str(trip_id)
 
         try:
-            await container.delete_item(item=trip_id_str, partition_key=trip_id_str)
-            logger.info(f"Deleted trip: {trip_id_str}")
-            return True
+            item = await container.read_item(item=trip_id_str, partition_key=trip_id_str)
         except exceptions.CosmosResourceNotFoundError:
             logger.debug(f"Trip not found for deletion: {trip_id_str}")
             return False
 
-    async def add_gallery_image(self, trip_id: UUID, image: GalleryImage) -> Trip | None:
+        image_ids = [
+            image_id
+            async for image_id in container.query_items(
+                query="SELECT VALUE c.id FROM c WHERE c.doc_type = @doc_type",
+                parameters=[{"name": "@doc_type", "value": GALLERY_DOC_TYPE}],
+                partition_key=trip_id_str,
+            )
+        ]
+        # Image items first, so a failure never leaves images without their trip
+        for start in range(0, len(image_ids), MAX_BATCH_OPERATIONS):
+            chunk = image_ids[start : start + MAX_BATCH_OPERATIONS]
+            await container.execute_item_batch(
+                batch_operations=[("delete", (image_id,)) for image_id in chunk], partition_key=trip_id_str
+            )
+
+        # No toy_id field: tombstones must never match trip queries
+        tombstone = {
+            "id": TOMBSTONE_ID,
+            "trip_id": trip_id_str,
+            "doc_type": TOMBSTONE_DOC_TYPE,
+            "deleted_toy_id": item["toy_id"],
+            "ttl": TOMBSTONE_TTL_SECONDS,
+        }
+        try:
+            await container.execute_item_batch(
+                batch_operations=[("delete", (trip_id_str,)), ("upsert", (tombstone,))], partition_key=trip_id_str
+            )
+        except exceptions.CosmosBatchOperationError as e:
+            if e.error_index != 0 or e.status_code != 404:
+                raise
+            logger.debug(f"Trip not found for deletion: {trip_id_str}")
+            return False
+        logger.info(f"Deleted trip: {trip_id_str} ({len(image_ids)} gallery items)")
+        return True
+
+    async def list_gallery(
+        self, trip_id: UUID, limit: int = 50, continuation_token: str | None = None
+    ) -> tuple[list[GalleryImage], str | None] | None:
         """
-        Add an image to the trip gallery.
+        List gallery images of a trip in upload order with keyset pagination.
+
+        Single-partition query: image items share the trip's partition key.
 
         Args:
             trip_id: UUID of the trip
-            image: GalleryImage to add
+            limit: Maximum number of images to return
+            continuation_token: Token returned with the previous page
 
         Returns:
-            Updated Trip if found, None otherwise
+            Tuple of (list of images, continuation token for the next page or None),
+            or None if the trip doesn't exist
+
+        Raises:
+            ValueError: If the continuation token is invalid
         """
         container = await self._ensure_initialized()
         trip_id_str = str(trip_id)
+        if await self._read_trip_item(container, trip_id_str) is None:
+            return None
+
+        conditions = ["c.doc_type = @doc_type"]
+        parameters: list[dict[str, Any]] = [
+            {"name": "@limit", "value": limit + 1},
+            {"name": "@doc_type", "value": GALLERY_DOC_TYPE},
+        ]
+        if continuation_token:
+            after_uploaded_at, after_id = decode_continuation(continuation_token)
+            conditions.append(
+                "(c.uploaded_at > @after_uploaded_at OR (c.uploaded_at = @after_uploaded_at AND c.id > @after_id))"
+            )
+            parameters += [
+                {"name": "@after_uploaded_at", "value": after_uploaded_at},
+                {"name": "@after_id", "value": after_id},
+            ]
+        query = (
+            f"SELECT TOP @limit * FROM c WHERE {' AND '.join(conditions)} "
+            "ORDER BY c.doc_type ASC, c.uploaded_at ASC, c.id ASC"
+        )
+
+        items = [
+            item
+            async for item in container.query_items(query=query, parameters=parameters, partition_key=trip_id_str)
+        ]
+        next_token = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_token = encode_continuation(items[-1]["uploaded_at"], items[-1]["id"])
+
+        images = [GalleryImageDocument(**item).to_image() for item in items]
+        logger.debug(f"Listed {len(images)} gallery images for trip {trip_id_str}")
+        return images, next_token
+
+    async def get_gallery_image(self, trip_id: UUID, image_id: UUID) -> GalleryImage | None:
+        """
+        Retrieve one gallery image by point read.
+
+        The image item is read directly by (image_id, trip_id), so the cost is
+        one point read regardless of the gallery size and the trip document is
+        not loaded. Only while embedded galleries may still exist does a miss
+        fall back to reading the trip document.
+
+        Args:
+            trip_id: UUID of the trip
+            image_id: UUID of the image
+
+        Returns:
+            GalleryImage if found, None otherwise
+        """
+        container = await self._ensure_initialized()
+        trip_id_str = str(trip_id)
+        image_id_str = str(image_id)
 
         try:
-            # Read current item
-            item = await container.read_item(item=trip_id_str, partition_key=trip_id_str)
+            item = await container.read_item(item=image_id_str, partition_key=trip_id_str)
+        except exceptions.CosmosResourceNotFoundError:
+            item = None
+        if item is not None and item.get("doc_type") == GALLERY_DOC_TYPE:
+            return GalleryImageDocument(**item).to_image()
+        if self._embedded_galleries_migrated:
+            return None
 
-            # Add image to gallery
-            if "gallery" not in item:
-                item["gallery"] = []
+        # Not migrated yet: the image may still be embedded in the trip document
+        trip_item = await self._read_trip_item(container, trip_id_str, migrate=False)
+        embedded = (trip_item or {}).get("gallery") or []
+        match = next((img for img in embedded if img.get("image_id") == image_id_str), None)
+        return GalleryImage(**match) if match else None
 
-            item["gallery"].append(image.model_dump(mode="json"))
+    async def add_gallery_image(self, trip_id: UUID, image: GalleryImage) -> Trip | None:
+        """
+        Add an image to the trip gallery.
 
-            # Update timestamp
-            from datetime import datetime, UTC
-            item["updated_at"] = datetime.now(UTC).isoformat()
+        Args:
+            trip_id: UUID of the trip
+            image: GalleryImage to add
 
-            # Replace item
-            updated_item = await container.replace_item(item=item, body=item)
-            logger.info(f"Added gallery image to trip: {trip_id_str}")
-            return TripDocument(**updated_item).to_trip()
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        return await self.add_gallery_images(trip_id, [image])
 
-        except exceptions.CosmosResourceNotFoundError:
-            logger.debug(f"Trip not found for adding gallery image: {trip_id_str}")
+    async def add_gallery_images(self, trip_id: UUID, images: list[GalleryImage]) -> Trip | None:
+        """
+        Add several images to the trip gallery.
+
+        Creates the image items and patches the trip's gallery_count (and
+        cover_image when the trip has none) in one transactional batch, so the
+        trip document never grows with the gallery. Up to
+        MAX_BATCH_OPERATIONS - 1 images are committed per batch.
+
+        Args:
+            trip_id: UUID of the trip
+            images: GalleryImages to add, oldest first; images already in the gallery are skipped
+
+        Returns:
+            Updated Trip if found, None otherwise
+        """
+        container = await self._ensure_initialized()
+        trip_id_str = str(trip_id)
+
+        item = await self._read_trip_item(container, trip_id_str)
+        if item is None:
+            logger.debug(f"Trip not found for adding gallery images: {trip_id_str}")
             return None
+        if not images:
+            return TripDocument(**item).to_trip()
+
+        has_cover = bool(item.get("cover_image"))
+        chunk_size = MAX_BATCH_OPERATIONS - 1
+        added = 0
+        trip_body = item
+        for start in range(0, len(images), chunk_size):
+            chunk = images[start : start + chunk_size]
+            while chunk:
+                patch = [
+                    {"op": "incr", "path": "/gallery_count", "value": len(chunk)},
+                    {"op": "set", "path": "/updated_at", "value": datetime.now(UTC).isoformat()},
+                ]
+                if not has_cover:
+                    patch.append({"op": "set", "path": "/cover_image", "value": chunk[0].model_dump(mode="json")})
+                operations = [
+                    ("create", (GalleryImageDocument.from_image(trip_id_str, image).model_dump(mode="json"),))
+                    for image in chunk
+                ]
+                try:
+                    results = await container.execute_item_batch(
+                        batch_operations=[*operations, ("patch", (trip_id_str, patch))],
+                        partition_key=trip_id_str,
+                    )
+                except exceptions.CosmosBatchOperationError as e:
+                    # The batch is rolled back; an image that already exists (a repeated or concurrent
+                    # commit) is left out and the rest is retried, so adding an image is idempotent
+                    if e.status_code != 409 or e.error_index >= len(chunk):
+                        raise
+                    logger.debug(f"Gallery image {chunk[e.error_index].image_id} already in trip: {trip_id_str}")
+                    chunk = chunk[: e.error_index] + chunk[e.error_index + 1 :]
+                    continue
+                trip_body = results[-1]["resourceBody"]
+                has_cover = True
+                added += len(chunk)
+                break
+        logger.info(f"Added {added} gallery images to trip: {trip_id_str}")
+        return TripDocument(**trip_body).to_trip()
 
     async def remove_gallery_image(self, trip_id: UUID, image_id: UUID) -> Trip | None:
         """
         Remove an image from the trip gallery.
 
+        Deletes the image item and patches the trip's gallery_count (and
+        cover_image when the cover is removed) in one transactional batch.
+
         Args:
             trip_id: UUID of the trip
             image_id: UUID of the image to remove
 
         Returns:
-            Updated Trip if found, None otherwise
+            Updated Trip if this call removed the image, None if the trip or image was not found
         """
         container = await self._ensure_initialized()
         trip_id_str = str(trip_id)
         image_id_str = str(image_id)
 
+        item = await self._read_trip_item(container, trip_id_str)
+        if item is None:
+            logger.debug(f"Trip not found for removing gallery image: {trip_id_str}")
+            return None
+
+        patch = [
+            {"op": "incr", "path": "/gallery_count", "value": -1},
+            {"op": "set", "path": "/updated_at", "value": datetime.now(UTC).isoformat()},
+        ]
+        if (item.get("cover_image") or {}).get("image_id") == image_id_str:
+            # Next oldest image becomes the cover
+            candidates = [
+                candidate
+                async for candidate in container.query_items(
+                    query=(
+                        "SELECT TOP 2 * FROM c WHERE c.doc_type = @doc_type "
+                        "ORDER BY c.doc_type ASC, c.uploaded_at ASC, c.id ASC"
+                    ),
+                    parameters=[{"name": "@doc_type", "value": GALLERY_DOC_TYPE}],
+                    partition_key=trip_id_str,
+                )
+            ]
+            cover = next((c for c in candidates if c["id"] != image_id_str), None)
+            cover_value = GalleryImageDocument(**cover).to_image().model_dump(mode="json") if cover else None
+            patch.append({"op": "set", "path": "/cover_image", "value": cover_value})
+
         try:
-            # Read current item
-            item = await container.read_item(item=trip_id_str, partition_key=trip_id_str)
+            results = await container.execute_item_batch(
+                batch_operations=[("delete", (image_id_str,)), ("patch", (trip_id_str, patch))],
+                partition_key=trip_id_str,
+            )
+        except exceptions.CosmosBatchOperationError as e:
+            # The whole batch is rolled back; only a missing image is expected here
+            if e.error_index != 0 or e.status_code != 404:
+                raise
+            logger.debug(f"Gallery image {image_id_str} not found in trip: {trip_id_str}")
+            return None
+
+        logger.info(f"Removed gallery image {image_id_str} from trip: {trip_id_str}")
+        return TripDocument(**results[1]["resourceBody"]).to_trip()
 
-            # Remove image from gallery
-            if "gallery" in item:
-                item["gallery"] = [img for img in item["gallery"] if img.get("image_id") != image_id_str]
+    async def migrate_embedded_galleries(self) -> int:
+        """
+        Move galleries still embedded in trip documents into image items.
 
-            # Update timestamp
-            from datetime import datetime, UTC
-            item["updated_at"] = datetime.now(UTC).isoformat()
+        Safe to run while the service handles traffic: each trip is migrated
+        with idempotent upserts and an ETag-conditional replace, and trips
+        touched by gallery operations are migrated on access as well.
 
-            # Replace item
-            updated_item = await container.replace_item(item=item, body=item)
-            logger.info(f"Removed gallery image {image_id_str} from trip: {trip_id_str}")
-            return TripDocument(**updated_item).to_trip()
+        Returns:
+            Number of migrated trips
+        """
+        container = await self._ensure_initialized()
+        migrated = 0
+        skipped = 0
+        # /gallery/* is not indexed: select candidates by the indexed paths first. Every trip written
+        # by this version carries gallery_count, so only pre-migration trips lack it.
+        query = (
+            "SELECT * FROM c WHERE NOT IS_DEFINED(c.doc_type) AND NOT IS_DEFINED(c.gallery_count) "
+            "AND IS_DEFINED(c.gallery)"
+        )
+        async for item in container.query_items(query=query):
+            try:
+                await self._migrate_trip_item(container, item)
+                migrated += 1
+            except exceptions.CosmosAccessConditionFailedError:
+                # Changed concurrently; it is migrated again on its next gallery access or sweep
+                skipped += 1
+                logger.debug(f"Trip {item['id']} changed during gallery migration; skipped")
+        # New documents are never written with an embedded gallery, so a clean sweep is final
+        self._embedded_galleries_migrated = skipped == 0
+        if migrated:
+            logger.info(f"Migrated embedded galleries of {migrated} trips")
+        return migrated
+
+    async def read_changes(
+        self, continuation: str | None = None, max_items: int = 100
+    ) -> tuple[list[TripChange], str | None]:
+        """
+        Read the trip change feed: the latest version of each trip changed since the continuation.
 
+        Uses the container's change feed (latest version mode). Deletions are
+        reported through the tombstone items written by delete; gallery image
+        items and view documents are skipped.
+
+        Args:
+            continuation: Continuation returned by the previous call, or None to start from the beginning
+            max_items: Maximum number of feed items to read
+
+        Returns:
+            Tuple of (changes in commit order per partition, continuation to read on from)
+        """
+        container = await self._ensure_initialized()
+        start = {"continuation": continuation} if continuation else {"start_time": "Beginning"}
+        pages = container.query_items_change_feed(max_item_count=max_items, **start).by_page()
+        async for page in pages:
+            items = [item async for item in page]
+            return [change for item in items if (change := _trip_change(item))], pages.continuation_token
+        return [], continuation
+
+    async def read_views(self, partition: str, view_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Read view documents by ID (point reads).
+
+        Args:
+            partition: View partition
+            view_ids: Document IDs
+
+        Returns:
+            Documents found, by ID, each with its ETag under VERSION_KEY
+        """
+        container = await self._ensure_initialized()
+
+        async def read(view_id: str) -> dict[str, Any] | None:
+            try:
+                return await container.read_item(item=view_id, partition_key=partition)
+            except exceptions.CosmosResourceNotFoundError:
+                return None
+
+        items = await asyncio.gather(*(read(view_id) for view_id in view_ids))
+        return {item["id"]: _view_body(item) for item in items if item is not None}
+
+    async def list_views(self, partition: str, prefix: str = "") -> list[dict[str, Any]]:
+        """
+        Read the view documents of a partition, ordered by ID (single-partition query).
+
+        Args:
+            partition: View partition
+            prefix: Only documents whose ID starts with this
+
+        Returns:
+            Documents, each with its ETag under VERSION_KEY
+        """
+        container = await self._ensure_initialized()
+        return [
+            _view_body(item)
+            async for item in container.query_items(
+                query="SELECT * FROM c WHERE c.doc_type = @doc_type AND STARTSWITH(c.id, @prefix) ORDER BY c.id",
+                parameters=[{"name": "@doc_type", "value": VIEW_DOC_TYPE}, {"name": "@prefix", "value": prefix}],
+                partition_key=partition,
+            )
+        ]
+
+    async def write_views(
+        self, partition: str, writes: list[dict[str, Any]], deletes: list[dict[str, Any]] | None = None
+    ):
+        """
+        Create, replace and delete view documents of one partition in one transactional batch.
+
+        Replaces and deletes are conditional on the ETag that was read.
+
+        Args:
+            partition: View partition
+            writes: Documents to store; a VERSION_KEY of None creates the document
+            deletes: Documents to delete, as read
+
+        Raises:
+            ViewConflictError: If any document changed since it was read
+        """
+        container = await self._ensure_initialized()
+        operations: list[tuple] = []
+        for doc in writes:
+            item = {
+                "id": doc["id"],
+                "trip_id": partition,
+                "doc_type": VIEW_DOC_TYPE,
+                "body": {key: value for key, value in doc.items() if key not in {"id", VERSION_KEY}},
+            }
+            etag = doc.get(VERSION_KEY)
+            operations.append(
+                ("replace", (doc["id"], item), {"if_match_etag": etag}) if etag else ("create", (item,))
+            )
+        for doc in deletes or []:
+            operations.append(("delete", (doc["id"],), {"if_match_etag": doc[VERSION_KEY]}))
+
+        try:
+            await container.execute_item_batch(batch_operations=operations, partition_key=partition)
+        except exceptions.CosmosBatchOperationError as e:
+            if e.status_code not in (404, 409, 412):
+                raise
+            raise ViewConflictError(f"View document changed in partition {partition}") from e
+
+    async def clear_views(self, prefix: str) -> int:
+        """
+        Delete all view documents of the partitions starting with a prefix (cross-partition query).
+
+        Args:
+            prefix: Partition prefix
+
+        Returns:
+            Number of deleted documents
+        """
+        container = await self._ensure_initialized()
+        items = [
+            item
+            async for item in container.query_items(
+                query="SELECT c.id, c.trip_id FROM c WHERE c.doc_type = @doc_type AND STARTSWITH(c.trip_id, @prefix)",
+                parameters=[{"name": "@doc_type", "value": VIEW_DOC_TYPE}, {"name": "@prefix", "value": prefix}],
+            )
+        ]
+        for item in items:
+            try:
+                await container.delete_item(item=item["id"], partition_key=item["trip_id"])
+            except exceptions.CosmosResourceNotFoundError:
+                pass
+        return len(items)
+
+    async def _read_trip_item(
+        self, container: ContainerProxy, trip_id_str: str, migrate: bool = True
+    ) -> dict[str, Any] | None:
+        """Point-read a trip document, migrating an embedded gallery first if present."""
+        try:
+            item = await container.read_item(item=trip_id_str, partition_key=trip_id_str)
         except exceptions.CosmosResourceNotFoundError:
-            logger.debug(f"Trip not found for removing gallery image: {trip_id_str}")
             return None
+        if migrate and "gallery" in item:
+            try:
+                item = await self._migrate_trip_item(container, item)
+            except exceptions.CosmosAccessConditionFailedError:
+                return await self._read_trip_item(container, trip_id_str)
+        return item
+
+    async def _migrate_trip_item(self, container: ContainerProxy, item: dict[str, Any]) -> dict[str, Any]:
+        """Move one trip's embedded gallery into image items and strip it from the trip document."""
+        trip_id_str = item["id"]
+        gallery = item.get("gallery") or []
+        image_items = [
+            GalleryImageDocument.from_image(trip_id_str, GalleryImage(**image)).model_dump(mode="json")
+            for image in gallery
+        ]
+        # Upserts make a retried migration idempotent; the final conditional replace commits it
+        for start in range(0, len(image_items), MAX_BATCH_OPERATIONS):
+            chunk = image_items[start : start + MAX_BATCH_OPERATIONS]
+            await container.execute_item_batch(
+                batch_operations=[("upsert", (image_item,)) for image_item in chunk], partition_key=trip_id_str
+            )
 
-
+        body = {key: value for key, value in item.items() if key != "gallery" and not key.startswith("_")}
+        body["gallery_count"] = len(gallery)
+        body["cover_image"] = gallery[0] if gallery else None
+        migrated = await container.replace_item(
+            item=trip_id_str, body=body, etag=item["_etag"], match_condition=MatchConditions.IfNotModified
+        )
+        logger.info(f"Migrated {len(gallery)} embedded gallery images of trip {trip_id_str}")
+        return migrated
 
     async def close(self):
         """Close underlying Cosmos DB client if initialized.
@@ -314,3 +943,18 @@ class TripRepository:
                 logger.info("Cosmos client closed")
             except Exception as e:
                 logger.warning(f"Failed to close Cosmos client: {e}")
+
+
+def _trip_change(item: dict[str, Any]) -> TripChange | None:
+    """Change feed entry of a container item; None for items that are not trips."""
+    doc_type = item.get("doc_type")
+    if doc_type == TOMBSTONE_DOC_TYPE:
+        return TripChange(item["trip_id"], item["deleted_toy_id"], None)
+    if doc_type is not None or "toy_id" not in item:
+        return None
+    return TripChange(item["id"], item["toy_id"], TripDocument(**item).to_trip())
+
+
+def _view_body(item: dict[str, Any]) -> dict[str, Any]:
+    """View document as returned by read_views: body, ID and ETag."""
+    return {**item["body"], "id": item["id"], VERSION_KEY: item["_etag"]}
@@ -0,0 +1,53 @@
+"""Change feed entries and materialized view documents shared by all backends.
+
+Read models (per-toy statistics, destination aggregates) are maintained from
+a change feed of trips. Each backend yields the latest version of every
+changed trip in commit order, plus a marker for deleted trips, and continues
+after an opaque continuation string. Deleted trips never come back on a
+replay, so folding the feed into a view is idempotent as long as each view
+keeps what it last applied per trip.
+
+View documents are small JSON bodies grouped in partitions. All documents of
+one partition are written atomically, and every write is conditional on the
+version read before, so concurrent processors never lose an update. In Cosmos
+DB they are items of the trips container (`doc_type: "view"`) whose partition
+key value is the view partition.
+"""
+from dataclasses import dataclass
+
+from models import Trip
+
+# Key of the optimistic concurrency version in view documents. read_views returns
+# it with each document; write_views creates documents whose version is None and
+# otherwise replaces or deletes them only if the version is unchanged.
+VERSION_KEY = "_version"
+
+class ViewConflictError(Exception):
+    """A view document changed (or appeared) since it was read; read again and retry."""
+
+@dataclass
+class TripChange:
+    """One entry of the trip change feed."""
+
+    trip_id: str
+    toy_id: str
+    trip: Trip | None  # Latest version; None when the trip was deleted
+
+def parse_sequence(continuation: str | None) -> int:
+    """
+    Decode the continuation of a sequence-numbered change feed (memory and SQLite backends).
+
+    Args:
+        continuation: Continuation returned by read_changes, or None to start from the beginning
+
+    Returns:
+        Sequence number of the last change already read
+
+    Raises:
+        ValueError: If the continuation is malformed
+    """
+    if continuation is None:
+        return 0
+    if not continuation.isdigit():
+        raise ValueError("Invalid change feed continuation")
+    return int(continuation)
@@ -1,4 +1,5 @@
 """Trip API routes."""
 from routes.trip_routes import router
+from routes.timeline_routes import router as timeline_router
 
-__all__ = ["router"]
+__all__ = ["router", "timeline_router"]
@@ -0,0 +1,74 @@
+"""Precomputed statistics routes.
+
+Statistics are read from materialized view documents maintained by background
+processors, so each request costs a few point reads however many trips exist.
+They lag behind trip changes by up to one processor poll interval.
+"""
+import logging
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+
+from middleware import JsonResponseCache
+from models import DestinationStats, ToyTripStats
+from services import DestinationStatsService, TripStatsService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Stats"])
+
+# Destination responses kept in memory, one per locations value (LRU beyond this)
+DESTINATIONS_CACHE_ENTRIES = 32
+
+# Dependency injection placeholders (will be set in main.py)
+trip_stats_service: TripStatsService | None = None
+destination_stats_service: DestinationStatsService | None = None
+destinations_cache_ttl_seconds: float = 60.0
+
+# Destination statistics by locations per country
+_destinations_cache = JsonResponseCache(DESTINATIONS_CACHE_ENTRIES)
+
+
+def get_trip_stats_svc() -> TripStatsService:
+    """Dependency to get the trip statistics service."""
+    if trip_stats_service is None:
+        raise RuntimeError("TripStatsService not initialized")
+    return trip_stats_service
+
+
+def get_destination_stats_svc() -> DestinationStatsService:
+    """Dependency to get the destination statistics service."""
+    if destination_stats_service is None:
+        raise RuntimeError("DestinationStatsService not initialized")
+    return destination_stats_service
+
+
+@router.get("/toy/{toy_id}/stats", response_model=ToyTripStats)
+async def get_toy_stats(
+    toy_id: UUID,
+    stats: Annotated[TripStatsService, Depends(get_trip_stats_svc)],
+) -> ToyTripStats:
+    """
+    Get trip statistics of a toy: trip and image counts, visited countries and the newest trip.
+
+    Global read access. A toy without trips gets all-zero statistics.
+    """
+    return await stats.get(toy_id)
+
+
+@router.get("/trip/stats/destinations", response_model=DestinationStats)
+async def get_destination_stats(
+    destinations: Annotated[DestinationStatsService, Depends(get_destination_stats_svc)],
+    locations: int = Query(10, ge=0, le=100, description="Most visited locations per country"),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Get trip counts per country and location, most visited first.
+
+    Global read access. Reads one document per country, cached for
+    DESTINATION_STATS_CACHE_TTL_SECONDS and revalidated with the ETag.
+    """
+    return await _destinations_cache.respond(
+        locations, lambda: destinations.get(locations), destinations_cache_ttl_seconds, if_none_match
+    )
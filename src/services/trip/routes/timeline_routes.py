@@ -0,0 +1,96 @@
+"""Aggregated toy timeline route.
+
+Serves everything a toy page needs in one response: the toy (from the toy
+service), its most recent trip summaries (from the trip repository) and its
+precomputed trip statistics, fetched concurrently. Assembled payloads are
+cached for a few seconds and carry an ETag, so repeated views are answered
+without any fan-out and unchanged pages revalidate with 304.
+"""
+import asyncio
+import logging
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+
+from middleware import JsonResponseCache
+from models import ToyTimeline, TripSummary
+from repositories import TripRepository
+from routes.trip_routes import get_trip_repo
+from services import ToyClient, ToyServiceError, TripStatsService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/toy", tags=["Timeline"])
+
+# Assembled timelines kept in memory (LRU beyond this)
+TIMELINE_CACHE_ENTRIES = 1024
+
+# Dependency injection placeholders (will be set in main.py)
+toy_client: ToyClient | None = None
+# None (or a processor not caught up with the feed) serves timelines without statistics
+trip_stats_service: TripStatsService | None = None
+cache_ttl_seconds: float = 10.0
+
+# Assembled timelines by (toy_id, limit)
+_cache = JsonResponseCache(TIMELINE_CACHE_ENTRIES)
+
+
+def get_timeline_toy_client() -> ToyClient:
+    """Dependency to get the toy service client."""
+    if toy_client is None:
+        raise RuntimeError("ToyClient not initialized")
+    return toy_client
+
+
+async def _assemble(toy_id: UUID, limit: int, repo: TripRepository, toys: ToyClient) -> ToyTimeline:
+    """Fetch the toy, its trip summaries and its trip count or statistics concurrently."""
+    toy_stats = None
+    try:
+        if trip_stats_service is not None and trip_stats_service.caught_up:
+            # The statistics carry the trip count, so the cross-partition COUNT is skipped
+            toy, (trips, next_token), toy_stats = await asyncio.gather(
+                toys.get_toy(toy_id),
+                repo.list_by_toy(toy_id, limit),
+                trip_stats_service.get(toy_id),
+            )
+            trip_count = toy_stats.trip_count
+        else:
+            toy, (trips, next_token), trip_count = await asyncio.gather(
+                toys.get_toy(toy_id),
+                repo.list_by_toy(toy_id, limit),
+                repo.count_by_toy(toy_id),
+            )
+    except ToyServiceError:
+        raise HTTPException(status_code=503, detail="Toy service unavailable")
+    if toy is None:
+        raise HTTPException(status_code=404, detail="Toy not found")
+    return ToyTimeline(
+        toy=toy,
+        trips=[TripSummary.from_trip(trip) for trip in trips],
+        trip_count=trip_count,
+        stats=toy_stats,
+        continuation_token=next_token,
+    )
+
+
+@router.get("/{toy_id}/timeline", response_model=ToyTimeline)
+async def get_toy_timeline(
+    toy_id: UUID,
+    repo: Annotated[TripRepository, Depends(get_trip_repo)],
+    toys: Annotated[ToyClient, Depends(get_timeline_toy_client)],
+    limit: int = Query(20, ge=1, le=100, description="Maximum trips"),
+    if_none_match: str | None = Header(None),
+) -> Response:
+    """
+    Get a toy with its most recent trips in one response.
+
+    Global read access. Cached for TIMELINE_CACHE_TTL_SECONDS; the response
+    may lag behind toy and trip changes by that long.
+    """
+    async def assemble() -> ToyTimeline:
+        timeline = await _assemble(toy_id, limit, repo, toys)
+        logger.debug(f"Assembled timeline of toy {toy_id} ({len(timeline.trips)} trips)")
+        return timeline
+
+    return await _cache.respond((str(toy_id), limit), assemble, cache_ttl_seconds, if_none_match)
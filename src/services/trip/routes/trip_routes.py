@@ -1,25 +1,72 @@
 """Trip API routes."""
+import asyncio
 import logging
-from typing import Annotated, Callable
-from uuid import UUID
+from typing import Annotated, Callable, Literal
+from uuid import UUID, uuid4
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, Query
-from fastapi.responses import StreamingResponse
-import httpx
-
-from models import Trip, TripCreate, TripUpdate, GalleryImage
-from repositories import TripRepository
-from services import GalleryService
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Path, Request, UploadFile, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from models import (
+    GalleryBatchUploadResponse,
+    GalleryImage,
+    GalleryUploadCommit,
+    GalleryUploadRequest,
+    GalleryUploadResult,
+    GalleryUploadSession,
+    GalleryUploadSessionCreate,
+    GalleryUploadTicket,
+    GeoPoint,
+    Trip,
+    TripCreate,
+    TripStatus,
+    TripUpdate,
+)
+from repositories import TripExistsError, TripRepository
+from services import (
+    ContactSheetService,
+    GalleryService,
+    Gazetteer,
+    IncompleteUploadError,
+    ToyClient,
+    ToyServiceError,
+    UploadSessionService,
+    contact_sheet_prefix,
+)
+from services.byte_range import RangeNotSatisfiableError
+from services.content_store import is_content_addressed
+from services.contact_sheet_service import FORMATS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/trip", tags=["Trip"])
 
+# Gallery metadata page size when collecting blobs of a deleted trip
+GALLERY_DELETE_PAGE_SIZE = 500
+
+# Files accepted by one multi-file gallery upload (committed in one metadata batch)
+GALLERY_UPLOAD_MAX_FILES = 50
+
+# Trips accepted by one bulk create
+TRIP_BATCH_MAX_ITEMS = 100
+# Trip writes of one bulk create in flight at a time
+TRIP_BATCH_CONCURRENCY = 8
+
+# Largest radius of GET /trip/nearby
+NEARBY_MAX_RADIUS_KM = 1000
+
 # Dependency injection placeholders (will be set in main.py)
 trip_repository: TripRepository | None = None
 gallery_service: GalleryService | None = None
 toy_service_url: str | None = None
+# None when toy validation is disabled
+toy_client: ToyClient | None = None
+contact_sheet_service: ContactSheetService | None = None
+upload_session_service: UploadSessionService | None = None
+# None when geocoding is disabled
+gazetteer: Gazetteer | None = None
+contact_sheet_max_images = 36
 
 
 def set_toy_service_url(url: str):
@@ -43,34 +90,179 @@ def get_gallery_svc() -> GalleryService:
     return gallery_service
 
 
-@router.post("", response_model=Trip, status_code=201)
-async def create_trip(
-    trip_data: TripCreate,
-    repo: TripRepository = Depends(get_trip_repo),
-) -> Trip:
+def get_contact_sheet_svc() -> ContactSheetService:
+    """Dependency to get contact sheet service instance."""
+    if contact_sheet_service is None:
+        raise RuntimeError("ContactSheetService not initialized")
+    return contact_sheet_service
+
+
+def get_upload_session_svc() -> UploadSessionService:
+    """Dependency to get upload session service instance."""
+    if upload_session_service is None:
+        raise RuntimeError("UploadSessionService not initialized")
+    return upload_session_service
+
+
+def get_toy_client() -> ToyClient | None:
+    """Dependency to get the toy service client (None when toy validation is disabled)."""
+    return toy_client
+
+
+async def _validate_toys(client: ToyClient | None, toy_ids: list[UUID]):
     """
-    Create a new trip for a toy.
+    Reject trips that reference toys which do not exist.
+
+    Args:
+        client: Toy service client, or None to skip validation
+        toy_ids: Referenced toy IDs
+
+    Raises:
+        HTTPException: 404 if a toy does not exist, 503 if the toy service cannot be reached
     """
-    # Create trip
+    if client is None:
+        return
+    try:
+        missing = await client.missing(toy_ids)
+    except ToyServiceError:
+        raise HTTPException(status_code=503, detail="Toy service unavailable")
+    if missing:
+        if len(toy_ids) == 1:
+            raise HTTPException(status_code=404, detail="Toy not found")
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Toys not found", "missing_toy_ids": sorted(str(toy_id) for toy_id in missing)},
+        )
+
+
+def _geocode(location_name: str, country_code: str) -> GeoPoint | None:
+    """Coordinates of a destination from the gazetteer (None if unknown or geocoding is disabled)."""
+    return gazetteer.geocode(location_name, country_code) if gazetteer else None
+
+
+def _new_trip(trip_data: TripCreate) -> Trip:
+    """Build a Trip from create data (trimmed text, optional explicit ID, geocoded location)."""
+    location_name = trip_data.location_name.strip()
     trip_kwargs = {
         "title": trip_data.title.strip(),
         "description": trip_data.description.strip() if trip_data.description else None,
-        "location_name": trip_data.location_name.strip(),
+        "location_name": location_name,
         "country_code": trip_data.country_code,
         "toy_id": trip_data.toy_id,
         "public_tracking_enabled": trip_data.public_tracking_enabled,
+        "location": trip_data.location or _geocode(location_name, trip_data.country_code),
     }
     if trip_data.id is not None:
         trip_kwargs["id"] = trip_data.id
+    return Trip(**trip_kwargs)
+
+
+@router.post("", response_model=Trip, status_code=201)
+async def create_trip(
+    trip_data: TripCreate,
+    repo: TripRepository = Depends(get_trip_repo),
+    toys: ToyClient | None = Depends(get_toy_client),
+) -> Trip:
+    """
+    Create a new trip for a toy.
 
-    trip = Trip(**trip_kwargs)
+    The toy must exist; the check is answered from the toy cache for known toys.
+    """
+    await _validate_toys(toys, [trip_data.toy_id])
 
-    created_trip = await repo.create(trip)
+    trip = _new_trip(trip_data)
+    try:
+        created_trip = await repo.create(trip)
+    except TripExistsError:
+        raise HTTPException(status_code=409, detail=f"Trip already exists: {trip.id}")
     logger.info(f"Created trip {created_trip.id} for toy {trip_data.toy_id}")
 
     return created_trip
 
 
+@router.post("/batch", response_model=list[Trip], status_code=201)
+async def create_trips(
+    trips_data: Annotated[list[TripCreate], Body(min_length=1, max_length=TRIP_BATCH_MAX_ITEMS)],
+    repo: TripRepository = Depends(get_trip_repo),
+    toys: ToyClient | None = Depends(get_toy_client),
+) -> list[Trip]:
+    """
+    Create several trips in one request (imports, seeding).
+
+    All referenced toys are validated with one batched lookup before any
+    trip is written. Trips are created independently, not atomically: when
+    some fail, the response lists the IDs that were created and those that
+    failed, so a retry can leave the created ones out. Trips whose IDs
+    already exist fail with 409.
+    """
+    explicit_ids = [trip_data.id for trip_data in trips_data if trip_data.id is not None]
+    if len(set(explicit_ids)) != len(explicit_ids):
+        raise HTTPException(status_code=400, detail="Trip IDs must be unique within a batch")
+
+    await _validate_toys(toys, list(dict.fromkeys(trip_data.toy_id for trip_data in trips_data)))
+
+    trips = [_new_trip(trip_data) for trip_data in trips_data]
+    # Bounded like gallery uploads, so one batch does not take over the shared connection pool
+    semaphore = asyncio.Semaphore(TRIP_BATCH_CONCURRENCY)
+
+    async def create(trip: Trip) -> Trip:
+        async with semaphore:
+            return await repo.create(trip)
+
+    outcomes = await asyncio.gather(*(create(trip) for trip in trips), return_exceptions=True)
+    failures = [(trip, outcome) for trip, outcome in zip(trips, outcomes) if isinstance(outcome, BaseException)]
+    if failures:
+        created_ids = [str(outcome.id) for outcome in outcomes if not isinstance(outcome, BaseException)]
+        conflict = all(isinstance(error, TripExistsError) for _, error in failures)
+        if not conflict:
+            for trip, error in failures:
+                logger.error(f"Failed to create trip {trip.id}: {error}")
+        logger.warning(f"Created {len(created_ids)} of {len(trips)} trips in batch")
+        raise HTTPException(
+            status_code=409 if conflict else 500,
+            detail={
+                "message": "Trips already exist" if conflict else "Failed to create trips",
+                "created": created_ids,
+                "failed": [str(trip.id) for trip, _ in failures],
+            },
+        )
+    logger.info(f"Created {len(outcomes)} trips")
+
+    return list(outcomes)
+
+
+@router.get("/nearby", response_model=dict)
+async def list_nearby_trips(
+    repo: TripRepository = Depends(get_trip_repo),
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the centre"),
+    lon: float = Query(..., ge=-180, le=180, description="Longitude of the centre"),
+    radius_km: float = Query(50, gt=0, le=NEARBY_MAX_RADIUS_KM, description="Search radius in kilometres"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum results"),
+    continuation_token: str | None = Query(None, description="Token from the previous page"),
+) -> dict:
+    """
+    List trips within a radius of a point, newest first.
+
+    Only trips with coordinates are found: given on create or update, or
+    looked up from location_name in the bundled gazetteer. Pages are linked
+    by continuation_token.
+
+    Global read access.
+    """
+    try:
+        trips, next_token = await repo.list_nearby(lat, lon, radius_km, limit, continuation_token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.debug(f"Listed {len(trips)} trips near ({lat}, {lon}) (more: {next_token is not None})")
+
+    return {
+        "items": trips,
+        "limit": limit,
+        "continuation_token": next_token,
+    }
+
+
 @router.get("/{trip_id}", response_model=Trip)
 async def get_trip(
     trip_id: UUID,
@@ -94,27 +286,47 @@ async def list_trips(
     repo: TripRepository = Depends(get_trip_repo),
     toy_id: UUID | None = Query(None, description="Filter by toy ID"),
     limit: int = Query(20, ge=1, le=1000, description="Maximum results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    continuation_token: str | None = Query(None, description="Token from the previous page"),
+    include_total: bool = Query(False, description="Also count the toy's trips (toy_id listings only)"),
+    country_code: str | None = Query(None, min_length=2, max_length=2, description="Filter by country code"),
+    status: TripStatus | None = Query(None, description="Filter by trip status"),
+    public_tracking_enabled: bool | None = Query(None, description="Filter by public tracking setting"),
 ) -> dict:
     """
-    List trips with optional filtering.
+    List trips with optional filtering, newest first.
+
+    With toy_id, lists that toy's trips; without it, lists trips across all
+    toys. Pages are linked by continuation_token instead of offset so every
+    page costs the same regardless of depth.
 
     Global read access.
     """
-    if toy_id:
-        trips, total = await repo.list_by_toy(toy_id, limit, offset)
-    else:
-        # For now, require at least one filter to prevent full table scan
-        raise HTTPException(status_code=400, detail="Must specify toy_id filter")
+    try:
+        if toy_id:
+            if country_code or status or public_tracking_enabled is not None:
+                raise HTTPException(status_code=400, detail="toy_id cannot be combined with global listing filters")
+            trips, next_token = await repo.list_by_toy(toy_id, limit, continuation_token)
+        else:
+            trips, next_token = await repo.list_trips(
+                limit,
+                continuation_token,
+                country_code=country_code.upper() if country_code else None,
+                status=status.value if status else None,
+                public_tracking_enabled=public_tracking_enabled,
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    logger.debug(f"Listed {len(trips)} trips (total: {total})")
+    logger.debug(f"Listed {len(trips)} trips (more: {next_token is not None})")
 
-    return {
+    response = {
         "items": trips,
-        "total": total,
         "limit": limit,
-        "offset": offset,
+        "continuation_token": next_token,
     }
+    if include_total and toy_id:
+        response["total"] = await repo.count_by_toy(toy_id)
+    return response
 
 
 @router.patch("/{trip_id}", response_model=Trip)
@@ -136,6 +348,13 @@ async def update_trip(
     if not updates:
         return trip  # No changes
 
+    if "location" not in updates and ("location_name" in updates or "country_code" in updates):
+        # Coordinates follow the destination; a place the gazetteer does not know clears them
+        location = _geocode(
+            updates.get("location_name", trip.location_name), updates.get("country_code", trip.country_code)
+        )
+        updates["location"] = location.model_dump() if location else None
+
     updated_trip = await repo.update(trip_id, updates)
     if not updated_trip:
         raise HTTPException(status_code=404, detail="Trip not found")
@@ -149,30 +368,92 @@ async def delete_trip(
     trip_id: UUID,
     repo: Annotated[TripRepository, Depends(get_trip_repo)],
     gallery_svc: Annotated[GalleryService, Depends(get_gallery_svc)],
+    sessions: Annotated[UploadSessionService, Depends(get_upload_session_svc)],
 ):
     """
-    Delete a trip.
+    Delete a trip and its gallery images.
+
+    Gallery blobs are deleted in batches first. If any of them fail, the
+    trip is kept and the failed blob names are returned, so the request can
+    be retried. Shared (content-addressed) blobs are released only after the
+    trip is gone, because releasing a reference twice would drop another
+    trip's image.
     """
     # Get existing trip
     trip = await repo.get_by_id(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
-    # Delete all gallery images
-    for image in trip.gallery:
-        await gallery_svc.delete_image(image.blob_name)
+    # Delete all gallery images (paged so large galleries are never loaded at once)
+    blob_names: list[str] = []
+    continuation_token = None
+    while True:
+        page = await repo.list_gallery(trip_id, GALLERY_DELETE_PAGE_SIZE, continuation_token)
+        if page is None:
+            break
+        images, continuation_token = page
+        blob_names += [image.blob_name for image in images]
+        if continuation_token is None:
+            break
+    # Everything else under the trip's prefix: contact sheets, uncommitted direct uploads, upload sessions
+    await sessions.discard_trip(trip_id)
+    shared = [name for name in blob_names if is_content_addressed(name)]
+    blob_names = list(dict.fromkeys(
+        [name for name in blob_names if not is_content_addressed(name)]
+        + await gallery_svc.list_blob_names(f"{trip_id}/")
+    ))
+    failed = await gallery_svc.delete_images(blob_names)
+    if failed:
+        # Keep the trip so its image metadata still lists the blobs; retrying the delete is safe
+        logger.error(f"Failed to delete {len(failed)} gallery blobs of trip {trip_id}; trip kept for retry")
+        raise HTTPException(
+            status_code=500,
+            detail={"message": "Failed to delete gallery images; retry the request", "failed_blobs": failed},
+        )
 
     # Delete trip from database
     deleted = await repo.delete(trip_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Trip not found")
 
+    # One release per image: two images of the trip may share a blob
+    unreleased = await gallery_svc.delete_images(shared)
+    if unreleased:
+        logger.error(f"Failed to release {len(unreleased)} shared gallery blobs of deleted trip {trip_id}")
+
     logger.info(f"Deleted trip {trip_id}")
 
 
 # Gallery endpoints
 
 
+@router.get("/{trip_id}/gallery", response_model=dict)
+async def list_gallery(
+    trip_id: UUID,
+    repo: TripRepository = Depends(get_trip_repo),
+    limit: int = Query(50, ge=1, le=500, description="Maximum results"),
+    continuation_token: str | None = Query(None, description="Token from the previous page"),
+) -> dict:
+    """
+    List gallery image metadata in upload order.
+
+    Global read access.
+    """
+    try:
+        page = await repo.list_gallery(trip_id, limit, continuation_token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    images, next_token = page
+    return {
+        "items": images,
+        "limit": limit,
+        "continuation_token": next_token,
+    }
+
+
 @router.post("/{trip_id}/gallery", response_model=Trip)
 async def upload_gallery_image(
     trip_id: UUID,
@@ -219,41 +500,374 @@ async def upload_gallery_image(
         raise HTTPException(status_code=500, detail="Failed to upload gallery image")
 
 
-@router.get("/{trip_id}/gallery/{image_id}")
-async def get_gallery_image(
+@router.post("/{trip_id}/gallery/batch", response_model=GalleryBatchUploadResponse)
+async def upload_gallery_images(
+    trip_id: UUID,
+    landmark: str | None = Query(None, max_length=200, description="Optional landmark name for all images"),
+    caption: str | None = Query(None, max_length=500, description="Optional caption for all images"),
+    files: list[UploadFile] = File(..., description="Gallery images (JPEG, PNG, or WebP)"),
+    repo: TripRepository = Depends(get_trip_repo),
+    gallery_svc: GalleryService = Depends(get_gallery_svc),
+) -> GalleryBatchUploadResponse:
+    """
+    Upload several gallery images in one request.
+
+    Files are stored concurrently (bounded by GALLERY_UPLOAD_CONCURRENCY) and
+    all stored images are added to the trip in one metadata write. A file
+    that fails validation or storage is reported in its result and does not
+    fail the others.
+    """
+    if len(files) > GALLERY_UPLOAD_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {GALLERY_UPLOAD_MAX_FILES} files per upload")
+
+    trip = await repo.get_by_id(trip_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    outcomes = await gallery_svc.upload_images(files, str(trip_id))
+
+    images: list[GalleryImage] = []
+    results: list[GalleryUploadResult] = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, ValueError):
+            results.append(GalleryUploadResult(filename=file.filename, error=str(outcome)))
+            continue
+        image = GalleryImage(landmark=landmark, blob_name=outcome, caption=caption, source="user")
+        images.append(image)
+        results.append(GalleryUploadResult(filename=file.filename, image=image))
+
+    if images:
+        try:
+            updated_trip = await repo.add_gallery_images(trip_id, images)
+        except Exception as e:
+            logger.error(f"Failed to add gallery images to trip {trip_id}: {e}")
+            updated_trip = None
+        if updated_trip is None:
+            # No metadata references the stored blobs; remove them so they do not leak
+            await asyncio.gather(*(gallery_svc.delete_image(image.blob_name) for image in images))
+            raise HTTPException(status_code=500, detail="Failed to upload gallery images")
+        trip = updated_trip
+
+    logger.info(f"Uploaded {len(images)} of {len(files)} gallery images for trip {trip_id}")
+    return GalleryBatchUploadResponse(trip=trip, results=results)
+
+
+@router.post("/{trip_id}/gallery/uploads", response_model=GalleryUploadTicket, status_code=201)
+async def create_gallery_upload(
+    trip_id: UUID,
+    upload: GalleryUploadRequest,
+    repo: TripRepository = Depends(get_trip_repo),
+    gallery_svc: GalleryService = Depends(get_gallery_svc),
+) -> GalleryUploadTicket:
+    """
+    Start a direct-to-storage gallery upload.
+
+    Returns a short-lived, write-only URL. The client PUTs the image bytes
+    there with the returned headers, then calls the commit endpoint with the
+    returned image ID. Image bytes never pass through the API.
+    """
+    trip = await repo.get_by_id(trip_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    image_id = uuid4()
+    try:
+        blob_name = gallery_svc.pending_blob_name(str(trip_id), str(image_id), upload.content_type)
+        upload_url, expires_at = await gallery_svc.create_upload_url(blob_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to create upload URL for trip {trip_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create upload URL")
+
+    logger.info(f"Created direct upload {image_id} for trip {trip_id}")
+    return GalleryUploadTicket(
+        image_id=image_id,
+        upload_url=upload_url,
+        upload_headers={"x-ms-blob-type": "BlockBlob", "x-ms-blob-content-type": upload.content_type},
+        expires_at=expires_at,
+    )
+
+
+@router.post("/{trip_id}/gallery/uploads/{image_id}/commit", response_model=Trip)
+async def commit_gallery_upload(
     trip_id: UUID,
     image_id: UUID,
+    commit: GalleryUploadCommit | None = None,
     repo: TripRepository = Depends(get_trip_repo),
     gallery_svc: GalleryService = Depends(get_gallery_svc),
+) -> Trip:
+    """
+    Add a directly uploaded image to the gallery.
+
+    The uploaded blob's size and content type are verified first; an invalid
+    upload is deleted. Committing an image that is already in the gallery
+    returns the trip unchanged, so the call can be retried, also concurrently:
+    the repository skips images that already exist.
+    """
+    commit = commit or GalleryUploadCommit()
+
+    trip = await repo.get_by_id(trip_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    if await repo.get_gallery_image(trip_id, image_id):
+        return trip
+
+    try:
+        blob_name = await gallery_svc.verify_upload(str(trip_id), str(image_id))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    image = GalleryImage(
+        image_id=image_id,
+        landmark=commit.landmark,
+        blob_name=blob_name,
+        caption=commit.caption,
+        source="user",
+    )
+    updated_trip = await repo.add_gallery_image(trip_id, image)
+    if not updated_trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    logger.info(f"Committed direct upload {image_id} for trip {trip_id}")
+    return updated_trip
+
+
+@router.post("/{trip_id}/gallery/sessions", response_model=GalleryUploadSession, status_code=201)
+async def create_upload_session(
+    trip_id: UUID,
+    upload: GalleryUploadSessionCreate,
+    repo: TripRepository = Depends(get_trip_repo),
+    sessions: UploadSessionService = Depends(get_upload_session_svc),
+) -> GalleryUploadSession:
+    """
+    Start a resumable gallery upload.
+
+    The image is then sent as `chunk_count` chunks of `chunk_size` bytes (the
+    last one shorter), in any order and with retries, and committed once all
+    chunks have arrived.
+    """
+    trip = await repo.get_by_id(trip_id)
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    try:
+        return await sessions.create(trip_id, upload.content_type, upload.size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{trip_id}/gallery/sessions/{session_id}", response_model=GalleryUploadSession)
+async def get_upload_session(
+    trip_id: UUID,
+    session_id: UUID,
+    sessions: UploadSessionService = Depends(get_upload_session_svc),
+) -> GalleryUploadSession:
+    """
+    Get a resumable upload with the chunks received so far.
+
+    A client resuming after an interruption sends only the chunks missing
+    from `received_chunks`.
+    """
+    try:
+        return await sessions.get(trip_id, session_id, with_received=True)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+
+
+@router.put("/{trip_id}/gallery/sessions/{session_id}/chunks/{index}", status_code=204)
+async def put_upload_chunk(
+    trip_id: UUID,
+    session_id: UUID,
+    request: Request,
+    index: int = Path(..., ge=0, description="Chunk index (0-based)"),
+    sessions: UploadSessionService = Depends(get_upload_session_svc),
 ):
     """
-    Download a gallery image.
+    Store one chunk of a resumable upload (raw bytes in the request body).
 
-    Global read access.
+    Sending a chunk again replaces it.
     """
-    # Get trip to verify image exists
+    try:
+        session = await sessions.get(trip_id, session_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+
+    # Stop reading as soon as the body is larger than any chunk can be
+    data = bytearray()
+    async for part in request.stream():
+        data += part
+        if len(data) > session.chunk_size:
+            raise HTTPException(status_code=413, detail=f"Chunks are at most {session.chunk_size} bytes")
+
+    try:
+        await sessions.put_chunk(session, index, bytes(data))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{trip_id}/gallery/sessions/{session_id}/commit", response_model=Trip)
+async def commit_upload_session(
+    trip_id: UUID,
+    session_id: UUID,
+    commit: GalleryUploadCommit | None = None,
+    repo: TripRepository = Depends(get_trip_repo),
+    sessions: UploadSessionService = Depends(get_upload_session_svc),
+) -> Trip:
+    """
+    Assemble a resumable upload and add the image to the gallery.
+
+    Fails with 409 and the missing chunk indexes if not all chunks have
+    arrived. The image gets the session ID as its image ID; committing again,
+    also concurrently, returns the trip unchanged.
+    """
+    commit = commit or GalleryUploadCommit()
+
     trip = await repo.get_by_id(trip_id)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
+    if await repo.get_gallery_image(trip_id, session_id):
+        return trip
+
+    try:
+        session = await sessions.get(trip_id, session_id)
+        blob_name = await sessions.complete(session)
+    except FileNotFoundError:
+        # A concurrent commit may have finished the session in the meantime
+        if await repo.get_gallery_image(trip_id, session_id):
+            return await repo.get_by_id(trip_id)
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    except IncompleteUploadError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "missing_chunks": e.missing})
+
+    image = GalleryImage(
+        image_id=session_id,
+        landmark=commit.landmark,
+        blob_name=blob_name,
+        caption=commit.caption,
+        source="user",
+    )
+    updated_trip = await repo.add_gallery_image(trip_id, image)
+    if not updated_trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    await sessions.finish(session)
+
+    logger.info(f"Committed upload session {session_id} for trip {trip_id} ({session.size} bytes)")
+    return updated_trip
+
+
+@router.delete("/{trip_id}/gallery/sessions/{session_id}", status_code=204)
+async def delete_upload_session(
+    trip_id: UUID,
+    session_id: UUID,
+    sessions: UploadSessionService = Depends(get_upload_session_svc),
+):
+    """Cancel a resumable upload and drop its chunks."""
+    try:
+        session = await sessions.get(trip_id, session_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    await sessions.discard(session)
+
+
+@router.get("/{trip_id}/gallery/contact-sheet")
+async def get_contact_sheet(
+    trip_id: UUID,
+    limit: int = Query(36, ge=1, description="Maximum number of images on the sheet"),
+    format: Literal["jpeg", "webp"] = Query("jpeg", description="Image format"),
+    if_none_match: str | None = Header(None),
+    repo: TripRepository = Depends(get_trip_repo),
+    sheet_svc: ContactSheetService = Depends(get_contact_sheet_svc),
+) -> Response:
+    """
+    Download one mosaic image of the first gallery images.
+
+    Global read access. The sheet is rendered once per gallery state and
+    served from blob storage afterwards; its ETag changes with the gallery.
+    """
+    if limit > contact_sheet_max_images:
+        raise HTTPException(status_code=400, detail=f"At most {contact_sheet_max_images} images per contact sheet")
+
+    page = await repo.list_gallery(trip_id, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Trip not found")
+    images, _ = page
+    if not images:
+        raise HTTPException(status_code=404, detail="Gallery is empty")
 
-    # Find image in gallery
-    image = next((img for img in trip.gallery if str(img.image_id) == str(image_id)), None)
+    # The blob name identifies the sheet content (size, gallery hash, format)
+    blob_name = sheet_svc.sheet_name(str(trip_id), limit, images, format)
+    etag = f'"{blob_name.removeprefix(contact_sheet_prefix(str(trip_id)))}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if if_none_match and etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        content = await sheet_svc.get(str(trip_id), limit, images, format)
+    except Exception as e:
+        logger.error(f"Failed to render contact sheet for trip {trip_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to render contact sheet")
+
+    return Response(content, media_type=FORMATS[format][1], headers=headers)
+
+
+@router.get("/{trip_id}/gallery/{image_id}")
+async def get_gallery_image(
+    trip_id: UUID,
+    image_id: UUID,
+    range_header: str | None = Header(None, alias="Range"),
+    if_range: str | None = Header(None),
+    repo: TripRepository = Depends(get_trip_repo),
+    gallery_svc: GalleryService = Depends(get_gallery_svc),
+):
+    """
+    Download a gallery image.
+
+    Global read access. The blob is resolved from a point read of the image
+    item; the trip document is not loaded. A single `Range` (with optional
+    `If-Range`) is answered with 206 and only those bytes are read from
+    storage.
+    """
+    image = await repo.get_gallery_image(trip_id, image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found in gallery")
 
     try:
-        # Stream image from blob storage
-        stream, content_type = await gallery_svc.stream_image(image.blob_name)
+        # Filesystem backend: let the server send the file directly (sendfile, no copy through Python);
+        # FileResponse answers Range and If-Range itself
+        path = gallery_svc.local_path(image.blob_name)
+        if path is not None:
+            if not path.is_file():
+                raise FileNotFoundError(image.blob_name)
+            return FileResponse(
+                path,
+                headers={"Cache-Control": "public, max-age=3600"},
+                filename=f"gallery-{image_id}{path.suffix}",
+                content_disposition_type="inline",
+            )
+
+        # Stream image (or the requested range of it) from blob storage
+        blob = await gallery_svc.open_image(image.blob_name, range_header, if_range)
 
         return StreamingResponse(
-            stream,
-            media_type=content_type,
+            blob.chunks,
+            status_code=blob.status_code,
+            media_type=blob.content_type,
             headers={
+                **blob.headers(),
                 "Cache-Control": "public, max-age=3600",  # 1 hour cache
                 "Content-Disposition": f'inline; filename="gallery-{image_id}.jpg"',
             },
         )
 
+    except RangeNotSatisfiableError as e:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": e.content_range})
     except FileNotFoundError:
         logger.error(f"Blob not found for image {image_id}: {image.blob_name}")
         raise HTTPException(status_code=404, detail="Image file not found")
@@ -272,23 +886,17 @@ async def delete_gallery_image(
     """
     Delete a gallery image.
     """
-    # Get existing trip
-    trip = await repo.get_by_id(trip_id)
-    if not trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
-
-    # Find image in gallery
-    image = next((img for img in trip.gallery if str(img.image_id) == str(image_id)), None)
+    image = await repo.get_gallery_image(trip_id, image_id)
     if not image:
         raise HTTPException(status_code=404, detail="Image not found in gallery")
 
-    # Delete blob from storage
-    await gallery_svc.delete_image(image.blob_name)
-
-    # Remove from trip gallery
+    # Release the blob only if this call removed the image: a concurrent or retried delete
+    # finds nothing to remove, so a shared blob is never released twice
     updated_trip = await repo.remove_gallery_image(trip_id, image_id)
     if not updated_trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
+        raise HTTPException(status_code=404, detail="Image not found in gallery")
+
+    await gallery_svc.delete_image(image.blob_name)
 
     logger.info(f"Deleted gallery image {image_id} from trip {trip_id}")
 
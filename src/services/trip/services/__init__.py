@@ -1,4 +1,35 @@
 """Service modules."""
 from services.gallery_service import GalleryService
+from services.contact_sheet_service import ContactSheetService, contact_sheet_prefix
+from services.credentials import (
+    SharedTokenCredential,
+    close_shared_credential,
+    get_shared_credential,
+    shared_credential_metrics,
+)
+from services.destination_stats_service import DestinationStatsService
+from services.filesystem_gallery_service import FilesystemGalleryService
+from services.gazetteer import Gazetteer
+from services.http_pool import HttpConnectionPool
+from services.toy_client import ToyClient, ToyServiceError
+from services.trip_stats_service import TripStatsService
+from services.upload_session_service import IncompleteUploadError, UploadSessionService
 
-__all__ = ["GalleryService"]
+__all__ = [
+    "ContactSheetService",
+    "DestinationStatsService",
+    "FilesystemGalleryService",
+    "GalleryService",
+    "Gazetteer",
+    "HttpConnectionPool",
+    "IncompleteUploadError",
+    "SharedTokenCredential",
+    "ToyClient",
+    "ToyServiceError",
+    "TripStatsService",
+    "UploadSessionService",
+    "close_shared_credential",
+    "contact_sheet_prefix",
+    "get_shared_credential",
+    "shared_credential_metrics",
+]
@@ -0,0 +1,196 @@
+"""Contact sheets: one composite thumbnail image per trip gallery.
+
+A trip overview would otherwise download every gallery image at full size to
+draw a grid of thumbnails. Instead, the first images of the gallery are
+rendered into one mosaic in a worker process (decoding and resizing is CPU
+bound and must not block the event loop), stored next to the gallery blobs,
+and served from there until the gallery changes.
+
+Sheets are keyed by the requested tile count and a hash of the images they
+show and the rendering parameters: `{trip_id}/contact-sheet-{limit}-{hash}.{ext}`.
+Any gallery change produces a new hash, so stale sheets are never served; they
+are replaced lazily on the next request and removed together with the trip.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any
+
+from models import GalleryImage
+
+logger = logging.getLogger(__name__)
+
+# Output formats: query value -> (Pillow format, content type, extension)
+FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+    "webp": ("WEBP", "image/webp", ".webp"),
+}
+
+
+def contact_sheet_prefix(trip_id: str) -> str:
+    """Blob name prefix shared by all contact sheets of a trip."""
+    return f"{trip_id}/contact-sheet-"
+
+
+def render_contact_sheet(images: list[bytes], tile_px: int, image_format: str, quality: int) -> bytes:
+    """
+    Render images into a square-tiled mosaic.
+
+    Runs in a worker process. Unreadable images leave their tile blank.
+
+    Args:
+        images: Encoded source images, in display order
+        tile_px: Edge length of one square tile
+        image_format: Pillow output format (JPEG or WEBP)
+        quality: Encoder quality (1-100)
+
+    Returns:
+        Encoded mosaic
+    """
+    # Imported in the worker only; the API process never decodes images
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    columns = max(1, math.ceil(math.sqrt(len(images))))
+    rows = max(1, math.ceil(len(images) / columns))
+    sheet = Image.new("RGB", (columns * tile_px, rows * tile_px), "white")
+    for index, data in enumerate(images):
+        try:
+            with Image.open(BytesIO(data)) as source:
+                # JPEG decoders can downscale while decoding, far cheaper than a full-size decode
+                source.draft("RGB", (tile_px * 2, tile_px * 2))
+                tile = ImageOps.fit(ImageOps.exif_transpose(source).convert("RGB"), (tile_px, tile_px))
+        except (UnidentifiedImageError, OSError, ValueError):
+            continue
+        sheet.paste(tile, ((index % columns) * tile_px, (index // columns) * tile_px))
+
+    output = BytesIO()
+    sheet.save(output, format=image_format, quality=quality)
+    return output.getvalue()
+
+
+class ContactSheetService:
+    """Renders, caches and serves gallery contact sheets."""
+
+    # Source images downloaded at the same time for one sheet
+    DOWNLOAD_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        gallery_service: Any,
+        workers: int = 2,
+        tile_px: int = 240,
+        quality: int = 80,
+    ):
+        """
+        Initialize the contact sheet service.
+
+        Args:
+            gallery_service: GalleryService or FilesystemGalleryService holding images and sheets
+            workers: Size of the rendering process pool
+            tile_px: Edge length of one thumbnail tile
+            quality: JPEG/WebP encoder quality
+        """
+        self.gallery_service = gallery_service
+        self.workers = workers
+        self.tile_px = tile_px
+        self.quality = quality
+        self._executor: ProcessPoolExecutor | None = None
+        # blob name -> rendering in progress, shared by concurrent requests for the same sheet
+        self._inflight: dict[str, asyncio.Task[bytes]] = {}
+
+    def sheet_name(self, trip_id: str, limit: int, images: list[GalleryImage], image_format: str) -> str:
+        """
+        Cache key of a sheet: blob name derived from the gallery content hash.
+
+        Args:
+            trip_id: Trip ID
+            limit: Requested maximum number of tiles
+            images: Images shown on the sheet, in display order
+            image_format: Key of FORMATS
+
+        Returns:
+            Blob name of the sheet
+        """
+        digest = hashlib.sha256(f"{self.tile_px}:{self.quality}".encode())
+        for image in images:
+            digest.update(f"|{image.image_id}:{image.blob_name}".encode())
+        return f"{contact_sheet_prefix(trip_id)}{limit}-{digest.hexdigest()[:32]}{FORMATS[image_format][2]}"
+
+    async def get(self, trip_id: str, limit: int, images: list[GalleryImage], image_format: str) -> bytes:
+        """
+        Return a trip's contact sheet, rendering and storing it on a cache miss.
+
+        Concurrent misses for the same sheet share one rendering.
+
+        Args:
+            trip_id: Trip ID
+            limit: Requested maximum number of tiles
+            images: Images to show (at most limit), in display order
+            image_format: Key of FORMATS
+
+        Returns:
+            Encoded sheet
+        """
+        blob_name = self.sheet_name(trip_id, limit, images, image_format)
+        try:
+            content, _ = await self.gallery_service.download_image(blob_name)
+            return content
+        except FileNotFoundError:
+            pass
+
+        task = self._inflight.get(blob_name)
+        if task is None:
+            task = asyncio.create_task(self._render_and_store(trip_id, limit, blob_name, images, image_format))
+            self._inflight[blob_name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(blob_name, None))
+        # Shielded: a disconnecting client must not cancel a rendering other requests wait for
+        return await asyncio.shield(task)
+
+    async def _render_and_store(
+        self, trip_id: str, limit: int, blob_name: str, images: list[GalleryImage], image_format: str
+    ) -> bytes:
+        """Download the source images, render in the process pool, store, and drop stale sheets."""
+        semaphore = asyncio.Semaphore(self.DOWNLOAD_CONCURRENCY)
+
+        async def download(image: GalleryImage) -> bytes:
+            async with semaphore:
+                try:
+                    content, _ = await self.gallery_service.download_image(image.blob_name)
+                except FileNotFoundError:
+                    logger.warning(f"Contact sheet source missing: {image.blob_name}")
+                    return b""
+                return content
+
+        sources = await asyncio.gather(*(download(image) for image in images))
+        pil_format, content_type, _ = FORMATS[image_format]
+        sheet = await asyncio.get_running_loop().run_in_executor(
+            self._pool(), render_contact_sheet, list(sources), self.tile_px, pil_format, self.quality
+        )
+        await self.gallery_service.put_blob(blob_name, sheet, content_type)
+
+        # Older sheets of the same size and format; other variants stay so they do not evict each other
+        stale = [
+            name
+            for name in await self.gallery_service.list_blob_names(f"{contact_sheet_prefix(trip_id)}{limit}-")
+            if name != blob_name and name.endswith(FORMATS[image_format][2])
+        ]
+        if stale:
+            await self.gallery_service.delete_images(stale)
+        logger.info(f"Rendered contact sheet {blob_name} from {len(images)} images ({len(sheet)} bytes)")
+        return sheet
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def close(self):
+        """Stop the rendering processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("Contact sheet workers stopped")
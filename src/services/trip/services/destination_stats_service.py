@@ -0,0 +1,249 @@
+"""Trips by country and location, materialized from the trip change feed.
+
+Grouping every trip by country_code and location_name on request would read
+the whole container. Instead, a background processor keeps one document per
+country with its trip count and per-location counts, so reading all
+destinations is one query returning one document per country.
+
+All documents live in a single view partition so that a trip moving between
+countries updates both countries and its ledger entry (what was counted for
+the trip) in one conditional batch; reapplying a change is a no-op (see
+FeedProcessor for checkpointing and rebuilds). One partition caps the write
+rate of the aggregate, which is far above the rate of trip changes.
+
+Periodic reconciliation compares the ledger with a full scan of the feed and
+re-applies the current state of every trip that differs, then recounts the
+country documents from the ledger. It repairs drift from missed deletions
+(for example Cosmos DB tombstones that expired while no processor ran)
+without the downtime of a rebuild.
+"""
+import logging
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from models import CountryDestinations, DestinationStats, LocationCount, Trip
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError
+from services.feed_processor import FeedProcessor
+
+logger = logging.getLogger(__name__)
+
+DESTINATIONS_PARTITION_PREFIX = "destinations:"
+DESTINATIONS_PARTITION = f"{DESTINATIONS_PARTITION_PREFIX}all"
+COUNTRY_PREFIX = "country:"
+TRIP_ENTRY_PREFIX = "trip:"
+
+
+def _contribution(trip: Trip | None) -> dict[str, Any] | None:
+    """Destination a trip counts towards (None for a deleted trip)."""
+    if trip is None:
+        return None
+    return {"country_code": trip.country_code, "location_name": trip.location_name}
+
+
+def _country_id(country_code: str) -> str:
+    """View document ID of a country."""
+    return f"{COUNTRY_PREFIX}{country_code}"
+
+
+def _new_country(country_code: str) -> dict[str, Any]:
+    """Country document before its first trip."""
+    return {
+        "id": _country_id(country_code),
+        VERSION_KEY: None,
+        "country_code": country_code,
+        "trip_count": 0,
+        "locations": {},
+    }
+
+
+def _entry_values(entry: dict[str, Any] | None) -> dict[str, Any] | None:
+    """What a ledger entry counted, without its ID and version."""
+    if entry is None:
+        return None
+    return {"country_code": entry["country_code"], "location_name": entry["location_name"]}
+
+
+class DestinationStatsService(FeedProcessor):
+    """Maintains and serves trip counts per country and location."""
+
+    partition_prefix = DESTINATIONS_PARTITION_PREFIX
+
+    def __init__(
+        self, repository: Any, batch_size: int = 100, poll_seconds: float = 5.0, reconcile_seconds: float = 3600.0
+    ):
+        """
+        Initialize the destinations service.
+
+        Args:
+            repository: Trip repository providing the change feed and view documents
+            batch_size: Changes read per feed request
+            poll_seconds: Pause of the background processor once the feed is drained
+            reconcile_seconds: Interval of the background reconciliation (0 disables it)
+        """
+        super().__init__(repository, batch_size=batch_size, poll_seconds=poll_seconds)
+        self.reconcile_seconds = reconcile_seconds
+        self._next_reconcile = time.monotonic() + reconcile_seconds
+
+    async def get(self, locations: int = 10) -> DestinationStats:
+        """
+        Read trip counts of all countries.
+
+        Args:
+            locations: Most visited locations to include per country
+
+        Returns:
+            Countries ordered by trip count, most visited first
+        """
+        docs = await self.repository.list_views(DESTINATIONS_PARTITION, COUNTRY_PREFIX)
+        countries = [
+            CountryDestinations(
+                country_code=doc["country_code"],
+                trip_count=doc["trip_count"],
+                location_count=len(doc["locations"]),
+                locations=[
+                    LocationCount(location_name=name, trip_count=count)
+                    for name, count in sorted(doc["locations"].items(), key=lambda item: (-item[1], item[0]))
+                ][:locations],
+            )
+            for doc in docs
+        ]
+        countries.sort(key=lambda country: (-country.trip_count, country.country_code))
+        return DestinationStats(
+            trip_count=sum(country.trip_count for country in countries),
+            countries=countries,
+            updated_at=max((doc["updated_at"] for doc in docs), default=None),
+        )
+
+    async def apply(self, change: TripChange):
+        """
+        Fold one feed change into the country documents (idempotent).
+
+        Args:
+            change: Trip change from the feed
+
+        Raises:
+            ViewConflictError: If the documents kept changing concurrently for MAX_ATTEMPTS rounds
+        """
+        await self._apply(change.trip_id, _contribution(change.trip))
+
+    async def reconcile(self) -> int:
+        """
+        Repair the aggregate against the change feed without dropping it.
+
+        Reads every trip once and the ledger twice, so it runs rarely.
+
+        Returns:
+            Number of trips and countries corrected
+        """
+        live: dict[str, dict[str, Any] | None] = {}
+        continuation = None
+        while True:
+            changes, next_continuation = await self.repository.read_changes(continuation, self.batch_size)
+            if next_continuation == continuation:
+                break
+            for change in changes:
+                live[change.trip_id] = _contribution(change.trip)
+            continuation = next_continuation
+
+        ledger = {
+            doc["id"].removeprefix(TRIP_ENTRY_PREFIX): _entry_values(doc)
+            for doc in await self.repository.list_views(DESTINATIONS_PARTITION, TRIP_ENTRY_PREFIX)
+        }
+        fixed = 0
+        for trip_id in live.keys() | ledger.keys():
+            if live.get(trip_id) != ledger.get(trip_id):
+                # The feed scan and the ledger are no single snapshot; apply the trip as it is now
+                trip = await self.repository.get_by_id(UUID(trip_id))
+                fixed += await self._apply(trip_id, _contribution(trip))
+        fixed += await self._recount_countries()
+        if fixed:
+            logger.warning(f"Destination reconciliation corrected {fixed} trips and countries")
+        return fixed
+
+    async def _after_round(self):
+        """Reconcile once the interval has passed."""
+        if self.reconcile_seconds and time.monotonic() >= self._next_reconcile:
+            self._next_reconcile = time.monotonic() + self.reconcile_seconds
+            await self.reconcile()
+
+    async def _apply(self, trip_id: str, contribution: dict[str, Any] | None) -> bool:
+        """Move a trip's count to its current destination; True if anything changed."""
+        entry_id = f"{TRIP_ENTRY_PREFIX}{trip_id}"
+        for _ in range(self.MAX_ATTEMPTS):
+            entry = (await self.repository.read_views(DESTINATIONS_PARTITION, [entry_id])).get(entry_id)
+            previous = _entry_values(entry)
+            if previous == contribution:
+                return False
+            codes = {values["country_code"] for values in (previous, contribution) if values is not None}
+            stored = await self.repository.read_views(DESTINATIONS_PARTITION, [_country_id(code) for code in codes])
+            countries = {code: stored.get(_country_id(code)) or _new_country(code) for code in codes}
+            if previous is not None:
+                self._count(countries[previous["country_code"]], previous["location_name"], -1)
+            if contribution is not None:
+                self._count(countries[contribution["country_code"]], contribution["location_name"], 1)
+
+            now = datetime.now(UTC).isoformat()
+            writes, deletes = [], []
+            for country in countries.values():
+                if country["trip_count"]:
+                    writes.append({**country, "updated_at": now})
+                elif country[VERSION_KEY] is not None:
+                    deletes.append(country)
+            if contribution is not None:
+                writes.append({**contribution, "id": entry_id, VERSION_KEY: entry[VERSION_KEY] if entry else None})
+            else:
+                deletes.append(entry)
+            try:
+                await self.repository.write_views(DESTINATIONS_PARTITION, writes, deletes)
+                return True
+            except ViewConflictError:
+                continue
+        raise ViewConflictError(f"Destinations kept changing; giving up on trip {trip_id}")
+
+    async def _recount_countries(self) -> int:
+        """Rewrite country documents whose counts differ from the ledger; returns how many."""
+        # Countries are read before the ledger: a change applied in between alters the versions
+        # of exactly the countries it touches, so their conditional rewrites fail instead of
+        # clobbering the change, and every other country is the same in both reads
+        countries = {
+            doc["country_code"]: doc for doc in await self.repository.list_views(DESTINATIONS_PARTITION, COUNTRY_PREFIX)
+        }
+        expected: dict[str, Counter] = {}
+        for entry in await self.repository.list_views(DESTINATIONS_PARTITION, TRIP_ENTRY_PREFIX):
+            expected.setdefault(entry["country_code"], Counter())[entry["location_name"]] += 1
+
+        fixed = 0
+        now = datetime.now(UTC).isoformat()
+        for code in countries.keys() | expected.keys():
+            locations = dict(expected.get(code, {}))
+            country = countries.get(code)
+            trip_count = sum(locations.values())
+            if country is not None and (country["trip_count"], country["locations"]) == (trip_count, locations):
+                continue
+            try:
+                if locations:
+                    rewritten = {
+                        **(country or _new_country(code)),
+                        "trip_count": trip_count,
+                        "locations": locations,
+                        "updated_at": now,
+                    }
+                    await self.repository.write_views(DESTINATIONS_PARTITION, [rewritten])
+                else:
+                    await self.repository.write_views(DESTINATIONS_PARTITION, [], [country])
+                fixed += 1
+            except ViewConflictError:
+                logger.info(f"Country {code} changed during reconciliation; left for the next round")
+        return fixed
+
+    @staticmethod
+    def _count(country: dict[str, Any], location_name: str, delta: int):
+        """Add a trip to (or remove one from) a country document."""
+        country["trip_count"] += delta
+        locations = country["locations"]
+        locations[location_name] = locations.get(location_name, 0) + delta
+        if not locations[location_name]:
+            del locations[location_name]
@@ -0,0 +1,142 @@
+"""Base of the read models maintained from the trip change feed.
+
+A processor reads the feed from its checkpoint, applies each change to its
+view documents and saves the new checkpoint after the changes it covers.
+Subclasses make apply() idempotent, so a crash between the two replays the
+changes harmlessly and several processors may run at once. A full rebuild
+drops the processor's view partitions, including the checkpoint, and replays
+the feed from the beginning; the feed returns the latest version of every
+trip, so the replay is as long as the number of trips, not the history.
+"""
+import asyncio
+import logging
+from typing import Any
+
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_ID = "checkpoint"
+
+
+class FeedProcessor:
+    """Applies the trip change feed to view documents under one partition prefix."""
+
+    # Prefix of every view partition of the processor (subclasses set it)
+    partition_prefix = ""
+    # Optimistic concurrency retries of one change
+    MAX_ATTEMPTS = 8
+
+    def __init__(self, repository: Any, batch_size: int = 100, poll_seconds: float = 5.0):
+        """
+        Initialize the processor.
+
+        Args:
+            repository: Trip repository providing the change feed and view documents
+            batch_size: Changes read per feed request
+            poll_seconds: Pause of the background processor once the feed is drained
+        """
+        self.repository = repository
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        # Checkpoint as last read or written; None until loaded
+        self._checkpoint: dict[str, Any] | None = None
+        # True once this processor has drained the feed: its views include every trip change
+        # up to then. Stays False on instances that do not run the processor.
+        self.caught_up = False
+
+    @property
+    def checkpoint_partition(self) -> str:
+        """View partition holding the feed position."""
+        return f"{self.partition_prefix}checkpoint"
+
+    async def apply(self, change: TripChange):
+        """
+        Fold one feed change into the views (idempotent).
+
+        Args:
+            change: Trip change from the feed
+        """
+        raise NotImplementedError
+
+    async def process_changes(self) -> int:
+        """
+        Apply all pending changes of the trip feed.
+
+        Returns:
+            Number of trip changes read
+        """
+        if self._checkpoint is None:
+            await self._load_checkpoint()
+        continuation = self._checkpoint.get("continuation")
+        processed = 0
+        while True:
+            changes, next_continuation = await self.repository.read_changes(continuation, self.batch_size)
+            if next_continuation == continuation:
+                self.caught_up = True
+                return processed
+            for change in changes:
+                await self.apply(change)
+            continuation = next_continuation
+            processed += len(changes)
+            # Pages without trip changes are not checkpointed: with Cosmos DB the checkpoint write
+            # is itself a feed item, and saving it for its own sake would never end
+            if changes:
+                await self._save_checkpoint(continuation)
+
+    async def rebuild(self) -> int:
+        """
+        Drop all views of the processor and rebuild them from the whole change feed.
+
+        Returns:
+            Number of trip changes read
+        """
+        self.caught_up = False
+        cleared = await self.repository.clear_views(self.partition_prefix)
+        self._checkpoint = {"id": CHECKPOINT_ID, VERSION_KEY: None}
+        logger.info(f"{type(self).__name__}: rebuilding ({cleared} view documents dropped)")
+        processed = await self.process_changes()
+        logger.info(f"{type(self).__name__}: rebuilt from {processed} trips")
+        return processed
+
+    async def run(self, rebuild: bool = False):
+        """
+        Background processor: apply feed changes until cancelled.
+
+        Args:
+            rebuild: Run a full rebuild first
+        """
+        while True:
+            try:
+                if rebuild:
+                    await self.rebuild()
+                    rebuild = False
+                processed = await self.process_changes()
+                if processed:
+                    logger.debug(f"{type(self).__name__}: applied {processed} trip changes")
+                await self._after_round()
+            except Exception as e:
+                # Not fatal: the next round resumes from the last checkpoint (or retries the rebuild)
+                logger.warning(f"{type(self).__name__}: update failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _after_round(self):
+        """Hook run by the background processor after each drained round."""
+        return None
+
+    async def _load_checkpoint(self):
+        """Read the saved feed position."""
+        docs = await self.repository.read_views(self.checkpoint_partition, [CHECKPOINT_ID])
+        self._checkpoint = docs.get(CHECKPOINT_ID) or {"id": CHECKPOINT_ID, VERSION_KEY: None}
+
+    async def _save_checkpoint(self, continuation: str | None):
+        """Save the feed position; on a conflict, continue from the position another processor saved."""
+        checkpoint = {**self._checkpoint, "continuation": continuation}
+        try:
+            await self.repository.write_views(self.checkpoint_partition, [checkpoint])
+        except ViewConflictError:
+            # Changes between the two positions are applied again, which is harmless
+            await self._load_checkpoint()
+            return
+        # Re-read for the new version (ETag) of the checkpoint
+        await self._load_checkpoint()
@@ -0,0 +1,379 @@
+"""Local filesystem storage for gallery images.
+
+Drop-in replacement for GalleryService on local and single-node deployments.
+Files use the same `{trip_id}/{uuid}.{ext}` layout as the blob container, are
+written atomically (temp file + rename), and expose their local path so routes
+can answer with `FileResponse`, letting the server use `sendfile` instead of
+copying image bytes through Python.
+"""
+import asyncio
+import logging
+import mimetypes
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from typing import Iterator
+from uuid import uuid4
+
+from fastapi import UploadFile
+
+from services.content_store import content_blob_name, file_refcount, is_content_addressed, read_hashed
+from services.gallery_service import GalleryService
+
+logger = logging.getLogger(__name__)
+
+
+class FilesystemGalleryService:
+    """Gallery image storage in a directory tree instead of a blob container."""
+
+    ALLOWED_CONTENT_TYPES = GalleryService.ALLOWED_CONTENT_TYPES
+    MAX_FILE_SIZE_BYTES = GalleryService.MAX_FILE_SIZE_BYTES
+
+    def __init__(
+        self, root: str, container_name: str, upload_concurrency: int = 8, content_addressed: bool = False
+    ):
+        """
+        Initialize filesystem gallery service.
+
+        Args:
+            root: Base directory for all containers
+            container_name: Sub-directory playing the role of the blob container
+            upload_concurrency: Maximum parallel writes of one upload_images call
+            content_addressed: Store uploads under their content hash, shared and reference counted
+        """
+        self.container_name = container_name
+        self.upload_concurrency = upload_concurrency
+        self.content_addressed = content_addressed
+        self.directory = (Path(root) / container_name).resolve()
+
+    async def warm_up(self):
+        """Create the container directory ahead of the first request."""
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+        logger.info(f"Using filesystem storage at '{self.directory}'")
+
+    def local_path(self, blob_name: str) -> Path:
+        """
+        Resolve a blob name to its file path.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Absolute path inside the container directory
+
+        Raises:
+            FileNotFoundError: If the name escapes the container directory
+        """
+        path = (self.directory / blob_name).resolve()
+        if not path.is_relative_to(self.directory):
+            raise FileNotFoundError(f"Invalid blob name: {blob_name}")
+        return path
+
+    async def upload_image(self, file: UploadFile, trip_id: str) -> str:
+        """
+        Store a gallery image.
+
+        Args:
+            file: Uploaded file from FastAPI
+            trip_id: Trip ID for organizing files
+
+        Returns:
+            Blob name (reference for database)
+
+        Raises:
+            ValueError: If file type or size is invalid
+        """
+        content_type = file.content_type
+        if content_type not in self.ALLOWED_CONTENT_TYPES:
+            raise ValueError(
+                f"Unsupported file type: {content_type}. Allowed: {', '.join(self.ALLOWED_CONTENT_TYPES)}"
+            )
+
+        if self.content_addressed:
+            return await self._upload_shared(file, content_type)
+
+        content = await file.read()
+        if len(content) > self.MAX_FILE_SIZE_BYTES:
+            raise ValueError(f"File size exceeds maximum of {self.MAX_FILE_SIZE_BYTES / 1024 / 1024}MB")
+
+        # Same naming as the blob container: {trip_id}/{uuid}.{extension}
+        extension = mimetypes.guess_extension(content_type) or ".jpg"
+        blob_name = f"{trip_id}/{uuid4()}{extension}"
+
+        await asyncio.to_thread(_write_atomic, self.local_path(blob_name), content)
+        logger.info(f"Stored gallery image: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
+    async def _upload_shared(self, file: UploadFile, content_type: str) -> str:
+        """Store an upload under its content hash; identical bytes reuse the existing file."""
+        content, digest = await read_hashed(file, self.MAX_FILE_SIZE_BYTES)
+        blob_name = content_blob_name(digest, content_type)
+        path = self.local_path(blob_name)
+
+        def acquire() -> bool:
+            with file_refcount(path) as refs:
+                written = refs.value == 0 or not path.is_file()
+                if written:
+                    _write_atomic(path, content)
+                refs.value += 1
+                refs.save()
+            return written
+
+        written = await asyncio.to_thread(acquire)
+        logger.info(f"{'Stored' if written else 'Reused'} gallery image: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
+    def _release(self, blob_name: str):
+        """Drop a reference to a shared file, deleting it with the last one (runs in a worker thread)."""
+        path = self.local_path(blob_name)
+        with file_refcount(path) as refs:
+            refs.value = max(0, refs.value - 1)
+            if refs.value == 0:
+                path.unlink(missing_ok=True)
+            refs.save()
+
+    # Same bounded fan-out as the blob service, writing through upload_image above
+    upload_images = GalleryService.upload_images
+
+    # Same naming as direct uploads to the blob container
+    pending_blob_name = GalleryService.pending_blob_name
+
+    async def create_upload_url(self, blob_name: str):
+        """Direct uploads need a blob container that accepts pre-signed URLs."""
+        raise NotImplementedError("Direct uploads require Blob Storage (BLOB_BACKEND=azure)")
+
+    async def verify_upload(self, trip_id: str, image_id: str) -> str:
+        """Direct uploads need a blob container that accepts pre-signed URLs."""
+        raise NotImplementedError("Direct uploads require Blob Storage (BLOB_BACKEND=azure)")
+
+    async def put_blob(self, blob_name: str, content: bytes, content_type: str):
+        """
+        Store generated content (e.g. a contact sheet) under a given name.
+
+        Args:
+            blob_name: Target blob name
+            content: Bytes to store
+            content_type: Ignored; served by extension like all files
+        """
+        await asyncio.to_thread(_write_atomic, self.local_path(blob_name), content)
+        logger.debug(f"Stored file: {blob_name} ({len(content)} bytes)")
+
+    async def list_blob_names(self, prefix: str) -> list[str]:
+        """
+        List blob names starting with a prefix.
+
+        Args:
+            prefix: Blob name prefix
+
+        Returns:
+            Matching blob names (temp files of in-progress writes excluded)
+        """
+        directory = self.local_path(prefix.rpartition("/")[0]) if "/" in prefix else self.directory
+
+        def scan() -> list[str]:
+            if not directory.is_dir():
+                return []
+            names = (path.relative_to(self.directory).as_posix() for path in directory.iterdir() if path.is_file())
+            return sorted(name for name in names if name.startswith(prefix) and not name.rpartition("/")[2].startswith("."))
+
+        return await asyncio.to_thread(scan)
+
+    def _blocks_directory(self, blob_name: str) -> Path:
+        """Hidden directory next to the target file holding its staged blocks."""
+        path = self.local_path(blob_name)
+        return path.parent / f".blocks-{path.name}"
+
+    async def stage_block(self, blob_name: str, block_id: str, data: bytes):
+        """
+        Store one block of a file without making it visible (resumable uploads).
+
+        Args:
+            blob_name: Target blob name
+            block_id: Block ID (file name inside the blocks directory)
+            data: Block content
+        """
+        await asyncio.to_thread(_write_atomic, self._blocks_directory(blob_name) / block_id, data)
+
+    async def staged_block_ids(self, blob_name: str) -> set[str]:
+        """
+        IDs of the staged blocks of a file.
+
+        Args:
+            blob_name: Target blob name
+
+        Returns:
+            Staged block IDs (empty if there are none)
+        """
+        directory = self._blocks_directory(blob_name)
+
+        def scan() -> set[str]:
+            if not directory.is_dir():
+                return set()
+            return {path.name for path in directory.iterdir() if not path.name.startswith(".")}
+
+        return await asyncio.to_thread(scan)
+
+    async def commit_blocks(self, blob_name: str, block_ids: list[str], content_type: str):
+        """
+        Concatenate staged blocks into the file atomically, then drop the blocks.
+
+        Args:
+            blob_name: Target blob name
+            block_ids: Staged block IDs in content order
+            content_type: Ignored; served by extension like all files
+        """
+        path = self.local_path(blob_name)
+        directory = self._blocks_directory(blob_name)
+
+        def assemble():
+            fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    for block_id in block_ids:
+                        with open(directory / block_id, "rb") as block:
+                            shutil.copyfileobj(block, handle)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_name, path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+            shutil.rmtree(directory, ignore_errors=True)
+
+        await asyncio.to_thread(assemble)
+        logger.info(f"Committed {len(block_ids)} blocks to {blob_name}")
+
+    async def discard_blocks(self, blob_name: str):
+        """Delete the staged blocks of a file."""
+        await asyncio.to_thread(shutil.rmtree, self._blocks_directory(blob_name), True)
+
+    async def download_image(self, blob_name: str) -> tuple[bytes, str]:
+        """
+        Read a gallery image.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Tuple of (image bytes, content type)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        path = self.local_path(blob_name)
+        try:
+            content = await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            raise FileNotFoundError(f"Gallery image not found: {blob_name}") from e
+        return content, self.content_type(blob_name)
+
+    async def delete_image(self, blob_name: str) -> bool:
+        """
+        Delete a gallery image.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            True if deleted, False if not found
+        """
+        try:
+            if is_content_addressed(blob_name):
+                await asyncio.to_thread(self._release, blob_name)
+            else:
+                await asyncio.to_thread(self.local_path(blob_name).unlink)
+        except (FileNotFoundError, OSError) as e:
+            logger.warning(f"Failed to delete file {blob_name}: {e}")
+            return False
+        logger.info(f"Deleted gallery image: {blob_name}")
+        return True
+
+    async def delete_images(self, blob_names: list[str]) -> list[str]:
+        """
+        Delete many gallery images in one worker thread call.
+
+        Files that are already gone count as deleted, matching the blob service.
+
+        Args:
+            blob_names: Blob references from database
+
+        Returns:
+            Blob names that could not be deleted (empty when all succeeded)
+        """
+
+        def delete_all() -> list[str]:
+            failed = []
+            for blob_name in blob_names:
+                try:
+                    if is_content_addressed(blob_name):
+                        self._release(blob_name)
+                    else:
+                        self.local_path(blob_name).unlink(missing_ok=True)
+                except OSError as e:
+                    logger.warning(f"Failed to delete file {blob_name}: {e}")
+                    failed.append(blob_name)
+            return failed
+
+        failed = await asyncio.to_thread(delete_all)
+        logger.info(f"Deleted {len(blob_names) - len(failed)} of {len(blob_names)} gallery images")
+        return failed
+
+    async def stream_image(self, blob_name: str) -> tuple[BytesIO, str]:
+        """
+        Read a gallery image into a stream (for callers that cannot use local_path).
+
+        Args:
+            blob_name: Blob reference from database
+
+        Returns:
+            Tuple of (BytesIO stream, content type)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        content, content_type = await self.download_image(blob_name)
+        return BytesIO(content), content_type
+
+    @contextmanager
+    def mmap_image(self, blob_name: str) -> Iterator[mmap.mmap]:
+        """
+        Memory-map a gallery image read-only, e.g. for image processing without a copy.
+
+        Args:
+            blob_name: Blob reference from database
+
+        Yields:
+            Read-only memory map of the file
+        """
+        with open(self.local_path(blob_name), "rb") as handle, mmap.mmap(
+            handle.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            yield mapped
+
+    @staticmethod
+    def content_type(blob_name: str) -> str:
+        """Content type derived from the file extension."""
+        return mimetypes.guess_type(blob_name)[0] or "application/octet-stream"
+
+    async def close(self):
+        """Nothing to release; present for API parity with GalleryService."""
+        return None
+
+
+def _write_atomic(path: Path, content: bytes):
+    """Write to a temp file in the target directory, fsync, then rename over the target."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
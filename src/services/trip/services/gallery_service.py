@@ -4,17 +4,30 @@ This module uses the async Azure Blob Storage SDK (azure.storage.blob.aio) which
 is designed for use with async frameworks like FastAPI. The async SDK provides
 native async/await support without blocking the event loop.
 """
+import asyncio
 import logging
 import mimetypes
+from datetime import UTC, datetime, timedelta
 from io import BytesIO
+from pathlib import Path
 from uuid import uuid4
 
-from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient
-from azure.storage.blob import ContentSettings
-from azure.core.exceptions import ServiceRequestError, ClientAuthenticationError  # type: ignore
+from azure.storage.blob import BlobBlock, BlobSasPermissions, ContentSettings, UserDelegationKey, generate_blob_sas
+from azure.core import MatchConditions
+from azure.core.exceptions import (  # type: ignore
+    ClientAuthenticationError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+)
 from fastapi import UploadFile
 
+from services.byte_range import BlobRange, RangeNotSatisfiableError, if_range_matches, parse_range, resolve_range
+from services.content_store import acquire_blob, content_blob_name, is_content_addressed, read_hashed, release_blob
+from services.credentials import get_shared_credential
+from services.http_pool import HttpConnectionPool
+
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -26,8 +39,25 @@ class GalleryService:
     # Supported image formats
     ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
     MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB (larger than avatars for high-quality trip photos)
-
-    def __init__(self, storage_account_url: str, container_name: str, credential: Any = None):
+    # Blob batch API limit of sub-requests per call
+    MAX_BATCH_DELETE = 256
+    # Parallel delete calls (batches, or single deletes when batching is unavailable)
+    DELETE_CONCURRENCY = 8
+    # Direct uploads: one user delegation key signs upload URLs for this long
+    USER_DELEGATION_KEY_LIFETIME = timedelta(hours=6)
+    # Upload URLs become valid slightly in the past to tolerate client clock skew
+    CLOCK_SKEW = timedelta(minutes=5)
+
+    def __init__(
+        self,
+        storage_account_url: str,
+        container_name: str,
+        credential: Any = None,
+        http_pool: HttpConnectionPool | None = None,
+        upload_concurrency: int = 8,
+        upload_url_ttl_seconds: int = 900,
+        content_addressed: bool = False,
+    ):
         """
         Initialize gallery service.
 
@@ -35,28 +65,44 @@ class GalleryService:
             storage_account_url: Storage account URL
             container_name: Container name for gallery images
             credential: Optional credential (key or TokenCredential)
+            http_pool: Optional connection pool providing the HTTP transport
+            upload_concurrency: Maximum parallel uploads of one upload_images call
+            upload_url_ttl_seconds: Lifetime of pre-signed direct upload URLs
+            content_addressed: Store uploads under their content hash, shared and reference counted
         """
         self.storage_account_url = storage_account_url
         self.container_name = container_name
         self.credential = credential
+        self.http_pool = http_pool
+        self.upload_concurrency = upload_concurrency
+        self.upload_url_ttl_seconds = upload_url_ttl_seconds
+        self.content_addressed = content_addressed
         self._client: BlobServiceClient | None = None
         self._container_client = None
+        self._delegation_key: UserDelegationKey | None = None
+        self._delegation_key_expiry: datetime | None = None
 
     async def _ensure_initialized(self):
         """Ensure blob service client and container are initialized."""
         if self._container_client is not None:
             return
 
+        # Pooled transport when configured, SDK default otherwise
+        transport_kwargs = {"transport": self.http_pool.create_transport("blob")} if self.http_pool else {}
+
         # Initialize async client
         if self.credential:
-            self._client = BlobServiceClient(account_url=self.storage_account_url, credential=self.credential)
+            self._client = BlobServiceClient(
+                account_url=self.storage_account_url, credential=self.credential, **transport_kwargs
+            )
         else:
             # Initialize async client with managed identity
-            # Exclude shared token cache to prevent home tenant confusion in multi-tenant scenarios
-            # Local: Uses Azure CLI (logged in with correct tenant)
-            # AKS: Uses Workload Identity / Managed Identity (federated identity)
-            credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
-            self._client = BlobServiceClient(account_url=self.storage_account_url, credential=credential)
+            # One credential per process: discovery and token acquisition happen once and
+            # tokens are refreshed in the background (see services/credentials.py)
+            credential = get_shared_credential()
+            self._client = BlobServiceClient(
+                account_url=self.storage_account_url, credential=credential, **transport_kwargs
+            )
 
         # Get container and create if it doesn't exist (for local development with emulator)
         self._container_client = self._client.get_container_client(self.container_name)
@@ -68,6 +114,19 @@ class GalleryService:
             pass
         logger.info(f"Connected to container '{self.container_name}'")
 
+    def local_path(self, blob_name: str) -> Path | None:
+        """Blobs have no local file; routes fall back to streaming (see FilesystemGalleryService)."""
+        return None
+
+    async def warm_up(self):
+        """
+        Open the storage connection ahead of the first request.
+
+        Initialization already performs a round trip to the container, which
+        also acquires the first access token when using managed identity.
+        """
+        await self._ensure_initialized()
+
     async def upload_image(self, file: UploadFile, trip_id: str) -> str:
         """
         Upload gallery image to blob storage.
@@ -91,6 +150,9 @@ class GalleryService:
                 f"Unsupported file type: {content_type}. Allowed: {', '.join(self.ALLOWED_CONTENT_TYPES)}"
             )
 
+        if self.content_addressed:
+            return await self._upload_shared(file, content_type)
+
         # Read file content and validate size
         content = await file.read()
         if len(content) > self.MAX_FILE_SIZE_BYTES:
@@ -120,6 +182,236 @@ class GalleryService:
         logger.info(f"Uploaded gallery image: {blob_name} ({len(content)} bytes)")
         return blob_name
 
+    async def _upload_shared(self, file: UploadFile, content_type: str) -> str:
+        """Store an upload under its content hash; identical bytes reuse the existing blob."""
+        content, digest = await read_hashed(file, self.MAX_FILE_SIZE_BYTES)
+        blob_name = content_blob_name(digest, content_type)
+        try:
+            written = await acquire_blob(self._container_client, blob_name, content, content_type)
+        except (ServiceRequestError, ClientAuthenticationError, TimeoutError) as e:  # network / auth layer
+            logger.error(f"Failed to upload gallery image (network/auth): {e}")
+            raise ValueError("Gallery image upload failed due to storage connectivity or authentication issue") from e
+
+        logger.info(f"{'Uploaded' if written else 'Reused'} gallery image: {blob_name} ({len(content)} bytes)")
+        return blob_name
+
+    async def upload_images(self, files: list[UploadFile], trip_id: str) -> list[str | ValueError]:
+        """
+        Upload several gallery images concurrently.
+
+        At most `upload_concurrency` uploads run at a time, so one large batch
+        does not take every pooled connection.
+
+        Args:
+            files: Uploaded files from FastAPI
+            trip_id: Trip ID for organizing blobs
+
+        Returns:
+            Blob name, or the ValueError raised by upload_image, for each file in input order
+        """
+        semaphore = asyncio.Semaphore(self.upload_concurrency)
+
+        async def upload(file: UploadFile) -> str | ValueError:
+            async with semaphore:
+                try:
+                    return await self.upload_image(file, trip_id)
+                except ValueError as e:
+                    return e
+
+        return list(await asyncio.gather(*(upload(file) for file in files)))
+
+    def pending_blob_name(self, trip_id: str, image_id: str, content_type: str) -> str:
+        """
+        Blob name of a directly uploaded image, derived from its future image ID.
+
+        Args:
+            trip_id: Trip ID for organizing blobs
+            image_id: ID of the pending image
+            content_type: Declared content type of the image
+
+        Returns:
+            Blob name (`{trip_id}/{image_id}.{extension}`)
+
+        Raises:
+            ValueError: If the content type is not allowed
+        """
+        if content_type not in self.ALLOWED_CONTENT_TYPES:
+            raise ValueError(
+                f"Unsupported file type: {content_type}. Allowed: {', '.join(self.ALLOWED_CONTENT_TYPES)}"
+            )
+        extension = mimetypes.guess_extension(content_type) or ".jpg"
+        return f"{trip_id}/{image_id}{extension}"
+
+    async def create_upload_url(self, blob_name: str) -> tuple[str, datetime]:
+        """
+        Create a short-lived, write-only URL for uploading a blob directly.
+
+        The SAS grants create permission only: it cannot read blobs, and it
+        cannot overwrite the blob once it exists, so an image cannot be swapped
+        after its commit was verified. With an account key the SAS is signed
+        locally; with Entra ID it is signed by a cached user delegation key.
+
+        Args:
+            blob_name: Target blob name (see pending_blob_name)
+
+        Returns:
+            Tuple of (upload URL, expiry time)
+        """
+        await self._ensure_initialized()
+
+        now = datetime.now(UTC)
+        expires_at = now + timedelta(seconds=self.upload_url_ttl_seconds)
+        signing = (
+            {"account_key": self.credential}
+            if isinstance(self.credential, str)
+            else {"user_delegation_key": await self._user_delegation_key(now, expires_at)}
+        )
+        sas = generate_blob_sas(
+            account_name=self._client.account_name,
+            container_name=self.container_name,
+            blob_name=blob_name,
+            permission=BlobSasPermissions(create=True),
+            start=now - self.CLOCK_SKEW,
+            expiry=expires_at,
+            **signing,
+        )
+        return f"{self._container_client.get_blob_client(blob_name).url}?{sas}", expires_at
+
+    async def _user_delegation_key(self, now: datetime, valid_until: datetime) -> UserDelegationKey:
+        """User delegation key valid until at least valid_until, fetched again only when needed."""
+        if self._delegation_key is None or self._delegation_key_expiry < valid_until:
+            expiry = now + self.USER_DELEGATION_KEY_LIFETIME
+            self._delegation_key = await self._client.get_user_delegation_key(now - self.CLOCK_SKEW, expiry)
+            self._delegation_key_expiry = expiry
+            logger.info(f"Fetched user delegation key valid until {expiry.isoformat()}")
+        return self._delegation_key
+
+    async def verify_upload(self, trip_id: str, image_id: str) -> str:
+        """
+        Check a directly uploaded image before it is added to the gallery.
+
+        An upload with a disallowed content type, a content type other than the
+        one it was requested for, or an invalid size is deleted.
+
+        Args:
+            trip_id: Trip ID for organizing blobs
+            image_id: ID of the pending image
+
+        Returns:
+            Blob name of the verified upload
+
+        Raises:
+            FileNotFoundError: If nothing was uploaded for the image
+            ValueError: If the upload is invalid (and has been deleted)
+        """
+        await self._ensure_initialized()
+
+        blob_names = await self.list_blob_names(f"{trip_id}/{image_id}.")
+        if not blob_names:
+            raise FileNotFoundError(f"No upload found for image {image_id}")
+        blob_name = blob_names[0]
+        try:
+            properties = await self._container_client.get_blob_client(blob_name).get_blob_properties()
+        except ResourceNotFoundError as e:
+            raise FileNotFoundError(f"No upload found for image {image_id}") from e
+
+        content_type = properties.content_settings.content_type
+        problem = None
+        if content_type not in self.ALLOWED_CONTENT_TYPES or (
+            self.pending_blob_name(trip_id, image_id, content_type) != blob_name
+        ):
+            problem = f"Uploaded content type {content_type} does not match the requested upload"
+        elif not 0 < properties.size <= self.MAX_FILE_SIZE_BYTES:
+            problem = f"File size must be between 1 byte and {self.MAX_FILE_SIZE_BYTES / 1024 / 1024}MB"
+        if problem:
+            await self.delete_image(blob_name)
+            raise ValueError(problem)
+
+        logger.info(f"Verified direct upload: {blob_name} ({properties.size} bytes)")
+        return blob_name
+
+    async def stage_block(self, blob_name: str, block_id: str, data: bytes):
+        """
+        Store one block of a blob without making it visible (resumable uploads).
+
+        Staging the same block ID again replaces the block, so retries are safe.
+        Uncommitted blocks are discarded by Blob Storage after seven days.
+
+        Args:
+            blob_name: Target blob name
+            block_id: Block ID; all blocks of a blob must use IDs of the same length
+            data: Block content
+        """
+        await self._ensure_initialized()
+        await self._container_client.get_blob_client(blob_name).stage_block(block_id, data, length=len(data))
+
+    async def staged_block_ids(self, blob_name: str) -> set[str]:
+        """
+        IDs of the uncommitted blocks of a blob.
+
+        Args:
+            blob_name: Target blob name
+
+        Returns:
+            Staged block IDs (empty if there are none)
+        """
+        await self._ensure_initialized()
+        try:
+            _, uncommitted = await self._container_client.get_blob_client(blob_name).get_block_list("uncommitted")
+        except ResourceNotFoundError:
+            return set()
+        return {block.id for block in uncommitted}
+
+    async def commit_blocks(self, blob_name: str, block_ids: list[str], content_type: str):
+        """
+        Assemble staged blocks into the blob, in the given order.
+
+        Args:
+            blob_name: Target blob name
+            block_ids: Staged block IDs in content order
+            content_type: Content type to serve the blob with
+        """
+        await self._ensure_initialized()
+        await self._container_client.get_blob_client(blob_name).commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids],
+            content_settings=ContentSettings(content_type=content_type),
+        )
+        logger.info(f"Committed {len(block_ids)} blocks to {blob_name}")
+
+    async def discard_blocks(self, blob_name: str):
+        """Uncommitted blocks cannot be deleted; Blob Storage drops them after seven days."""
+        return None
+
+    async def put_blob(self, blob_name: str, content: bytes, content_type: str):
+        """
+        Store generated content (e.g. a contact sheet) under a given name.
+
+        Args:
+            blob_name: Target blob name
+            content: Bytes to store
+            content_type: Content type to serve the blob with
+        """
+        await self._ensure_initialized()
+        await self._container_client.get_blob_client(blob_name).upload_blob(
+            data=content,
+            content_settings=ContentSettings(content_type=content_type),
+            overwrite=True,
+        )
+        logger.debug(f"Stored blob: {blob_name} ({len(content)} bytes)")
+
+    async def list_blob_names(self, prefix: str) -> list[str]:
+        """
+        List blob names starting with a prefix.
+
+        Args:
+            prefix: Blob name prefix
+
+        Returns:
+            Matching blob names
+        """
+        await self._ensure_initialized()
+        return [blob.name async for blob in self._container_client.list_blobs(name_starts_with=prefix)]
+
     async def download_image(self, blob_name: str) -> tuple[bytes, str]:
         """
         Download gallery image from blob storage.
@@ -164,6 +456,8 @@ class GalleryService:
         blob_client = self._container_client.get_blob_client(blob_name)
 
         try:
+            if is_content_addressed(blob_name):
+                return await release_blob(self._container_client, blob_name)
             await blob_client.delete_blob()
             logger.info(f"Deleted gallery image: {blob_name}")
             return True
@@ -171,6 +465,77 @@ class GalleryService:
             logger.warning(f"Failed to delete blob {blob_name}: {e}")
             return False
 
+    async def delete_images(self, blob_names: list[str]) -> list[str]:
+        """
+        Delete many gallery images with the Blob batch API.
+
+        Blobs are deleted MAX_BATCH_DELETE per call, with up to
+        DELETE_CONCURRENCY calls in flight. A blob that is already gone counts
+        as deleted, so retrying with the returned names is safe. When a batch
+        call itself fails (e.g. an emulator without batch support), its blobs
+        are deleted one by one instead. Shared (content-addressed) blobs are
+        released instead, one reference per name.
+
+        Args:
+            blob_names: Blob references from database
+
+        Returns:
+            Blob names that could not be deleted (empty when all succeeded)
+        """
+        await self._ensure_initialized()
+        semaphore = asyncio.Semaphore(self.DELETE_CONCURRENCY)
+
+        async def release(blob_name: str) -> bool:
+            async with semaphore:
+                return await self.delete_image(blob_name)
+
+        shared = [blob_name for blob_name in blob_names if is_content_addressed(blob_name)]
+        blob_names = [blob_name for blob_name in blob_names if not is_content_addressed(blob_name)]
+
+        async def delete_one(blob_name: str) -> bool:
+            async with semaphore:
+                try:
+                    await self._container_client.delete_blob(blob_name)
+                except ResourceNotFoundError:
+                    pass
+                except Exception as e:  # noqa: BLE001
+                    logger.warning(f"Failed to delete blob {blob_name}: {e}")
+                    return False
+                return True
+
+        async def delete_batch(chunk: list[str]) -> list[str]:
+            try:
+                async with semaphore:
+                    responses = [
+                        response
+                        async for response in await self._container_client.delete_blobs(
+                            *chunk, raise_on_any_failure=False
+                        )
+                    ]
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Blob batch delete failed, deleting {len(chunk)} blobs individually: {e}")
+                deleted = await asyncio.gather(*(delete_one(blob_name) for blob_name in chunk))
+                return [blob_name for blob_name, ok in zip(chunk, deleted) if not ok]
+            return [
+                blob_name
+                for blob_name, response in zip(chunk, responses)
+                if response.status_code not in (202, 404)
+            ]
+
+        chunks = [
+            blob_names[start : start + self.MAX_BATCH_DELETE]
+            for start in range(0, len(blob_names), self.MAX_BATCH_DELETE)
+        ]
+        results, released = await asyncio.gather(
+            asyncio.gather(*(delete_batch(chunk) for chunk in chunks)),
+            asyncio.gather(*(release(blob_name) for blob_name in shared)),
+        )
+        failed = [blob_name for chunk_failed in results for blob_name in chunk_failed]
+        failed += [blob_name for blob_name, ok in zip(shared, released) if not ok]
+        total = len(blob_names) + len(shared)
+        logger.info(f"Deleted {total - len(failed)} of {total} gallery images")
+        return failed
+
     async def stream_image(self, blob_name: str) -> tuple[BytesIO, str]:
         """
         Stream gallery image from blob storage (memory efficient).
@@ -187,6 +552,75 @@ class GalleryService:
         content, content_type = await self.download_image(blob_name)
         return BytesIO(content), content_type
 
+    async def open_image(
+        self, blob_name: str, range_header: str | None = None, if_range: str | None = None
+    ) -> BlobRange:
+        """
+        Open a gallery image for streaming, optionally only a byte range of it.
+
+        Without a range this is a single download request whose response also
+        carries the blob properties. With a range, the properties are read
+        first to resolve the range (and If-Range), then only the requested
+        bytes are downloaded, on condition that the blob still has the ETag
+        they were resolved against. If it was replaced in between, the whole
+        new blob is sent instead (200), never a range mixing two versions.
+
+        Args:
+            blob_name: Blob reference from database
+            range_header: Optional `Range` request header
+            if_range: Optional `If-Range` request header
+
+        Returns:
+            Range of the blob to send, with its chunk iterator
+
+        Raises:
+            FileNotFoundError: If blob doesn't exist
+            RangeNotSatisfiableError: If the range lies outside the blob
+        """
+        await self._ensure_initialized()
+
+        blob_client = self._container_client.get_blob_client(blob_name)
+        requested = parse_range(range_header)
+
+        try:
+            if requested is None:
+                downloader = await blob_client.download_blob()
+                properties = downloader.properties
+                start, end = 0, properties.size - 1
+            else:
+                properties = await blob_client.get_blob_properties()
+                start, end = 0, properties.size - 1
+                if not if_range or if_range_matches(if_range, properties.etag, properties.last_modified):
+                    start, end = resolve_range(requested, properties.size)
+                offset, length = (None, None) if (start, end) == (0, properties.size - 1) else (start, end - start + 1)
+                try:
+                    downloader = await blob_client.download_blob(
+                        offset=offset,
+                        length=length,
+                        etag=properties.etag,
+                        match_condition=MatchConditions.IfNotModified,
+                    )
+                except ResourceModifiedError:
+                    logger.info(f"Blob {blob_name} changed while opening a range; sending it whole")
+                    downloader = await blob_client.download_blob()
+                    properties = downloader.properties
+                    start, end = 0, properties.size - 1
+        except RangeNotSatisfiableError:
+            raise
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Failed to open blob {blob_name}: {e}")
+            raise FileNotFoundError(f"Gallery image not found: {blob_name}") from e
+
+        return BlobRange(
+            chunks=downloader.chunks(),
+            content_type=properties.content_settings.content_type or "application/octet-stream",
+            size=properties.size,
+            start=start,
+            end=end,
+            etag=properties.etag,
+            last_modified=properties.last_modified,
+        )
+
     async def close(self):
         """Close blob service client connection."""
         if self._client:
@@ -0,0 +1,64 @@
+"""Offline geocoding of trip destinations.
+
+Trips name their destination only as free text (location_name plus
+country_code). To place them on a map and answer nearby queries, trips
+created or moved without explicit coordinates are looked up in a gazetteer
+bundled with the service (`data/gazetteer.csv`: capitals and popular
+destinations). Lookups are local and synchronous, so geocoding adds no
+network call to the write path. Names match case- and accent-insensitively
+within the trip's country; unknown places keep no coordinates.
+"""
+import csv
+import logging
+import unicodedata
+from pathlib import Path
+
+from models import GeoPoint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GAZETTEER_PATH = Path(__file__).parent / "data" / "gazetteer.csv"
+
+
+def normalize_place_name(name: str) -> str:
+    """Lookup key of a place name: accents removed, case folded, whitespace collapsed."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(without_accents.casefold().split())
+
+
+class Gazetteer:
+    """Place name lookup loaded from a CSV file of name,country_code,latitude,longitude rows."""
+
+    def __init__(self, path: str | Path = DEFAULT_GAZETTEER_PATH):
+        """
+        Load the gazetteer.
+
+        Args:
+            path: CSV file; `#` lines are comments and names may list alternatives separated by `|`
+        """
+        self.path = Path(path)
+        self._places: dict[tuple[str, str], GeoPoint] = {}
+        with open(self.path, encoding="utf-8", newline="") as handle:
+            rows = csv.reader(line for line in handle if line.strip() and not line.startswith("#"))
+            for names, country_code, latitude, longitude in rows:
+                point = GeoPoint(coordinates=[float(longitude), float(latitude)])
+                for name in names.split("|"):
+                    self._places.setdefault((normalize_place_name(name), country_code.upper()), point)
+        logger.info(f"Loaded {len(self._places)} place names from {self.path}")
+
+    def __len__(self) -> int:
+        return len(self._places)
+
+    def geocode(self, location_name: str, country_code: str) -> GeoPoint | None:
+        """
+        Look up the coordinates of a place.
+
+        Args:
+            location_name: Place name as entered on the trip
+            country_code: ISO 3166-1 alpha-2 country code of the trip
+
+        Returns:
+            Coordinates, or None for an unknown place
+        """
+        return self._places.get((normalize_place_name(location_name), country_code.upper()))
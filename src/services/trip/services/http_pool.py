@@ -0,0 +1,112 @@
+"""Tunable aiohttp connection pool for the Azure SDK clients.
+
+By default every async Azure SDK client creates its own aiohttp session with
+default pool limits. This module builds transports from configured limits and,
+optionally, one session shared by the Cosmos and Blob clients, and reports pool
+saturation (open connections, queued waiters) for tuning.
+"""
+import logging
+from typing import Any
+
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+
+logger = logging.getLogger(__name__)
+
+
+class HttpConnectionPool:
+    """Factory for Azure SDK transports backed by configurable aiohttp connectors."""
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        per_host_limit: int = 0,
+        keepalive_seconds: float = 15.0,
+        dns_cache_seconds: int = 10,
+        shared_session: bool = True,
+    ):
+        """
+        Initialize the connection pool settings.
+
+        Args:
+            pool_size: Maximum simultaneous connections per session (0 = unlimited)
+            per_host_limit: Maximum simultaneous connections per host (0 = unlimited)
+            keepalive_seconds: How long idle connections are kept open
+            dns_cache_seconds: DNS cache TTL (0 disables DNS caching)
+            shared_session: Share one session across all SDK clients
+        """
+        self.pool_size = pool_size
+        self.per_host_limit = per_host_limit
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_cache_seconds = dns_cache_seconds
+        self.shared_session = shared_session
+        # name -> session; a single "shared" entry when sharing is enabled
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp session configured like the SDK default, with our pool limits."""
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.per_host_limit,
+            keepalive_timeout=self.keepalive_seconds,
+            use_dns_cache=self.dns_cache_seconds > 0,
+            ttl_dns_cache=self.dns_cache_seconds or None,
+        )
+        # Mirrors AioHttpTransport's own session: no cookies, SDK handles decompression
+        return aiohttp.ClientSession(
+            connector=connector,
+            trust_env=True,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            auto_decompress=False,
+        )
+
+    def create_transport(self, name: str) -> AioHttpTransport:
+        """
+        Create a transport for one SDK client.
+
+        Must be called from a running event loop.
+
+        Args:
+            name: Client name used for metrics when sessions are not shared
+
+        Returns:
+            AioHttpTransport that does not close the pooled session on client close
+        """
+        key = "shared" if self.shared_session else name
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[key] = session
+            logger.info(
+                f"Created HTTP pool '{key}' (limit={self.pool_size}, per_host={self.per_host_limit}, "
+                f"keepalive={self.keepalive_seconds}s, dns_ttl={self.dns_cache_seconds}s)"
+            )
+        return AioHttpTransport(session=session, session_owner=False)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return per-pool saturation metrics."""
+        pools = {}
+        for key, session in self._sessions.items():
+            connector = session.connector
+            if connector is None or connector.closed:
+                continue
+            # aiohttp keeps these as private attributes; read defensively
+            acquired = getattr(connector, "_acquired", ())
+            idle = getattr(connector, "_conns", {})
+            waiters = getattr(connector, "_waiters", {})
+            pools[key] = {
+                "limit": connector.limit,
+                "limit_per_host": connector.limit_per_host,
+                "in_use": len(acquired),
+                "idle": sum(len(conns) for conns in idle.values()),
+                "waiters": sum(len(queue) for queue in waiters.values()),
+            }
+        return pools
+
+    async def close(self):
+        """Close all pooled sessions."""
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+        logger.info("HTTP connection pools closed")
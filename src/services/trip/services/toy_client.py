@@ -0,0 +1,240 @@
+"""Toy service client with cached toy existence checks.
+
+Trips reference toys owned by the toy service. Asking the toy service on every
+trip write would add a cross-service round trip to each create, so the client
+keeps a TTL cache of toy IDs (found and missing ones), collapses concurrent
+lookups of the same ID into one request (single-flight), and resolves many IDs
+with one `POST /toy/lookup` call. One long-lived `httpx.AsyncClient` keeps
+connections to the toy service alive between requests.
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional "h2" package (httpx[http2]); without it the client speaks HTTP/1.1
+_H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ToyServiceError(Exception):
+    """The toy service could not answer a lookup."""
+
+
+class ToyClient:
+    """Toy service client: toy fetches and existence checks backed by a TTL cache."""
+
+    # POST /toy/lookup accepts at most this many IDs per call
+    MAX_LOOKUP_IDS = 100
+
+    def __init__(
+        self,
+        base_url: str,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 30.0,
+        max_entries: int = 10_000,
+        timeout_seconds: float = 5.0,
+        max_connections: int = 20,
+        keepalive_seconds: float = 15.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """
+        Initialize the toy client.
+
+        Args:
+            base_url: Toy service base URL
+            ttl_seconds: How long an existing toy is remembered
+            negative_ttl_seconds: How long a missing toy is remembered (short, so new toys show up quickly)
+            max_entries: Cache size; least recently used IDs are evicted first
+            timeout_seconds: Timeout of one lookup request
+            max_connections: Connection pool size towards the toy service
+            keepalive_seconds: Idle time before a pooled connection is closed
+            transport: Optional httpx transport (tests)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        # HTTP/2 is negotiated via ALPN, i.e. only for https:// toy service URLs
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=_H2_AVAILABLE,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_seconds,
+            ),
+            transport=transport,
+        )
+        # toy_id -> (exists, expires_at on the monotonic clock)
+        self._cache: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+        # toy_id -> lookup in progress; resolves to exists, or None when the lookup failed
+        self._inflight: dict[str, asyncio.Future[bool | None]] = {}
+        self._metrics = {
+            "cache_hits": 0,
+            "coalesced": 0,
+            "lookups": 0,
+            "looked_up_ids": 0,
+            "lookup_failures": 0,
+            "toy_fetches": 0,
+        }
+
+    async def exists(self, toy_id: UUID) -> bool:
+        """
+        Check whether a toy exists.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            True if the toy exists
+
+        Raises:
+            ToyServiceError: If the toy service cannot be reached
+        """
+        return not await self.missing([toy_id])
+
+    async def missing(self, toy_ids: list[UUID]) -> set[UUID]:
+        """
+        Find which of the given toys do not exist.
+
+        Cached IDs are answered locally, IDs already being looked up by another
+        request are awaited, and the rest are resolved with batched lookups.
+
+        Args:
+            toy_ids: UUIDs of the toys
+
+        Returns:
+            Set of the IDs that do not exist
+
+        Raises:
+            ToyServiceError: If the toy service cannot be reached
+        """
+        now = time.monotonic()
+        known: dict[str, bool] = {}
+        waiting: dict[str, asyncio.Future[bool | None]] = {}
+        to_fetch: list[str] = []
+        for toy_id in dict.fromkeys(str(toy_id) for toy_id in toy_ids):
+            cached = self._cached(toy_id, now)
+            if cached is not None:
+                self._metrics["cache_hits"] += 1
+                known[toy_id] = cached
+            elif toy_id in self._inflight:
+                self._metrics["coalesced"] += 1
+                waiting[toy_id] = self._inflight[toy_id]
+            else:
+                to_fetch.append(toy_id)
+
+        if to_fetch:
+            known.update(await self._fetch(to_fetch))
+
+        for toy_id, future in waiting.items():
+            exists = await future
+            if exists is None:
+                raise ToyServiceError("Toy lookup failed")
+            known[toy_id] = exists
+
+        return {UUID(toy_id) for toy_id, exists in known.items() if not exists}
+
+    async def get_toy(self, toy_id: UUID) -> dict[str, Any] | None:
+        """
+        Fetch a toy from the toy service.
+
+        The answer also refreshes the existence cache for the toy.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Toy as returned by GET /toy/{id}, or None if it does not exist
+
+        Raises:
+            ToyServiceError: If the toy service cannot be reached
+        """
+        self._metrics["toy_fetches"] += 1
+        try:
+            response = await self._client.get(f"/toy/{toy_id}")
+            if response.status_code != 404:
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            self._metrics["lookup_failures"] += 1
+            logger.error(f"Fetching toy {toy_id} failed: {e}")
+            raise ToyServiceError("Toy service unavailable") from e
+
+        exists = response.status_code != 404
+        self._store(str(toy_id), exists, time.monotonic())
+        return response.json() if exists else None
+
+    async def _fetch(self, toy_ids: list[str]) -> dict[str, bool]:
+        """Look up uncached IDs, publishing the result to concurrent waiters."""
+        loop = asyncio.get_running_loop()
+        futures: dict[str, asyncio.Future[bool | None]] = {toy_id: loop.create_future() for toy_id in toy_ids}
+        self._inflight.update(futures)
+        try:
+            found = await self._lookup(toy_ids)
+            now = time.monotonic()
+            result = {toy_id: toy_id in found for toy_id in toy_ids}
+            for toy_id, exists in result.items():
+                self._store(toy_id, exists, now)
+                futures[toy_id].set_result(exists)
+            return result
+        finally:
+            for toy_id, future in futures.items():
+                # Failed or cancelled: waiters see None and report the failure themselves
+                if not future.done():
+                    future.set_result(None)
+                self._inflight.pop(toy_id, None)
+
+    async def _lookup(self, toy_ids: list[str]) -> set[str]:
+        """Resolve IDs with POST /toy/lookup, MAX_LOOKUP_IDS per call."""
+        chunks = [
+            toy_ids[start : start + self.MAX_LOOKUP_IDS] for start in range(0, len(toy_ids), self.MAX_LOOKUP_IDS)
+        ]
+        self._metrics["lookups"] += len(chunks)
+        self._metrics["looked_up_ids"] += len(toy_ids)
+        try:
+            responses = await asyncio.gather(
+                *(self._client.post("/toy/lookup", json={"ids": chunk}) for chunk in chunks)
+            )
+            for response in responses:
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            self._metrics["lookup_failures"] += 1
+            logger.error(f"Toy lookup of {len(toy_ids)} IDs failed: {e}")
+            raise ToyServiceError("Toy service unavailable") from e
+        return {str(toy_id) for response in responses for toy_id in response.json()["found"]}
+
+    def _cached(self, toy_id: str, now: float) -> bool | None:
+        """Cached existence of a toy, or None when unknown or expired."""
+        entry = self._cache.get(toy_id)
+        if entry is None:
+            return None
+        exists, expires_at = entry
+        if expires_at <= now:
+            del self._cache[toy_id]
+            return None
+        self._cache.move_to_end(toy_id)
+        return exists
+
+    def _store(self, toy_id: str, exists: bool, now: float):
+        """Remember a lookup result, evicting the least recently used entries."""
+        ttl = self.ttl_seconds if exists else self.negative_ttl_seconds
+        self._cache[toy_id] = (exists, now + ttl)
+        self._cache.move_to_end(toy_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def metrics(self) -> dict[str, Any]:
+        """Cache and lookup counters for the /metrics endpoint."""
+        return {**self._metrics, "cached_ids": len(self._cache), "inflight_ids": len(self._inflight)}
+
+    async def close(self):
+        """Close the pooled connections."""
+        await self._client.aclose()
+        logger.info("Toy service client closed")
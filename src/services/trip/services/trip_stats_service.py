@@ -0,0 +1,146 @@
+"""Per-toy trip statistics materialized from the trip change feed.
+
+Counting a toy's trips, images and countries on request would read every trip
+of the toy. Instead, a background processor folds the trip change feed into
+one summary document per toy (trip count, image count, countries, newest
+trip). Reading the statistics is then one point read.
+
+Next to the summary, each toy's view partition keeps a ledger entry per trip
+with the values last counted for it. A change only applies the difference
+between the trip and its ledger entry, and the summary and the entry are
+written in one conditional batch, so reapplying a change is a no-op (see
+FeedProcessor for checkpointing and rebuilds).
+"""
+import logging
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from models import ToyTripStats, Trip
+from repositories.views import VERSION_KEY, TripChange, ViewConflictError
+from services.feed_processor import FeedProcessor
+
+logger = logging.getLogger(__name__)
+
+STATS_PARTITION_PREFIX = "toy-stats:"
+SUMMARY_ID = "summary"
+TRIP_ENTRY_PREFIX = "trip:"
+
+
+def stats_partition(toy_id: UUID | str) -> str:
+    """View partition holding a toy's summary and trip ledger."""
+    return f"{STATS_PARTITION_PREFIX}{toy_id}"
+
+
+def _contribution(trip: Trip | None) -> dict[str, Any] | None:
+    """Values a trip adds to its toy's statistics (None for a deleted trip)."""
+    if trip is None:
+        return None
+    return {"country_code": trip.country_code, "image_count": trip.gallery_count, "created_at": trip.created_at.isoformat()}
+
+
+class TripStatsService(FeedProcessor):
+    """Maintains and serves per-toy trip statistics."""
+
+    partition_prefix = STATS_PARTITION_PREFIX
+
+    async def get(self, toy_id: UUID) -> ToyTripStats:
+        """
+        Read the statistics of a toy.
+
+        Args:
+            toy_id: UUID of the toy
+
+        Returns:
+            Statistics (all zero for a toy without processed trips)
+        """
+        summary = (await self.repository.read_views(stats_partition(toy_id), [SUMMARY_ID])).get(SUMMARY_ID)
+        if summary is None:
+            return ToyTripStats(toy_id=toy_id)
+        return ToyTripStats(
+            toy_id=toy_id,
+            trip_count=summary["trip_count"],
+            image_count=summary["image_count"],
+            countries=sorted(summary["countries"]),
+            last_trip_at=summary["last_trip_at"],
+            updated_at=summary["updated_at"],
+        )
+
+    async def apply(self, change: TripChange):
+        """
+        Fold one feed change into its toy's statistics (idempotent).
+
+        Args:
+            change: Trip change from the feed
+
+        Raises:
+            ViewConflictError: If the documents kept changing concurrently for MAX_ATTEMPTS rounds
+        """
+        partition = stats_partition(change.toy_id)
+        entry_id = f"{TRIP_ENTRY_PREFIX}{change.trip_id}"
+        contribution = _contribution(change.trip)
+        for _ in range(self.MAX_ATTEMPTS):
+            docs = await self.repository.read_views(partition, [SUMMARY_ID, entry_id])
+            entry = docs.get(entry_id)
+            previous = {key: value for key, value in entry.items() if key not in {"id", VERSION_KEY}} if entry else None
+            if previous == contribution:
+                return
+            summary = docs.get(SUMMARY_ID) or {
+                "id": SUMMARY_ID,
+                VERSION_KEY: None,
+                "trip_count": 0,
+                "image_count": 0,
+                "countries": {},
+                "last_trip_at": None,
+            }
+            if previous is not None:
+                self._subtract(summary, previous)
+                if contribution is None and previous["created_at"] == summary["last_trip_at"]:
+                    summary["last_trip_at"] = await self._newest_other_trip(partition, entry_id)
+            if contribution is not None:
+                self._add(summary, contribution)
+            summary["updated_at"] = datetime.now(UTC).isoformat()
+
+            writes = [summary]
+            deletes = []
+            if contribution is not None:
+                writes.append({**contribution, "id": entry_id, VERSION_KEY: entry[VERSION_KEY] if entry else None})
+            else:
+                deletes.append(entry)
+            try:
+                await self.repository.write_views(partition, writes, deletes)
+                return
+            except ViewConflictError:
+                continue
+        raise ViewConflictError(f"Statistics of toy {change.toy_id} kept changing; giving up on trip {change.trip_id}")
+
+    @staticmethod
+    def _add(summary: dict[str, Any], contribution: dict[str, Any]):
+        """Count a trip in a summary."""
+        summary["trip_count"] += 1
+        summary["image_count"] += contribution["image_count"]
+        countries = summary["countries"]
+        countries[contribution["country_code"]] = countries.get(contribution["country_code"], 0) + 1
+        if summary["last_trip_at"] is None or datetime.fromisoformat(contribution["created_at"]) > datetime.fromisoformat(
+            summary["last_trip_at"]
+        ):
+            summary["last_trip_at"] = contribution["created_at"]
+
+    @staticmethod
+    def _subtract(summary: dict[str, Any], previous: dict[str, Any]):
+        """Uncount a trip from a summary (the newest trip date is left to the caller)."""
+        summary["trip_count"] -= 1
+        summary["image_count"] -= previous["image_count"]
+        countries = summary["countries"]
+        countries[previous["country_code"]] -= 1
+        if not countries[previous["country_code"]]:
+            del countries[previous["country_code"]]
+
+    async def _newest_other_trip(self, partition: str, entry_id: str) -> str | None:
+        """Creation time of the newest trip in a toy's ledger apart from one entry (after its newest trip is gone)."""
+        created = [
+            datetime.fromisoformat(doc["created_at"])
+            for doc in await self.repository.list_views(partition, TRIP_ENTRY_PREFIX)
+            if doc["id"] != entry_id
+        ]
+        return max(created).isoformat() if created else None
@@ -0,0 +1,228 @@
+"""Resumable gallery uploads built on staged blob blocks.
+
+An image is sent in fixed-size chunks. Each chunk is staged as one block of
+the final blob, so a retry after a dropped connection only sends the chunks
+that are missing, and the client can ask which chunks arrived. The commit
+assembles the blocks in order (Put Block List) and adds the gallery image.
+
+Sessions are stored as small JSON blobs next to the gallery
+(`{trip_id}/upload-{session_id}.json`), so any instance can serve any chunk,
+and trip deletion removes them with the trip's other blobs. The received
+chunks are not written to the session; they are read from the staged block
+list, so parallel chunk uploads never contend on session state.
+"""
+import logging
+import math
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+from models import GalleryUploadSession
+
+logger = logging.getLogger(__name__)
+
+
+class IncompleteUploadError(ValueError):
+    """Commit of a session whose chunks have not all arrived."""
+
+    def __init__(self, missing: list[int]):
+        super().__init__(f"{len(missing)} chunks are missing")
+        self.missing = missing
+
+
+def upload_session_prefix(trip_id: str) -> str:
+    """Blob name prefix shared by all upload sessions of a trip."""
+    return f"{trip_id}/upload-"
+
+
+class UploadSessionService:
+    """Creates, tracks and commits resumable gallery uploads."""
+
+    # Session metadata never changes after creation; recently used sessions are kept in memory
+    CACHE_ENTRIES = 1024
+
+    def __init__(self, gallery_service: Any, chunk_size: int = 1024 * 1024, ttl_seconds: int = 86_400):
+        """
+        Initialize the upload session service.
+
+        Args:
+            gallery_service: GalleryService or FilesystemGalleryService storing blocks and sessions
+            chunk_size: Size of every chunk except the last
+            ttl_seconds: Session lifetime (Blob Storage drops uncommitted blocks after seven days)
+        """
+        self.gallery_service = gallery_service
+        self.chunk_size = chunk_size
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, GalleryUploadSession] = OrderedDict()
+
+    @staticmethod
+    def block_id(index: int) -> str:
+        """Block ID of a chunk; fixed length, as Blob Storage requires within one blob."""
+        return f"{index:06d}"
+
+    def blob_name(self, session: GalleryUploadSession) -> str:
+        """Name of the blob the session assembles."""
+        return self.gallery_service.pending_blob_name(
+            str(session.trip_id), str(session.session_id), session.content_type
+        )
+
+    async def create(self, trip_id: UUID, content_type: str, size: int) -> GalleryUploadSession:
+        """
+        Start a resumable upload.
+
+        Args:
+            trip_id: Trip the image is uploaded to
+            content_type: Content type of the image
+            size: Total image size in bytes
+
+        Returns:
+            New session
+
+        Raises:
+            ValueError: If the content type or size is not allowed
+        """
+        max_size = self.gallery_service.MAX_FILE_SIZE_BYTES
+        if size > max_size:
+            raise ValueError(f"File size exceeds maximum of {max_size / 1024 / 1024}MB")
+
+        session = GalleryUploadSession(
+            session_id=uuid4(),
+            trip_id=trip_id,
+            content_type=content_type,
+            size=size,
+            chunk_size=self.chunk_size,
+            chunk_count=math.ceil(size / self.chunk_size),
+            expires_at=datetime.now(UTC) + timedelta(seconds=self.ttl_seconds),
+        )
+        # Validates the content type before anything is stored
+        self.blob_name(session)
+        await self.gallery_service.put_blob(
+            self._session_blob_name(str(trip_id), str(session.session_id)),
+            session.model_dump_json(exclude={"received_chunks"}).encode(),
+            "application/json",
+        )
+        self._remember(session)
+        logger.info(f"Created upload session {session.session_id} for trip {trip_id} ({session.chunk_count} chunks)")
+        return session
+
+    async def get(self, trip_id: UUID, session_id: UUID, with_received: bool = False) -> GalleryUploadSession:
+        """
+        Load a session.
+
+        Args:
+            trip_id: Trip the image is uploaded to
+            session_id: Session ID
+            with_received: Also fill received_chunks from the staged blocks
+
+        Returns:
+            Session
+
+        Raises:
+            FileNotFoundError: If the session does not exist or has expired
+        """
+        key = str(session_id)
+        session = self._sessions.get(key)
+        if session is None:
+            try:
+                content, _ = await self.gallery_service.download_image(self._session_blob_name(str(trip_id), key))
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Upload session not found: {session_id}") from None
+            session = GalleryUploadSession.model_validate_json(content)
+            self._remember(session)
+        else:
+            self._sessions.move_to_end(key)
+
+        if session.trip_id != trip_id:
+            raise FileNotFoundError(f"Upload session not found: {session_id}")
+        if session.expires_at <= datetime.now(UTC):
+            await self.discard(session)
+            raise FileNotFoundError(f"Upload session expired: {session_id}")
+
+        if with_received:
+            staged = await self.gallery_service.staged_block_ids(self.blob_name(session))
+            session = session.model_copy(
+                update={"received_chunks": [i for i in range(session.chunk_count) if self.block_id(i) in staged]}
+            )
+        return session
+
+    async def put_chunk(self, session: GalleryUploadSession, index: int, data: bytes):
+        """
+        Store one chunk. Sending a chunk again replaces it.
+
+        Args:
+            session: Session
+            index: Chunk index (0-based)
+            data: Chunk content; chunk_size bytes, except for the last chunk
+
+        Raises:
+            ValueError: If the index or length is wrong
+        """
+        if not 0 <= index < session.chunk_count:
+            raise ValueError(f"Chunk index must be between 0 and {session.chunk_count - 1}")
+        expected = min(session.chunk_size, session.size - index * session.chunk_size)
+        if len(data) != expected:
+            raise ValueError(f"Chunk {index} must be {expected} bytes, got {len(data)}")
+        await self.gallery_service.stage_block(self.blob_name(session), self.block_id(index), data)
+
+    async def complete(self, session: GalleryUploadSession) -> str:
+        """
+        Assemble the chunks into the image blob.
+
+        A blob that was already assembled by an earlier, interrupted commit is
+        kept, so the commit can be retried.
+
+        Args:
+            session: Session
+
+        Returns:
+            Blob name of the image
+
+        Raises:
+            IncompleteUploadError: If chunks are missing
+        """
+        blob_name = self.blob_name(session)
+        if blob_name in await self.gallery_service.list_blob_names(blob_name):
+            return blob_name
+
+        staged = await self.gallery_service.staged_block_ids(blob_name)
+        block_ids = [self.block_id(index) for index in range(session.chunk_count)]
+        missing = [index for index, block_id in enumerate(block_ids) if block_id not in staged]
+        if missing:
+            raise IncompleteUploadError(missing)
+
+        await self.gallery_service.commit_blocks(blob_name, block_ids, session.content_type)
+        return blob_name
+
+    async def finish(self, session: GalleryUploadSession):
+        """Remove the session record once its image is in the gallery."""
+        self._sessions.pop(str(session.session_id), None)
+        await self.gallery_service.delete_image(
+            self._session_blob_name(str(session.trip_id), str(session.session_id))
+        )
+
+    async def discard(self, session: GalleryUploadSession):
+        """Cancel a session: drop its staged chunks and its record."""
+        await self.gallery_service.discard_blocks(self.blob_name(session))
+        await self.finish(session)
+        logger.info(f"Discarded upload session {session.session_id}")
+
+    async def discard_trip(self, trip_id: UUID):
+        """Drop the staged chunks of all sessions of a trip (records go with the trip's blobs)."""
+        for name in await self.gallery_service.list_blob_names(upload_session_prefix(str(trip_id))):
+            session_id = name.removeprefix(upload_session_prefix(str(trip_id))).removesuffix(".json")
+            try:
+                session = await self.get(trip_id, UUID(session_id))
+            except (FileNotFoundError, ValueError):
+                continue
+            await self.gallery_service.discard_blocks(self.blob_name(session))
+
+    def _session_blob_name(self, trip_id: str, session_id: str) -> str:
+        """Blob name of a session record."""
+        return f"{upload_session_prefix(trip_id)}{session_id}.json"
+
+    def _remember(self, session: GalleryUploadSession):
+        """Cache a session, evicting the least recently used ones."""
+        self._sessions[str(session.session_id)] = session
+        while len(self._sessions) > self.CACHE_ENTRIES:
+            self._sessions.popitem(last=False)
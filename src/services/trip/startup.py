@@ -0,0 +1,85 @@
+"""Startup profiling for cold-start measurements.
+
+Records how long imports and each lifespan phase take and logs every phase as a
+structured event once startup completes, so scale-to-zero cold starts can be
+broken down from logs. Events are emitted at the end because import-time phases
+run before logging is configured.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger("startup")
+
+# Captured as early as possible: main.py imports this module before anything heavy
+PROCESS_STARTED = time.perf_counter()
+
+
+class StartupProfile:
+    """Collects named startup phase durations."""
+
+    def __init__(self, service: str):
+        """
+        Initialize the startup profile.
+
+        Args:
+            service: Service name attached to every logged event
+        """
+        self.service = service
+        self.phases: dict[str, float] = {}
+        self._last_mark = PROCESS_STARTED
+
+    def mark(self, phase: str) -> float:
+        """
+        Record a phase that ended now and started at the previous mark.
+
+        Args:
+            phase: Phase name
+
+        Returns:
+            Phase duration in milliseconds
+        """
+        now = time.perf_counter()
+        duration_ms = (now - self._last_mark) * 1000
+        self._last_mark = now
+        self._record(phase, duration_ms)
+        return duration_ms
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Time the wrapped block as a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._last_mark = now
+            self._record(phase, (now - started) * 1000)
+
+    def complete(self) -> float:
+        """
+        Record the total time from process start to ready and log all phases.
+
+        Returns:
+            Total startup duration in milliseconds
+        """
+        total_ms = (time.perf_counter() - PROCESS_STARTED) * 1000
+        self._record("total", total_ms)
+        for phase, duration_ms in self.phases.items():
+            self._log(phase, duration_ms)
+        return total_ms
+
+    def snapshot(self) -> dict[str, float]:
+        """Return recorded phase durations in milliseconds."""
+        return dict(self.phases)
+
+    def _record(self, phase: str, duration_ms: float):
+        self.phases[phase] = round(duration_ms, 2)
+
+    def _log(self, phase: str, duration_ms: float):
+        # key=value message keeps the event greppable; extra carries it for JSON formatters
+        logger.info(
+            f"startup_phase service={self.service} phase={phase} duration_ms={duration_ms:.1f}",
+            extra={"event": "startup_phase", "service": self.service, "phase": phase, "duration_ms": duration_ms},
+        )
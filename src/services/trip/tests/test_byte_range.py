@@ -0,0 +1,71 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from services.byte_range import (
+    BlobRange,
+    RangeNotSatisfiableError,
+    if_range_matches,
+    parse_range,
+    resolve_range,
+)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-499", (0, 499)),
+        ("bytes=500-", (500, None)),
+        ("bytes=-500", (None, 500)),
+        (" bytes = 10 - 20 ", (10, 20)),
+        (None, None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=5-1", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert parse_range(header) == expected
+
+
+def test_resolve_range_clamps_to_blob():
+    assert resolve_range((0, 499), 100) == (0, 99)
+    assert resolve_range((90, None), 100) == (90, 99)
+    assert resolve_range((None, 500), 100) == (0, 99)
+    assert resolve_range((None, 10), 100) == (90, 99)
+
+
+@pytest.mark.parametrize("requested, size", [((100, None), 100), ((None, 0), 100), ((None, 5), 0)])
+def test_resolve_range_not_satisfiable(requested, size):
+    with pytest.raises(RangeNotSatisfiableError) as error:
+        resolve_range(requested, size)
+    assert error.value.content_range == f"bytes */{size}"
+
+
+def test_if_range_matches_strong_etag_or_exact_date():
+    modified = datetime(2025, 1, 1, 10, 0, 0, 123, tzinfo=UTC)
+
+    assert if_range_matches('"0x8D1"', "0x8D1", modified)
+    assert if_range_matches('"0x8D1"', '"0x8D1"', modified)
+    assert not if_range_matches('"0x8D2"', "0x8D1", modified)
+    assert not if_range_matches('W/"0x8D1"', "0x8D1", modified)
+    assert if_range_matches("Wed, 01 Jan 2025 10:00:00 GMT", "0x8D1", modified)
+    assert not if_range_matches("Wed, 01 Jan 2025 09:00:00 GMT", "0x8D1", modified)
+    assert not if_range_matches("yesterday", "0x8D1", modified)
+
+
+def test_blob_range_headers():
+    partial = BlobRange(chunks=None, content_type="image/jpeg", size=100, start=10, end=19, etag="0x8D1")
+    full = BlobRange(chunks=None, content_type="image/jpeg", size=100, start=0, end=99)
+
+    assert partial.status_code == 206
+    assert partial.headers() == {
+        "Accept-Ranges": "bytes",
+        "Content-Length": "10",
+        "Content-Range": "bytes 10-19/100",
+        "ETag": '"0x8D1"',
+    }
+    assert full.status_code == 200
+    assert "Content-Range" not in full.headers()
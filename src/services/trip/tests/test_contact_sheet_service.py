@@ -0,0 +1,92 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+
+from models import GalleryImage
+from services import ContactSheetService, FilesystemGalleryService, contact_sheet_prefix
+from services import contact_sheet_service
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replace the Pillow renderer with a counting fake running in a thread pool."""
+    calls: list[int] = []
+
+    def fake_render(images, tile_px, image_format, quality):
+        calls.append(len(images))
+        return f"{image_format}:{len(images)}".encode()
+
+    monkeypatch.setattr(contact_sheet_service, "render_contact_sheet", fake_render)
+    return calls
+
+
+def make_service(tmp_path) -> tuple[ContactSheetService, list[GalleryImage]]:
+    gallery = FilesystemGalleryService(str(tmp_path), "gallery")
+    images = [GalleryImage(blob_name=f"trip/{i}.jpg") for i in range(3)]
+    for image in images:
+        path = gallery.local_path(image.blob_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"image")
+    service = ContactSheetService(gallery)
+    service._executor = ThreadPoolExecutor(max_workers=1)
+    return service, images
+
+
+def test_sheet_name_changes_with_gallery(tmp_path):
+    service, images = make_service(tmp_path)
+
+    name = service.sheet_name("trip", 6, images, "jpeg")
+
+    assert name.startswith(f"{contact_sheet_prefix('trip')}6-") and name.endswith(".jpg")
+    assert service.sheet_name("trip", 6, images, "jpeg") == name
+    assert service.sheet_name("trip", 6, images[:2], "jpeg") != name
+    assert service.sheet_name("trip", 6, images, "webp").endswith(".webp")
+
+
+async def test_get_renders_once_and_serves_stored_sheet(tmp_path, renders):
+    service, images = make_service(tmp_path)
+
+    first, second = await asyncio.gather(
+        service.get("trip", 6, images, "jpeg"), service.get("trip", 6, images, "jpeg")
+    )
+    third = await service.get("trip", 6, images, "jpeg")
+
+    assert first == second == third == b"JPEG:3"
+    assert renders == [3]
+
+
+async def test_regeneration_removes_stale_sheet_of_same_variant(tmp_path, renders):
+    service, images = make_service(tmp_path)
+    gallery = service.gallery_service
+
+    await service.get("trip", 6, images, "jpeg")
+    await service.get("trip", 6, images, "webp")
+    await service.get("trip", 2, images[:2], "jpeg")
+    await service.get("trip", 6, images[:2], "jpeg")
+
+    names = await gallery.list_blob_names(contact_sheet_prefix("trip"))
+    assert sorted(names) == sorted(
+        [
+            service.sheet_name("trip", 6, images[:2], "jpeg"),
+            service.sheet_name("trip", 6, images, "webp"),
+            service.sheet_name("trip", 2, images[:2], "jpeg"),
+        ]
+    )
+
+
+def test_render_contact_sheet_tiles_images():
+    Image = pytest.importorskip("PIL.Image")
+
+    def encoded(color: str) -> bytes:
+        output = BytesIO()
+        Image.new("RGB", (400, 300), color).save(output, format="JPEG")
+        return output.getvalue()
+
+    sheet = contact_sheet_service.render_contact_sheet(
+        [encoded("red"), encoded("blue"), b"not an image"], 100, "JPEG", 80
+    )
+
+    with Image.open(BytesIO(sheet)) as image:
+        assert image.size == (200, 200)
@@ -0,0 +1,93 @@
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+from services import FilesystemGalleryService
+from services.content_store import REFCOUNT_KEY, acquire_blob, is_content_addressed, release_blob
+
+
+def upload(content: bytes) -> UploadFile:
+    return UploadFile(BytesIO(content), filename="image.jpg", headers=Headers({"content-type": "image/jpeg"}))
+
+
+class FakeBlobClient:
+    """One blob of a FakeContainerClient, with ETag-conditional metadata writes and deletes."""
+
+    def __init__(self, container, name):
+        self.container = container
+        self.name = name
+
+    def _current(self, etag):
+        blob = self.container.blobs.get(self.name)
+        if blob is None:
+            raise ResourceNotFoundError("gone")
+        if etag is not None and blob["etag"] != etag:
+            raise ResourceModifiedError("changed")
+        return blob
+
+    async def get_blob_properties(self):
+        blob = self._current(None)
+        return SimpleNamespace(metadata=dict(blob["metadata"]), etag=blob["etag"])
+
+    async def upload_blob(self, data, content_settings, metadata, overwrite):
+        if self.name in self.container.blobs:
+            raise ResourceExistsError("exists")
+        self.container.writes += 1
+        self.container.blobs[self.name] = {"data": data, "metadata": metadata, "etag": 1}
+
+    async def set_blob_metadata(self, metadata, etag=None, match_condition=None):
+        await asyncio.sleep(0)  # Lets concurrent updates interleave
+        blob = self._current(etag)
+        blob["metadata"], blob["etag"] = metadata, blob["etag"] + 1
+
+    async def delete_blob(self, etag=None, match_condition=None):
+        self._current(etag)
+        del self.container.blobs[self.name]
+
+
+class FakeContainerClient:
+    def __init__(self):
+        self.blobs: dict[str, dict] = {}
+        self.writes = 0
+
+    def get_blob_client(self, name):
+        return FakeBlobClient(self, name)
+
+
+async def test_identical_uploads_share_one_file(tmp_path):
+    gallery = FilesystemGalleryService(str(tmp_path), "gallery", content_addressed=True)
+
+    first = await gallery.upload_image(upload(b"same"), "trip-a")
+    second = await gallery.upload_image(upload(b"same"), "trip-b")
+    other = await gallery.upload_image(upload(b"other"), "trip-a")
+
+    assert first == second != other
+    assert is_content_addressed(first) and first.endswith(".jpg")
+    assert await gallery.list_blob_names("sha256/") == sorted([first, other])
+
+    assert await gallery.delete_image(first)
+    assert gallery.local_path(first).read_bytes() == b"same"
+    assert await gallery.delete_images([second, other]) == []
+    assert await gallery.list_blob_names("sha256/") == []
+
+
+async def test_azure_reference_count_survives_concurrent_updates():
+    container = FakeContainerClient()
+    name = "sha256/abc.jpg"
+
+    written = await asyncio.gather(*(acquire_blob(container, name, b"x", "image/jpeg") for _ in range(4)))
+
+    assert sorted(written) == [False, False, False, True]
+    assert container.writes == 1
+    assert container.blobs[name]["metadata"][REFCOUNT_KEY] == "4"
+
+    assert all(await asyncio.gather(*(release_blob(container, name) for _ in range(3))))
+    assert container.blobs[name]["metadata"][REFCOUNT_KEY] == "1"
+    assert await release_blob(container, name)
+    assert name not in container.blobs
+    # Releasing a blob that is already gone is not an error
+    assert await release_blob(container, name)
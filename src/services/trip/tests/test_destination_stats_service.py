@@ -0,0 +1,74 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from models import Trip
+from repositories.memory_repository import InMemoryTripRepository
+from repositories.sqlite_repository import SqliteTripRepository
+from services import DestinationStatsService
+from services.destination_stats_service import DESTINATIONS_PARTITION
+
+
+def make_trip(location_name="Prague", country_code="CZ") -> Trip:
+    return Trip(
+        title="Trip",
+        location_name=location_name,
+        country_code=country_code,
+        toy_id=uuid4(),
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+
+def summarize(stats):
+    return [(c.country_code, c.trip_count, [(l.location_name, l.trip_count) for l in c.locations]) for c in stats.countries]
+
+
+async def test_counts_follow_creates_updates_and_deletes():
+    repo = InMemoryTripRepository()
+    destinations = DestinationStatsService(repo, batch_size=2)
+    prague = await repo.create(make_trip())
+    await repo.create(make_trip())
+    await repo.create(make_trip("Brno"))
+    vienna = await repo.create(make_trip("Vienna", "AT"))
+
+    await destinations.process_changes()
+    stats = await destinations.get()
+    assert stats.trip_count == 4
+    assert summarize(stats) == [("CZ", 3, [("Prague", 2), ("Brno", 1)]), ("AT", 1, [("Vienna", 1)])]
+
+    await repo.update(prague.id, {"location_name": "Bratislava", "country_code": "SK"})
+    await repo.delete(vienna.id)
+    await destinations.process_changes()
+    stats = await destinations.get(locations=1)
+    assert summarize(stats) == [("CZ", 2, [("Brno", 1)]), ("SK", 1, [("Bratislava", 1)])]
+    assert stats.countries[0].location_count == 2
+
+    # Replaying the whole feed changes nothing
+    changes, _ = await repo.read_changes(max_items=100)
+    for change in changes:
+        await destinations.apply(change)
+    assert summarize(await destinations.get(locations=1)) == summarize(stats)
+
+
+async def test_reconcile_repairs_drift(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    destinations = DestinationStatsService(repo)
+    kept = await repo.create(make_trip())
+    gone = await repo.create(make_trip("Vienna", "AT"))
+    await destinations.process_changes()
+    expected = summarize(await destinations.get())
+
+    # A deletion the processor never saw, a lost ledger entry and a corrupted total
+    await destinations._apply(str(uuid4()), {"country_code": "AT", "location_name": "Graz"})
+    ledger = await repo.read_views(DESTINATIONS_PARTITION, [f"trip:{kept.id}", "country:CZ"])
+    await repo.write_views(
+        DESTINATIONS_PARTITION, [{**ledger["country:CZ"], "trip_count": 7}], [ledger[f"trip:{kept.id}"]]
+    )
+
+    assert await destinations.reconcile() == 3
+    assert summarize(await destinations.get()) == expected
+    assert await destinations.reconcile() == 0
+
+    await repo.delete(gone.id)
+    await destinations.rebuild()
+    assert summarize(await destinations.get()) == [("CZ", 1, [("Prague", 1)])]
+    await repo.close()
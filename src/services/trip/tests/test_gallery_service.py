@@ -0,0 +1,209 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import ResourceModifiedError, ResourceNotFoundError
+
+from services import FilesystemGalleryService, GalleryService
+from services.byte_range import RangeNotSatisfiableError
+
+
+class FakeContainerClient:
+    """Records blob batch calls; answers with a status per blob name."""
+
+    def __init__(self, statuses=None, batch_supported=True):
+        self.statuses = statuses or {}
+        self.batch_supported = batch_supported
+        self.batches: list[int] = []
+        self.single_deletes: list[str] = []
+
+    async def delete_blobs(self, *blobs, raise_on_any_failure=True):
+        if not self.batch_supported:
+            raise RuntimeError("batch not supported")
+        self.batches.append(len(blobs))
+
+        async def responses():
+            for name in blobs:
+                yield SimpleNamespace(status_code=self.statuses.get(name, 202))
+
+        return responses()
+
+    async def delete_blob(self, blob_name):
+        self.single_deletes.append(blob_name)
+        if self.statuses.get(blob_name) == 404:
+            raise ResourceNotFoundError("gone")
+        if self.statuses.get(blob_name, 202) != 202:
+            raise RuntimeError("storage error")
+
+
+class FakeBlobClient:
+    """Serves one blob; records the ranges requested from storage."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.downloads: list[tuple] = []
+        self.properties = SimpleNamespace(
+            size=len(content),
+            etag='"0x8D1"',
+            last_modified=None,
+            content_settings=SimpleNamespace(content_type="image/jpeg"),
+        )
+
+    async def get_blob_properties(self):
+        return self.properties
+
+    def replace(self, content: bytes):
+        self.content = content
+        self.properties = SimpleNamespace(**{**vars(self.properties), "size": len(content), "etag": '"0x8D9"'})
+
+    async def download_blob(self, offset=None, length=None, etag=None, match_condition=None):
+        if etag is not None and etag != self.properties.etag:
+            raise ResourceModifiedError("blob changed")
+        self.downloads.append((offset, length))
+        start = offset or 0
+        data = self.content[start : start + length if length is not None else None]
+
+        async def chunks():
+            yield data
+
+        return SimpleNamespace(properties=self.properties, chunks=chunks)
+
+
+class FakeBlobContainerClient:
+    def __init__(self, blob_client):
+        self.blob_client = blob_client
+
+    def get_blob_client(self, blob_name):
+        return self.blob_client
+
+
+def make_service(container_client) -> GalleryService:
+    service = GalleryService("https://example.blob.core.windows.net", "gallery")
+    service._container_client = container_client
+    return service
+
+
+async def test_delete_images_batches_and_reports_failures():
+    names = [f"trip/{i}.jpg" for i in range(600)]
+    client = FakeContainerClient(statuses={"trip/5.jpg": 404, "trip/7.jpg": 500})
+
+    failed = await make_service(client).delete_images(names)
+
+    assert sorted(client.batches) == [88, 256, 256]
+    assert failed == ["trip/7.jpg"]
+
+
+async def test_delete_images_falls_back_to_single_deletes():
+    client = FakeContainerClient(statuses={"a.jpg": 404, "b.jpg": 503}, batch_supported=False)
+
+    failed = await make_service(client).delete_images(["a.jpg", "b.jpg", "c.jpg"])
+
+    assert sorted(client.single_deletes) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert failed == ["b.jpg"]
+
+
+async def test_filesystem_delete_images_ignores_missing_files(tmp_path):
+    service = FilesystemGalleryService(str(tmp_path), "gallery")
+    path = service.local_path("trip/a.jpg")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"x")
+
+    assert await service.delete_images(["trip/a.jpg", "trip/missing.jpg"]) == []
+    assert not path.exists()
+
+
+async def read_range(service, range_header=None, if_range=None):
+    blob = await service.open_image("trip/a.jpg", range_header, if_range)
+    return blob, b"".join([chunk async for chunk in blob.chunks])
+
+
+async def test_open_image_downloads_only_the_requested_range():
+    blob_client = FakeBlobClient(bytes(range(100)))
+    service = make_service(FakeBlobContainerClient(blob_client))
+
+    blob, body = await read_range(service, "bytes=-10")
+    assert (blob.status_code, blob.start, blob.end, body) == (206, 90, 99, bytes(range(90, 100)))
+    assert blob_client.downloads == [(90, 10)]
+
+    blob, body = await read_range(service, "bytes=10-19", if_range='"0x8D2"')
+    assert (blob.status_code, len(body)) == (200, 100)
+
+    blob, body = await read_range(service)
+    assert (blob.status_code, len(body)) == (200, 100)
+    assert blob_client.downloads[1:] == [(None, None), (None, None)]
+
+
+async def test_open_image_sends_whole_blob_replaced_while_opening_a_range():
+    blob_client = FakeBlobClient(bytes(range(100)))
+    service = make_service(FakeBlobContainerClient(blob_client))
+    read_properties = blob_client.get_blob_properties
+
+    async def properties_then_replace():
+        properties = await read_properties()
+        blob_client.replace(b"new" * 10)
+        return properties
+
+    blob_client.get_blob_properties = properties_then_replace
+    blob, body = await read_range(service, "bytes=0-9")
+
+    assert (blob.status_code, blob.size, blob.etag, body) == (200, 30, '"0x8D9"', b"new" * 10)
+    assert blob_client.downloads == [(None, None)]
+
+
+async def test_open_image_rejects_unsatisfiable_range():
+    service = make_service(FakeBlobContainerClient(FakeBlobClient(b"x" * 10)))
+
+    with pytest.raises(RangeNotSatisfiableError):
+        await service.open_image("trip/a.jpg", "bytes=10-")
+
+
+class FakeUploadContainer:
+    """Holds directly uploaded blobs as name -> (size, content type)."""
+
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def list_blobs(self, name_starts_with):
+        async def names():
+            for name in self.blobs:
+                if name.startswith(name_starts_with):
+                    yield SimpleNamespace(name=name)
+
+        return names()
+
+    def get_blob_client(self, blob_name):
+        container = self
+
+        class BlobClient:
+            url = f"https://example.blob.core.windows.net/gallery/{blob_name}"
+
+            async def get_blob_properties(self):
+                size, content_type = container.blobs[blob_name]
+                return SimpleNamespace(size=size, content_settings=SimpleNamespace(content_type=content_type))
+
+            async def delete_blob(self):
+                del container.blobs[blob_name]
+
+        return BlobClient()
+
+
+async def test_create_upload_url_is_create_only():
+    service = make_service(FakeUploadContainer({}))
+    service.credential = "a2V5"
+    service._client = SimpleNamespace(account_name="example")
+
+    url, _ = await service.create_upload_url(service.pending_blob_name("trip", "img", "image/png"))
+
+    assert url.startswith("https://example.blob.core.windows.net/gallery/trip/img.png?")
+    assert "sp=c&" in url
+
+
+async def test_verify_upload_deletes_mismatched_content():
+    blobs = {"trip/ok.jpg": (100, "image/jpeg"), "trip/bad.jpg": (100, "image/png")}
+    service = make_service(FakeUploadContainer(blobs))
+
+    assert await service.verify_upload("trip", "ok") == "trip/ok.jpg"
+    with pytest.raises(ValueError):
+        await service.verify_upload("trip", "bad")
+    assert "trip/bad.jpg" not in blobs
+    with pytest.raises(FileNotFoundError):
+        await service.verify_upload("trip", "missing")
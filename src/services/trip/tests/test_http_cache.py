@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+
+from middleware import JsonResponseCache, etag_matches
+
+
+class Payload(BaseModel):
+    value: int
+
+
+def counting_builder():
+    calls = []
+
+    async def build() -> Payload:
+        calls.append(1)
+        return Payload(value=len(calls))
+
+    return build, calls
+
+
+async def test_cached_response_is_built_once_and_revalidates():
+    cache = JsonResponseCache()
+    build, calls = counting_builder()
+
+    first = await cache.respond("key", build, ttl_seconds=60)
+    second = await cache.respond("key", build, ttl_seconds=60, if_none_match=first.headers["etag"])
+
+    assert first.status_code == 200
+    assert first.body == b'{"value":1}'
+    assert first.headers["cache-control"] == "public, max-age=60"
+    assert second.status_code == 304
+    assert len(calls) == 1
+
+
+async def test_expired_responses_are_rebuilt_and_size_is_bounded():
+    cache = JsonResponseCache(max_entries=2)
+    build, calls = counting_builder()
+
+    await cache.respond("a", build, ttl_seconds=0)
+    response = await cache.respond("a", build, ttl_seconds=0)
+    assert response.body == b'{"value":2}'
+
+    for key in ("b", "c", "d"):
+        await cache.respond(key, build, ttl_seconds=60)
+    assert len(cache) == 2
+
+
+def test_etag_matches_is_weak_and_accepts_lists():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"x"', 'W/"abc"')
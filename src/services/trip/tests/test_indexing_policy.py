@@ -0,0 +1,45 @@
+import pytest
+
+from repositories.indexing_policy import (
+    SPATIAL_INDEXES,
+    TRIP_INDEXING_POLICY,
+    merged_policy,
+    missing_composite_indexes,
+    missing_spatial_indexes,
+)
+from repositories.pagination import decode_continuation, encode_continuation
+
+
+def test_missing_composite_indexes_ignores_default_ascending_order():
+    required = TRIP_INDEXING_POLICY["compositeIndexes"]
+    # Cosmos returns policies without "order" for ascending paths
+    current = {"compositeIndexes": [[{k: v for k, v in p.items() if v != "ascending"} for p in i] for i in required]}
+
+    assert missing_composite_indexes(current) == []
+    assert missing_composite_indexes({}) == required
+
+
+def test_merged_policy_keeps_existing_settings():
+    existing = [[{"path": "/title", "order": "ascending"}, {"path": "/id", "order": "descending"}]]
+    current = {"indexingMode": "consistent", "compositeIndexes": existing, "spatialIndexes": [{"path": "/location/*"}]}
+
+    policy = merged_policy(current)
+
+    assert policy["spatialIndexes"] == current["spatialIndexes"]
+    assert policy["compositeIndexes"][0] == existing[0]
+    assert missing_composite_indexes(policy) == []
+
+
+def test_continuation_token_round_trip_and_rejects_garbage():
+    token = encode_continuation("2026-01-01T10:00:00+00:00", "abc")
+    assert decode_continuation(token) == ("2026-01-01T10:00:00+00:00", "abc")
+    for bad in ("not-a-token", encode_continuation("a", "b")[:-3], "W10"):
+        with pytest.raises(ValueError):
+            decode_continuation(bad)
+
+
+def test_merged_policy_adds_missing_spatial_index():
+    policy = merged_policy({"compositeIndexes": TRIP_INDEXING_POLICY["compositeIndexes"]})
+
+    assert policy["spatialIndexes"] == SPATIAL_INDEXES
+    assert missing_spatial_indexes(policy) == []
@@ -0,0 +1,128 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from models import GalleryImage, Trip, TripStatus
+from repositories.memory_repository import InMemoryTripRepository
+
+
+def make_trip(toy_id, minutes=0, **kwargs) -> Trip:
+    kwargs.setdefault("country_code", "CZ")
+    return Trip(
+        title=f"Trip {minutes}",
+        location_name="Prague",
+        toy_id=toy_id,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+        **kwargs,
+    )
+
+
+async def test_list_by_toy_uses_per_toy_index():
+    repo = InMemoryTripRepository()
+    toy_a, toy_b = uuid4(), uuid4()
+    for minutes in range(4):
+        await repo.create(make_trip(toy_a, minutes))
+    await repo.create(make_trip(toy_b, 10))
+
+    trips, token = await repo.list_by_toy(toy_a, limit=3)
+    assert [t.title for t in trips] == ["Trip 3", "Trip 2", "Trip 1"]
+    trips, token = await repo.list_by_toy(toy_a, limit=3, continuation_token=token)
+    assert [t.title for t in trips] == ["Trip 0"]
+    assert token is None
+
+    assert await repo.count_by_toy(toy_a) == 4
+    assert (await repo.list_by_toy(uuid4())) == ([], None)
+
+
+async def test_update_and_delete_keep_index_consistent():
+    repo = InMemoryTripRepository()
+    toy_id = uuid4()
+    trip = await repo.create(make_trip(toy_id))
+
+    updated = await repo.update(trip.id, {"status": TripStatus.COMPLETED, "toy_id": str(uuid4())})
+    assert updated.status == TripStatus.COMPLETED
+    assert updated.toy_id == toy_id
+
+    assert await repo.delete(trip.id) is True
+    assert await repo.list_by_toy(toy_id) == ([], None)
+    assert await repo.delete(trip.id) is False
+
+
+async def test_gallery_items_keep_count_and_cover():
+    repo = InMemoryTripRepository()
+    trip = await repo.create(make_trip(uuid4()))
+    images = [GalleryImage(blob_name=f"{trip.id}/{i}.jpg") for i in range(3)]
+    for image in images:
+        with_image = await repo.add_gallery_image(trip.id, image)
+    assert (with_image.gallery_count, with_image.cover_image.image_id) == (3, images[0].image_id)
+
+    page, token = await repo.list_gallery(trip.id, limit=2)
+    rest, token = await repo.list_gallery(trip.id, limit=2, continuation_token=token)
+    assert [img.image_id for img in page + rest] == [img.image_id for img in images]
+    assert token is None
+
+    without_cover = await repo.remove_gallery_image(trip.id, images[0].image_id)
+    assert (without_cover.gallery_count, without_cover.cover_image.image_id) == (2, images[1].image_id)
+    assert await repo.get_gallery_image(trip.id, images[0].image_id) is None
+    # A repeated removal reports that nothing was removed
+    assert await repo.remove_gallery_image(trip.id, images[0].image_id) is None
+    assert (await repo.get_by_id(trip.id)).gallery_count == 2
+    assert await repo.add_gallery_image(uuid4(), images[0]) is None
+
+
+async def test_add_gallery_images_commits_batch_in_one_update():
+    repo = InMemoryTripRepository()
+    trip = await repo.create(make_trip(uuid4()))
+    await repo.add_gallery_image(trip.id, GalleryImage(blob_name=f"{trip.id}/first.jpg"))
+    images = [GalleryImage(blob_name=f"{trip.id}/{i}.jpg") for i in range(30)]
+
+    updated = await repo.add_gallery_images(trip.id, images)
+    assert updated.gallery_count == 31
+    assert updated.cover_image.blob_name == f"{trip.id}/first.jpg"
+    listed, _ = await repo.list_gallery(trip.id, limit=100)
+    assert [img.image_id for img in listed[1:]] == [img.image_id for img in images]
+    assert await repo.add_gallery_images(uuid4(), images) is None
+
+
+async def test_add_gallery_images_skips_images_already_in_gallery():
+    repo = InMemoryTripRepository()
+    trip = await repo.create(make_trip(uuid4()))
+    image = GalleryImage(blob_name=f"{trip.id}/image.jpg")
+    await repo.add_gallery_image(trip.id, image)
+
+    # A repeated commit of the same image
+    again = await repo.add_gallery_image(trip.id, image)
+    assert again.gallery_count == 1
+    assert [img.image_id for img in (await repo.list_gallery(trip.id))[0]] == [image.image_id]
+
+
+async def test_list_trips_filters_and_pages_with_continuation_token():
+    repo = InMemoryTripRepository()
+    for minutes in range(5):
+        await repo.create(make_trip(uuid4(), minutes, public_tracking_enabled=minutes % 2 == 0))
+    await repo.create(make_trip(uuid4(), 9, country_code="SK"))
+
+    first, token = await repo.list_trips(limit=2, country_code="CZ")
+    assert [t.title for t in first] == ["Trip 4", "Trip 3"]
+    second, token = await repo.list_trips(limit=2, continuation_token=token, country_code="CZ")
+    assert [t.title for t in second] == ["Trip 2", "Trip 1"]
+    last, token = await repo.list_trips(limit=2, continuation_token=token, country_code="CZ")
+    assert [t.title for t in last] == ["Trip 0"]
+    assert token is None
+
+    tracked, _ = await repo.list_trips(public_tracking_enabled=True, status="planned")
+    assert [t.title for t in tracked] == ["Trip 4", "Trip 2", "Trip 0"]
+
+
+async def test_change_feed_returns_latest_versions_in_commit_order():
+    repo = InMemoryTripRepository()
+    toy_id = uuid4()
+    first = await repo.create(make_trip(toy_id, 0))
+    second = await repo.create(make_trip(toy_id, 1))
+    await repo.update(first.id, {"title": "Renamed"})
+    await repo.delete(second.id)
+
+    changes, continuation = await repo.read_changes(max_items=1)
+    assert [(c.trip_id, c.trip.title) for c in changes] == [(str(first.id), "Renamed")]
+    changes, continuation = await repo.read_changes(continuation)
+    assert [(c.trip_id, c.toy_id, c.trip) for c in changes] == [(str(second.id), str(toy_id), None)]
+    assert await repo.read_changes(continuation) == ([], continuation)
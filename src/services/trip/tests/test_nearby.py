@@ -0,0 +1,98 @@
+import math
+import random
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from models import GeoPoint, Trip
+from repositories.geo import EARTH_RADIUS_KM, distance_km, search_boxes
+from repositories.memory_repository import InMemoryTripRepository
+from repositories.rtree import RTree
+from repositories.sqlite_repository import SqliteTripRepository
+from services import Gazetteer
+
+PARIS = (48.8566, 2.3522)
+
+
+def make_trip(name, latitude, longitude, minutes=0) -> Trip:
+    return Trip(
+        title=name,
+        location_name=name,
+        country_code="FR",
+        toy_id=uuid4(),
+        location=GeoPoint(coordinates=[longitude, latitude]),
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+def test_rtree_matches_linear_scan_through_inserts_and_deletes():
+    random.seed(7)
+    tree, points = RTree(max_entries=4), {}
+    for step in range(2000):
+        if points and random.random() < 0.3:
+            key = random.choice(list(points))
+            assert tree.delete(key)
+            del points[key]
+        else:
+            x, y = random.uniform(-180, 180), random.uniform(-90, 90)
+            points[step] = (x, y)
+            tree.insert(step, (x, y, x, y))
+    for _ in range(50):
+        x, y = random.uniform(-180, 140), random.uniform(-90, 50)
+        box = (x, y, x + 40, y + 40)
+        expected = {key for key, (px, py) in points.items() if box[0] <= px <= box[2] and box[1] <= py <= box[3]}
+        assert set(tree.search(box)) == expected
+    assert len(tree) == len(points)
+    assert not tree.delete("missing")
+
+
+def test_search_boxes_cover_the_circle_across_the_antimeridian():
+    latitude, longitude, radius = -17.7, 179.9, 100
+    boxes = search_boxes(latitude, longitude, radius)
+    assert len(boxes) == 2
+
+    # Points just inside the radius in every direction fall into one of the boxes
+    delta = radius * 0.999 / EARTH_RADIUS_KM
+    phi, lam = math.radians(latitude), math.radians(longitude)
+    for bearing in map(math.radians, range(0, 360, 10)):
+        phi2 = math.asin(math.sin(phi) * math.cos(delta) + math.cos(phi) * math.sin(delta) * math.cos(bearing))
+        lam2 = lam + math.atan2(
+            math.sin(bearing) * math.sin(delta) * math.cos(phi), math.cos(delta) - math.sin(phi) * math.sin(phi2)
+        )
+        point_latitude, point_longitude = math.degrees(phi2), (math.degrees(lam2) + 180) % 360 - 180
+        assert distance_km(latitude, longitude, point_latitude, point_longitude) <= radius
+        assert any(b[0] <= point_longitude <= b[2] and b[1] <= point_latitude <= b[3] for b in boxes)
+
+    # Circles around a pole span all longitudes
+    assert search_boxes(89.5, 0, 100)[0][0::2] == (-180.0, 180.0)
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+async def test_list_nearby_filters_by_distance_and_pages(backend, tmp_path):
+    repo = InMemoryTripRepository() if backend == "memory" else SqliteTripRepository(str(tmp_path / "trips.db"))
+    await repo.create(make_trip("Versailles", 48.8049, 2.1204, 1))
+    louvre = await repo.create(make_trip("Louvre", 48.8606, 2.3376, 2))
+    await repo.create(make_trip("Reims", 49.2583, 4.0317, 3))
+    await repo.create(make_trip("Disneyland", 48.8674, 2.7836, 4))
+    await repo.create(Trip(title="Unplaced", location_name="Somewhere", country_code="FR", toy_id=uuid4()))
+
+    first, token = await repo.list_nearby(*PARIS, radius_km=40, limit=2)
+    assert [t.title for t in first] == ["Disneyland", "Louvre"]
+    rest, token = await repo.list_nearby(*PARIS, radius_km=40, limit=2, continuation_token=token)
+    assert [t.title for t in rest] == ["Versailles"]
+    assert token is None
+
+    # Moving a trip moves it in the spatial index; deleting removes it
+    await repo.update(louvre.id, {"location": GeoPoint(coordinates=[4.0317, 49.2583]).model_dump()})
+    await repo.delete((await repo.list_nearby(*PARIS, radius_km=40))[0][0].id)
+    assert [t.title for t in (await repo.list_nearby(*PARIS, radius_km=40))[0]] == ["Versailles"]
+    assert [t.title for t in (await repo.list_nearby(49.26, 4.03, radius_km=5))[0]] == ["Reims", "Louvre"]
+    await repo.close()
+
+
+def test_gazetteer_matches_names_case_and_accent_insensitively():
+    gazetteer = Gazetteer()
+    assert gazetteer.geocode("  zurich ", "ch") == gazetteer.geocode("Zürich", "CH")
+    assert gazetteer.geocode("Praha", "CZ").latitude == pytest.approx(50.08, abs=0.01)
+    assert gazetteer.geocode("Paris", "US") is None
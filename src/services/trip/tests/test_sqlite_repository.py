@@ -0,0 +1,163 @@
+import json
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from models import GalleryImage, Trip, TripStatus
+from repositories.sqlite_repository import SqliteTripRepository
+from repositories.views import ViewConflictError
+
+
+def make_trip(toy_id, minutes=0) -> Trip:
+    return Trip(
+        title=f"Trip {minutes}",
+        location_name="Prague",
+        country_code="CZ",
+        toy_id=toy_id,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+async def test_list_by_toy_and_persistence(tmp_path):
+    path = str(tmp_path / "trips.db")
+    repo = SqliteTripRepository(path, read_connections=2)
+    toy_id = uuid4()
+    for minutes in range(4):
+        await repo.create(make_trip(toy_id, minutes))
+    await repo.create(make_trip(uuid4(), 10))
+    await repo.close()
+
+    reopened = SqliteTripRepository(path)
+    trips, token = await reopened.list_by_toy(toy_id, limit=2)
+    assert [t.title for t in trips] == ["Trip 3", "Trip 2"]
+    trips, token = await reopened.list_by_toy(toy_id, limit=2, continuation_token=token)
+    assert [t.title for t in trips] == ["Trip 1", "Trip 0"]
+    assert token is None
+    assert await reopened.count_by_toy(toy_id) == 4
+
+    plan = await reopened.pool.read(
+        lambda c: c.execute(
+            "EXPLAIN QUERY PLAN SELECT doc FROM trips WHERE toy_id = ? AND (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC",
+            (str(toy_id), "2026", "x"),
+        ).fetchall()
+    )
+    assert "idx_trips_toy_created_at" in str(plan)
+    await reopened.close()
+
+
+async def test_update_and_gallery_items(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    trip = await repo.create(make_trip(uuid4()))
+
+    updated = await repo.update(trip.id, {"status": TripStatus.COMPLETED, "toy_id": str(uuid4())})
+    assert updated.status == TripStatus.COMPLETED
+    assert updated.toy_id == trip.toy_id
+
+    first, second = GalleryImage(blob_name=f"{trip.id}/a.jpg"), GalleryImage(blob_name=f"{trip.id}/b.jpg")
+    await repo.add_gallery_image(trip.id, first)
+    with_images = await repo.add_gallery_image(trip.id, second)
+    assert (with_images.gallery_count, with_images.cover_image.image_id) == (2, first.image_id)
+    assert (await repo.get_gallery_image(trip.id, second.image_id)).blob_name == second.blob_name
+    assert await repo.get_gallery_image(uuid4(), second.image_id) is None
+
+    page, token = await repo.list_gallery(trip.id, limit=1)
+    assert [img.image_id for img in page] == [first.image_id]
+    page, token = await repo.list_gallery(trip.id, limit=1, continuation_token=token)
+    assert [img.image_id for img in page] == [second.image_id]
+    assert token is None
+
+    batch = [GalleryImage(blob_name=f"{trip.id}/{i}.jpg") for i in range(3)]
+    assert (await repo.add_gallery_images(trip.id, batch)).gallery_count == 5
+    for image in batch:
+        await repo.remove_gallery_image(trip.id, image.image_id)
+
+    without_cover = await repo.remove_gallery_image(trip.id, first.image_id)
+    assert (without_cover.gallery_count, without_cover.cover_image.image_id) == (1, second.image_id)
+    # A repeated removal reports that nothing was removed
+    assert await repo.remove_gallery_image(trip.id, first.image_id) is None
+    assert (await repo.get_by_id(trip.id)).gallery_count == 1
+    assert await repo.delete(trip.id) is True
+    assert await repo.pool.read(lambda c: c.execute("SELECT COUNT(*) FROM gallery_images").fetchone()[0]) == 0
+    assert await repo.add_gallery_image(trip.id, first) is None
+    assert await repo.list_gallery(trip.id) is None
+    await repo.close()
+
+
+async def test_add_gallery_images_skips_images_already_in_gallery(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    trip = await repo.create(make_trip(uuid4()))
+    image = GalleryImage(blob_name=f"{trip.id}/image.jpg")
+    await repo.add_gallery_image(trip.id, image)
+
+    # A repeated commit of the same image, alone and within a batch
+    again = await repo.add_gallery_image(trip.id, image)
+    assert again.gallery_count == 1
+    other = GalleryImage(blob_name=f"{trip.id}/other.jpg")
+    assert (await repo.add_gallery_images(trip.id, [image, other])).gallery_count == 2
+    await repo.close()
+
+
+async def test_embedded_galleries_are_migrated_on_open(tmp_path):
+    path = str(tmp_path / "trips.db")
+    repo = SqliteTripRepository(path)
+    trip = await repo.create(make_trip(uuid4()))
+    legacy = [GalleryImage(blob_name=f"{trip.id}/{i}.jpg").model_dump(mode="json") for i in range(3)]
+    await repo.pool.write(
+        lambda c: c.execute(
+            "UPDATE trips SET doc = json_set(json_remove(doc, '$.gallery_count', '$.cover_image'), '$.gallery', json(?))",
+            (json.dumps(legacy),),
+        )
+    )
+    await repo.close()
+
+    reopened = SqliteTripRepository(path)
+    migrated = await reopened.get_by_id(trip.id)
+    assert (migrated.gallery_count, str(migrated.cover_image.image_id)) == (3, legacy[0]["image_id"])
+    images, _ = await reopened.list_gallery(trip.id)
+    assert [str(img.image_id) for img in images] == [img["image_id"] for img in legacy]
+    await reopened.close()
+
+
+async def test_list_trips_keyset_pages_use_filter_indexes(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    for minutes in range(5):
+        await repo.create(make_trip(uuid4(), minutes))
+    await repo.update((await repo.list_trips(limit=1))[0][0].id, {"status": "completed"})
+
+    titles, token = [], None
+    while True:
+        page, token = await repo.list_trips(limit=2, continuation_token=token, country_code="CZ")
+        titles += [t.title for t in page]
+        if token is None:
+            break
+    assert titles == ["Trip 4", "Trip 3", "Trip 2", "Trip 1", "Trip 0"]
+
+    completed, _ = await repo.list_trips(status="completed")
+    assert [t.title for t in completed] == ["Trip 4"]
+    assert (await repo.list_trips(public_tracking_enabled=True)) == ([], None)
+
+    plan = await repo.pool.read(
+        lambda c: c.execute(
+            "EXPLAIN QUERY PLAN SELECT doc FROM trips WHERE json_extract(doc, '$.status') = ? "
+            "ORDER BY created_at DESC, id DESC",
+            ("completed",),
+        ).fetchall()
+    )
+    assert "idx_trips_status_created_at" in str(plan)
+    await repo.close()
+
+
+async def test_view_writes_are_conditional(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    await repo.write_views("p", [{"id": "a", "_version": None, "n": 1}])
+    doc = (await repo.read_views("p", ["a", "missing"]))["a"]
+    assert doc["n"] == 1
+
+    await repo.write_views("p", [{**doc, "n": 2}])
+    with pytest.raises(ViewConflictError):
+        await repo.write_views("p", [{**doc, "n": 3}])
+    assert [d["n"] for d in await repo.list_views("p")] == [2]
+    assert await repo.clear_views("p") == 1
+    await repo.close()
@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+
+import startup
+from startup import StartupProfile
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic perf_counter starting at the process start."""
+    now = [100.0]
+    monkeypatch.setattr(startup, "PROCESS_STARTED", 100.0)
+    monkeypatch.setattr(startup.time, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_mark_times_from_the_previous_mark(clock):
+    profile = StartupProfile("trip")
+
+    clock[0] = 100.25
+    assert profile.mark("imports") == pytest.approx(250)
+    clock[0] = 100.26
+    assert profile.mark("settings") == pytest.approx(10)
+
+    assert profile.snapshot() == {"imports": 250.0, "settings": 10.0}
+
+
+def test_phase_times_its_block_and_moves_the_mark(clock):
+    profile = StartupProfile("trip")
+
+    clock[0] = 101.0
+    with pytest.raises(RuntimeError):
+        with profile.phase("clients"):
+            clock[0] = 101.5
+            raise RuntimeError("failed")
+    clock[0] = 101.75
+    profile.mark("warm_models")
+
+    assert profile.snapshot() == {"clients": 500.0, "warm_models": 250.0}
+
+
+def test_complete_records_total_and_logs_every_phase(clock, caplog):
+    profile = StartupProfile("trip")
+    clock[0] = 100.1
+    profile.mark("imports")
+    clock[0] = 100.3
+
+    with caplog.at_level(logging.INFO, logger="startup"):
+        total = profile.complete()
+
+    assert total == pytest.approx(300)
+    assert [(r.phase, r.duration_ms) for r in caplog.records] == [("imports", 100.0), ("total", 300.0)]
+    assert all(r.event == "startup_phase" and r.service == "trip" for r in caplog.records)
+    assert caplog.records[0].getMessage() == "startup_phase service=trip phase=imports duration_ms=100.0"
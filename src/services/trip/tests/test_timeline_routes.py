@@ -0,0 +1,63 @@
+from uuid import uuid4
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models import Trip
+from repositories.memory_repository import InMemoryTripRepository
+from routes import timeline_routes, trip_routes
+from services import TripStatsService
+
+
+class FakeToyClient:
+    async def get_toy(self, toy_id):
+        return {"id": str(toy_id), "name": "Bear"}
+
+
+async def test_timeline_takes_trip_count_from_stats(monkeypatch):
+    repo = InMemoryTripRepository()
+    toy_id = uuid4()
+    for index in range(3):
+        await repo.create(Trip(toy_id=toy_id, title=f"Trip {index}", location_name="Prague", country_code="CZ"))
+    stats = TripStatsService(repo)
+    await stats.process_changes()
+
+    async def fail_count(toy_id):
+        raise AssertionError("count_by_toy must not run when statistics are available")
+
+    monkeypatch.setattr(repo, "count_by_toy", fail_count)
+    monkeypatch.setattr(trip_routes, "trip_repository", repo)
+    monkeypatch.setattr(timeline_routes, "toy_client", FakeToyClient())
+    monkeypatch.setattr(timeline_routes, "trip_stats_service", stats)
+    timeline_routes._cache.clear()
+    app = FastAPI()
+    app.include_router(timeline_routes.router)
+
+    body = TestClient(app).get(f"/toy/{toy_id}/timeline?limit=2").json()
+
+    assert body["trip_count"] == 3
+    assert body["stats"]["trip_count"] == 3
+    assert len(body["trips"]) == 2
+
+
+async def test_timeline_counts_trips_without_a_caught_up_processor(monkeypatch):
+    repo = InMemoryTripRepository()
+    toy_id = uuid4()
+    for index in range(3):
+        await repo.create(Trip(toy_id=toy_id, title=f"Trip {index}", location_name="Prague", country_code="CZ"))
+    # Constructed but never run, as on instances with the processor disabled
+    stats = TripStatsService(repo)
+
+    monkeypatch.setattr(trip_routes, "trip_repository", repo)
+    monkeypatch.setattr(timeline_routes, "toy_client", FakeToyClient())
+    monkeypatch.setattr(timeline_routes, "trip_stats_service", stats)
+    timeline_routes._cache.clear()
+    app = FastAPI()
+    app.include_router(timeline_routes.router)
+
+    body = TestClient(app).get(f"/toy/{toy_id}/timeline?limit=2").json()
+
+    assert body["trip_count"] == 3
+    assert body["stats"] is None
+    await stats.rebuild()
+    assert stats.caught_up
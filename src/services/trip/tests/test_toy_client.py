@@ -0,0 +1,108 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+
+from services import ToyClient, ToyServiceError
+
+
+class FakeToyService:
+    """POST /toy/lookup handler recording each call."""
+
+    def __init__(self, existing, delay=0.0, fail=False):
+        self.existing = {str(toy_id) for toy_id in existing}
+        self.delay = delay
+        self.fail = fail
+        self.calls: list[list[str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            toy_id = request.url.path.rsplit("/", 1)[-1]
+            self.calls.append([toy_id])
+            if toy_id not in self.existing:
+                return httpx.Response(404, json={"detail": "Toy not found"})
+            return httpx.Response(200, json={"id": toy_id, "name": "Bear"})
+        ids = json.loads(request.content)["ids"]
+        self.calls.append(ids)
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return httpx.Response(503)
+        found = [toy_id for toy_id in ids if toy_id in self.existing]
+        return httpx.Response(200, json={"found": found, "missing": [i for i in ids if i not in found]})
+
+
+def make_client(service: FakeToyService, **kwargs) -> ToyClient:
+    return ToyClient("http://toy", transport=httpx.MockTransport(service), **kwargs)
+
+
+async def test_found_and_missing_toys_are_cached():
+    toy_id, ghost_id = uuid4(), uuid4()
+    service = FakeToyService([toy_id])
+    client = make_client(service)
+
+    assert await client.exists(toy_id) is True
+    assert await client.exists(ghost_id) is False
+    assert await client.missing([toy_id, ghost_id]) == {ghost_id}
+    assert len(service.calls) == 2
+    assert client.metrics()["cache_hits"] == 2
+    await client.close()
+
+
+async def test_expired_negative_entry_is_looked_up_again():
+    toy_id = uuid4()
+    service = FakeToyService([])
+    client = make_client(service, negative_ttl_seconds=0)
+
+    assert await client.exists(toy_id) is False
+    service.existing.add(str(toy_id))
+    assert await client.exists(toy_id) is True
+    assert len(service.calls) == 2
+    await client.close()
+
+
+async def test_concurrent_lookups_share_one_request():
+    toy_id = uuid4()
+    service = FakeToyService([toy_id], delay=0.05)
+    client = make_client(service)
+
+    results = await asyncio.gather(*(client.exists(toy_id) for _ in range(10)))
+
+    assert results == [True] * 10
+    assert service.calls == [[str(toy_id)]]
+    await client.close()
+
+
+async def test_bulk_lookup_is_batched():
+    toy_ids = [uuid4() for _ in range(150)]
+    service = FakeToyService(toy_ids[:140])
+    client = make_client(service)
+
+    assert await client.missing(toy_ids + toy_ids[:5]) == set(toy_ids[140:])
+    assert sorted(len(ids) for ids in service.calls) == [50, 100]
+    await client.close()
+
+
+async def test_failures_are_reported_and_not_cached():
+    toy_id = uuid4()
+    service = FakeToyService([toy_id], delay=0.05, fail=True)
+    client = make_client(service)
+
+    results = await asyncio.gather(client.exists(toy_id), client.exists(toy_id), return_exceptions=True)
+    assert all(isinstance(result, ToyServiceError) for result in results)
+
+    service.fail = False
+    assert await client.exists(toy_id) is True
+    await client.close()
+
+
+async def test_get_toy_refreshes_existence_cache():
+    toy_id, ghost_id = uuid4(), uuid4()
+    service = FakeToyService([toy_id])
+    client = make_client(service)
+
+    assert (await client.get_toy(toy_id))["name"] == "Bear"
+    assert await client.get_toy(ghost_id) is None
+    assert await client.missing([toy_id, ghost_id]) == {ghost_id}
+    assert len(service.calls) == 2
+    await client.close()
@@ -0,0 +1,119 @@
+from uuid import uuid4
+
+from azure.cosmos import exceptions
+
+from models import GalleryImage, GalleryImageDocument
+from repositories import TripRepository
+
+
+class FakeContainer:
+    """Cosmos container holding items by (partition key, id); records point reads."""
+
+    def __init__(self):
+        self.items: dict[tuple[str, str], dict] = {}
+        self.reads: list[str] = []
+
+    def put(self, partition_key, item):
+        self.items[(partition_key, item["id"])] = {**item, "_etag": f'"{len(self.items)}"'}
+
+    async def read_item(self, item, partition_key):
+        self.reads.append(item)
+        try:
+            return dict(self.items[(partition_key, item)])
+        except KeyError:
+            raise exceptions.CosmosResourceNotFoundError(message="not found") from None
+
+    def query_items(self, query):
+        async def embedded():
+            for item in list(self.items.values()):
+                if "doc_type" not in item and "gallery_count" not in item and "gallery" in item:
+                    yield dict(item)
+
+        return embedded()
+
+    async def execute_item_batch(self, batch_operations, partition_key):
+        for _, (item,) in batch_operations:
+            self.put(partition_key, item)
+
+    async def replace_item(self, item, body, etag, match_condition):
+        if self.items[(item, item)]["_etag"] != etag:
+            raise exceptions.CosmosAccessConditionFailedError(message="etag mismatch")
+        self.put(item, body)
+        return self.items[(item, item)]
+
+
+def make_repository(container) -> TripRepository:
+    repo = TripRepository("https://example.documents.azure.com", "db", "trips")
+    repo._container = container
+    return repo
+
+
+def legacy_trip(images) -> dict:
+    """Trip document as written before galleries moved into image items."""
+    return {
+        "id": str(uuid4()),
+        "toy_id": str(uuid4()),
+        "title": "Weekend",
+        "location_name": "Prague",
+        "country_code": "CZ",
+        "gallery": [image.model_dump(mode="json") for image in images],
+    }
+
+
+async def test_get_gallery_image_is_one_point_read():
+    container = FakeContainer()
+    trip_id, image = str(uuid4()), GalleryImage(blob_name="trip/a.jpg")
+    container.put(trip_id, GalleryImageDocument.from_image(trip_id, image).model_dump(mode="json"))
+
+    found = await make_repository(container).get_gallery_image(trip_id, image.image_id)
+
+    assert found.blob_name == "trip/a.jpg"
+    assert container.reads == [str(image.image_id)]
+
+
+async def test_get_gallery_image_falls_back_to_embedded_gallery_until_migrated():
+    container = FakeContainer()
+    images = [GalleryImage(blob_name=f"trip/{index}.jpg") for index in range(2)]
+    trip = legacy_trip(images)
+    container.put(trip["id"], trip)
+    repo = make_repository(container)
+
+    # Not migrated yet: the miss on the image item reads the trip document
+    found = await repo.get_gallery_image(trip["id"], images[1].image_id)
+    assert found.blob_name == "trip/1.jpg"
+    assert container.reads == [str(images[1].image_id), trip["id"]]
+    assert await repo.get_gallery_image(trip["id"], uuid4()) is None
+    # Reading does not migrate the trip
+    assert "gallery" in container.items[(trip["id"], trip["id"])]
+
+    assert await repo.migrate_embedded_galleries() == 1
+    migrated = container.items[(trip["id"], trip["id"])]
+    assert "gallery" not in migrated and migrated["gallery_count"] == 2
+
+    # After a clean sweep, images are point reads and misses no longer read the trip
+    container.reads.clear()
+    assert (await repo.get_gallery_image(trip["id"], images[0].image_id)).blob_name == "trip/0.jpg"
+    assert await repo.get_gallery_image(trip["id"], uuid4()) is None
+    assert trip["id"] not in container.reads
+    assert len(container.reads) == 2
+
+
+async def test_sweep_with_concurrently_changed_trip_keeps_fallback():
+    container = FakeContainer()
+    image = GalleryImage(blob_name="trip/a.jpg")
+    trip = legacy_trip([image])
+    container.put(trip["id"], trip)
+    repo = make_repository(container)
+    replace_item = container.replace_item
+
+    async def changed_concurrently(item, body, etag, match_condition):
+        container.put(item, {**container.items[(item, item)]})
+        return await replace_item(item, body, etag, match_condition)
+
+    container.replace_item = changed_concurrently
+    assert await repo.migrate_embedded_galleries() == 0
+
+    found = await repo.get_gallery_image(trip["id"], image.image_id)
+    assert found.blob_name == "trip/a.jpg"
+    assert await repo.get_gallery_image(trip["id"], uuid4()) is None
+    assert container.reads[-1] == trip["id"]
@@ -0,0 +1,215 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models import GalleryImage
+from repositories.memory_repository import InMemoryTripRepository
+from routes import trip_routes
+from services import UploadSessionService
+from services.filesystem_gallery_service import FilesystemGalleryService
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(trip_routes, "trip_repository", InMemoryTripRepository())
+    monkeypatch.setattr(trip_routes, "toy_client", None)
+    monkeypatch.setattr(trip_routes, "gazetteer", None)
+    app = FastAPI()
+    app.include_router(trip_routes.router)
+    return TestClient(app)
+
+
+def trip_body(trip_id=None) -> dict:
+    body = {"toy_id": str(uuid4()), "title": "Weekend", "location_name": "Prague", "country_code": "CZ"}
+    if trip_id is not None:
+        body["id"] = str(trip_id)
+    return body
+
+
+def test_create_existing_trip_is_conflict(client):
+    trip_id = uuid4()
+    assert client.post("/trip", json=trip_body(trip_id)).status_code == 201
+
+    response = client.post("/trip", json=trip_body(trip_id))
+
+    assert response.status_code == 409
+    assert response.json()["detail"] == f"Trip already exists: {trip_id}"
+
+
+def test_create_maps_only_existing_trips_to_conflict(client, monkeypatch):
+    async def failing_create(trip):
+        raise ValueError("Invalid trip")
+
+    monkeypatch.setattr(trip_routes.trip_repository, "create", failing_create)
+    with pytest.raises(ValueError):
+        client.post("/trip", json=trip_body())
+
+
+def test_batch_writes_are_bounded_and_batch_size_is_capped(client, monkeypatch):
+    repo = trip_routes.trip_repository
+    create = repo.create
+    in_flight, peak = 0, 0
+
+    async def tracking_create(trip):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        try:
+            return await create(trip)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(repo, "create", tracking_create)
+    response = client.post("/trip/batch", json=[trip_body() for _ in range(40)])
+
+    assert response.status_code == 201
+    assert len(response.json()) == 40
+    assert peak == trip_routes.TRIP_BATCH_CONCURRENCY
+    too_many = [trip_body() for _ in range(trip_routes.TRIP_BATCH_MAX_ITEMS + 1)]
+    assert client.post("/trip/batch", json=too_many).status_code == 422
+
+
+def test_batch_rejects_duplicate_ids_before_writing(client):
+    trip_id = uuid4()
+
+    response = client.post("/trip/batch", json=[trip_body(trip_id), trip_body(trip_id)])
+
+    assert response.status_code == 400
+    assert client.get(f"/trip/{trip_id}").status_code == 404
+
+
+def test_batch_conflict_reports_created_trips(client):
+    existing_id, new_id = uuid4(), uuid4()
+    assert client.post("/trip", json=trip_body(existing_id)).status_code == 201
+
+    response = client.post("/trip/batch", json=[trip_body(new_id), trip_body(existing_id)])
+
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["created"] == [str(new_id)]
+    assert detail["failed"] == [str(existing_id)]
+    # Retrying without the created and existing trips succeeds
+    assert client.get(f"/trip/{new_id}").status_code == 200
+    assert client.post("/trip/batch", json=[trip_body()]).status_code == 201
+
+
+class RecordingGallery:
+    def __init__(self):
+        self.deleted = []
+
+    async def delete_image(self, blob_name):
+        self.deleted.append(blob_name)
+        return True
+
+
+def test_racing_image_deletes_release_blob_once(client, monkeypatch):
+    gallery = RecordingGallery()
+    monkeypatch.setattr(trip_routes, "gallery_service", gallery)
+    repo = trip_routes.trip_repository
+    trip_id = client.post("/trip", json=trip_body()).json()["id"]
+    image = GalleryImage(blob_name="sha256/ab/abcdef.jpg")
+    asyncio.run(repo.add_gallery_image(UUID(trip_id), image))
+
+    # Both deletes pass the existence check, as when they race
+    async def stale_get_gallery_image(trip_id, image_id):
+        return image
+
+    monkeypatch.setattr(repo, "get_gallery_image", stale_get_gallery_image)
+    first = client.delete(f"/trip/{trip_id}/gallery/{image.image_id}")
+    second = client.delete(f"/trip/{trip_id}/gallery/{image.image_id}")
+
+    assert (first.status_code, second.status_code) == (204, 404)
+    assert gallery.deleted == [image.blob_name]
+
+
+class DirectUploadGallery(FilesystemGalleryService):
+    """Filesystem gallery standing in for Blob Storage's pre-signed uploads."""
+
+    async def create_upload_url(self, blob_name):
+        return f"file:///{blob_name}", datetime.now(UTC) + timedelta(minutes=15)
+
+    async def verify_upload(self, trip_id, image_id):
+        blob_names = await self.list_blob_names(f"{trip_id}/{image_id}.")
+        if not blob_names:
+            raise FileNotFoundError(image_id)
+        return blob_names[0]
+
+
+def test_direct_upload_commit_is_idempotent(client, monkeypatch, tmp_path):
+    gallery = DirectUploadGallery(str(tmp_path), "gallery")
+    monkeypatch.setattr(trip_routes, "gallery_service", gallery)
+    repo = trip_routes.trip_repository
+    trip_id = client.post("/trip", json=trip_body()).json()["id"]
+
+    assert client.post(f"/trip/{trip_id}/gallery/uploads", json={"content_type": "image/gif"}).status_code == 400
+    ticket = client.post(f"/trip/{trip_id}/gallery/uploads", json={"content_type": "image/png"}).json()
+    commit_url = f"/trip/{trip_id}/gallery/uploads/{ticket['image_id']}/commit"
+    assert client.post(commit_url).status_code == 404
+
+    # The client's PUT to the upload URL
+    asyncio.run(gallery.put_blob(f"{trip_id}/{ticket['image_id']}.png", b"png", "image/png"))
+    assert client.post(commit_url, json={"caption": "Beach"}).json()["gallery_count"] == 1
+    assert client.post(commit_url).json()["gallery_count"] == 1
+
+    # Concurrent commits both pass the route's existence check
+    async def missing_gallery_image(trip_id, image_id):
+        return None
+
+    monkeypatch.setattr(repo, "get_gallery_image", missing_gallery_image)
+    response = client.post(commit_url)
+    assert response.status_code == 200
+    assert response.json()["gallery_count"] == 1
+
+
+def test_upload_session_chunks_commit_and_cancel(client, monkeypatch, tmp_path):
+    gallery = FilesystemGalleryService(str(tmp_path), "gallery")
+    monkeypatch.setattr(trip_routes, "upload_session_service", UploadSessionService(gallery, chunk_size=4))
+    repo = trip_routes.trip_repository
+    trip_id = client.post("/trip", json=trip_body()).json()["id"]
+    sessions_url = f"/trip/{trip_id}/gallery/sessions"
+
+    session = client.post(sessions_url, json={"content_type": "image/png", "size": 10}).json()
+    session_url = f"{sessions_url}/{session['session_id']}"
+    assert session["chunk_count"] == 3
+    assert client.put(f"{session_url}/chunks/2", content=b"89").status_code == 204
+    assert client.put(f"{session_url}/chunks/0", content=b"012").status_code == 400
+    assert client.put(f"{session_url}/chunks/0", content=b"01234").status_code == 413
+    assert client.put(f"{session_url}/chunks/3", content=b"89").status_code == 400
+    assert client.put(f"{session_url}/chunks/0", content=b"0123").status_code == 204
+    assert client.get(session_url).json()["received_chunks"] == [0, 2]
+
+    incomplete = client.post(f"{session_url}/commit")
+    assert incomplete.status_code == 409
+    assert incomplete.json()["detail"]["missing_chunks"] == [1]
+
+    assert client.put(f"{session_url}/chunks/1", content=b"4567").status_code == 204
+    committed = client.post(f"{session_url}/commit", json={"caption": "Harbour"}).json()
+    assert committed["gallery_count"] == 1
+    image = asyncio.run(repo.get_gallery_image(UUID(trip_id), UUID(session["session_id"])))
+    assert (tmp_path / "gallery" / image.blob_name).read_bytes() == b"0123456789"
+    assert client.get(session_url).status_code == 404
+
+    # A commit racing the finished one passes the existence check, then finds the session gone
+    calls = []
+    get_gallery_image = repo.get_gallery_image
+
+    async def stale_first_read(trip_id, image_id):
+        calls.append(image_id)
+        return None if len(calls) == 1 else await get_gallery_image(trip_id, image_id)
+
+    monkeypatch.setattr(repo, "get_gallery_image", stale_first_read)
+    raced = client.post(f"{session_url}/commit")
+    assert raced.status_code == 200
+    assert raced.json()["gallery_count"] == 1
+
+    cancelled = client.post(sessions_url, json={"content_type": "image/png", "size": 4}).json()
+    cancelled_url = f"{sessions_url}/{cancelled['session_id']}"
+    assert client.put(f"{cancelled_url}/chunks/0", content=b"0123").status_code == 204
+    assert client.delete(cancelled_url).status_code == 204
+    assert client.get(cancelled_url).status_code == 404
+    assert client.post(f"{cancelled_url}/commit").status_code == 404
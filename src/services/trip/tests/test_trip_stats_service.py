@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from models import GalleryImage, Trip
+from repositories.memory_repository import InMemoryTripRepository
+from repositories.sqlite_repository import SqliteTripRepository
+from services import TripStatsService
+
+
+def make_trip(toy_id, minutes=0, country_code="CZ") -> Trip:
+    return Trip(
+        title=f"Trip {minutes}",
+        location_name="Prague",
+        country_code=country_code,
+        toy_id=toy_id,
+        created_at=datetime(2026, 1, 1, tzinfo=UTC) + timedelta(minutes=minutes),
+    )
+
+
+async def test_statistics_follow_trip_changes():
+    repo = InMemoryTripRepository()
+    stats = TripStatsService(repo, batch_size=2)
+    toy_id = uuid4()
+    first = await repo.create(make_trip(toy_id, 0))
+    newest = await repo.create(make_trip(toy_id, 5, country_code="SK"))
+    await repo.create(make_trip(uuid4(), 9))
+    await repo.add_gallery_images(first.id, [GalleryImage(blob_name=f"{first.id}/{i}.jpg") for i in range(3)])
+
+    assert await stats.process_changes() == 3
+    summary = await stats.get(toy_id)
+    assert (summary.trip_count, summary.image_count, summary.countries) == (2, 3, ["CZ", "SK"])
+    assert summary.last_trip_at == newest.created_at
+
+    await repo.update(first.id, {"country_code": "AT"})
+    await repo.delete(newest.id)
+    assert await stats.process_changes() == 2
+    summary = await stats.get(toy_id)
+    assert (summary.trip_count, summary.image_count, summary.countries) == (1, 3, ["AT"])
+    assert summary.last_trip_at == first.created_at
+    assert await stats.process_changes() == 0
+
+    empty = await stats.get(uuid4())
+    assert (empty.trip_count, empty.countries, empty.last_trip_at) == (0, [], None)
+
+
+async def test_replayed_changes_are_applied_once():
+    repo = InMemoryTripRepository()
+    toy_id = uuid4()
+    for minutes in range(3):
+        await repo.create(make_trip(toy_id, minutes))
+    stats = TripStatsService(repo)
+    changes, _ = await repo.read_changes()
+
+    for change in changes + changes:
+        await stats.apply(change)
+    assert (await stats.get(toy_id)).trip_count == 3
+
+    # A second processor starts from the saved checkpoint instead of the beginning
+    await stats.process_changes()
+    await repo.create(make_trip(toy_id, 10))
+    assert await TripStatsService(repo).process_changes() == 1
+    assert (await stats.get(toy_id)).trip_count == 4
+
+
+async def test_rebuild_recreates_the_same_statistics(tmp_path):
+    repo = SqliteTripRepository(str(tmp_path / "trips.db"))
+    stats = TripStatsService(repo)
+    toy_id = uuid4()
+    trips = [await repo.create(make_trip(toy_id, minutes, country_code=code)) for minutes, code in enumerate("CZ SK CZ".split())]
+    await stats.process_changes()
+    await repo.delete(trips[0].id)
+    await stats.process_changes()
+    before = await stats.get(toy_id)
+
+    assert await stats.rebuild() == 3
+    after = await stats.get(toy_id)
+    assert after.model_dump(exclude={"updated_at"}) == before.model_dump(exclude={"updated_at"})
+    assert (after.trip_count, after.countries) == (2, ["CZ", "SK"])
+    await repo.close()
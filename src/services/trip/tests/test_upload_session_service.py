@@ -0,0 +1,70 @@
+import os
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from services import FilesystemGalleryService, IncompleteUploadError, UploadSessionService
+
+
+def make_service(tmp_path, **kwargs) -> UploadSessionService:
+    return UploadSessionService(FilesystemGalleryService(str(tmp_path), "gallery"), chunk_size=10, **kwargs)
+
+
+async def test_chunks_in_any_order_assemble_the_image(tmp_path):
+    sessions = make_service(tmp_path)
+    trip_id = uuid4()
+    content = os.urandom(25)
+    session = await sessions.create(trip_id, "image/jpeg", len(content))
+
+    await sessions.put_chunk(session, 2, content[20:])
+    await sessions.put_chunk(session, 0, content[:10])
+    # A fresh instance sees the same session and chunks
+    resumed = await make_service(tmp_path).get(trip_id, session.session_id, with_received=True)
+    assert resumed.received_chunks == [0, 2]
+
+    with pytest.raises(IncompleteUploadError) as error:
+        await sessions.complete(session)
+    assert error.value.missing == [1]
+
+    await sessions.put_chunk(session, 1, content[10:20])
+    blob_name = await sessions.complete(session)
+    assert blob_name == f"{trip_id}/{session.session_id}.jpg"
+    assert sessions.gallery_service.local_path(blob_name).read_bytes() == content
+    # Retried commit after the blob was assembled
+    assert await sessions.complete(session) == blob_name
+
+
+async def test_put_chunk_checks_index_and_length(tmp_path):
+    sessions = make_service(tmp_path)
+    session = await sessions.create(uuid4(), "image/png", 15)
+
+    with pytest.raises(ValueError):
+        await sessions.put_chunk(session, 2, b"x" * 5)
+    with pytest.raises(ValueError):
+        await sessions.put_chunk(session, 1, b"x" * 10)
+
+
+async def test_create_rejects_invalid_uploads(tmp_path):
+    sessions = make_service(tmp_path)
+
+    with pytest.raises(ValueError):
+        await sessions.create(uuid4(), "image/gif", 10)
+    with pytest.raises(ValueError):
+        await sessions.create(uuid4(), "image/jpeg", sessions.gallery_service.MAX_FILE_SIZE_BYTES + 1)
+
+
+async def test_expired_session_is_discarded(tmp_path):
+    sessions = make_service(tmp_path, ttl_seconds=60)
+    trip_id = uuid4()
+    session = await sessions.create(trip_id, "image/jpeg", 5)
+    await sessions.put_chunk(session, 0, b"x" * 5)
+    sessions._sessions[str(session.session_id)] = session.model_copy(
+        update={"expires_at": datetime.now(UTC) - timedelta(seconds=1)}
+    )
+
+    with pytest.raises(FileNotFoundError):
+        await sessions.get(trip_id, session.session_id)
+    assert await sessions.gallery_service.staged_block_ids(sessions.blob_name(session)) == set()
+    with pytest.raises(FileNotFoundError):
+        await sessions.get(trip_id, session.session_id)
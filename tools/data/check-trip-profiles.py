@@ -84,10 +84,16 @@ def main():
         owner_oid = trip.get("owner_oid", "unknown")
         toy_id = trip.get("toy_id", "unknown")
         legs = trip.get("legs", [])
-        gallery = trip.get("gallery", [])
+        gallery_count = trip.get("gallery_count", 0)
+        # Gallery metadata is listed separately; only the first images are checked
+        gallery = []
+        if gallery_count:
+            response = httpx.get(f"{service_url}/trip/{trip_id}/gallery", params={"limit": 3}, timeout=10.0)
+            if response.is_success:
+                gallery = response.json().get("items", [])
 
         total_legs += len(legs)
-        total_images += len(gallery)
+        total_images += gallery_count
 
         print(f"\n[{idx}] {trip_title}")
         print(f"    ID: {trip_id}")
@@ -103,7 +109,7 @@ def main():
         if len(legs) > 3:
             print(f"       ... and {len(legs) - 3} more")
 
-        print(f"    Gallery: {len(gallery)} images")
+        print(f"    Gallery: {gallery_count} images")
 
         # Check gallery images
         if gallery:
@@ -128,8 +134,8 @@ def main():
 
             if checked_images > 0:
                 print(f"       ✅ Checked {checked_images} images - all OK")
-            if len(gallery) > 3:
-                print(f"       ... and {len(gallery) - 3} more images")
+            if gallery_count > 3:
+                print(f"       ... and {gallery_count - 3} more images")
         else:
             image_missing += 1
 
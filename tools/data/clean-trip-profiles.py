@@ -69,11 +69,22 @@ def main():
     for trip in trips_to_delete:
         trip_id = trip["id"]
         trip_title = trip["title"]
-        gallery = trip.get("gallery", [])
-
-        if not gallery:
+        if not trip.get("gallery_count"):
             continue
 
+        # Gallery metadata is listed separately from the trip, page by page
+        gallery = []
+        params = {"limit": 500}
+        while True:
+            response = httpx.get(f"{service_url}/trip/{trip_id}/gallery", params=params, timeout=10.0)
+            if not response.is_success:
+                break
+            page = response.json()
+            gallery += page.get("items", [])
+            if not page.get("continuation_token"):
+                break
+            params["continuation_token"] = page["continuation_token"]
+
         for image in gallery:
             image_id = image["image_id"]
 
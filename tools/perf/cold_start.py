@@ -0,0 +1,160 @@
+"""Measure time-to-first-successful-response for the toy and trip services.
+
+Each run starts a fresh service process (a simulated scale-to-zero cold start),
+polls a real data endpoint until it answers with 2xx, and records the elapsed
+time together with the `startup_phase` events the service logs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import httpx
+
+
+ROOT = Path(__file__).resolve().parents[2]
+SERVICES_DIR = ROOT / "src" / "services"
+
+# Probe paths hit the repository (not /health) so the first response includes DB access
+SERVICES = {
+    "toy": {"port": 8001, "probe": "/toy?limit=1"},
+    "trip": {"port": 8002, "probe": "/trip?toy_id=00000000-0000-0000-0000-000000000000&limit=1"},
+}
+
+PHASE_PATTERN = re.compile(r"startup_phase service=\S+ phase=(?P<phase>\S+) duration_ms=(?P<ms>[\d.]+)")
+
+
+@dataclass
+class ColdStartRun:
+    """Result of one cold start."""
+
+    service: str
+    first_response_ms: float | None
+    status_code: int | None
+    phases: dict[str, float] = field(default_factory=dict)
+
+
+def _collect_phases(stream, phases: dict[str, float]) -> None:
+    """Parse startup phase events from the service log stream."""
+
+    for line in stream:
+        match = PHASE_PATTERN.search(line)
+        if match:
+            phases[match.group("phase")] = float(match.group("ms"))
+
+
+def measure_once(service: str, command: list[str], timeout: float) -> ColdStartRun:
+    """Start the service, wait for the first successful probe, then stop it."""
+
+    config = SERVICES[service]
+    port = config["port"]
+    url = f"http://127.0.0.1:{port}{config['probe']}"
+    phases: dict[str, float] = {}
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [*command, "--port", str(port)],
+        cwd=SERVICES_DIR / service,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    reader = threading.Thread(target=_collect_phases, args=(process.stdout, phases), daemon=True)
+    reader.start()
+
+    elapsed_ms: float | None = None
+    status_code: int | None = None
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    break
+                try:
+                    response = client.get(url)
+                except httpx.TransportError:
+                    time.sleep(0.02)
+                    continue
+                status_code = response.status_code
+                if response.is_success:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    break
+                time.sleep(0.02)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        reader.join(timeout=2)
+
+    return ColdStartRun(service=service, first_response_ms=elapsed_ms, status_code=status_code, phases=phases)
+
+
+def summarize(runs: list[ColdStartRun]) -> dict:
+    """Aggregate runs into min/median/max time-to-first-response."""
+
+    samples = [run.first_response_ms for run in runs if run.first_response_ms is not None]
+    summary = {"runs": len(runs), "failures": len(runs) - len(samples)}
+    if samples:
+        summary.update(
+            min_ms=round(min(samples), 1),
+            median_ms=round(statistics.median(samples), 1),
+            max_ms=round(max(samples), 1),
+        )
+    return summary
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    # No argparse choices: with nargs="*" they reject the list default on Python < 3.12
+    parser.add_argument("services", nargs="*", default=sorted(SERVICES), help="toy and/or trip (default: both)")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per service")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the first 2xx")
+    parser.add_argument(
+        "--command",
+        default="uv run uvicorn main:app --host 127.0.0.1",
+        help="Command that starts a service from its directory (--port is appended)",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+    unknown = set(args.services) - set(SERVICES)
+    if unknown:
+        parser.error(f"unknown services: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    command = args.command.split()
+    results: dict[str, dict] = {}
+
+    for service in args.services:
+        runs = [measure_once(service, command, args.timeout) for _ in range(args.runs)]
+        results[service] = {"summary": summarize(runs), "runs": [asdict(run) for run in runs]}
+        summary = results[service]["summary"]
+        print(
+            f"{service}: median {summary.get('median_ms', 'n/a')} ms "
+            f"(min {summary.get('min_ms', 'n/a')}, max {summary.get('max_ms', 'n/a')}, "
+            f"failures {summary['failures']}/{summary['runs']})"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    return 0 if all(r["summary"]["failures"] == 0 for r in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,490 @@
+"""Open-loop load test for the toy and trip services driven by their OpenAPI contracts.
+
+Operations are resolved from `specs/{toy,trip}/contracts/openapi.yaml` by
+operationId, mixed by weight, and fired at a fixed arrival rate regardless of
+how fast the services answer (open loop), so queueing delay shows up in the
+percentiles instead of silently lowering the offered load. Results are written
+as JSON so runs before and after a change can be compared with `compare`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+import yaml
+
+
+ROOT = Path(__file__).resolve().parents[2]
+CONTRACTS = {
+    "toy": ROOT / "specs" / "toy" / "contracts" / "openapi.yaml",
+    "trip": ROOT / "specs" / "trip" / "contracts" / "openapi.yaml",
+}
+
+# Cosmos DB request charge, reported when a service forwards it
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+
+# Smallest valid JPEG-like payload the services accept (content type is checked, not pixels)
+SAMPLE_IMAGE = b"\xff\xd8\xff\xe0" + b"\x00" * 2044 + b"\xff\xd9"
+
+# Named workload mixes: operationId -> relative weight
+PROFILES: dict[str, dict[str, int]] = {
+    "mixed": {
+        "listToys": 10,
+        "getToy": 15,
+        "updateToy": 4,
+        "getAvatar": 8,
+        "uploadAvatar": 2,
+        "listTrips": 15,
+        "getTrip": 20,
+        "updateTrip": 5,
+        "uploadGalleryImage": 3,
+        "getGalleryImage": 18,
+    },
+    "read-heavy": {
+        "listToys": 15,
+        "getToy": 20,
+        "getAvatar": 10,
+        "listTrips": 20,
+        "getTrip": 20,
+        "getGalleryImage": 15,
+    },
+    "write-heavy": {
+        "getTrip": 20,
+        "updateToy": 15,
+        "updateTrip": 25,
+        "uploadAvatar": 10,
+        "uploadGalleryImage": 30,
+    },
+    "gallery": {
+        "getTrip": 15,
+        "listGallery": 15,
+        "uploadGalleryImage": 25,
+        "getGalleryImage": 45,
+    },
+}
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One contract operation."""
+
+    operation_id: str
+    service: str
+    method: str
+    path: str
+
+
+@dataclass
+class Fixtures:
+    """Entities seeded before the run and referenced by generated requests."""
+
+    toy_ids: list[str] = field(default_factory=list)
+    trips: list[tuple[str, str]] = field(default_factory=list)  # (trip_id, toy_id)
+    images: list[tuple[str, str]] = field(default_factory=list)  # (trip_id, image_id)
+
+
+@dataclass
+class Sample:
+    """Outcome of one request."""
+
+    operation_id: str
+    latency_ms: float
+    service_ms: float
+    status_code: int | None
+    request_charge: float | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code is not None and self.status_code < 400
+
+
+def load_contract(service: str, path: Path) -> dict[str, Operation]:
+    """Index a contract's operations by operationId."""
+
+    spec = yaml.safe_load(path.read_text(encoding="utf-8"))
+    operations: dict[str, Operation] = {}
+    for route, methods in spec.get("paths", {}).items():
+        for method, details in methods.items():
+            operation_id = details.get("operationId") if isinstance(details, dict) else None
+            if operation_id:
+                operations[operation_id] = Operation(operation_id, service, method.upper(), route)
+    return operations
+
+
+def load_operations(contracts: dict[str, Path] = CONTRACTS) -> dict[str, Operation]:
+    """Load the operations of all service contracts."""
+
+    operations: dict[str, Operation] = {}
+    for service, path in contracts.items():
+        operations.update(load_contract(service, path))
+    return operations
+
+
+def parse_mix(profile: str, overrides: str | None) -> dict[str, int]:
+    """Return the workload weights for a profile with optional `op=weight,...` overrides."""
+
+    weights = dict(PROFILES[profile])
+    for item in filter(None, (overrides or "").split(",")):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = int(weight)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile of unsorted values."""
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil without float error
+    return ordered[int(rank) - 1]
+
+
+def build_request(operation: Operation, fixtures: Fixtures, rng: random.Random) -> dict[str, Any] | None:
+    """Build httpx request arguments for an operation from the seeded fixtures.
+
+    Returns None when the fixtures cannot satisfy the operation (e.g. no images yet).
+    """
+
+    oid = operation.operation_id
+    params: dict[str, Any] = {}
+    kwargs: dict[str, Any] = {}
+
+    if oid in {"getToy", "updateToy", "getAvatar", "uploadAvatar"}:
+        if not fixtures.toy_ids:
+            return None
+        path_params = {"id": rng.choice(fixtures.toy_ids)}
+    elif oid in {"getTrip", "updateTrip", "uploadGalleryImage", "listGallery"}:
+        if not fixtures.trips:
+            return None
+        path_params = {"id": rng.choice(fixtures.trips)[0]}
+        if oid == "listGallery":
+            params = {"limit": 50}
+    elif oid == "getGalleryImage":
+        if not fixtures.images:
+            return None
+        trip_id, image_id = rng.choice(fixtures.images)
+        path_params = {"id": trip_id, "image_id": image_id}
+    elif oid == "listToys":
+        path_params = {}
+        params = {"limit": 20, "offset": rng.choice([0, 0, 0, 20])}
+    elif oid == "listTrips":
+        if not fixtures.toy_ids:
+            return None
+        path_params = {}
+        params = {"toy_id": rng.choice(fixtures.toy_ids), "limit": 20}
+    else:
+        return None
+
+    if oid in {"updateToy", "updateTrip"}:
+        kwargs["json"] = {"description": f"load test update {rng.random():.6f}"}
+    elif oid in {"uploadAvatar", "uploadGalleryImage"}:
+        kwargs["files"] = {"file": ("load-test.jpg", SAMPLE_IMAGE, "image/jpeg")}
+
+    return {
+        "method": operation.method,
+        "url": operation.path.format(**path_params),
+        "params": params,
+        **kwargs,
+    }
+
+
+async def seed(
+    clients: dict[str, httpx.AsyncClient],
+    toys: int,
+    trips_per_toy: int,
+    images_per_trip: int,
+) -> Fixtures:
+    """Create the toys, trips and gallery images the workload operates on."""
+
+    fixtures = Fixtures()
+    for index in range(toys):
+        response = await clients["toy"].post("/toy", json={"name": f"Load Test Toy {index}"})
+        response.raise_for_status()
+        toy_id = response.json()["id"]
+        fixtures.toy_ids.append(toy_id)
+        files = {"file": ("avatar.jpg", SAMPLE_IMAGE, "image/jpeg")}
+        (await clients["toy"].post(f"/toy/{toy_id}/avatar", files=files)).raise_for_status()
+
+        for trip_index in range(trips_per_toy):
+            response = await clients["trip"].post(
+                "/trip",
+                json={
+                    "toy_id": toy_id,
+                    "title": f"Load Test Trip {trip_index}",
+                    "location_name": "Prague",
+                    "country_code": "CZ",
+                },
+            )
+            response.raise_for_status()
+            trip_id = response.json()["id"]
+            fixtures.trips.append((trip_id, toy_id))
+            for _ in range(images_per_trip):
+                files = {"file": ("gallery.jpg", SAMPLE_IMAGE, "image/jpeg")}
+                response = await clients["trip"].post(f"/trip/{trip_id}/gallery", files=files)
+                response.raise_for_status()
+            if images_per_trip:
+                response = await clients["trip"].get(f"/trip/{trip_id}/gallery", params={"limit": images_per_trip})
+                response.raise_for_status()
+                fixtures.images += [(trip_id, image["image_id"]) for image in response.json()["items"]]
+    return fixtures
+
+
+async def teardown(clients: dict[str, httpx.AsyncClient], fixtures: Fixtures) -> None:
+    """Delete seeded trips (with their galleries) and toys."""
+
+    for trip_id, _ in fixtures.trips:
+        await clients["trip"].delete(f"/trip/{trip_id}")
+    for toy_id in fixtures.toy_ids:
+        await clients["toy"].delete(f"/toy/{toy_id}")
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    operation: Operation,
+    request: dict[str, Any],
+    scheduled: float,
+    samples: list[Sample],
+) -> None:
+    started = time.perf_counter()
+    status_code: int | None = None
+    charge: float | None = None
+    try:
+        response = await client.request(**request)
+        await response.aread()
+        status_code = response.status_code
+        if REQUEST_CHARGE_HEADER in response.headers:
+            charge = float(response.headers[REQUEST_CHARGE_HEADER])
+    except httpx.HTTPError:
+        pass
+    finished = time.perf_counter()
+    samples.append(
+        Sample(
+            operation_id=operation.operation_id,
+            # Measured from the scheduled send time so client-side queueing is not hidden
+            latency_ms=(finished - scheduled) * 1000,
+            service_ms=(finished - started) * 1000,
+            status_code=status_code,
+            request_charge=charge,
+        )
+    )
+
+
+async def run_open_loop(
+    clients: dict[str, httpx.AsyncClient],
+    operations: dict[str, Operation],
+    weights: dict[str, int],
+    fixtures: Fixtures,
+    rps: float,
+    duration: float,
+    max_in_flight: int,
+    seed_value: int,
+) -> tuple[list[Sample], int, float]:
+    """Fire requests at a constant arrival rate.
+
+    Returns:
+        Samples, number of arrivals dropped because max_in_flight was reached, and elapsed seconds
+    """
+
+    rng = random.Random(seed_value)
+    names = list(weights)
+    weight_values = list(weights.values())
+    samples: list[Sample] = []
+    in_flight: set[asyncio.Task] = set()
+    dropped = 0
+    total = int(rps * duration)
+
+    start = time.perf_counter()
+    for index in range(total):
+        scheduled = start + index / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        operation = operations[rng.choices(names, weights=weight_values)[0]]
+        request = build_request(operation, fixtures, rng)
+        if request is None:
+            continue
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+            continue
+        task = asyncio.create_task(_send(clients[operation.service], operation, request, scheduled, samples))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    return samples, dropped, time.perf_counter() - start
+
+
+def summarize(samples: list[Sample], elapsed: float | None = None) -> dict[str, Any]:
+    """Aggregate samples into counts, error rate, latency percentiles and request charge."""
+
+    latencies = [s.latency_ms for s in samples]
+    errors = sum(1 for s in samples if not s.ok)
+    charges = [s.request_charge for s in samples if s.request_charge is not None]
+    summary: dict[str, Any] = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+        "max_ms": _round(max(latencies) if latencies else None),
+        "service_p50_ms": _round(percentile([s.service_ms for s in samples], 50)),
+        "ru_total": round(sum(charges), 2) if charges else None,
+        "ru_avg": round(sum(charges) / len(charges), 2) if charges else None,
+    }
+    if elapsed:
+        summary["throughput_rps"] = round(len(samples) / elapsed, 2)
+    return summary
+
+
+def build_report(samples: list[Sample], meta: dict[str, Any], dropped: int, elapsed: float) -> dict[str, Any]:
+    """Build the machine-readable report for a run."""
+
+    by_operation: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_operation.setdefault(sample.operation_id, []).append(sample)
+    return {
+        "meta": {**meta, "elapsed_s": round(elapsed, 2), "dropped": dropped},
+        "overall": summarize(samples, elapsed),
+        "operations": {name: summarize(items) for name, items in sorted(by_operation.items())},
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold_pct: float) -> tuple[list[str], bool]:
+    """Compare two reports.
+
+    Returns:
+        Printable lines and whether any p95/p99 latency or error rate regressed beyond the threshold
+    """
+
+    lines: list[str] = []
+    regressed = False
+    sections = {"overall": (baseline["overall"], current["overall"])}
+    for name, stats in current["operations"].items():
+        if name in baseline["operations"]:
+            sections[name] = (baseline["operations"][name], stats)
+
+    for name, (before, after) in sections.items():
+        parts = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "error_rate", "ru_avg"):
+            old, new = before.get(metric), after.get(metric)
+            if old is None or new is None:
+                continue
+            change = ((new - old) / old * 100) if old else (0.0 if new == old else float("inf"))
+            parts.append(f"{metric} {old} -> {new} ({change:+.1f}%)")
+            if metric in ("p95_ms", "p99_ms") and change > threshold_pct:
+                regressed = True
+            if metric == "error_rate" and new > old:
+                regressed = True
+        lines.append(f"{name}: " + ", ".join(parts))
+    return lines, regressed
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    operations = load_operations()
+    weights = parse_mix(args.profile, args.mix)
+    unknown = sorted(set(weights) - set(operations))
+    if unknown:
+        raise SystemExit(f"Operations not in contracts: {', '.join(unknown)}")
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    timeout = httpx.Timeout(args.request_timeout)
+    async with (
+        httpx.AsyncClient(base_url=args.toy_url, limits=limits, timeout=timeout) as toy_client,
+        httpx.AsyncClient(base_url=args.trip_url, limits=limits, timeout=timeout) as trip_client,
+    ):
+        clients = {"toy": toy_client, "trip": trip_client}
+        fixtures = await seed(clients, args.toys, args.trips_per_toy, args.images_per_trip)
+        try:
+            samples, dropped, elapsed = await run_open_loop(
+                clients, operations, weights, fixtures, args.rps, args.duration, args.max_in_flight, args.seed
+            )
+        finally:
+            if not args.keep_data:
+                await teardown(clients, fixtures)
+
+    meta = {
+        "profile": args.profile,
+        "weights": weights,
+        "target_rps": args.rps,
+        "duration_s": args.duration,
+        "max_in_flight": args.max_in_flight,
+        "seed": args.seed,
+        "toy_url": args.toy_url,
+        "trip_url": args.trip_url,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    return build_report(samples, meta, dropped, elapsed)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run a workload against running services")
+    run_parser.add_argument("--toy-url", default="http://localhost:8001")
+    run_parser.add_argument("--trip-url", default="http://localhost:8002")
+    run_parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    run_parser.add_argument("--mix", help="Weight overrides, e.g. getTrip=40,updateTrip=0")
+    run_parser.add_argument("--rps", type=float, default=50.0, help="Target arrival rate")
+    run_parser.add_argument("--duration", type=float, default=60.0, help="Seconds of load")
+    run_parser.add_argument("--max-in-flight", type=int, default=200, help="Arrivals beyond this are dropped")
+    run_parser.add_argument("--request-timeout", type=float, default=30.0)
+    run_parser.add_argument("--toys", type=int, default=10)
+    run_parser.add_argument("--trips-per-toy", type=int, default=3)
+    run_parser.add_argument("--images-per-trip", type=int, default=2)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--keep-data", action="store_true", help="Skip deleting seeded data")
+    run_parser.add_argument("--output", type=Path, help="Write the JSON report to this file")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95/p99 regression in %%")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        lines, regressed = compare(baseline, current, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+
+    report = asyncio.run(run(args))
+    overall = report["overall"]
+    print(
+        f"{overall['requests']} requests ({overall.get('throughput_rps', 0)} rps, dropped {report['meta']['dropped']}): "
+        f"p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms, "
+        f"errors {overall['error_rate']:.2%}"
+    )
+    for name, stats in report["operations"].items():
+        print(f"  {name}: n={stats['requests']} p95={stats['p95_ms']} ms err={stats['error_rate']:.2%}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+if __name__ == "__main__":
+    sys.exit(main())
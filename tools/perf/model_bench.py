@@ -0,0 +1,300 @@
+"""Microbenchmarks for the toy and trip data-model and serialization hot paths.
+
+Covers document parsing (`parse_datetime`), Cosmos document conversion
+(`from_toy`/`to_toy`, `from_trip`/`to_trip`), the `GalleryImage` serializers,
+gallery pages and list response building, at parametrized sizes.
+Each service runs in its own interpreter because both services ship a
+top-level `models` package. Results are written as JSON and can be compared
+against a saved baseline to catch serialization regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable
+from uuid import uuid4
+
+
+ROOT = Path(__file__).resolve().parents[2]
+SERVICES_DIR = ROOT / "src" / "services"
+
+LIST_SIZES = [1, 10, 100, 1000]
+GALLERY_SIZES = [0, 10, 100, 500]
+
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> dict[str, float]:
+    """Time fn with timeit, auto-scaling loops so each repeat takes at least min_time seconds."""
+
+    timer = timeit.Timer(fn)
+    loops = 1
+    while True:
+        elapsed = timer.timeit(loops)
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    samples = [t / loops * 1e6 for t in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        "loops": loops,
+        "min_us": round(min(samples), 3),
+        "median_us": round(statistics.median(samples), 3),
+    }
+
+
+def toy_benchmarks(list_sizes: list[int]) -> dict[str, Callable[[], Any]]:
+    """Benchmarks for the toy service models (imported from the service directory)."""
+
+    from models import Toy, ToyDocument
+
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    toy = Toy(name="Bench Bear", description="A well travelled bear")
+    item = ToyDocument.from_toy(toy).model_dump(by_alias=False, mode="json")
+    document = ToyDocument(**item)
+
+    benchmarks: dict[str, Callable[[], Any]] = {
+        "toy.parse_datetime[offset]": lambda: ToyDocument.parse_datetime("2026-01-01T10:00:00.123456+00:00"),
+        "toy.parse_datetime[z]": lambda: ToyDocument.parse_datetime("2026-01-01T10:00:00.123456Z"),
+        "toy.parse_datetime[offset_z]": lambda: ToyDocument.parse_datetime("2026-01-01T10:00:00+00:00Z"),
+        "toy.from_toy": lambda: ToyDocument.from_toy(toy),
+        "toy.to_toy": document.to_toy,
+        "toy.document_round_trip": lambda: ToyDocument(**item).to_toy(),
+    }
+
+    for size in list_sizes:
+        items = [
+            ToyDocument.from_toy(Toy(name=f"Toy {i}", created_at=base + timedelta(seconds=i))).model_dump(
+                by_alias=False, mode="json"
+            )
+            for i in range(size)
+        ]
+
+        def list_response(items=items, size=size):
+            # Repository conversion followed by the list_toys response body
+            toys = [ToyDocument(**i).to_toy() for i in items]
+            return {"items": [t.model_dump(mode="json") for t in toys], "total": size, "limit": size, "offset": 0}
+
+        benchmarks[f"toy.list_response[n={size}]"] = list_response
+    return benchmarks
+
+
+def trip_benchmarks(list_sizes: list[int], gallery_sizes: list[int]) -> dict[str, Callable[[], Any]]:
+    """Benchmarks for the trip service models (imported from the service directory)."""
+
+    from models import GalleryImage, GalleryImageDocument, Trip, TripDocument
+
+    base = datetime(2026, 1, 1, tzinfo=UTC)
+    image = GalleryImage(blob_name="trip/image.jpg", landmark="Charles Bridge", caption="Sunset")
+    image_item = image.model_dump(mode="json")
+
+    def make_trip(index: int = 0) -> Trip:
+        # Gallery images are separate items; the trip only carries the count and cover
+        return Trip(
+            title=f"Trip {index}",
+            location_name="Prague",
+            country_code="CZ",
+            toy_id=uuid4(),
+            created_at=base + timedelta(seconds=index),
+            gallery_count=12,
+            cover_image=image,
+        )
+
+    trip = make_trip()
+    document = TripDocument.from_trip(trip)
+    item = document.model_dump(by_alias=False, mode="json")
+    benchmarks: dict[str, Callable[[], Any]] = {
+        "trip.parse_datetime[offset]": lambda: TripDocument.parse_datetime("2026-01-01T10:00:00.123456+00:00"),
+        "trip.gallery_image.model_dump": image.model_dump,
+        "trip.gallery_image.model_dump_json_mode": lambda: image.model_dump(mode="json"),
+        "trip.gallery_image.validate": lambda: GalleryImage(**image_item),
+        "trip.from_trip": lambda: TripDocument.from_trip(trip),
+        "trip.to_trip": document.to_trip,
+        "trip.document_round_trip": lambda: TripDocument(**item).to_trip(),
+        "trip.response_json": lambda: trip.model_dump(mode="json"),
+    }
+
+    for size in gallery_sizes:
+        trip_id = str(uuid4())
+        image_items = [
+            GalleryImageDocument.from_image(trip_id, GalleryImage(blob_name=f"{trip_id}/{i}.jpg", caption="Sunset"))
+            .model_dump(mode="json")
+            for i in range(size)
+        ]
+
+        def gallery_page(image_items=image_items, size=size):
+            # Repository conversion of image items followed by the list_gallery response body
+            images = [GalleryImageDocument(**i).to_image() for i in image_items]
+            return {"items": [i.model_dump(mode="json") for i in images], "limit": size, "continuation_token": None}
+
+        benchmarks[f"trip.gallery_page[n={size}]"] = gallery_page
+
+    for size in list_sizes:
+        items = [
+            TripDocument.from_trip(make_trip(i)).model_dump(by_alias=False, mode="json") for i in range(size)
+        ]
+
+        def list_response(items=items, size=size):
+            trips = [TripDocument(**i).to_trip() for i in items]
+            return {"items": [t.model_dump(mode="json") for t in trips], "limit": size, "continuation_token": None}
+
+        benchmarks[f"trip.list_response[n={size}]"] = list_response
+    return benchmarks
+
+
+def run_worker(service: str, args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    """Run one service's benchmarks in this interpreter (cwd/sys.path must be the service directory)."""
+
+    if service == "toy":
+        benchmarks = toy_benchmarks(args.list_sizes)
+    else:
+        benchmarks = trip_benchmarks(args.list_sizes, args.gallery_sizes)
+
+    results = {}
+    for name, fn in benchmarks.items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(fn, args.repeat, args.min_time)
+    return results
+
+
+def run_service(service: str, args: argparse.Namespace) -> dict[str, dict[str, float]]:
+    """Run a service's benchmarks in a subprocess rooted in the service directory."""
+
+    service_dir = SERVICES_DIR / service
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "worker",
+        service,
+        "--repeat", str(args.repeat),
+        "--min-time", str(args.min_time),
+        "--list-sizes", *map(str, args.list_sizes),
+        "--gallery-sizes", *map(str, args.gallery_sizes),
+    ]
+    if args.filter:
+        command += ["--filter", args.filter]
+    env = {**os.environ, "PYTHONPATH": str(service_dir)}
+    completed = subprocess.run(command, cwd=service_dir, env=env, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{service} benchmarks failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold_pct: float) -> tuple[list[str], list[str]]:
+    """Compare median timings of two result files.
+
+    Returns:
+        Printable lines and the names of benchmarks slower than the threshold
+    """
+
+    lines: list[str] = []
+    regressions: list[str] = []
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            lines.append(f"{name}: {stats['median_us']} us (new)")
+            continue
+        change = (stats["median_us"] - before["median_us"]) / before["median_us"] * 100
+        marker = ""
+        if change > threshold_pct:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        lines.append(f"{name}: {before['median_us']} -> {stats['median_us']} us ({change:+.1f}%){marker}")
+    return lines, regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_measure_options(sub: argparse.ArgumentParser):
+        sub.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark (median is reported)")
+        sub.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per repeat")
+        sub.add_argument("--list-sizes", type=int, nargs="+", default=LIST_SIZES)
+        sub.add_argument("--gallery-sizes", type=int, nargs="+", default=GALLERY_SIZES)
+        sub.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+
+    run_parser = commands.add_parser("run", help="Run benchmarks and write JSON results")
+    # No argparse choices: with nargs="*" they reject the list default on Python < 3.12
+    run_parser.add_argument("services", nargs="*", default=["toy", "trip"], help="toy and/or trip (default: both)")
+    add_measure_options(run_parser)
+    run_parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    run_parser.add_argument("--baseline", type=Path, help="Compare against this results file")
+    run_parser.add_argument("--threshold", type=float, default=15.0, help="Allowed median slowdown in %%")
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=15.0, help="Allowed median slowdown in %%")
+
+    worker_parser = commands.add_parser("worker", help=argparse.SUPPRESS)
+    worker_parser.add_argument("service", choices=["toy", "trip"])
+    add_measure_options(worker_parser)
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and set(args.services) - {"toy", "trip"}:
+        parser.error(f"unknown services: {', '.join(sorted(set(args.services) - {'toy', 'trip'}))}")
+    return args
+
+
+def _report_comparison(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> int:
+    lines, regressions = compare(baseline, current, threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed more than {threshold}%")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+
+    if args.command == "worker":
+        print(json.dumps(run_worker(args.service, args)))
+        return 0
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        return _report_comparison(baseline, current, args.threshold)
+
+    results: dict[str, dict[str, float]] = {}
+    for service in args.services:
+        results.update(run_service(service, args))
+
+    import pydantic
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pydantic": pydantic.VERSION,
+            "platform": platform.platform(),
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "repeat": args.repeat,
+            "min_time_s": args.min_time,
+        },
+        "results": results,
+    }
+    for name, stats in results.items():
+        print(f"{name}: {stats['median_us']} us")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        return _report_comparison(baseline, report, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
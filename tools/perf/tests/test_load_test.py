@@ -0,0 +1,115 @@
+"""Unit tests for the contract-driven load test."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import unittest
+
+import httpx
+
+from module_loader import load_module
+
+
+load_test = load_module("load_test", "load_test.py")
+
+
+class ContractTests(unittest.TestCase):
+    """Tests for resolving operations from the OpenAPI contracts."""
+
+    def test_profiles_only_reference_contract_operations(self) -> None:
+        """Every weighted operation exists in the service contracts."""
+
+        operations = load_test.load_operations()
+        for profile in load_test.PROFILES.values():
+            self.assertLessEqual(set(profile), set(operations))
+
+    def test_operations_keep_service_method_and_path(self) -> None:
+        """Operations map to the owning service, HTTP method and path template."""
+
+        operations = load_test.load_operations()
+        self.assertEqual(operations["getGalleryImage"].service, "trip")
+        self.assertEqual(operations["getGalleryImage"].method, "GET")
+        self.assertEqual(operations["getGalleryImage"].path, "/trip/{id}/gallery/{image_id}")
+        self.assertEqual(operations["updateToy"].method, "PATCH")
+
+    def test_build_request_fills_path_parameters(self) -> None:
+        """Requests reference seeded fixtures."""
+
+        operations = load_test.load_operations()
+        fixtures = load_test.Fixtures(toy_ids=["t1"], trips=[("p1", "t1")], images=[("p1", "i1")])
+        request = load_test.build_request(operations["getGalleryImage"], fixtures, random.Random(1))
+        self.assertEqual(request["url"], "/trip/p1/gallery/i1")
+        self.assertIsNone(load_test.build_request(operations["getGalleryImage"], load_test.Fixtures(), random.Random(1)))
+
+
+class ReportTests(unittest.TestCase):
+    """Tests for percentiles, reports and run comparison."""
+
+    def test_nearest_rank_percentiles(self) -> None:
+        """Percentiles use the nearest-rank method."""
+
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(load_test.percentile(values, 50), 50.0)
+        self.assertEqual(load_test.percentile(values, 99), 99.0)
+        self.assertEqual(load_test.percentile([5.0], 95), 5.0)
+        self.assertIsNone(load_test.percentile([], 50))
+
+    def test_mix_overrides_and_disables_operations(self) -> None:
+        """Overrides change weights and zero removes an operation."""
+
+        weights = load_test.parse_mix("gallery", "getTrip=0,getGalleryImage=70")
+        self.assertNotIn("getTrip", weights)
+        self.assertEqual(weights["getGalleryImage"], 70)
+
+    def test_compare_flags_p95_regression(self) -> None:
+        """A p95 increase above the threshold is a regression."""
+
+        samples = [load_test.Sample("getTrip", float(ms), float(ms), 200) for ms in range(1, 101)]
+        baseline = load_test.build_report(samples, {}, 0, 1.0)
+        slower = [load_test.Sample("getTrip", ms * 1.5, ms * 1.5, 200) for ms in range(1, 101)]
+        current = load_test.build_report(slower, {}, 0, 1.0)
+
+        _, regressed = load_test.compare(baseline, current, threshold_pct=10.0)
+        self.assertTrue(regressed)
+        _, regressed = load_test.compare(baseline, baseline, threshold_pct=10.0)
+        self.assertFalse(regressed)
+
+
+class OpenLoopTests(unittest.TestCase):
+    """Tests for the arrival-rate driven generator."""
+
+    def test_open_loop_sends_at_target_rate_and_reads_request_charge(self) -> None:
+        """The generator issues rps * duration requests and collects RU headers."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = 500 if request.url.path.endswith("/gallery/i1") else 200
+            return httpx.Response(status, headers={"x-ms-request-charge": "2.5"}, json={})
+
+        async def scenario():
+            transport = httpx.MockTransport(handler)
+            async with (
+                httpx.AsyncClient(transport=transport, base_url="http://toy") as toy,
+                httpx.AsyncClient(transport=transport, base_url="http://trip") as trip,
+            ):
+                return await load_test.run_open_loop(
+                    {"toy": toy, "trip": trip},
+                    load_test.load_operations(),
+                    {"getTrip": 1, "getGalleryImage": 1},
+                    load_test.Fixtures(toy_ids=["t1"], trips=[("p1", "t1")], images=[("p1", "i1")]),
+                    rps=200,
+                    duration=0.2,
+                    max_in_flight=10,
+                    seed_value=7,
+                )
+
+        samples, dropped, _ = asyncio.run(scenario())
+        self.assertEqual(len(samples) + dropped, 40)
+        report = load_test.build_report(samples, {}, dropped, 0.2)
+        self.assertEqual(report["operations"]["getTrip"]["error_rate"], 0.0)
+        self.assertEqual(report["operations"]["getGalleryImage"]["error_rate"], 1.0)
+        self.assertEqual(report["overall"]["ru_avg"], 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Unit tests for the model microbenchmark suite."""
+
+from __future__ import annotations
+
+import argparse
+import unittest
+
+from module_loader import load_module
+
+
+model_bench = load_module("model_bench", "model_bench.py")
+
+
+def results(**medians: float) -> dict:
+    return {"results": {name: {"median_us": value, "min_us": value, "loops": 1} for name, value in medians.items()}}
+
+
+class CompareTests(unittest.TestCase):
+    """Tests for baseline comparison."""
+
+    def test_slowdown_beyond_threshold_is_a_regression(self) -> None:
+        """Only benchmarks slower than the threshold are reported."""
+
+        baseline = results(fast=10.0, slow=10.0)
+        current = results(fast=11.0, slow=12.0, added=5.0)
+
+        lines, regressions = model_bench.compare(baseline, current, threshold_pct=15.0)
+
+        self.assertEqual(regressions, ["slow"])
+        self.assertIn("added: 5.0 us (new)", lines)
+
+
+class ServiceRunTests(unittest.TestCase):
+    """Smoke test that each service suite runs in its own interpreter."""
+
+    def test_services_run_with_small_sizes(self) -> None:
+        """Both suites import their own models package and report timings."""
+
+        args = argparse.Namespace(repeat=1, min_time=0.0, list_sizes=[1], gallery_sizes=[0, 1], filter=None)
+        toy = model_bench.run_service("toy", args)
+        trip = model_bench.run_service("trip", args)
+
+        self.assertIn("toy.list_response[n=1]", toy)
+        self.assertIn("trip.gallery_page[n=1]", trip)
+        self.assertGreater(trip["trip.from_trip"]["median_us"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()